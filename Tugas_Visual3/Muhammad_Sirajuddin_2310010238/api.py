@@ -0,0 +1,510 @@
+# api.py — service HTTP/JSON headless (asyncio) untuk operasi crud, tanpa Qt
+"""
+Untuk integrasi (feed ERP, job malam) yang menulis ke tabel yang sama dengan form.
+Tabel, PK, dan kolom yang boleh ditulis diambil dari registry.py (sama dengan BaseForm).
+
+    python api.py --host 127.0.0.1 --port 8765 --pool 32
+
+Backend mysql (default, DB_CONFIG di crud.py): pool async aiomysql, SQL dibangun fungsi crud yang
+sama (page_sql, insert_sql, ...). Backend sqlite/replica (DB_BACKEND): crud biasa di thread pool.
+
+Rute (JSON; decimal dikirim sebagai string supaya tidak kena galat biner, tanggal ISO):
+    GET    /                       daftar tabel, PK, kolom, filter
+    GET    /stats                  jumlah request, error, koneksi, pool
+    GET    /<tabel>?limit=&cursor=&q=&order=[-]kolom&<kolom>=a,b&<kolom>.min=&<kolom>.max=
+                                   -> {"rows": [...], "next": cursor halaman berikutnya / null}
+    GET    /<tabel>/<id>           satu baris (404 kalau tidak ada)
+    POST   /<tabel>                insert satu baris -> 201 {"id": ...}
+    PUT    /<tabel>/<id>           update kolom yang dikirim (PATCH sama) -> {"updated": bool}
+    DELETE /<tabel>/<id>           -> {"deleted": bool}
+    POST   /<tabel>/bulk           list baris: yang membawa PK di-upsert, sisanya di-insert
+                                   (satu transaksi) -> {"inserted": n, "upserted": n}
+Koneksi HTTP/1.1 keep-alive; body harus pakai Content-Length (tanpa chunked).
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import crud as crud_module
+from crud import (
+    DB_CONFIG, TABLES, check_columns, crud, delete_sql, derived_values, insert_sql, page_sql,
+    select_by_id_sql, table_infos, update_sql
+)
+from registry import REGISTRY
+
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", "8765"))
+API_POOL_SIZE = int(os.environ.get("API_POOL_SIZE", "32"))   # koneksi DB maksimum
+PAGE_LIMIT = 200       # baris per halaman kalau ?limit tidak diisi
+MAX_LIMIT = 1000
+MAX_BODY = 16 * 1024 * 1024   # byte; bulk lebih besar dari ini dipecah di sisi klien
+BULK_BATCH = 1000      # baris per executemany
+KEEPALIVE_TIMEOUT = 30   # detik koneksi HTTP nganggur sebelum ditutup
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 411: "Length Required",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(v):
+    if isinstance(v, Decimal):
+        return str(v)
+    if isinstance(v, (datetime.date, datetime.time)):   # datetime juga turunan date
+        return v.isoformat()
+    if isinstance(v, datetime.timedelta):   # kolom TIME dari driver MySQL
+        return str(v)
+    if isinstance(v, (bytes, bytearray)):
+        return v.decode("utf-8", "replace")
+    raise TypeError(f"{type(v).__name__} tidak bisa dijadikan JSON")
+
+
+def dumps(obj):
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _db_error_status(e):
+    """Status HTTP untuk error DB; nama kelas DB-API 2 (PEP 249) sama di sqlite3/pymysql/mysql-connector."""
+    names = {c.__name__ for c in type(e).__mro__}
+    if "IntegrityError" in names:
+        return 409   # duplikat / FK
+    if "DataError" in names:
+        return 400   # nilai terlalu panjang / di luar rentang
+    return None
+
+
+def _bulk_groups(pk_name, rows):
+    """Baris bulk dikelompokkan per (ada PK?, kolom) supaya tiap kelompok satu executemany."""
+    groups = {}
+    for r in rows:
+        has_pk = r.get(pk_name) is not None
+        cols = tuple(c for c in r if c != pk_name or has_pk)
+        groups.setdefault((has_pk, cols), []).append(r)
+    return groups
+
+
+# ========== penyimpanan ==========
+class MySQLStore:
+    """aiomysql: pool async; SQL dari fungsi crud + dialek backend_mysql (tanpa mysql-connector pool)."""
+    name = "mysql"
+
+    def __init__(self, config=DB_CONFIG, pool_size=API_POOL_SIZE):
+        self._config = config
+        self._size = pool_size
+        self._pool = None
+        self.infos = {}
+
+    async def start(self):
+        import aiomysql
+        from backend_mysql import COLUMNS_SQL, FKS_SQL, Backend
+        self._dict_cursor = aiomysql.DictCursor
+        self._dialect = Backend
+        c = self._config
+        self._pool = await aiomysql.create_pool(
+            host=c["host"], port=c.get("port", 3306), user=c["user"], password=c["password"],
+            db=c["database"], charset="utf8mb4", autocommit=True,
+            connect_timeout=c.get("connection_timeout", 5), minsize=1, maxsize=self._size)
+        in_list = ", ".join(["%s"] * len(TABLES))
+        cols = await self._fetch(COLUMNS_SQL.format(in_list), TABLES)
+        fks = await self._fetch(FKS_SQL.format(in_list), TABLES)
+        self.infos = table_infos(TABLES, cols, fks)
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+
+    def stats(self):
+        return {"backend": self.name, "size": self._pool.size, "idle": self._pool.freesize,
+                "max": self._pool.maxsize}
+
+    async def _fetch(self, sql, params=()):
+        async with self._pool.acquire() as conn:
+            async with conn.cursor(self._dict_cursor) as cur:
+                await cur.execute(sql, params)
+                return await cur.fetchall()
+
+    async def _write(self, sql, params):
+        async with self._pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params)
+                return cur.rowcount, cur.lastrowid
+
+    def _prepare(self, table, data):
+        info = self.infos[table]
+        check_columns(info, data)
+        return info, derived_values(table, data)
+
+    async def page(self, table, cursor, limit, keyword, filters, order):
+        info = self.infos[table]
+        sql, params, next_cursor = page_sql(info, info.pk, cursor, limit, keyword, filters, order,
+                                            self._dialect.fulltext)
+        rows = await self._fetch(sql, params)
+        return rows, next_cursor(rows)
+
+    async def get(self, table, id_value):
+        rows = await self._fetch(select_by_id_sql(table, self.infos[table].pk), (id_value,))
+        return rows[0] if rows else None
+
+    async def insert(self, table, data):
+        info, data = self._prepare(table, data)
+        cols = tuple(k for k, v in data.items() if v is not None)
+        _, new_id = await self._write(insert_sql(table, cols), tuple(data[c] for c in cols))
+        return data[info.pk] if data.get(info.pk) is not None else new_id
+
+    async def update(self, table, id_value, data):
+        info, data = self._prepare(table, data)
+        cols = tuple(k for k in data if k != info.pk)
+        if not cols:
+            return False
+        n, _ = await self._write(update_sql(table, info.pk, cols),
+                                 tuple(data[c] for c in cols) + (id_value,))
+        return n > 0
+
+    async def delete(self, table, id_value):
+        n, _ = await self._write(delete_sql(table, self.infos[table].pk), (id_value,))
+        return n > 0
+
+    async def bulk(self, table, rows):
+        info = self.infos[table]
+        rows = [self._prepare(table, r)[1] for r in rows]
+        counts = {"inserted": 0, "upserted": 0}
+        async with self._pool.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor() as cur:
+                    for (has_pk, cols), group in _bulk_groups(info.pk, rows).items():
+                        sql = (self._dialect.upsert_sql(table, info.pk, cols) if has_pk
+                               else insert_sql(table, cols))
+                        for i in range(0, len(group), BULK_BATCH):
+                            await cur.executemany(sql, [tuple(r[c] for c in cols)
+                                                        for r in group[i:i + BULK_BATCH]])
+                        counts["upserted" if has_pk else "inserted"] += len(group)
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+        return counts
+
+
+def _bulk_sync(db, table, rows):
+    pk_name = REGISTRY[table].pk
+    counts = {"inserted": 0, "upserted": 0}
+    with db.unit_of_work() as uow:
+        for (has_pk, cols), group in _bulk_groups(pk_name, rows).items():
+            for i in range(0, len(group), BULK_BATCH):
+                chunk = group[i:i + BULK_BATCH]
+                if has_pk:
+                    uow.upsert_many(table, pk_name, chunk, cols)
+                else:
+                    uow.insert_many(table, chunk, cols)
+            counts["upserted" if has_pk else "inserted"] += len(group)
+    return counts
+
+
+class ThreadStore:
+    """Backend sqlite/replica: method crud biasa (sinkron) dijalankan di thread pool."""
+
+    def __init__(self, threads=crud_module.POOL_SIZE):
+        self.name = crud_module.DB_BACKEND
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix="api-db")
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, crud(), *args))
+
+    async def start(self):
+        await self._run(lambda db: db.table_info(TABLES[0]))   # buka backend & muat skema sekali
+
+    async def close(self):
+        self._executor.shutdown(wait=True)
+
+    def stats(self):
+        return crud.pool_stats()
+
+    async def page(self, table, cursor, limit, keyword, filters, order):
+        return await self._run(crud.query_page, table, REGISTRY[table].pk, cursor, limit,
+                               keyword, filters, order)
+
+    async def get(self, table, id_value):
+        return await self._run(crud.fetch_by_id, table, REGISTRY[table].pk, id_value)
+
+    async def insert(self, table, data):
+        return await self._run(crud.insert, table, data)
+
+    async def update(self, table, id_value, data):
+        return await self._run(crud.update, table, REGISTRY[table].pk, id_value, data)
+
+    async def delete(self, table, id_value):
+        return await self._run(crud.delete, table, REGISTRY[table].pk, id_value)
+
+    async def bulk(self, table, rows):
+        return await self._run(_bulk_sync, table, rows)
+
+
+def make_store(pool_size=API_POOL_SIZE):
+    if crud_module.DB_BACKEND == "mysql":
+        return MySQLStore(DB_CONFIG, pool_size)
+    return ThreadStore(min(pool_size, crud_module.POOL_SIZE))
+
+
+# ========== HTTP ==========
+async def read_message(reader, max_body=MAX_BODY):
+    """
+    Satu pesan HTTP/1.1 (request atau response) -> (baris awal, header huruf kecil, body);
+    None kalau koneksi ditutup sebelum ada pesan. Dipakai juga klien beban di bench.py.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    if "chunked" in headers.get("transfer-encoding", ""):
+        raise ApiError(411, "body harus pakai Content-Length")
+    length = int(headers.get("content-length") or 0)
+    if length > max_body:
+        raise ApiError(413, f"body lebih dari {max_body} byte")
+    body = await reader.readexactly(length) if length else b""
+    return line.decode("latin-1").strip(), headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = dumps(payload).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{name} harus angka: {value!r}")
+
+
+def _scalar(v):
+    return type(v) in (int, float, str)
+
+
+def _check_cursor(cursor, order, pk):
+    """
+    Cursor harus berbentuk sama dengan "next" yang dikirim sebelumnya: skalar untuk urut PK
+    (atau offset pencarian), [nilai, pk] untuk urut kolom (offset kalau kolomnya enum).
+    """
+    if cursor is None:
+        return
+    if order is None or order[0] == pk:
+        ok = _scalar(cursor)
+    elif isinstance(cursor, tuple):
+        ok = len(cursor) == 2 and (cursor[0] is None or _scalar(cursor[0])) and _scalar(cursor[1])
+    else:
+        ok = type(cursor) is int and cursor >= 0
+    if not ok:
+        raise ApiError(400, "cursor tidak valid")
+
+
+def _list_params(query, pk):
+    """?limit=&cursor=&q=&order=&<kolom>=a,b&<kolom>.min=&<kolom>.max= -> argumen page()."""
+    limit, cursor, keyword, order = PAGE_LIMIT, None, "", None
+    filters, ranges = {}, {}
+    for k, v in parse_qsl(query, keep_blank_values=True):
+        if k == "limit":
+            limit = max(1, min(_int(v, "limit"), MAX_LIMIT))
+        elif k == "cursor":
+            if v:
+                try:
+                    cursor = json.loads(v)
+                except ValueError:
+                    raise ApiError(400, "cursor tidak valid")
+                if isinstance(cursor, list):
+                    cursor = tuple(cursor)
+        elif k == "q":
+            keyword = v.strip()
+        elif k == "order":
+            order = (v[1:], True) if v.startswith("-") else (v, False)
+        elif k.endswith(".min") or k.endswith(".max"):
+            lo_hi = ranges.setdefault(k[:-4], [None, None])
+            lo_hi[k.endswith(".max")] = v or None
+        else:
+            filters[k] = [x for x in v.split(",") if x != ""]
+    filters.update((col, tuple(lo_hi)) for col, lo_hi in ranges.items())
+    _check_cursor(cursor, order, pk)
+    return cursor, limit, keyword, filters, order
+
+
+def _writable(table, data):
+    """Body tulis harus objek JSON berisi kolom registry (diubah_pada dsb. diisi DB)."""
+    if not isinstance(data, dict):
+        raise ApiError(400, "body harus objek JSON")
+    unknown = [k for k in data if k not in REGISTRY[table].columns]
+    if unknown:
+        raise ApiError(400, f"kolom tidak bisa ditulis di `{table}`: {', '.join(unknown)}")
+    return data
+
+
+class ApiServer:
+    def __init__(self, store):
+        self.store = store
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.in_flight = 0
+
+    def stats(self):
+        return {"uptime_s": round(time.time() - self.started, 1), "requests": self.requests,
+                "errors": self.errors, "connections": self.connections,
+                "in_flight": self.in_flight, "pool": self.store.stats()}
+
+    async def handle(self, reader, writer):
+        """Satu koneksi klien: request dilayani berurutan selama keep-alive."""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    msg = await asyncio.wait_for(read_message(reader), KEEPALIVE_TIMEOUT)
+                except ApiError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, False))
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break
+                if msg is None:
+                    break
+                start, headers, body = msg
+                parts = start.split()
+                version = parts[2] if len(parts) == 3 else "HTTP/1.0"
+                conn = headers.get("connection", "").lower()
+                keep_alive = conn == "keep-alive" or (version == "HTTP/1.1" and conn != "close")
+                if len(parts) != 3:
+                    status, payload = 400, {"error": "baris request tidak valid"}
+                else:
+                    status, payload = await self.dispatch(parts[0], parts[1], body)
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            return await self.route(method, target, body)
+        except ApiError as e:
+            self.errors += 1
+            return e.status, {"error": str(e)}
+        except ValueError as e:   # kolom / nilai enum / filter tidak valid (crud)
+            self.errors += 1
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self.errors += 1
+            return _db_error_status(e) or 500, {"error": str(e)}
+        finally:
+            self.in_flight -= 1
+
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        if not parts:
+            if method != "GET":
+                raise ApiError(405, "hanya GET")
+            return 200, {"tables": {t.name: {"pk": t.pk, "columns": list(t.columns),
+                                              "filters": t.filters} for t in REGISTRY.values()}}
+        if parts == ["stats"]:
+            return 200, self.stats()
+        table = parts[0]
+        if table not in REGISTRY or len(parts) > 2:
+            raise ApiError(404, f"tidak ada: {url.path}")
+        data = None
+        if body:
+            try:
+                data = json.loads(body, parse_float=Decimal)
+            except ValueError as e:
+                raise ApiError(400, f"JSON tidak valid: {e}")
+
+        if len(parts) == 1:
+            if method == "GET":
+                rows, nxt = await self.store.page(table, *_list_params(url.query, REGISTRY[table].pk))
+                return 200, {"rows": rows, "next": None if nxt is None else dumps(nxt)}
+            if method == "POST":
+                new_id = await self.store.insert(table, _writable(table, data))
+                return 201, {"id": new_id}
+            raise ApiError(405, "GET atau POST")
+
+        if parts[1] == "bulk":
+            if method != "POST":
+                raise ApiError(405, "hanya POST")
+            if not isinstance(data, list):
+                raise ApiError(400, "body bulk harus list baris")
+            return 200, await self.store.bulk(table, [_writable(table, r) for r in data])
+
+        id_value = _int(parts[1], "id")
+        if method == "GET":
+            row = await self.store.get(table, id_value)
+            if row is None:
+                raise ApiError(404, f"{table} {id_value} tidak ada")
+            return 200, row
+        if method in ("PUT", "PATCH"):
+            data = dict(_writable(table, data))
+            data.pop(REGISTRY[table].pk, None)
+            return 200, {"updated": await self.store.update(table, id_value, data)}
+        if method == "DELETE":
+            return 200, {"deleted": await self.store.delete(table, id_value)}
+        raise ApiError(405, "GET, PUT, PATCH, atau DELETE")
+
+
+async def serve(host=API_HOST, port=API_PORT, pool_size=API_POOL_SIZE, ready=None):
+    """Jalankan service sampai dibatalkan; ready(server) dipanggil sesudah port terbuka."""
+    store = make_store(pool_size)
+    await store.start()
+    api = ApiServer(store)
+    server = await asyncio.start_server(api.handle, host, port, backlog=1024)
+    try:
+        print(f"api: http://{host}:{port}/ (backend {store.name}, pool {pool_size})", flush=True)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await store.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Service HTTP/JSON untuk operasi crud (tanpa GUI)")
+    ap.add_argument("--host", default=API_HOST)
+    ap.add_argument("--port", type=int, default=API_PORT)
+    ap.add_argument("--pool", type=int, default=API_POOL_SIZE, help="koneksi DB maksimum")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.pool))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# backend_mysql.py — backend crud untuk server MySQL/MariaDB (mysql-connector)
+import queue
+import threading
+import time
+from functools import lru_cache
+
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+
+CHECKOUT_TIMEOUT = 10    # detik nunggu koneksi kosong sebelum menyerah
+HEALTH_INTERVAL = 30     # koneksi yang nganggur lebih lama dari ini di-ping dulu
+
+
+def _forget_statements(cnx):
+    # sesi baru / putus: prepared statement (crud.prepared) sudah hilang di server
+    cache = getattr(cnx, "_stmt_cache", None)
+    if cache:
+        cache.clear()
+
+
+class _Pool(pooling.MySQLConnectionPool):
+    """
+    MySQLConnectionPool yang:
+    - menunggu (bukan langsung error) kalau semua koneksi sedang dipakai,
+    - cuma ping koneksi yang sudah lama nganggur (bawaan: ping tiap get_connection),
+    - mencatat statistik waktu tunggu & berapa kali pool habis.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._stats_lock = threading.Lock()
+        self._last_used = {}    # connection_id -> waktu terakhir dikembalikan
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.exhausted = 0      # checkout yang harus antri karena pool habis
+        self.timeouts = 0       # checkout yang gagal karena kelamaan antri
+        self.pings = 0
+
+    def get_connection(self, timeout=CHECKOUT_TIMEOUT):
+        t0 = time.monotonic()
+        try:
+            cnx = self._cnx_queue.get(block=False)
+        except queue.Empty:
+            with self._stats_lock:
+                self.exhausted += 1
+            try:
+                cnx = self._cnx_queue.get(timeout=timeout)
+            except queue.Empty:
+                with self._stats_lock:
+                    self.timeouts += 1
+                raise PoolError("Pool koneksi DB habis (semua koneksi sedang dipakai)")
+        waited = time.monotonic() - t0
+
+        idle = time.monotonic() - self._last_used.get(cnx.connection_id, 0)
+        if idle > HEALTH_INTERVAL:
+            old_id = cnx.connection_id
+            try:
+                with self._stats_lock:
+                    self.pings += 1
+                cnx.ping(reconnect=True, attempts=1, delay=0)
+            except Error:
+                _forget_statements(cnx)
+                self.add_connection(cnx)   # tetap dikembalikan, dicoba lagi lain kali
+                raise
+            if cnx.connection_id != old_id:
+                _forget_statements(cnx)
+
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return pooling.PooledMySQLConnection(self, cnx)
+
+    def release(self, conn):
+        self._last_used[conn.connection_id] = time.monotonic()
+        conn.close()   # PooledMySQLConnection.close() = kembali ke pool
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "size": self.pool_size,
+                "idle": self._cnx_queue.qsize(),
+                "checkouts": self.checkouts,
+                "wait_avg_ms": 1000 * self.wait_total / self.checkouts if self.checkouts else 0.0,
+                "wait_max_ms": 1000 * self.wait_max,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+            }
+
+
+# information_schema untuk SchemaCatalog ({} = daftar %s nama tabel); juga dipakai api.py (aiomysql)
+COLUMNS_SQL = ("SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, DATA_TYPE, IS_NULLABLE, "
+               "COLUMN_KEY, COLUMN_DEFAULT, EXTRA FROM information_schema.COLUMNS "
+               "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({}) "
+               "ORDER BY TABLE_NAME, ORDINAL_POSITION")
+FKS_SQL = ("SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+           "FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = DATABASE() "
+           "AND REFERENCED_TABLE_NAME IS NOT NULL AND TABLE_NAME IN ({})")
+
+
+@lru_cache(maxsize=64)
+def _upsert_sql(table, pk_name, cols):
+    return (f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in cols)}) "
+            f"VALUES ({', '.join(['%s'] * len(cols))}) "
+            f"ON DUPLICATE KEY UPDATE {', '.join(f'`{c}`=VALUES(`{c}`)' for c in cols if c != pk_name)}")
+
+
+class Backend:
+    """MySQL: pool koneksi bersama + dialek SQL (FULLTEXT, ON DUPLICATE KEY, information_schema)."""
+    name = "mysql"
+
+    _STAMP_SQL = ("SELECT COUNT(*) AS n, SUM(CRC32(CONCAT_WS(':', TABLE_NAME, COLUMN_NAME, "
+                  "COLUMN_TYPE, COLUMN_KEY, ORDINAL_POSITION))) AS crc "
+                  "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                  "AND TABLE_NAME IN ({})")
+
+    def __init__(self, config, pool_size):
+        try:
+            self._pool = _Pool(pool_name=config.get("database", "crud"), pool_size=pool_size,
+                               pool_reset_session=False, **config)
+        except Error as e:
+            raise RuntimeError(f"Gagal koneksi DB: {e}")
+
+    # ----- koneksi -----
+    def get_connection(self):
+        return self._pool.get_connection()
+
+    def release(self, conn):
+        self._pool.release(conn)
+
+    def stats(self):
+        return dict(self._pool.stats(), backend=self.name)
+
+    def kill(self, db, connection_id):
+        with db.cursor() as cur:
+            cur.execute(f"KILL QUERY {int(connection_id)}")
+
+    # ----- dialek (tanpa koneksi: bisa dipanggil dari kelasnya, mis. oleh api.py) -----
+    @staticmethod
+    def upsert_sql(table, pk_name, cols):
+        """INSERT banyak baris; yang PK-nya sudah ada di-UPDATE."""
+        return _upsert_sql(table, pk_name, tuple(cols))
+
+    @staticmethod
+    def fulltext(table, pk_name, cols, tokens):
+        """(kondisi, params, order, order_params) untuk token prefix di index FULLTEXT."""
+        match = f"MATCH({', '.join(f'`{c}`' for c in cols)}) AGAINST(%s IN BOOLEAN MODE)"
+        expr = " ".join(f"+{t}*" for t in tokens)
+        return match, (expr,), f"{match} DESC", (expr,)
+
+    # ----- skema -----
+    def schema_stamp(self, db, names):
+        with db.cursor() as cur:
+            cur.execute(self._STAMP_SQL.format(", ".join(["%s"] * len(names))), tuple(names))
+            row = cur.fetchone()
+        return (row["n"], row["crc"])
+
+    def load_schema(self, db, names):
+        """Baris information_schema.COLUMNS dan FK (KEY_COLUMN_USAGE) untuk tabel `names`."""
+        in_list = ", ".join(["%s"] * len(names))
+        with db.cursor() as cur:
+            cur.execute(COLUMNS_SQL.format(in_list), tuple(names))
+            cols = cur.fetchall()
+            cur.execute(FKS_SQL.format(in_list), tuple(names))
+            fks = cur.fetchall()
+        return cols, fks
@@ -0,0 +1,458 @@
+# backend_sqlite.py — backend crud tanpa server: file SQLite (WAL) yang dibuat dari db_2310010238.sql
+import datetime
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from functools import lru_cache
+
+CHECKOUT_TIMEOUT = 10    # detik nunggu koneksi kosong / kunci tulis SQLite
+
+# Nilai Python <-> SQLite disamakan dengan yang dikembalikan mysql-connector
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+
+
+def _to_decimal(raw):
+    return Decimal(raw.decode())
+
+
+def _to_date(raw):
+    try:
+        return datetime.date.fromisoformat(raw.decode()[:10])
+    except ValueError:
+        return raw.decode()
+
+
+def _to_datetime(raw):
+    try:
+        return datetime.datetime.fromisoformat(raw.decode())
+    except ValueError:
+        return raw.decode()
+
+
+sqlite3.register_converter("decimal", _to_decimal)
+sqlite3.register_converter("date", _to_date)
+sqlite3.register_converter("timestamp", _to_datetime)
+sqlite3.register_converter("datetime", _to_datetime)
+
+
+# ========== dump MySQL (phpMyAdmin) -> DDL SQLite ==========
+_CREATE_RE = re.compile(r"CREATE TABLE `(\w+)` \((.*?)\n\)[^;]*;", re.S)
+_ALTER_RE = re.compile(r"ALTER TABLE `(\w+)`\s+(.*?);", re.S)
+_INSERT_RE = re.compile(r"^INSERT INTO .*?;\s*$", re.S | re.M)
+_TRIGGER_RE = re.compile(r"^CREATE TRIGGER (.*?) FOR EACH ROW (.*?)\n\$\$", re.S | re.M)
+_BEFORE_RE = re.compile(r"(`\w+`) BEFORE (INSERT|UPDATE) ON `(\w+)`")
+_SET_NEW_RE = re.compile(r"SET NEW\.`(\w+)` = (.*)", re.S)
+_INSERT_IGNORE_RE = re.compile(r"INSERT IGNORE INTO `(\w+)` \(`(\w+)`\) VALUES \((.+?)\)(?=;|$)")
+_COL_RE = re.compile(r"`(\w+)` (\w+(?:\([^)]*\))?)(.*)")
+_NAMES_RE = re.compile(r"`(\w+)`")
+
+
+class _Table:
+    def __init__(self, name):
+        self.name = name
+        self.columns = []     # (nama, tipe, sisa definisi)
+        self.pk = None
+        self.auto = None
+        self.indexes = []     # (jenis, nama, kolom): '', 'UNIQUE', 'FULLTEXT'
+        self.fks = []         # (kolom, tabel_ref, kolom_ref)
+        self.touch = []       # kolom ON UPDATE current_timestamp() -> trigger
+
+
+def parse_dump(text):
+    """Struktur tabel dari dump MySQL: ({nama: _Table}, statement INSERT, trigger SQLite)."""
+    tables = {}
+    for name, body in _CREATE_RE.findall(text):
+        t = tables[name] = _Table(name)
+        for line in body.strip().splitlines():
+            m = _COL_RE.search(line.strip().rstrip(","))
+            if m:
+                t.columns.append((m.group(1), m.group(2), m.group(3).strip()))
+    for name, body in _ALTER_RE.findall(text):
+        t = tables[name]
+        for part in re.split(r",\s*\n\s*", body.strip()):
+            names = _NAMES_RE.findall(part)
+            if part.startswith("ADD PRIMARY KEY"):
+                t.pk = names[0]
+            elif part.startswith(("ADD KEY", "ADD UNIQUE KEY", "ADD FULLTEXT KEY")):
+                kind = part.split()[1] if part.split()[1] in ("UNIQUE", "FULLTEXT") else ""
+                t.indexes.append((kind, names[0], names[1:]))
+            elif part.startswith("MODIFY") and "AUTO_INCREMENT" in part:
+                t.auto = names[0]
+            elif "FOREIGN KEY" in part:
+                t.fks.append((names[1], names[2], names[3]))
+    triggers = [_trigger_ddl(tables, head, body) for head, body in _TRIGGER_RE.findall(text)]
+    return tables, _INSERT_RE.findall(text), triggers
+
+
+def _trigger_ddl(tables, head, body):
+    """Trigger MySQL -> SQLite (satu statement, BEGIN ... END, atau BEFORE ... SET NEW.kolom)."""
+    # INSERT OR IGNORE di trigger ikut mode konflik statement luarnya (upsert -> gagal UNIQUE)
+    body = _INSERT_IGNORE_RE.sub(
+        r"INSERT INTO `\1` (`\2`) SELECT \3 WHERE NOT EXISTS (SELECT 1 FROM `\1` WHERE `\2` = \3)",
+        body.strip().rstrip(";"))
+    before, set_new = _BEFORE_RE.fullmatch(head), _SET_NEW_RE.fullmatch(body)
+    if before and set_new:
+        # SQLite tidak bisa mengubah NEW: sesudah ditulis, baris itu dibetulkan kalau nilainya beda
+        # (trigger AFTER UPDATE lain ikut jalan lagi dengan nilai yang sudah benar)
+        name, event, table = before.groups()
+        col, expr = set_new.groups()
+        pk = tables[table].pk
+        return (f"CREATE TRIGGER {name} AFTER {event} ON `{table}` FOR EACH ROW "
+                f"WHEN new.`{col}` IS NOT ({expr}) BEGIN UPDATE `{table}` SET `{col}` = {expr} "
+                f"WHERE `{pk}` = new.`{pk}`; END")
+    if body.upper().startswith("BEGIN"):
+        return f"CREATE TRIGGER {head} FOR EACH ROW {body}"
+    return f"CREATE TRIGGER {head} FOR EACH ROW BEGIN {body}; END"
+
+
+def _column_ddl(t, name, ctype, rest):
+    if name == t.pk and name == t.auto:
+        return f"`{name}` INTEGER PRIMARY KEY AUTOINCREMENT"
+    if "ON UPDATE" in rest:
+        t.touch.append(name)
+        rest = rest[:rest.index("ON UPDATE")].strip()
+    rest = rest.replace("current_timestamp()", "CURRENT_TIMESTAMP")
+    base = ctype.split("(")[0].lower()
+    if base == "enum":
+        values = ctype[ctype.index("("):]
+        return f"`{name}` enum {rest} COLLATE NOCASE CHECK (`{name}` IN {values})"
+    if base in ("varchar", "char", "text", "tinytext", "mediumtext", "longtext"):
+        return f"`{name}` {ctype} {rest} COLLATE NOCASE"   # = utf8mb4_general_ci
+    return f"`{name}` {ctype} {rest}"
+
+
+def schema_ddl(tables):
+    """Statement CREATE TABLE / INDEX / FTS5 + trigger yang setara dengan index di MySQL."""
+    out = []
+    for t in tables.values():
+        parts = [_column_ddl(t, *c) for c in t.columns]
+        if t.pk and t.pk != t.auto:
+            parts.append(f"PRIMARY KEY (`{t.pk}`)")
+        parts += [f"FOREIGN KEY (`{c}`) REFERENCES `{rt}` (`{rc}`)" for c, rt, rc in t.fks]
+        out.append(f"CREATE TABLE `{t.name}` (\n  " + ",\n  ".join(parts) + "\n)")
+        for col in t.touch:
+            # = ON UPDATE CURRENT_TIMESTAMP: cuma kalau UPDATE-nya tidak mengisi kolom itu sendiri
+            out.append(f"CREATE TRIGGER `{t.name}__{col}` AFTER UPDATE ON `{t.name}` "
+                       f"WHEN new.`{col}` IS old.`{col}` BEGIN UPDATE `{t.name}` "
+                       f"SET `{col}` = CURRENT_TIMESTAMP WHERE `{t.pk}` = new.`{t.pk}`; END")
+        for kind, name, cols in t.indexes:
+            col_list = ", ".join(f"`{c}`" for c in cols)
+            if kind == "FULLTEXT":
+                out += _fts_ddl(t, cols)
+            else:
+                out.append(_index_ddl(t, kind, name, col_list))
+    return out
+
+
+def _index_ddl(t, kind, name, col_list, if_missing=False):
+    unique = "UNIQUE " if kind == "UNIQUE" else ""
+    guard = "IF NOT EXISTS " if if_missing else ""
+    return f"CREATE {unique}INDEX {guard}`{t.name}__{name}` ON `{t.name}` ({col_list})"
+
+
+def ensure_schema(raw, dump_path):
+    """
+    Lengkapi file lama dengan yang ada di dump tapi belum ada di file: tabel baru (mis. tabel
+    ringkasan), trigger, dan index B-tree (mis. index baru untuk filter/urut).
+    Return nama tabel yang baru dibuat (isinya perlu dihitung dari data yang sudah ada).
+    """
+    with open(dump_path, encoding="utf-8") as f:
+        tables, _, triggers = parse_dump(f.read())
+    have = {name for (name,) in raw.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    created = [name for name in tables if name not in have]
+    raw.execute("BEGIN IMMEDIATE")
+    try:
+        for stmt in schema_ddl({name: tables[name] for name in created}):
+            raw.execute(stmt)
+        for stmt in triggers:
+            raw.execute(stmt.replace("CREATE TRIGGER ", "CREATE TRIGGER IF NOT EXISTS ", 1))
+        for t in tables.values():
+            for kind, name, cols in t.indexes:
+                if kind != "FULLTEXT":
+                    raw.execute(_index_ddl(t, kind, name, ", ".join(f"`{c}`" for c in cols), True))
+        raw.execute("COMMIT")
+    except BaseException:
+        raw.execute("ROLLBACK")
+        raise
+    return created
+
+
+def _fts_ddl(t, cols):
+    """Pengganti FULLTEXT: tabel FTS5 external-content yang dijaga trigger."""
+    fts, pk = f"{t.name}_fts", t.pk
+    col_list = ", ".join(f"`{c}`" for c in cols)
+    new = ", ".join(f"new.`{c}`" for c in cols)
+    old = ", ".join(f"old.`{c}`" for c in cols)
+    return [
+        f"CREATE VIRTUAL TABLE `{fts}` USING fts5({col_list}, content='{t.name}', "
+        f"content_rowid='{pk}', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER `{fts}_ai` AFTER INSERT ON `{t.name}` BEGIN "
+        f"INSERT INTO `{fts}`(rowid, {col_list}) VALUES (new.`{pk}`, {new}); END",
+        f"CREATE TRIGGER `{fts}_ad` AFTER DELETE ON `{t.name}` BEGIN "
+        f"INSERT INTO `{fts}`(`{fts}`, rowid, {col_list}) VALUES ('delete', old.`{pk}`, {old}); END",
+        f"CREATE TRIGGER `{fts}_au` AFTER UPDATE ON `{t.name}` BEGIN "
+        f"INSERT INTO `{fts}`(`{fts}`, rowid, {col_list}) VALUES ('delete', old.`{pk}`, {old}); "
+        f"INSERT INTO `{fts}`(rowid, {col_list}) VALUES (new.`{pk}`, {new}); END",
+    ]
+
+
+def create_database(path, dump_path):
+    """Bikin file SQLite baru dari dump MySQL (struktur, index, dan data INSERT-nya)."""
+    with open(dump_path, encoding="utf-8") as f:
+        tables, inserts, triggers = parse_dump(f.read())
+    raw = sqlite3.connect(path, isolation_level=None)
+    try:
+        raw.execute("PRAGMA journal_mode=WAL")
+        raw.execute("BEGIN")
+        for stmt in schema_ddl(tables):
+            raw.execute(stmt)
+        for stmt in inserts:
+            raw.execute(stmt.replace("\\'", "''"))
+        # trigger sesudah data: isi dump sudah hasil akhir (total, ringkasan), bukan perubahan
+        for stmt in triggers:
+            raw.execute(stmt)
+        raw.execute("COMMIT")
+    except BaseException:
+        raw.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        raise
+    raw.close()
+
+
+# ========== koneksi: meniru API mysql-connector yang dipakai crud ==========
+@lru_cache(maxsize=1024)
+def _qmark(sql):
+    return sql.replace("%s", "?")
+
+
+class _Cursor:
+    def __init__(self, raw, dictionary):
+        self._cur = raw.cursor()
+        self._dict = dictionary
+        self._names = None
+
+    def execute(self, sql, params=()):
+        self._cur.execute(_qmark(sql), tuple(params))
+        self._names = [d[0] for d in self._cur.description] if self._cur.description else None
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(_qmark(sql), seq)
+
+    def _row(self, r):
+        return dict(zip(self._names, r)) if self._dict else r
+
+    def fetchone(self):
+        r = self._cur.fetchone()
+        return None if r is None else self._row(r)
+
+    def fetchmany(self, size):
+        return [self._row(r) for r in self._cur.fetchmany(size)]
+
+    def fetchall(self):
+        rows = self._cur.fetchall()
+        return [dict(zip(self._names, r)) for r in rows] if self._dict else rows
+
+    @property
+    def column_names(self):
+        return tuple(self._names or ())
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def close(self):
+        self._cur.close()
+
+
+class _Connection:
+    unread_result = False
+
+    def __init__(self, raw, connection_id):
+        self.raw = raw
+        self.connection_id = connection_id
+
+    def cursor(self, dictionary=False, buffered=None, prepared=False):
+        # statement sudah di-cache sqlite3 sendiri (cached_statements); buffered tidak berlaku
+        return _Cursor(self.raw, dictionary)
+
+    def start_transaction(self):
+        self.raw.execute("BEGIN IMMEDIATE")   # kunci tulis dari awal: tidak ada deadlock upgrade
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def consume_results(self):
+        pass
+
+
+@lru_cache(maxsize=64)
+def _upsert_sql(table, pk_name, cols):
+    return (f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in cols)}) "
+            f"VALUES ({', '.join(['%s'] * len(cols))}) ON CONFLICT(`{pk_name}`) DO UPDATE SET "
+            f"{', '.join(f'`{c}`=excluded.`{c}`' for c in cols if c != pk_name)}")
+
+
+_ENUM_CHECK_RE = r"`{}` IN (\([^)]*\))"
+
+
+class Backend:
+    """SQLite: pool koneksi ke satu file WAL (banyak pembaca + satu penulis), dialek FTS5."""
+    name = "sqlite"
+
+    def __init__(self, path, dump_path, pool_size):
+        self.created_tables = []   # tabel dump yang baru ditambahkan ke file lama
+        if not os.path.exists(path):
+            create_database(path, dump_path)
+        else:
+            raw = sqlite3.connect(path, timeout=CHECKOUT_TIMEOUT, isolation_level=None)
+            try:
+                self.created_tables = ensure_schema(raw, dump_path)
+            finally:
+                raw.close()
+        self.path = path
+        self._queue = queue.Queue()
+        self._conns = {}
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.exhausted = 0
+        self.timeouts = 0
+        for i in range(1, pool_size + 1):
+            raw = sqlite3.connect(path, timeout=CHECKOUT_TIMEOUT, isolation_level=None,
+                                  check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES,
+                                  cached_statements=256)
+            raw.execute("PRAGMA journal_mode=WAL")
+            raw.execute("PRAGMA synchronous=NORMAL")   # aman untuk WAL, commit tanpa fsync per transaksi
+            raw.execute("PRAGMA foreign_keys=ON")     # = constraint InnoDB
+            self._conns[i] = _Connection(raw, i)
+            self._queue.put(self._conns[i])
+
+    # ----- koneksi -----
+    def get_connection(self, timeout=CHECKOUT_TIMEOUT):
+        t0 = time.monotonic()
+        try:
+            conn = self._queue.get(block=False)
+        except queue.Empty:
+            with self._stats_lock:
+                self.exhausted += 1
+            try:
+                conn = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                with self._stats_lock:
+                    self.timeouts += 1
+                raise RuntimeError("Pool koneksi DB habis (semua koneksi sedang dipakai)")
+        waited = time.monotonic() - t0
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        return conn
+
+    def release(self, conn):
+        conn.rollback()   # transaksi yang tertinggal jangan sampai menahan kunci tulis
+        self._queue.put(conn)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "backend": self.name,
+                "size": len(self._conns),
+                "idle": self._queue.qsize(),
+                "checkouts": self.checkouts,
+                "wait_avg_ms": 1000 * self.wait_total / self.checkouts if self.checkouts else 0.0,
+                "wait_max_ms": 1000 * self.wait_max,
+                "exhausted": self.exhausted,
+                "timeouts": self.timeouts,
+                "pings": 0,
+            }
+
+    def kill(self, db, connection_id):
+        conn = self._conns.get(connection_id)
+        if conn is not None:
+            conn.raw.interrupt()
+
+    # ----- dialek -----
+    @staticmethod
+    def upsert_sql(table, pk_name, cols):
+        return _upsert_sql(table, pk_name, tuple(cols))
+
+    @staticmethod
+    def fulltext(table, pk_name, cols, tokens):
+        fts = f"`{table}_fts`"
+        expr = " AND ".join(f'"{t}"*' for t in tokens)
+        cond = f"`{pk_name}` IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)"
+        rank = f"(SELECT rank FROM {fts} WHERE {fts} MATCH %s AND rowid = `{table}`.`{pk_name}`)"
+        return cond, (expr,), rank, (expr,)   # rank FTS5: makin kecil makin relevan
+
+    # ----- skema -----
+    def schema_stamp(self, db, names):
+        with db.cursor() as cur:
+            cur.execute("PRAGMA schema_version")
+            return tuple(cur.fetchone().values())
+
+    def load_schema(self, db, names):
+        """Baris berformat information_schema (COLUMNS dan FK) dari PRAGMA SQLite."""
+        cols, fks = [], []
+        with db.cursor() as cur:
+            for table in names:
+                cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=%s", (table,))
+                row = cur.fetchone()
+                if row is None:
+                    continue
+                create_sql = row["sql"]
+                cur.execute(f"PRAGMA index_list(`{table}`)")
+                unique, multi = set(), set()
+                for idx in cur.fetchall():
+                    cur.execute(f"PRAGMA index_info(`{idx['name']}`)")
+                    idx_cols = [r["name"] for r in cur.fetchall()]
+                    if idx["unique"] and len(idx_cols) == 1:
+                        unique.add(idx_cols[0])
+                    elif idx_cols:
+                        multi.add(idx_cols[0])
+                cur.execute(f"PRAGMA table_info(`{table}`)")
+                for c in cur.fetchall():
+                    ctype = c["type"].lower()
+                    auto = bool(c["pk"]) and ctype == "integer"
+                    if auto:
+                        ctype = "int(11)"
+                    elif ctype == "enum":
+                        m = re.search(_ENUM_CHECK_RE.format(c["name"]), create_sql)
+                        ctype = f"enum{m.group(1)}" if m else "varchar(255)"
+                    default = c["dflt_value"]
+                    if default is not None:
+                        default = None if default.upper() == "NULL" else default.strip("'")
+                    cols.append({
+                        "TABLE_NAME": table,
+                        "COLUMN_NAME": c["name"],
+                        "COLUMN_TYPE": ctype,
+                        "DATA_TYPE": ctype.split("(")[0],
+                        "IS_NULLABLE": "NO" if c["notnull"] or c["pk"] else "YES",
+                        "COLUMN_KEY": "PRI" if c["pk"] else "UNI" if c["name"] in unique
+                                      else "MUL" if c["name"] in multi else "",
+                        "COLUMN_DEFAULT": default,
+                        "EXTRA": "auto_increment" if auto else "",
+                    })
+                cur.execute(f"PRAGMA foreign_key_list(`{table}`)")
+                for fk in cur.fetchall():
+                    fks.append({"TABLE_NAME": table, "COLUMN_NAME": fk["from"],
+                                "REFERENCED_TABLE_NAME": fk["table"],
+                                "REFERENCED_COLUMN_NAME": fk["to"]})
+        return cols, fks
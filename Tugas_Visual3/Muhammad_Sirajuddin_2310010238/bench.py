@@ -0,0 +1,510 @@
+# bench.py — benchmark jalur panas crud & BaseForm di atas data sintetis (SQLite lokal, Qt offscreen)
+"""
+Contoh:
+    python bench.py --sizes 1000 10000 100000 --out bench_hasil.json
+    python bench.py --sizes 1000 --compare bench_lama.json --threshold 1.25
+    python bench.py --api http://127.0.0.1:8765 --clients 64 --seconds 10 --out api_hasil.json
+
+Tiap ukuran N: file SQLite dibuat dari db_2310010238.sql lalu diisi baris acak
+(deterministik, seed tetap) sesuai tipe kolom/enum/FK di SchemaCatalog; jumlah baris
+per tabel = N x MIX[tabel]. File disimpan di --data-dir dan dipakai ulang di run berikut.
+Cache hasil query crud (ResultCache) dimatikan supaya yang terukur query-nya;
+--cache menyalakannya (mengukur jalur hit).
+Hasil: persentil latensi (ms), puncak alokasi Python (tracemalloc) per operasi,
+byte per baris (list dict vs RowPage) per tabel, dan puncak RSS proses; --compare keluar dengan kode 1 kalau ada yang melambat.
+--api: uji beban service api.py yang sudah jalan (klien asyncio keep-alive, campuran baca/tulis);
+hasil per operasi dengan size = jumlah klien, jadi --compare juga berlaku.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import urlsplit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BASE = Path(__file__).resolve().parent
+if str(BASE) not in sys.path:
+    sys.path.insert(0, str(BASE))
+
+import backend_sqlite
+import crud as crud_module
+from crud import TABLES, crud, derived_values, insert_sql
+from rowstore import RowPage, rows_nbytes
+
+SIZES = (1_000, 10_000, 100_000)
+SEED = 2310010238
+REPEAT = 30          # maksimal pengulangan per operasi
+MIN_REPEAT = 3
+TIME_BUDGET = 5.0    # detik per operasi; operasi lambat berhenti lebih awal (minimal MIN_REPEAT)
+THRESHOLD = 1.25     # --compare: p50/p90 baru > lama x THRESHOLD = regresi ...
+MIN_DELTA_MS = 1.0   # ... dan selisihnya lebih dari ini (operasi kecil gampang bergoyang)
+SEED_BATCH = 10_000
+MEMORY_ROWS = 5_000  # baris per tabel untuk ukur byte/baris
+
+# Jumlah baris per tabel relatif terhadap N (detail_po = N)
+MIX = {
+    "pemasok": 0.05,
+    "pelanggan": 0.2,
+    "material": 0.2,
+    "purchase_order": 0.5,
+    "detail_po": 1.0,
+}
+
+# Operasi per tabel yang diukur
+FETCH_ALL_TABLES = ("material", "purchase_order", "detail_po")
+API_CLIENTS = 64
+API_SECONDS = 10.0
+API_WRITES = 0.1     # porsi iterasi klien yang insert -> update -> delete material
+API_PAGE = 50
+SEARCH_CASES = (("material", "bes"), ("pemasok", "sum"), ("pelanggan", "maju jaya"),
+                ("purchase_order", "PO-1"))
+FORMS = (("material", "MaterialForm"), ("purchase_order", "PurchaseOrderForm"),
+         ("detail_po", "DetailPOForm"))
+
+_WORDS = ("besi", "baja", "semen", "pasir", "kayu", "cat", "paku", "pipa", "kabel", "batu",
+          "sumber", "maju", "jaya", "abadi", "makmur", "sentosa", "karya", "mandiri",
+          "utama", "sejahtera", "banjarmasin", "martapura", "jalan", "gang", "blok")
+
+
+# ========== data sintetis ==========
+def _value(info, col, i, rnd, fk_counts):
+    """Nilai acak untuk kolom `col` baris ke-i, mengikuti tipe di TableInfo."""
+    dtype = info.data_types[col]
+    ref = info.fks.get(col)
+    if ref is not None:
+        return rnd.randint(1, fk_counts[ref[0]])
+    if info.keys.get(col) == "UNI":
+        return f"PO-{i:07d}" if dtype in ("varchar", "char") else i
+    if dtype in ("int", "tinyint", "smallint", "mediumint", "bigint"):
+        return rnd.randint(1, 100)
+    if dtype == "decimal":
+        return Decimal(rnd.randint(100, 10_000_000)).scaleb(-2)
+    if dtype == "date":
+        return datetime.date(2020, 1, 1) + datetime.timedelta(days=rnd.randrange(2400))
+    if dtype == "enum":
+        return rnd.choice(info.enums[col])
+    if dtype in ("timestamp", "datetime"):
+        return None   # default current_timestamp
+    text = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(1, 4))).title()
+    if col == "email":
+        text = text.replace(" ", ".").lower() + "@contoh.id"
+    elif col == "telepon":
+        text = "08" + "".join(rnd.choice("0123456789") for _ in range(10))
+    limit = _length(info.types[col])
+    return text[:limit] if limit else text
+
+
+def _length(ctype):
+    if "(" in ctype and ctype.startswith(("varchar", "char")):
+        return int(ctype[ctype.index("(") + 1:ctype.index(")")])
+    return None
+
+
+def seed_database(path, n, seed=SEED, progress=None):
+    """Bikin file SQLite `path` dari dump lalu isi N baris sintetis (lihat MIX)."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    backend_sqlite.create_database(path, crud_module.SQL_DUMP)
+    backend = backend_sqlite.Backend(path, crud_module.SQL_DUMP, 2)
+    db = crud(backend)
+    rnd = random.Random(seed)
+    counts = {}
+    for table in TABLES:   # urutan TABLES: tabel induk dulu
+        info = db.table_info(table)
+        cols = tuple(c for c in info.columns
+                     if c != info.pk and info.data_types[c] not in ("timestamp", "datetime"))
+        total = max(10, int(n * MIX.get(table, 1.0)))
+        done = counts[table] = 0
+        while done < total:
+            # total/subtotal mengikuti trigger (acakannya tetap diambil: data lain tidak bergeser)
+            batch = [derived_values(table, {c: _value(info, c, done + k + 1, rnd, counts)
+                                            for c in cols})
+                     for k in range(min(SEED_BATCH, total - done))]
+            names = tuple(batch[0])
+            with db.transaction() as cur:
+                cur.executemany(insert_sql(table, names), [tuple(r.values()) for r in batch])
+            done += len(batch)
+            if progress:
+                progress(table, done, total)
+        counts[table] = total
+    with db.transaction() as cur:
+        cur.execute("DELETE FROM `change_log`")   # isi dari trigger saat seeding, bukan perubahan
+    with db.cursor() as cur:
+        cur.execute("PRAGMA optimize")
+        cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")   # semua data di file utama, bisa disalin
+    return counts
+
+
+def dataset(data_dir, n, seed=SEED, fresh=False):
+    """Path file data untuk ukuran N; dibuat kalau belum ada (atau fresh=True)."""
+    path = str(Path(data_dir) / f"bench_{n}_{seed}.sqlite3")
+    if fresh or not os.path.exists(path):
+        t0 = time.perf_counter()
+        seed_database(path, n, seed, progress=_seed_progress)
+        print(f"\n  data N={n}: {time.perf_counter() - t0:.1f} dtk")
+    return path
+
+
+def working_copy(path):
+    """Salinan file data untuk satu run (insert di benchmark tidak mengubah data aslinya)."""
+    work = path.replace(".sqlite3", ".work.sqlite3")
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+    shutil.copyfile(path, work)
+    return work
+
+
+def _seed_progress(table, done, total):
+    print(f"\r  seed {table}: {done}/{total}", end="", flush=True)
+
+
+# ========== pengukuran ==========
+def percentile(values, p):
+    """Persentil p (0-100) dengan interpolasi linear."""
+    s = sorted(values)
+    if not s:
+        return None
+    k = (len(s) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def summarize(times, peak_bytes):
+    ms = [t * 1000 for t in times]
+    return {
+        "runs": len(ms),
+        "min_ms": min(ms),
+        "p50_ms": percentile(ms, 50),
+        "p90_ms": percentile(ms, 90),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": max(ms),
+        "mean_ms": sum(ms) / len(ms),
+        "peak_kb": peak_bytes / 1024,
+    }
+
+
+def measure(fn, repeat=REPEAT, budget=TIME_BUDGET):
+    """Jalankan fn() sekali di bawah tracemalloc (puncak memori), lalu ukur waktunya."""
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if len(times) >= MIN_REPEAT and time.perf_counter() - started > budget:
+            break
+    return summarize(times, peak)
+
+
+def _rss_peak_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ========== skenario ==========
+def _crud_cases(db, counts, rnd):
+    cases = []
+    for table in FETCH_ALL_TABLES:
+        cases.append((f"crud.fetch_all[{table}]", lambda t=table: db.fetch_all(t)))
+    for table, keyword in SEARCH_CASES:
+        cases.append((f"crud.search[{table}:{keyword}]",
+                      lambda t=table, k=keyword: db.search(t, k)))
+    info = db.table_info("material")
+    cols = [c for c in info.columns if c != info.pk and info.data_types[c] != "timestamp"]
+    seq = iter(range(10 ** 9))
+
+    def insert():
+        i = next(seq)
+        db.insert("material", {c: _value(info, c, i, rnd, counts) for c in cols})
+    cases.append(("crud.insert[material]", insert))
+    return cases
+
+
+def _memory(db, table):
+    """Byte per baris hasil fetch sebagai list dict vs dipak ke RowPage (seperti di LazyTableModel)."""
+    pk = db.table_info(table).pk
+    rows = db.fetch_page(table, pk, None, MEMORY_ROWS)
+    if not rows:
+        return None
+    as_dicts = rows_nbytes(rows) / len(rows)
+    packed = RowPage.from_rows(rows).nbytes() / len(rows)
+    return {"table": table, "rows": len(rows), "dict_bytes_per_row": as_dicts,
+            "page_bytes_per_row": packed, "factor": as_dicts / packed}
+
+
+def _form_cases():
+    import importlib
+
+    import changes
+    from PySide6.QtCore import QEventLoop, QTimer
+    changes.POLL_INTERVAL = 0   # poller change_log tidak ikut terukur
+
+    def wait(model):
+        loop = QEventLoop()
+        failed = []
+        model.loaded.connect(loop.quit)
+        model.failed.connect(lambda msg: (failed.append(msg), loop.quit()))
+        QTimer.singleShot(60_000, loop.quit)
+        loop.exec()
+        if failed:
+            raise RuntimeError(failed[0])
+
+    cases, forms = [], []
+    for module, cls in FORMS:
+        form = getattr(importlib.import_module(module), cls)()
+        forms.append(form)
+        if form._pending is not None:
+            wait(form._pending)   # muat awal dari __init__
+
+        def fill(f=form):
+            f._fill_table(f._pager())
+            wait(f._pending)
+        cases.append((f"BaseForm._fill_table[{form.TABLE}]", fill))
+
+        model = form.table.model()
+        rows = [model.row_dict(i) for i in range(min(model.rowCount(), 50))]
+        it = {"i": 0}
+
+        def set_data(f=form, rows=rows, it=it):
+            f.set_form_data(rows[it["i"] % len(rows)])
+            it["i"] += 1
+        if rows:
+            cases.append((f"BaseForm.set_form_data[{form.TABLE}]", set_data))
+    return cases, forms
+
+
+def run(sizes, data_dir, repeat=REPEAT, budget=TIME_BUDGET, seed=SEED, fresh=False, forms=True,
+        cache=False):
+    """Jalankan semua skenario untuk tiap ukuran; return dict siap ditulis ke JSON."""
+    crud_module.configure_result_cache(
+        max_mb=crud_module.RESULT_CACHE_MB if cache else 0)
+    app = None
+    if forms:
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+    Path(data_dir).mkdir(parents=True, exist_ok=True)
+    results, memory = [], []
+    for n in sizes:
+        path = working_copy(dataset(data_dir, n, seed, fresh))
+        crud_module.use_backend("sqlite", path)
+        db = crud()
+        counts = {t: db.count(t) for t in TABLES}
+        rnd = random.Random(seed + n)
+        cases = _crud_cases(db, counts, rnd)
+        opened = []
+        if forms:
+            form_cases, opened = _form_cases()
+            cases += form_cases
+        for name, fn in cases:
+            stats = measure(fn, repeat, budget)
+            results.append({"size": n, "op": name, **stats})
+            print(f"  N={n:>8} {name:<45} p50 {stats['p50_ms']:9.2f} ms  "
+                  f"p90 {stats['p90_ms']:9.2f} ms  peak {stats['peak_kb']:10.0f} KB")
+        for table in FETCH_ALL_TABLES:
+            m = _memory(db, table)
+            if m is not None:
+                memory.append({"size": n, **m})
+                print(f"  N={n:>8} {'memori[' + table + ']':<45} dict {m['dict_bytes_per_row']:7.0f} B/baris"
+                      f"  RowPage {m['page_bytes_per_row']:6.0f} B/baris  x{m['factor']:.1f}")
+        for form in opened:
+            form.close()
+            form.deleteLater()
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": "sqlite",
+            "seed": seed,
+            "sizes": list(sizes),
+            "mix": MIX,
+            "rss_peak_mb": _rss_peak_mb(),
+            "result_cache": crud.cache_stats() if cache else None,
+        },
+        "results": results,
+        "memory": memory,
+    }
+
+
+# ========== uji beban api.py ==========
+async def _api_call(conn, host, method, path, payload=None):
+    """Satu request keep-alive -> (status, body JSON)."""
+    from api import read_message
+    reader, writer = conn
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                  ).encode("latin-1") + body)
+    await writer.drain()
+    msg = await read_message(reader)
+    if msg is None:
+        raise ConnectionError("koneksi ditutup service")
+    start, _, data = msg
+    return int(start.split()[1]), (json.loads(data) if data else None)
+
+
+async def _api_load(url, clients, seconds, writes, seed):
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    setup = await asyncio.open_connection(host, port)
+    status, last = await _api_call(setup, host, "GET", "/material?order=-id_material&limit=1")
+    if status != 200:
+        raise SystemExit(f"{url}: status {status} {last}")
+    max_id = last["rows"][0]["id_material"] if last["rows"] else 1
+    setup[1].close()
+
+    reads = (
+        ("api list material", lambda r: ("GET", f"/material?limit={API_PAGE}", None)),
+        ("api list purchase_order filter", lambda r: (
+            "GET", f"/purchase_order?status_po=Draft&order=-tanggal_po&limit={API_PAGE}", None)),
+        ("api cari material", lambda r: ("GET", f"/material?q=bes&limit={API_PAGE}", None)),
+        ("api get material", lambda r: ("GET", f"/material/{r.randint(1, max_id)}", None)),
+    )
+    times = {}
+    errors = {}
+    deadline = time.perf_counter() + seconds
+
+    async def timed(conn, name, method, path, payload=None, ok=(200,)):
+        t0 = time.perf_counter()
+        status, data = await _api_call(conn, host, method, path, payload)
+        times.setdefault(name, []).append(time.perf_counter() - t0)
+        if status not in ok:
+            errors[name] = errors.get(name, 0) + 1
+        return data if status in ok else None
+
+    async def client(i):
+        rnd = random.Random(seed + i)
+        conn = await asyncio.open_connection(host, port)
+        try:
+            while time.perf_counter() < deadline:
+                if rnd.random() < writes:
+                    row = {"nama_material": f"beban {i}", "satuan": "pcs", "harga": "1000.00"}
+                    made = await timed(conn, "api insert material", "POST", "/material", row, (201,))
+                    if made is None:
+                        continue
+                    path = f"/material/{made['id']}"
+                    await timed(conn, "api update material", "PUT", path, {"harga": "1250.50"})
+                    await timed(conn, "api delete material", "DELETE", path)
+                else:
+                    name, make = rnd.choice(reads)
+                    # id acak bisa sudah dihapus -> 404 bukan error
+                    await timed(conn, name, *make(rnd), ok=(200, 404) if "get" in name else (200,))
+        finally:
+            conn[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return times, errors, time.perf_counter() - started
+
+
+def run_api(url, clients=API_CLIENTS, seconds=API_SECONDS, writes=API_WRITES, seed=SEED):
+    """Klien asyncio paralel ke service api.py selama `seconds` detik; return dict siap ke JSON."""
+    times, errors, elapsed = asyncio.run(_api_load(url, clients, seconds, writes, seed))
+    total = sum(len(t) for t in times.values())
+    results = []
+    for name in sorted(times):
+        stats = summarize(times[name], 0)
+        stats["rps"] = len(times[name]) / elapsed
+        stats["errors"] = errors.get(name, 0)
+        results.append({"size": clients, "op": name, **stats})
+        print(f"  klien={clients:>4} {name:<36} {stats['rps']:8.0f} req/s  p50 {stats['p50_ms']:7.2f} ms"
+              f"  p99 {stats['p99_ms']:7.2f} ms  error {stats['errors']}")
+    print(f"  total {total} request dalam {elapsed:.1f} s = {total / elapsed:,.0f} req/s, "
+          f"error {sum(errors.values())}")
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "api": url,
+            "clients": clients,
+            "seconds": elapsed,
+            "writes": writes,
+            "requests": total,
+            "rps": total / elapsed,
+            "errors": sum(errors.values()),
+            "rss_peak_mb": _rss_peak_mb(),
+        },
+        "results": results,
+    }
+
+
+def compare(old, new, threshold=THRESHOLD, min_delta=MIN_DELTA_MS):
+    """Baris (size, op, metrik, lama, baru, rasio) yang melambat lebih dari threshold."""
+    before = {(r["size"], r["op"]): r for r in old["results"]}
+    slower = []
+    for r in new["results"]:
+        prev = before.get((r["size"], r["op"]))
+        if prev is None:
+            continue
+        for key in ("p50_ms", "p90_ms"):
+            if prev[key] and r[key] / prev[key] > threshold and r[key] - prev[key] > min_delta:
+                slower.append((r["size"], r["op"], key, prev[key], r[key], r[key] / prev[key]))
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark crud & BaseForm di data sintetis")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                    help="jumlah baris detail_po (tabel lain mengikuti MIX), 1000 s/d 1000000")
+    ap.add_argument("--repeat", type=int, default=REPEAT)
+    ap.add_argument("--budget", type=float, default=TIME_BUDGET, help="detik maksimal per operasi")
+    ap.add_argument("--seed", type=int, default=SEED)
+    ap.add_argument("--data-dir", default=str(BASE / "bench_data"))
+    ap.add_argument("--fresh", action="store_true", help="buat ulang file data walau sudah ada")
+    ap.add_argument("--no-forms", action="store_true", help="lewati skenario BaseForm (tanpa Qt)")
+    ap.add_argument("--cache", action="store_true", help="ukur dengan cache hasil query crud menyala")
+    ap.add_argument("--out", default="bench_hasil.json")
+    ap.add_argument("--compare", help="file JSON hasil run sebelumnya")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    ap.add_argument("--min-delta", type=float, default=MIN_DELTA_MS, help="ms")
+    ap.add_argument("--api", metavar="URL", help="uji beban service api.py di URL ini (bukan crud lokal)")
+    ap.add_argument("--clients", type=int, default=API_CLIENTS, help="--api: klien paralel")
+    ap.add_argument("--seconds", type=float, default=API_SECONDS, help="--api: lama uji")
+    ap.add_argument("--writes", type=float, default=API_WRITES,
+                    help="--api: porsi iterasi tulis (insert/update/delete), 0-1")
+    args = ap.parse_args(argv)
+
+    if args.api:
+        result = run_api(args.api, args.clients, args.seconds, args.writes, args.seed)
+    else:
+        result = run(args.sizes, args.data_dir, args.repeat, args.budget, args.seed,
+                     args.fresh, forms=not args.no_forms, cache=args.cache)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Hasil: {args.out} (puncak RSS {result['meta']['rss_peak_mb']:.0f} MB)")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        slower = compare(old, result, args.threshold, args.min_delta)
+        for size, op, key, a, b, ratio in slower:
+            print(f"REGRESI N={size} {op} {key}: {a:.2f} -> {b:.2f} ms (x{ratio:.2f})")
+        if slower:
+            return 1
+        print(f"Tidak ada regresi (> x{args.threshold}) dibanding {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# bulk.py — impor/ekspor massal CSV & Excel (.xlsx) per tabel
+import csv
+import datetime
+import os
+import re
+from decimal import Decimal, InvalidOperation
+
+from crud import DERIVED_COLUMNS, insert_sql
+
+BATCH_SIZE = 1000     # baris per executemany
+MAX_ERRORS = 100      # baris salah yang dicatat di laporan
+
+
+class BulkCancelled(Exception):
+    pass
+
+
+class _Rollback(Exception):
+    pass
+
+
+class BulkError(Exception):
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+
+def _openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise RuntimeError("Untuk file .xlsx perlu paket openpyxl (pip install openpyxl)")
+    return openpyxl
+
+
+# ========== baca file (streaming) ==========
+def _is_xlsx(path):
+    return str(path).lower().endswith(".xlsx")
+
+
+def count_rows(path):
+    """Perkiraan jumlah baris data (untuk progress); -1 kalau tidak diketahui."""
+    if _is_xlsx(path):
+        wb = _openpyxl().load_workbook(path, read_only=True)
+        try:
+            n = wb.active.max_row
+        finally:
+            wb.close()
+        return n - 1 if n else -1
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def read_rows(path):
+    """Generator (no_baris, header, values) dari CSV/XLSX tanpa memuat seluruh file."""
+    if _is_xlsx(path):
+        wb = _openpyxl().load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+            for no, values in enumerate(rows, start=2):
+                if any(v not in (None, "") for v in values):
+                    yield no, header, values
+        finally:
+            wb.close()
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = [h.strip() for h in next(reader, [])]
+        for no, values in enumerate(reader, start=2):
+            if any(v.strip() for v in values):
+                yield no, header, values
+
+
+# ========== validasi sesuai tipe kolom (dari SchemaCatalog) ==========
+_LEN_RE = re.compile(r"\((\d+)(?:,(\d+))?\)")
+
+
+def _converter(info, col):
+    """Fungsi nilai-mentah -> nilai siap INSERT untuk satu kolom; ValueError kalau salah."""
+    ctype = info.types[col]
+    dtype = info.data_types[col]
+    m = _LEN_RE.search(ctype)
+
+    if dtype in ("int", "tinyint", "smallint", "mediumint", "bigint"):
+        def conv(v):
+            if isinstance(v, float) and v.is_integer():
+                return int(v)
+            return int(str(v).strip())
+    elif dtype == "decimal":
+        prec, scale = (int(m.group(1)), int(m.group(2) or 0)) if m else (65, 30)
+        quant = Decimal(1).scaleb(-scale)
+
+        def conv(v):
+            try:
+                d = Decimal(str(v).strip().replace(",", "")).quantize(quant)
+            except InvalidOperation:
+                raise ValueError(f"bukan angka: {v!r}")
+            if len(d.as_tuple().digits) - max(-d.as_tuple().exponent, 0) > prec - scale:
+                raise ValueError(f"terlalu besar untuk {ctype}: {v}")
+            return d
+    elif dtype == "date":
+        def conv(v):
+            if isinstance(v, datetime.datetime):
+                return v.date()
+            if isinstance(v, datetime.date):
+                return v
+            s = str(v).strip()
+            for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+                try:
+                    return datetime.datetime.strptime(s, fmt).date()
+                except ValueError:
+                    pass
+            raise ValueError(f"tanggal tidak dikenal: {v!r}")
+    elif dtype == "enum":
+        values = info.enums[col]
+
+        def conv(v):
+            s = str(v).strip()
+            for e in values:
+                if e.lower() == s.lower():
+                    return e
+            raise ValueError(f"harus salah satu dari {', '.join(values)}")
+    else:
+        maxlen = int(m.group(1)) if m and dtype in ("varchar", "char") else None
+
+        def conv(v):
+            s = str(v).strip()
+            if maxlen is not None and len(s) > maxlen:
+                raise ValueError(f"lebih dari {maxlen} karakter")
+            return s
+
+    required = not info.nullable[col] and info.defaults[col] is None \
+        and "auto_increment" not in (info.extra[col] or "")
+
+    def convert(v):
+        if v is None or (isinstance(v, str) and not v.strip()):
+            if required:
+                raise ValueError("wajib diisi")
+            return None
+        return conv(v)
+    return convert
+
+
+def _plan(info, header):
+    unknown = [h for h in header if h and h not in info.types]
+    if unknown:
+        raise BulkError(f"Kolom tidak ada di tabel `{info.name}`: {', '.join(unknown)}")
+    # total/subtotal dari file (mis. hasil ekspor) tidak diimpor: dihitung trigger DB
+    cols = [h for h in header if h and h not in DERIVED_COLUMNS.get(info.name, ())]
+    missing = [c for c in info.columns if c not in cols and not info.nullable[c]
+               and info.defaults[c] is None and "auto_increment" not in (info.extra[c] or "")]
+    if missing:
+        raise BulkError(f"Kolom wajib tidak ada di file: {', '.join(missing)}")
+    pos = [header.index(c) for c in cols]
+    return cols, pos, [_converter(info, c) for c in cols]
+
+
+# ========== impor ==========
+def import_file(db, table, path, batch_size=BATCH_SIZE, atomic=True,
+                progress=None, cancelled=None):
+    """
+    Impor CSV/XLSX ke `table` dengan executemany per batch_size baris.
+    atomic=True  -> satu transaksi untuk seluruh file; ada baris salah = batal semua
+                    (inserted 0, errors berisi baris yang salah).
+    atomic=False -> commit per batch; baris salah dilewati dan dilaporkan.
+    Return dict ringkasan {inserted, skipped, errors}.
+    """
+    info = db.table_info(table)
+    if info is None:
+        raise BulkError(f"Tabel `{table}` tidak dikenal")
+    total = count_rows(path)
+    rows = read_rows(path)
+    first = next(rows, None)
+    if first is None:
+        return {"inserted": 0, "skipped": 0, "errors": []}
+    cols, pos, convs = _plan(info, first[1])
+    sql = insert_sql(table, tuple(cols))
+
+    errors, done, inserted, skipped = [], 0, 0, 0
+
+    def batches():
+        nonlocal done, skipped
+        batch = []
+        for no, _, values in _chain(first, rows):
+            done += 1
+            try:
+                batch.append(tuple(conv(values[p] if p < len(values) else None)
+                                   for conv, p in zip(convs, pos)))
+            except ValueError as e:
+                skipped += 1
+                if len(errors) < MAX_ERRORS:
+                    errors.append(f"baris {no}: {e}")
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def step(cur, batch):
+        nonlocal inserted
+        if cancelled is not None and cancelled.is_set():
+            raise BulkCancelled("Impor dibatalkan")
+        cur.executemany(sql, batch)
+        inserted += len(batch)
+        if progress:
+            progress(done, total)
+
+    try:
+        if atomic:
+            try:
+                with db.transaction() as cur:
+                    for batch in batches():
+                        step(cur, batch)
+                    if skipped:
+                        raise _Rollback
+            except _Rollback:
+                inserted = 0   # ada baris salah: seluruh file dibatalkan
+        else:
+            for batch in batches():
+                with db.transaction() as cur:
+                    step(cur, batch)
+    finally:
+        db.notify_bulk_write(table)
+    if progress:
+        progress(done, total)
+    return {"inserted": inserted, "skipped": skipped, "errors": errors}
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+# ========== ekspor ==========
+def _cell(v):
+    if isinstance(v, Decimal):
+        return str(v)
+    if isinstance(v, (datetime.date, datetime.datetime)):
+        return v.isoformat()
+    return v
+
+
+def export_file(db, table, path, progress=None, cancelled=None):
+    """Ekspor seluruh `table` ke CSV/XLSX lewat cursor unbuffered (memori konstan)."""
+    total = db.count(table)
+    done = 0
+    xlsx = _is_xlsx(path)
+    try:
+        if xlsx:
+            wb = _openpyxl().Workbook(write_only=True)
+            ws = wb.create_sheet(table)
+            write = ws.append
+            f = None
+        else:
+            f = open(path, "w", newline="", encoding="utf-8")
+            write = csv.writer(f).writerow
+        try:
+            for header, chunk in db.stream(f"SELECT * FROM `{table}`"):
+                if done == 0:
+                    write(header)
+                for row in chunk:
+                    write([_cell(v) for v in row])
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+                if cancelled is not None and cancelled.is_set():
+                    raise BulkCancelled("Ekspor dibatalkan")
+            if done == 0:
+                write(db.table_info(table).columns if db.table_info(table) else [])
+        finally:
+            if f is not None:
+                f.close()
+        if xlsx:
+            wb.save(path)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)   # jangan tinggalkan file setengah jadi
+        raise
+    return {"exported": done}
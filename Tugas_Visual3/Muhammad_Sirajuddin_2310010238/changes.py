@@ -0,0 +1,219 @@
+# changes.py — bus perubahan baris: form yang terbuka ikut ter-update tanpa muat ulang tabel
+import os
+import threading
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+from crud import add_write_hook, crud
+from worker import DbWorker
+
+POLL_INTERVAL = 2000     # ms antar baca change_log (tulis dari aplikasi/klien lain); 0 = mati
+POLL_LIMIT = 500         # baris change_log per baca
+CHANGE_LOG = "change_log"
+# Retensi change_log dipegang event MySQL `change_log_retensi` (lihat db_2310010238.sql).
+# Tanpa event scheduler: CHANGE_LOG_PRUNE=1 di SATU proses saja, poller-nya yang membuang baris
+# di luar CHANGE_LOG_KEEP terakhir (paling banyak PRUNE_BATCH sekali hapus, kunci singkat).
+CHANGE_LOG_PRUNE = os.environ.get("CHANGE_LOG_PRUNE") == "1"
+CHANGE_LOG_KEEP = 100_000
+PRUNE_BATCH = 5_000
+
+
+class ChangeBus(QObject):
+    """
+    Satu per proses (change_bus()). Sumber event:
+    - hook tulis crud (proses ini), dipanggil di thread worker sesudah commit;
+    - ChangeLogPoller (tabel change_log di DB yang diisi trigger MySQL).
+    Sinyal `changed` sampai di thread GUI (queued) sebagai
+    (tabel, op, pk_name, pk, row): op insert/update/delete membawa satu baris,
+    op bulk = banyak baris berubah sekaligus (row None, pk None).
+    """
+    changed = Signal(str, str, object, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._watched = {}   # tabel -> jumlah form yang mendengarkan
+        self._holds = 0      # jendela tanpa tabel (mis. laporan) yang butuh cache-nya dibuang poller
+
+    def watch(self, table, slot):
+        with self._lock:
+            self._watched[table] = self._watched.get(table, 0) + 1
+        self.changed.connect(slot)
+
+    def unwatch(self, table, slot):
+        with self._lock:
+            n = self._watched.get(table, 0) - 1
+            if n > 0:
+                self._watched[table] = n
+            else:
+                self._watched.pop(table, None)
+        try:
+            self.changed.disconnect(slot)
+        except (RuntimeError, TypeError):
+            pass
+
+    def watched(self, table):
+        with self._lock:
+            return table in self._watched
+
+    def tables(self):
+        with self._lock:
+            return set(self._watched)
+
+    def hold(self):
+        """Poller tetap jalan walau tidak ada form terbuka (cuma untuk membuang cache yang basi)."""
+        with self._lock:
+            self._holds += 1
+
+    def release(self):
+        with self._lock:
+            self._holds = max(0, self._holds - 1)
+
+    def held(self):
+        with self._lock:
+            return self._holds > 0
+
+    def publish(self, table, op, pk_name, pk, row=None):
+        try:
+            self.changed.emit(table, op, pk_name, pk, row)
+        except RuntimeError:
+            pass   # aplikasi sedang ditutup
+
+    def on_write(self, table, op, pk_name, pk, data):
+        """Hook crud: ambil baris lengkapnya sekali (di thread penulis), lalu siarkan."""
+        if not self.watched(table):
+            return
+        row = None
+        if op in ("insert", "update") and pk_name and pk is not None:
+            row = crud().fetch_by_id(table, pk_name, pk)
+            if row is None:
+                op = "delete"   # keburu dihapus
+        self.publish(table, op, pk_name, pk, row)
+
+
+def _prune(db, oldest, newest):
+    """
+    Buang baris change_log di luar CHANGE_LOG_KEEP terakhir (paling banyak PRUNE_BATCH);
+    return id terkecil yang mungkin masih ada.
+    """
+    cutoff = min(newest - CHANGE_LOG_KEEP, oldest + PRUNE_BATCH)
+    if cutoff <= oldest:
+        return oldest
+    with db.transaction() as cur:
+        cur.execute(f"DELETE FROM `{CHANGE_LOG}` WHERE `id` < %s", (cutoff,))
+    return cutoff
+
+
+def _poll(db, after, limit, watched, prune=False):
+    """Baris change_log sesudah id `after` + baris terbarunya; return (id_terakhir, event)."""
+    with db.cursor() as cur:
+        cur.execute(f"SELECT MIN(`id`) AS lo, MAX(`id`) AS hi FROM `{CHANGE_LOG}`")
+        bounds = cur.fetchone()
+    lo, hi = bounds["lo"], bounds["hi"]
+    if prune and hi is not None:
+        lo = _prune(db, lo, hi)
+    if after is None:
+        return hi or 0, []   # mulai dari sekarang, riwayat tidak diputar ulang
+    if lo is not None and after < lo - 1:
+        # baris yang belum dibaca sudah dibuang retensi: muat ulang semuanya
+        db.invalidate_cache()
+        return hi, [(t, "bulk", None, None, None) for t in sorted(watched)]
+    with db.cursor() as cur:
+        cur.execute(f"SELECT `id`, `tabel`, `op`, `pk` FROM `{CHANGE_LOG}` WHERE `id` > %s "
+                    f"ORDER BY `id` LIMIT %s", (after, limit))
+        log = cur.fetchall()
+    if not log:
+        return after, []
+    for table in {r["tabel"] for r in log}:
+        db.invalidate_cache(table)   # tulis dari proses lain: semua cache untuk tabel ini basi
+    # banyak event untuk baris yang sama cukup diwakili yang terakhir
+    last = {}
+    for r in log:
+        if r["tabel"] in watched:
+            last[(r["tabel"], r["pk"])] = r["op"]
+    events = []
+    by_table = {}
+    for (table, pk), op in last.items():
+        if op != "delete":
+            by_table.setdefault(table, []).append(pk)
+    rows = {}
+    pk_names = {t: db.table_info(t).pk for t, _ in last if db.table_info(t) is not None}
+    for table, pks in by_table.items():
+        pk_name = pk_names.get(table)
+        if pk_name is None:
+            continue
+        with db.cursor() as cur:
+            cur.execute(f"SELECT * FROM `{table}` WHERE `{pk_name}` IN "
+                        f"({', '.join(['%s'] * len(pks))})", tuple(pks))
+            for r in cur.fetchall():
+                rows[(table, r[pk_name])] = r
+    for (table, pk), op in last.items():
+        pk_name = pk_names.get(table)
+        if pk_name is None:
+            continue
+        row = rows.get((table, pk))
+        if op != "delete" and row is None:
+            op = "delete"
+        events.append((table, op, pk_name, pk, row))
+    return log[-1]["id"], events
+
+
+class ChangeLogPoller(QObject):
+    """Baca change_log tiap POLL_INTERVAL dengan watermark id; berhenti sendiri kalau tabelnya tidak ada."""
+
+    def __init__(self, bus, interval=POLL_INTERVAL, parent=None):
+        super().__init__(parent)
+        self._bus = bus
+        self._after = None
+        self._busy = False
+        self._worker = DbWorker(self)
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.poll)
+
+    def start(self):
+        self._timer.start()
+        self.poll()
+
+    def stop(self):
+        self._timer.stop()
+        self._worker.cancel_all()
+
+    def poll(self):
+        if self._busy:
+            return
+        watched = self._bus.tables()
+        if self._after is not None and not watched and not self._bus.held():
+            return
+        self._busy = True
+        self._worker.submit(_poll, self._after, POLL_LIMIT, watched, CHANGE_LOG_PRUNE,
+                            on_done=self._on_done, on_error=self._on_error, channel="poll")
+
+    def _on_done(self, result):
+        self._busy = False
+        self._after, events = result
+        for event in events:
+            self._bus.publish(*event)
+
+    def _on_error(self, msg):
+        self._busy = False
+        if CHANGE_LOG in msg:
+            self.stop()   # DB lama tanpa change_log: cukup bus di dalam proses
+
+
+_bus = None
+
+
+def change_bus():
+    """Bus bersama; dibuat (di thread GUI) oleh form pertama yang mendengarkan."""
+    global _bus
+    if _bus is None:
+        _bus = ChangeBus()
+        add_write_hook(_bus.on_write)
+        if POLL_INTERVAL > 0:
+            _bus.poller = ChangeLogPoller(_bus, POLL_INTERVAL, _bus)
+            _bus.poller.start()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(_bus.poller.stop)
+    return _bus
@@ -1,15 +1,466 @@
 # common.py
-from pathlib import Path
+import bisect
+import threading
+from collections import OrderedDict
+from functools import partial
 
-from PySide6 import QtWidgets, QtUiTools
-from PySide6.QtCore import QFile, QDate, QTime, Qt, QTimer
+from PySide6 import QtWidgets
+from PySide6.QtCore import (
+    QDate, QTime, Qt, QTimer, QAbstractTableModel, QAbstractListModel, QModelIndex, Signal
+)
 from PySide6.QtWidgets import (
     QTableView, QPushButton, QLineEdit, QSpinBox, QDoubleSpinBox, QDateEdit,
-    QTimeEdit, QCheckBox, QComboBox, QMessageBox, QVBoxLayout
+    QTimeEdit, QCheckBox, QComboBox, QMessageBox, QVBoxLayout, QCompleter,
+    QFileDialog, QProgressDialog, QLabel, QAbstractSpinBox
+)
+
+import bulk
+from changes import change_bus
+from crud import (
+    DERIVED_COLUMNS, SEARCH_INDEX, crud, extra_conditions, filter_matches, narrows, row_matches,
+    search_conditions
 )
-from PySide6.QtGui import QStandardItemModel, QStandardItem
+from filterbar import FilterBar
+from profiler import profiler
+from registry import REGISTRY
+from rowstore import RowPage, format_value, is_numeric
+from ui_loader import load_ui
+from worker import DbWorker
+
+
+def load_form_ui(widget, ui_file):
+    """Load file .ui (modul hasil uic / QUiLoader, lihat ui_loader) dan tempel ke layout `widget`."""
+    ui = load_ui(ui_file, widget)   # parent = widget
+
+    # tempel ke layout supaya tampil
+    lay = QVBoxLayout(widget)
+    lay.setContentsMargins(0, 0, 0, 0)
+    lay.addWidget(ui)
+    return ui
+
+
+# role yang dijawab LazyTableModel.data(), sebagai int: view mengirim role berupa int dan
+# int == enum Qt jauh lebih mahal (data() dipanggil ribuan kali waktu resizeColumnsToContents)
+_DISPLAY, _ALIGN, _RAW = int(Qt.DisplayRole), int(Qt.TextAlignmentRole), int(Qt.UserRole)
+_RIGHT = int(Qt.AlignRight | Qt.AlignVCenter)
+
+
+def _packed(db, fetch, start, limit):
+    """Jalan di worker: hasil fetch langsung dipak per kolom, list dict-nya tidak sampai ke GUI."""
+    rows, nxt = fetch(db, start, limit)
+    return RowPage.from_rows(rows), nxt
+
+
+class LazyTableModel(QAbstractTableModel):
+    """
+    Model tabel yang ambil data per halaman (canFetchMore/fetchMore) lewat DbWorker.
+    fetch(db, cursor, limit) -> (rows, next_cursor); next_cursor None = data habis.
+    Yang disimpan di memori cuma MAX_PAGES halaman terakhir dipakai,
+    halaman lain diambil ulang dari cursor awalnya kalau di-scroll lagi.
+    Perubahan satu baris (apply_change) diterapkan di tempat tanpa query ulang.
+    Tiap halaman disimpan sebagai RowPage (per kolom, bertipe); teks sel baru dibuat di data().
+    """
+    PAGE_SIZE = 200
+    MAX_PAGES = 25   # jendela baris di memori = PAGE_SIZE * MAX_PAGES
+
+    loaded = Signal()      # halaman pertama sudah datang
+    failed = Signal(str)
+
+    def __init__(self, fetch, worker, parent=None, rows=None, headers=None):
+        super().__init__(parent)
+        self._fetch = fetch
+        self._worker = worker
+        self._headers = []
+        self._starts = []            # cursor awal tiap halaman
+        self._sizes = []             # jumlah baris tiap halaman
+        self._offsets = []           # baris pertama tiap halaman (berubah kalau ada insert/delete)
+        self._pages = OrderedDict()  # no halaman -> RowPage (urut LRU)
+        self._rows = 0
+        self.keyword = ""            # kata kunci pencarian model ini ("" = semua data)
+        self.label = ""              # nama tabel (untuk profiler)
+        self._next = None
+        self._done = False
+        self._loading = True
+        self._reloading = set()      # no halaman yang sedang diambil ulang
+        self._seqs = set()
+        if rows is None:
+            self._request(None, self.PAGE_SIZE, self._on_page)
+            return
+        # baris sudah ada di klien (hasil penyaringan), tidak perlu query
+        self._headers = list(headers or [])
+        self._loading = False
+        self._done = True
+        for i in range(0, len(rows), self.PAGE_SIZE):
+            page = RowPage.from_rows(rows[i:i + self.PAGE_SIZE], self._headers)
+            self._store(len(self._starts), page)
+            self._starts.append(None)
+            self._sizes.append(len(page))
+            self._offsets.append(i)
+        self._rows = len(rows)
+
+    def all_rows(self):
+        """Semua baris kalau hasilnya sudah lengkap di memori, selain itu None."""
+        if not self._done or self._loading or len(self._pages) != len(self._starts):
+            return None
+        return [r for no in range(len(self._starts)) for r in self._pages[no].rows() if r]
+
+    def headers(self):
+        return list(self._headers)
+
+    def _request(self, start, limit, callback, *extra):
+        box = []
+        sent = profiler.now()
+
+        def done(result):
+            self._seqs.discard(box[0])
+            if not profiler.enabled:
+                callback(start, result, *extra)
+                return
+            # fetch = antri worker + query + kirim sinyal; page = masukkan baris ke model
+            profiler.span("model.fetch", self.label, sent, rows=len(result[0]))
+            t0 = profiler.now()
+            callback(start, result, *extra)
+            profiler.span("model.page", self.label, t0, rows=len(result[0]))
+
+        def fail(msg):
+            self._seqs.discard(box[0])
+            self._loading = False
+            self._done = True
+            self.failed.emit(msg)
+
+        box.append(self._worker.submit(_packed, self._fetch, start, limit,
+                                       on_done=done, on_error=fail))
+        self._seqs.add(box[0])
+
+    def close(self):
+        """Batalkan semua fetch yang masih jalan (model sudah diganti)."""
+        for seq in list(self._seqs):
+            self._worker.cancel(seq)
+        self._seqs.clear()
+
+    def _on_page(self, start, result):
+        rows, nxt = result
+        first = not self._starts
+        self._loading = False
+        if rows:
+            if first:
+                self.beginResetModel()
+                self._headers = list(rows.headers)
+            else:
+                self.beginInsertRows(QModelIndex(), self._rows, self._rows + len(rows) - 1)
+            self._store(len(self._starts), rows)
+            self._starts.append(start)
+            self._sizes.append(len(rows))
+            self._offsets.append(self._rows)
+            self._rows += len(rows)
+            if first:
+                self.endResetModel()
+            else:
+                self.endInsertRows()
+        self._next = nxt
+        self._done = nxt is None
+        if first:
+            self.loaded.emit()
+
+    def _on_reload(self, start, result, no):
+        self._reloading.discard(no)
+        size = self._sizes[no]
+        page = result[0] if len(result[0]) else RowPage.from_rows([], self._headers)
+        page.pad(size - len(page))   # baris yang sudah hilang di DB tampil kosong
+        self._store(no, page)
+        top = self._offsets[no]
+        self.dataChanged.emit(self.index(top, 0),
+                              self.index(top + size - 1, len(self._headers) - 1))
+
+    def _store(self, no, rows):
+        self._pages[no] = rows
+        self._pages.move_to_end(no)
+        while len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+
+    def _page(self, no):
+        rows = self._pages.get(no)
+        if rows is not None:
+            self._pages.move_to_end(no)
+            return rows
+        # halaman sudah dibuang dari memori -> ambil ulang dari cursor awalnya
+        if no not in self._reloading:
+            self._reloading.add(no)
+            self._request(self._starts[no], self._sizes[no], self._on_reload, no)
+        return None
+
+    def _locate(self, row):
+        """(RowPage, posisi) untuk baris ke-`row`, atau (None, 0) kalau halamannya belum ada."""
+        if not self._starts:
+            return None, 0
+        no = bisect.bisect_right(self._offsets, row) - 1
+        while no > 0 and self._sizes[no] == 0:
+            no -= 1
+        page = self._page(no)
+        i = row - self._offsets[no]
+        return (page, i) if page is not None and i < len(page) else (None, 0)
+
+    def row_dict(self, row):
+        page, i = self._locate(row)
+        return page.row(i) if page is not None else {}
+
+    def memory_estimate(self):
+        """Byte halaman yang ada di memori (array kolom + objek; string di-intern dihitung sekali)."""
+        seen = set()
+        return sum(page.nbytes(seen) for page in self._pages.values())
+
+    # ---- perubahan satu baris (ChangeBus) ----
+    def _find(self, pk_name, pk):
+        """(no halaman, posisi) baris ber-PK `pk` di halaman yang ada di memori, atau None."""
+        for no, page in self._pages.items():
+            i = page.find(pk_name, pk)
+            if i >= 0:
+                return no, i
+        return None
+
+    def _reindex(self, start):
+        for no in range(start + 1, len(self._sizes)):
+            self._offsets[no] = self._offsets[no - 1] + self._sizes[no - 1]
+
+    def apply_change(self, op, pk_name, pk, row=None, accept_insert=True):
+        """
+        update -> ganti baris + dataChanged; delete -> rowsRemoved;
+        insert -> rowsInserted di akhir (kalau semua data sudah dimuat; kalau belum,
+        baris itu datang sendiri lewat fetchMore karena urut PK).
+        Return False kalau model tidak bisa memastikan hasilnya (pemanggil muat ulang).
+        """
+        if not self._starts:
+            if op != "insert" or not accept_insert or row is None:
+                return True
+            if self._loading or not self._done:
+                return False
+            # tabel tadinya kosong: baris ini jadi halaman pertama
+            self.beginResetModel()
+            self._headers = self._headers or list(row.keys())
+            self._store(0, RowPage.from_rows([row], self._headers))
+            self._starts.append(None)
+            self._sizes.append(1)
+            self._offsets.append(0)
+            self._rows = 1
+            self.endResetModel()
+            return True
+        pos = self._find(pk_name, pk)
+        complete = len(self._pages) == len(self._starts)
+        if op == "delete":
+            if pos is None:
+                return complete   # mungkin ada di halaman yang sudah dibuang dari memori
+            no, i = pos
+            r = self._offsets[no] + i
+            self.beginRemoveRows(QModelIndex(), r, r)
+            self._pages[no].delete(i)
+            self._sizes[no] -= 1
+            self._rows -= 1
+            self._reindex(no)
+            self.endRemoveRows()
+            return True
+        if row is None:
+            return False
+        if pos is not None:
+            no, i = pos
+            if self._pages[no].row(i) == row:
+                return True   # event yang sama lewat hook dan change_log
+            self._pages[no].set_row(i, row)
+            r = self._offsets[no] + i
+            self.dataChanged.emit(self.index(r, 0), self.index(r, len(self._headers) - 1))
+            return True
+        if op != "insert" or not accept_insert or not self._done:
+            return True
+        last = len(self._starts) - 1
+        if last not in self._pages:
+            return False
+        self.beginInsertRows(QModelIndex(), self._rows, self._rows)
+        self._pages[last].append(row)
+        self._sizes[last] += 1
+        self._rows += 1
+        self.endInsertRows()
+        return True
+
+    # ---- API QAbstractTableModel ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._done and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self._request(self._next, self.PAGE_SIZE, self._on_page)
+
+    def data(self, index, role=_DISPLAY):
+        if (role != _DISPLAY and role != _ALIGN and role != _RAW) or not index.isValid():
+            return None
+        page, i = self._locate(index.row())
+        v = page.value(i, index.column()) if page is not None else None
+        if role == _DISPLAY:
+            return format_value(v)
+        if role == _ALIGN:
+            return _RIGHT if is_numeric(v) else None
+        return v   # UserRole: nilai asli (Decimal, date, ...)
+
+    def headerData(self, section, orientation, role=_DISPLAY):
+        if role != _DISPLAY:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
+
+
+class OptionsModel(QAbstractListModel):
+    """
+    Model QComboBox FK di atas OptionList. Baris ditampilkan bertahap per CHUNK
+    (canFetchMore/fetchMore), jadi combo dengan 100rb pilihan tetap langsung terbuka.
+    """
+    CHUNK = 500
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self._opts = options
+        self._shown = min(self.CHUNK, len(options))
+
+    def options(self):
+        return self._opts
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._shown
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._shown < len(self._opts)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._show_until(self._shown + self.CHUNK)
+
+    def _show_until(self, n):
+        n = min(n, len(self._opts))
+        if n > self._shown:
+            self.beginInsertRows(QModelIndex(), self._shown, n - 1)
+            self._shown = n
+            self.endInsertRows()
+
+    def row_of(self, id_value):
+        """Baris untuk id (ditampilkan dulu kalau belum), -1 kalau tidak ada."""
+        i = self._opts.index_of(id_value)
+        if i >= 0:
+            self._show_until(i + 1)
+        return i
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return str(self._opts.labels[index.row()])
+        if role == Qt.UserRole:
+            return self._opts.ids[index.row()]
+        return None
+
+
+class OptionsFilterModel(QAbstractListModel):
+    """Isi popup completer: maksimal LIMIT pilihan yang labelnya mengandung teks ketikan."""
+    LIMIT = 50
+
+    def __init__(self, options, parent=None):
+        super().__init__(parent)
+        self._opts = options
+        self._rows = []
+
+    def set_options(self, options):
+        self.beginResetModel()
+        self._opts = options
+        self._rows = []
+        self.endResetModel()
+
+    def set_filter(self, text):
+        text = (text or "").strip().lower()
+        rows = []
+        if text:
+            for i, label in enumerate(self._opts.lower_labels()):
+                if text in label:
+                    rows.append(i)
+                    if len(rows) >= self.LIMIT:
+                        break
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def id_at(self, row):
+        return self._opts.ids[self._rows[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return str(self._opts.labels[self._rows[index.row()]])
+        return None
+
+
+# ========== field form: jenis -> (kelas widget, getter(w), setter(w, nilai)) ==========
+def _set_spin(w, val):
+    w.setValue(int(val) if (val not in (None, "") and str(val).isdigit()) else 0)
+
+
+def _set_date(w, val):
+    if val:
+        d = QDate.fromString(str(val)[:10], "yyyy-MM-dd")
+        if d.isValid():
+            w.setDate(d)
+
+
+def _set_time(w, val):
+    if val:
+        t = QTime.fromString(str(val), "HH:mm:ss")
+        if t.isValid():
+            w.setTime(t)
+
+
+def _set_combo(w, val):
+    if val is not None:
+        BaseForm._select_combo(w, val)
+
+
+def _set_combo_text(w, val):
+    if val is None:
+        return
+    idx = w.findText(str(val), Qt.MatchFixedString | Qt.MatchCaseSensitive)
+    if idx < 0:
+        idx = w.findText(str(val), Qt.MatchContains)
+    if idx >= 0:
+        w.setCurrentIndex(idx)
+
+
+def _none(w):
+    return None
 
-from crud import crud
+
+def _ignore(w, val):
+    pass
+
+
+_FIELD_KINDS = {
+    "spin": (QSpinBox, lambda w: int(w.value()), _set_spin),
+    "double": (QDoubleSpinBox, lambda w: float(w.value()),
+               lambda w, v: w.setValue(float(v) if v not in (None, "") else 0.0)),
+    "line": (QLineEdit, lambda w: w.text().strip(),
+             lambda w, v: w.setText("" if v is None else str(v))),
+    "date": (QDateEdit, lambda w: w.date().toString("yyyy-MM-dd") if w.date().isValid() else None,
+             _set_date),
+    "time": (QTimeEdit, lambda w: w.time().toString("HH:mm:ss"), _set_time),
+    "check": (QCheckBox, lambda w: 1 if w.isChecked() else 0,
+              lambda w, v: w.setChecked(bool(int(v)) if v not in (None, "") else False)),
+    "combo": (QComboBox, lambda w: w.currentData(), _set_combo),
+    "combo_text": (QComboBox, lambda w: w.currentText(), _set_combo_text),
+}
+_FIELD_KINDS["pwd"] = _FIELD_KINDS["line"]
+_MISSING_GET = {"check": lambda w: 0}   # widget tidak ada: check = 0, lainnya None
 
 
 class BaseForm(QtWidgets.QWidget):
@@ -17,27 +468,28 @@ class BaseForm(QtWidgets.QWidget):
     UI_FILE = ""     # nama file .ui
     PK = "id"        # nama primary key di tabel
     FIELD_WIDGETS = {}  # kolom -> (jenis, objectName)
+    FILTERS = {}        # kolom -> jenis filter di atas tabel ('date', 'enum', 'range'; lihat filterbar)
+    SUMMARY = ""        # tabel ringkasan (crud.SUMMARY_TABLES) untuk baris terpilih, "" = tidak ada
+    SEARCH_DELAY = 250  # ms jeda setelah berhenti mengetik sebelum mencari
+
+    def __init_subclass__(cls, **kwargs):
+        # PK, FILTERS, SUMMARY tabel yang ada di registry diambil dari sana (sama dengan api.py)
+        super().__init_subclass__(**kwargs)
+        spec = REGISTRY.get(cls.TABLE)
+        if spec is None:
+            return
+        cls.PK, cls.FILTERS, cls.SUMMARY = spec.pk, spec.filters, spec.summary
+        unknown = [c for c in cls.FIELD_WIDGETS if c not in spec.columns]
+        if unknown:
+            raise TypeError(f"{cls.__name__}: kolom {', '.join(unknown)} tidak ada di "
+                            f"registry `{cls.TABLE}`")
 
     def __init__(self):
         super().__init__()
-        self.db = crud()
-
-        # --- Load UI aman via QFile ---
-        base = Path(__file__).resolve().parent
-        ui_path = base / self.UI_FILE
-        if not ui_path.exists():
-            raise FileNotFoundError(f"UI file tidak ditemukan: {ui_path}")
-        qf = QFile(str(ui_path))
-        if not qf.open(QFile.ReadOnly):
-            raise RuntimeError(f"Tidak bisa membuka UI: {ui_path}")
-        loader = QtUiTools.QUiLoader()
-        self.ui = loader.load(qf, self)   # parent = self
-        qf.close()
-
-        # tempel ke layout supaya tampil
-        lay = QVBoxLayout(self)
-        lay.setContentsMargins(0, 0, 0, 0)
-        lay.addWidget(self.ui)
+        self.worker = DbWorker(self)   # semua query jalan di thread pool, bukan di thread GUI
+
+        self.ui = load_form_ui(self, self.UI_FILE)
+        self._compile_bindings()
 
         # widget standar
         self.table = self.ui.findChild(QTableView, "tableView")
@@ -47,6 +499,8 @@ class BaseForm(QtWidgets.QWidget):
         self.btnDelete = self.ui.findChild(QPushButton, "btnDelete")
         self.btnClear = self.ui.findChild(QPushButton, "btnClear")
         self.btnRefresh = self.ui.findChild(QPushButton, "btnRefresh")
+        self.btnImport = self.ui.findChild(QPushButton, "btnImport")
+        self.btnExport = self.ui.findChild(QPushButton, "btnExport")
         self.lineSearch = self.ui.findChild(QLineEdit, "lineSearch")
 
         # sinyal tombol
@@ -56,28 +510,114 @@ class BaseForm(QtWidgets.QWidget):
         if self.btnDelete: self.btnDelete.clicked.connect(self.delete_record)
         if self.btnClear: self.btnClear.clicked.connect(self.clear_form)
         if self.btnRefresh: self.btnRefresh.clicked.connect(self.refresh_table)
-        if self.lineSearch: self.lineSearch.textChanged.connect(self.search_records)
+        if self.btnImport: self.btnImport.clicked.connect(self.import_records)
+        if self.btnExport: self.btnExport.clicked.connect(self.export_records)
+
+        # pencarian: tunggu user berhenti mengetik dulu (debounce)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY)
+        self._search_timer.timeout.connect(lambda: self.search_records(self.lineSearch.text()))
+        if self.lineSearch: self.lineSearch.textChanged.connect(self._search_timer.start)
+        self._pending = None    # model baru yang halaman pertamanya belum datang
+
+        # urut (klik header) & filter per kolom dikerjakan di SQL, bukan di model
+        self._order = None      # (kolom, desc) atau None = urut PK
+        self._filters = {}
+        self.filterBar = None
+        if self.table:
+            self.table.setSortingEnabled(True)   # sort() model kosong: cuma indikator header
+            self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.table.horizontalHeader().sortIndicatorChanged.connect(self._on_sort)
+            if self.FILTERS:
+                self._setup_filter_bar()
+        self.labelSummary = None
+        self._summary_pk = None
+        if self.table and self.SUMMARY:
+            self._setup_summary()
 
-        # Inisialisasi form kosong dulu (biar window kebuka cepat)
+        # perubahan baris dari form lain / proses lain diterapkan per baris
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(200)
+        self._reload_timer.timeout.connect(self.refresh_table)
+        change_bus().watch(self.TABLE, self._on_change)
+
+        # Inisialisasi form kosong dulu, data menyusul dari worker (window langsung tampil)
         self.clear_form()
+        self._first_load()
+
+    def _setup_filter_bar(self):
+        self.filterBar = FilterBar(self.FILTERS, self.ui)
+        lay = self.table.parentWidget().layout()
+        idx = lay.indexOf(self.table) if lay is not None else -1
+        if idx < 0 or not hasattr(lay, "insertWidget"):
+            self.filterBar.deleteLater()
+            self.filterBar = None
+            return
+        lay.insertWidget(idx, self.filterBar)
+        self.filterBar.changed.connect(self._on_filters)
+        enums = [c for c, kind in self.FILTERS.items() if kind == "enum"]
+        if enums:
+            table = self.TABLE
+
+            def fill(info):
+                for c in enums:
+                    self.filterBar.set_enum_values(c, info.enums.get(c, []) if info else [])
+            self.worker.submit(lambda db: db.table_info(table), on_done=fill)
+
+    def _setup_summary(self):
+        lay = self.table.parentWidget().layout()
+        idx = lay.indexOf(self.table) if lay is not None else -1
+        if idx < 0 or not hasattr(lay, "insertWidget"):
+            return
+        self.labelSummary = QLabel(self.ui)
+        lay.insertWidget(idx + 1, self.labelSummary)
+
+    def _show_summary(self, pk):
+        """Satu baris tabel ringkasan per PK (dijaga trigger), bukan agregasi ulang."""
+        if self.labelSummary is None:
+            return
+        self._summary_pk = pk
+        self.labelSummary.clear()
+        if not pk:
+            return
 
-        # TUNDA pemanggilan DB sampai event loop jalan (hindari freeze saat opening)
-        QTimer.singleShot(10, self._first_load)
+        def done(row):
+            if pk != self._summary_pk:
+                return   # baris lain sudah dipilih
+            if not row:
+                self.labelSummary.setText("Belum ada transaksi.")
+                return
+            self.labelSummary.setText("   ".join(
+                f"{k}: {format_value(v)}" for k, v in row.items() if k != self.PK))
+        self.worker.submit(crud.fetch_by_id, self.SUMMARY, self.PK, pk, on_done=done,
+                           on_error=lambda msg: None, channel="summary")
 
-    # ---- dipanggil setelah window tampil ----
     def _first_load(self):
-        try:
-            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
-            try:
-                self.setup_fk_options()
-            except Exception as e:
-                print(f"[WARN] setup_fk_options: {e}")
-            try:
-                self.refresh_table()
-            except Exception as e:
-                print(f"[WARN] refresh_table awal: {e}")
-        finally:
-            QtWidgets.QApplication.restoreOverrideCursor()
+        self.setup_fk_options()
+        self.refresh_table()
+
+    def closeEvent(self, event):
+        # form yang cuma disembunyikan (disimpan FormManager) tetap ikut ChangeBus
+        # dan query-nya dibiarkan selesai, jadi datanya masih hangat waktu dibuka lagi
+        if self.testAttribute(Qt.WA_DeleteOnClose):
+            change_bus().unwatch(self.TABLE, self._on_change)
+            self.worker.cancel_all()
+        super().closeEvent(event)
+
+    def cache_size(self):
+        """Perkiraan byte data tabel yang dipegang form ini (untuk batas memori FormManager)."""
+        model = self.table.model() if self.table else None
+        return model.memory_estimate() if isinstance(model, LazyTableModel) else 0
+
+    def _set_busy(self, busy):
+        for b in (self.btnSave, self.btnUpdate, self.btnDelete, self.btnImport, self.btnExport):
+            if b: b.setEnabled(not busy)
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
 
     # ========== util ambil/isi form ==========
     def _get_widget(self, name, cls):
@@ -86,109 +626,223 @@ class BaseForm(QtWidgets.QWidget):
             w = self.ui.findChild(QLineEdit, name)  # fallback
         return w
 
-    def get_form_data(self):
-        data = {}
+    def _compile_bindings(self):
+        """
+        Cari widget tiap kolom FIELD_WIDGETS sekali saja (bukan tiap get/set_form_data):
+        hasilnya list (kolom, widget, getter, setter, writable) sesuai jenis field.
+        Kolom turunan (crud.DERIVED_COLUMNS, diisi trigger) cuma ditampilkan: widgetnya
+        read-only dan tidak ikut get_form_data.
+        """
+        derived = DERIVED_COLUMNS.get(self.TABLE, ())
+        bindings = []
         for col, (kind, name) in self.FIELD_WIDGETS.items():
-            if kind == "spin":
-                w = self._get_widget(name, QSpinBox); data[col] = int(w.value()) if w else None
-            elif kind == "double":
-                w = self._get_widget(name, QDoubleSpinBox); data[col] = float(w.value()) if w else None
-            elif kind in ("line", "pwd"):
-                w = self._get_widget(name, QLineEdit); data[col] = w.text().strip() if w else None
-            elif kind == "date":
-                w = self._get_widget(name, QDateEdit); data[col] = w.date().toString("yyyy-MM-dd") if w and w.date().isValid() else None
-            elif kind == "time":
-                w = self._get_widget(name, QTimeEdit); data[col] = w.time().toString("HH:mm:ss") if w else None
-            elif kind == "check":
-                w = self._get_widget(name, QCheckBox); data[col] = 1 if (w and w.isChecked()) else 0
-            elif kind == "combo":
-                w = self._get_widget(name, QComboBox); data[col] = w.currentData() if w else None
-            elif kind == "combo_text":
-                w = self._get_widget(name, QComboBox); data[col] = w.currentText() if w else None
-        return data
+            cls, getter, setter = _FIELD_KINDS.get(kind, _FIELD_KINDS["line"])
+            w = self._get_widget(name, cls)
+            if w is None:
+                getter, setter = _MISSING_GET.get(kind, _none), _ignore
+            elif not isinstance(w, cls):
+                # objectName ketemu tapi ternyata QLineEdit: baca/isi sebagai teks
+                getter, setter = _FIELD_KINDS["line"][1:]
+            writable = col not in derived
+            if not writable and hasattr(w, "setReadOnly"):
+                w.setReadOnly(True)
+                if isinstance(w, QAbstractSpinBox):
+                    w.setButtonSymbols(QAbstractSpinBox.NoButtons)
+            bindings.append((col, w, getter, setter, writable))
+        self._bindings = bindings
+        self._empty = {col: (0 if typ in ('spin', 'check', 'combo') else "")
+                       for col, (typ, _) in self.FIELD_WIDGETS.items()}
+        self._empty[self.PK] = 0
+
+    def get_form_data(self):
+        return {col: get(w) for col, w, get, _, writable in self._bindings if writable}
 
     def set_form_data(self, row: dict):
-        for col, (kind, name) in self.FIELD_WIDGETS.items():
-            val = row.get(col)
-            if kind == "spin":
-                w = self._get_widget(name, QSpinBox)
-                if w: w.setValue(int(val) if (val not in (None,"") and str(val).isdigit()) else 0)
-            elif kind == "double":
-                w = self._get_widget(name, QDoubleSpinBox)
-                if w: w.setValue(float(val) if val not in (None,"") else 0.0)
-            elif kind in ("line","pwd"):
-                w = self._get_widget(name, QLineEdit)
-                if w: w.setText("" if val is None else str(val))
-            elif kind == "date":
-                w = self._get_widget(name, QDateEdit)
-                if w and val:
-                    d = QDate.fromString(str(val), "yyyy-MM-dd")
-                    if d.isValid(): w.setDate(d)
-            elif kind == "time":
-                w = self._get_widget(name, QTimeEdit)
-                if w and val:
-                    t = QTime.fromString(str(val), "HH:mm:ss")
-                    if t.isValid(): w.setTime(t)
-            elif kind == "check":
-                w = self._get_widget(name, QCheckBox)
-                if w: w.setChecked(bool(int(val)) if val not in (None,"") else False)
-            elif kind == "combo":
-                w = self._get_widget(name, QComboBox)
-                if w and val is not None:
-                    idx = w.findData(val)
-                    if idx >= 0: w.setCurrentIndex(idx)
-            elif kind == "combo_text":
-                w = self._get_widget(name, QComboBox)
-                if w and val is not None:
-                    idx = w.findText(str(val), Qt.MatchFixedString | Qt.MatchCaseSensitive)
-                    if idx < 0:
-                        idx = w.findText(str(val), Qt.MatchContains)
-                    if idx >= 0:
-                        w.setCurrentIndex(idx)
+        for col, w, _, put, _ in self._bindings:
+            put(w, row.get(col))
 
     # override di subclass kalau ada FK yang perlu diisi
     def setup_fk_options(self):
         pass
 
+    def load_combo(self, name, table, id_col, label_col=None):
+        """Isi QComboBox FK dari LookupCache bersama; query (di worker) cuma kalau belum ada."""
+        cmb = self.ui.findChild(QComboBox, name)
+        if not cmb:
+            return
+        opts = crud.cached_options(table, id_col, label_col)
+        if opts is not None:
+            self._set_combo_options(cmb, opts)
+            return
+        self.worker.submit(crud.fetch_option_list, table, id_col, label_col,
+                           on_done=lambda o: self._set_combo_options(cmb, o),
+                           channel=("fk", name))
+
+    def _set_combo_options(self, cmb, opts):
+        current = cmb.currentData()
+        filt = getattr(cmb, "_filter_model", None)
+        if filt is None:
+            # ketik untuk menyaring: completer di atas daftar lengkap, bukan cuma yang sudah tampil
+            cmb.setEditable(True)
+            cmb.setInsertPolicy(QComboBox.NoInsert)
+            filt = cmb._filter_model = OptionsFilterModel(opts, cmb)
+            completer = cmb._completer = QCompleter(filt, cmb)
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+
+            def on_edit(text):
+                filt.set_filter(text)
+                if filt.rowCount():
+                    completer.complete()
+
+            def on_pick(index):
+                self._select_combo(cmb, filt.id_at(index.row()))
+
+            cmb.lineEdit().textEdited.connect(on_edit)
+            completer.activated[QModelIndex].connect(on_pick)
+        else:
+            filt.set_options(opts)
+
+        # completer dilepas dulu: setModel() ikut mengganti model completer, dan
+        # completer bawaan QComboBox memaksa semua baris di-fetch sekaligus
+        cmb.lineEdit().setCompleter(None)
+        old = cmb.model()
+        cmb.setModel(OptionsModel(opts, cmb))
+        if isinstance(old, OptionsModel):
+            old.deleteLater()
+        cmb.lineEdit().setCompleter(cmb._completer)
+        self._select_combo(cmb, current)
+
+    @staticmethod
+    def _select_combo(cmb, val):
+        model = cmb.model()
+        idx = model.row_of(val) if isinstance(model, OptionsModel) else cmb.findData(val)
+        if idx >= 0:
+            cmb.setCurrentIndex(idx)
+
     # ========== table/view & selection ==========
-    def _fill_table(self, rows):
-        model = QStandardItemModel(0, 0, self)
-        if rows:
-            headers = list(rows[0].keys())
-            model.setColumnCount(len(headers))
-            model.setHorizontalHeaderLabels(headers)
-            for r in rows:
-                items = [QStandardItem("" if v is None else str(v)) for v in r.values()]
-                model.appendRow(items)
-        if self.table:
-            self.table.setModel(model)
-            self.table.resizeColumnsToContents()
-            sel = self.table.selectionModel()
-            if sel:
-                sel.selectionChanged.connect(self._on_selection)
+    def _pager(self, keyword=""):
+        """Fungsi fetch untuk LazyTableModel: keyset di PK, atau hasil pencarian berperingkat."""
+        table, pk = self.TABLE, self.PK
+        filters, order = dict(self._filters), self._order
+
+        def fetch(db, cursor, limit):
+            return db.query_page(table, pk, cursor, limit, keyword, filters, order)
+        return fetch
+
+    def _fill_table(self, fetch, err="Gagal ambil data", keyword=""):
+        """Muat model baru; tabel lama tetap tampil sampai halaman pertamanya datang."""
+        if not self.table:
+            return
+        self._drop_pending()
+        model = LazyTableModel(fetch, self.worker, self)
+        model.keyword = keyword
+        model.label = self.TABLE
+        self._pending = model
+        model.loaded.connect(lambda: self._show_model(model))
+        model.failed.connect(lambda msg: self._load_failed(model, f"{err}: {msg}"))
+
+    def _drop_pending(self):
+        if self._pending is not None:
+            self._pending.close()   # request lama (mis. pencarian sebelumnya) dibatalkan
+            self._pending.deleteLater()
+            self._pending = None
+
+    def _load_failed(self, model, msg):
+        if model is self._pending:
+            self._pending = None
+            model.deleteLater()
+        QMessageBox.warning(self, "DB", msg)
+
+    def _show_model(self, model):
+        if model is self._pending:
+            self._pending = None
+        old = self.table.model()
+        if old is model:
+            return
+        t0 = profiler.now()
+        self.table.setModel(model)
+        if isinstance(old, LazyTableModel):
+            old.close()
+        if old is not None:
+            old.deleteLater()
+        self.table.resizeColumnsToContents()
+        sel = self.table.selectionModel()
+        if sel:
+            sel.selectionChanged.connect(self._on_selection)
+        profiler.span("model.show", self.TABLE, t0, rows=model.rowCount())
 
     def refresh_table(self):
-        try:
-            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
-            rows = self.db.fetch_all(self.TABLE)
-        except Exception as e:
-            QMessageBox.warning(self, "DB", f"Gagal ambil data: {e}")
-            rows = []
-        finally:
-            QtWidgets.QApplication.restoreOverrideCursor()
-        self._fill_table(rows)
+        self._reload_timer.stop()
+        self._fill_table(self._pager())
+
+    def _current_keyword(self):
+        model = self._pending or (self.table.model() if self.table else None)
+        return getattr(model, "keyword", "")
+
+    def _on_sort(self, section, order):
+        model = self.table.model()
+        if not isinstance(model, LazyTableModel) or not 0 <= section < len(model.headers()):
+            return
+        col, desc = model.headers()[section], order == Qt.DescendingOrder
+        new = None if (col == self.PK and not desc) else (col, desc)
+        if new != self._order:
+            self._order = new
+            self._fill_table(self._pager(self._current_keyword()), "Gagal mengurutkan",
+                             self._current_keyword())
+
+    def _on_filters(self):
+        filters = self.filterBar.filters()
+        if filters != self._filters:
+            self._filters = filters
+            self._fill_table(self._pager(self._current_keyword()), "Gagal memfilter",
+                             self._current_keyword())
+
+    def _matches(self, keyword, row):
+        """Apakah baris baru ikut hasil pencarian `keyword` (sama dengan WHERE di crud)."""
+        if not keyword:
+            return True
+        if self.TABLE in SEARCH_INDEX:
+            return row_matches(self.TABLE, row, search_conditions(self.TABLE, keyword))
+        return any(keyword.lower() in str(v).lower() for v in row.values() if v is not None)
+
+    def _on_change(self, table, op, pk_name, pk, row):
+        if table != self.TABLE or not self.table:
+            return
+        model = self.table.model()
+        if self._pending is not None or not isinstance(model, LazyTableModel):
+            return   # model baru sedang dimuat: datanya sudah terbaru
+        if op == "bulk" or pk_name != self.PK:
+            self._reload_timer.start()   # banyak baris berubah: satu muat ulang untuk semuanya
+            return
+        accept = (row is not None and self._matches(model.keyword, row)
+                  and filter_matches(self._filters, row))
+        if op != "delete" and (self._order is not None
+                               or (self._filters and op == "update" and not accept)):
+            # posisi baris di urutan kolom / keluar-masuk filter: biar SQL yang menentukan
+            self._reload_timer.start()
+            return
+        if not model.apply_change(op, pk_name, pk, row, accept):
+            self._reload_timer.start()
 
     def search_records(self, text):
+        self._search_timer.stop()
         text = (text or "").strip()
-        try:
-            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
-            rows = self.db.search(self.TABLE, text) if text else self.db.fetch_all(self.TABLE)
-        except Exception as e:
-            QMessageBox.warning(self, "DB", f"Gagal mencari: {e}")
-            rows = []
-        finally:
-            QtWidgets.QApplication.restoreOverrideCursor()
-        self._fill_table(rows)
+        model = self.table.model() if self.table else None
+        prev = getattr(model, "keyword", "")
+        if (text and prev and isinstance(model, LazyTableModel)
+                and narrows(self.TABLE, prev, text)):
+            # kata kunci cuma diperpanjang -> saring hasil yang sudah ada, tanpa query lagi
+            rows = model.all_rows()
+            if rows is not None:
+                conds = search_conditions(self.TABLE, text)
+                extras = extra_conditions(self.TABLE, text)
+                rows = [r for r in rows if row_matches(self.TABLE, r, conds, extras)]
+                self._drop_pending()
+                narrowed = LazyTableModel(None, self.worker, self, rows, model.headers())
+                narrowed.keyword = text
+                self._show_model(narrowed)
+                return
+        self._fill_table(self._pager(text), "Gagal mencari", text)
 
     def _on_selection(self):
         if not self.table or not self.table.model():
@@ -198,6 +852,14 @@ class BaseForm(QtWidgets.QWidget):
             return
         row_idx = idxs[0].row()
         model = self.table.model()
+        if isinstance(model, LazyTableModel):
+            # langsung dari list baris di model (nilai asli), tanpa data()/headerData per kolom
+            row = model.row_dict(row_idx)
+            if not row:
+                return   # halamannya sedang diambil ulang
+            self.set_form_data(row)
+            self._show_summary(row.get(self.PK))
+            return
         row = {}
         for c in range(model.columnCount()):
             header = model.headerData(c, Qt.Horizontal)
@@ -206,35 +868,41 @@ class BaseForm(QtWidgets.QWidget):
         if pk in row and isinstance(row[pk], str) and row[pk].isdigit():
             row[pk] = int(row[pk])
         self.set_form_data(row)
+        self._show_summary(row.get(pk))
 
     # ========== tombol CRUD ==========
     def new_record(self):
         self.clear_form()
 
     def clear_form(self):
-        empty = {col: (0 if typ in ('spin','check','combo') else "")
-                 for col, (typ, _) in self.FIELD_WIDGETS.items()}
-        empty[self.PK] = 0
-        self.set_form_data(empty)
+        self.set_form_data(self._empty)
+        self._show_summary(None)
+
+    def _after_write(self, msg=None):
+        def done(result):
+            self._set_busy(False)
+            if msg:
+                QMessageBox.information(self, "Sukses", msg.format(result))
+            self.clear_form()   # tabel di-update lewat ChangeBus, tidak dimuat ulang
+        return done
+
+    def _write_failed(self, msg):
+        self._set_busy(False)
+        QMessageBox.critical(self, "DB", msg)
 
     def save_record(self):
         data = self.get_form_data()
         rid = int(data.get(self.PK) or 0)
-        try:
-            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
-            if rid == 0:
-                data.pop(self.PK, None)
-                new_id = self.db.insert(self.TABLE, data)
-                QMessageBox.information(self, "Sukses", f"Tambah data (pk={new_id})")
-            else:
-                self.db.update(self.TABLE, self.PK, rid, data)
-                QMessageBox.information(self, "Sukses", "Ubah data")
-            self.refresh_table()
-            self.clear_form()
-        except Exception as e:
-            QMessageBox.critical(self, "DB", str(e))
-        finally:
-            QtWidgets.QApplication.restoreOverrideCursor()
+        self._set_busy(True)
+        if rid == 0:
+            data.pop(self.PK, None)
+            self.worker.submit(crud.insert, self.TABLE, data,
+                               on_done=self._after_write("Tambah data (pk={})"),
+                               on_error=self._write_failed)
+        else:
+            self.worker.submit(crud.update, self.TABLE, self.PK, rid, data,
+                               on_done=self._after_write("Ubah data"),
+                               on_error=self._write_failed)
 
     def update_record(self):
         self.save_record()
@@ -245,12 +913,61 @@ class BaseForm(QtWidgets.QWidget):
             QMessageBox.information(self, "Hapus", "Pilih baris.")
             return
         if QMessageBox.question(self, "Konfirmasi", "Hapus data ini?") == QMessageBox.Yes:
-            try:
-                QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
-                self.db.delete(self.TABLE, self.PK, rid)
-                self.refresh_table()
-                self.clear_form()
-            except Exception as e:
-                QMessageBox.critical(self, "DB", str(e))
-            finally:
-                QtWidgets.QApplication.restoreOverrideCursor()
+            self._set_busy(True)
+            self.worker.submit(crud.delete, self.TABLE, self.PK, rid,
+                               on_done=self._after_write(),
+                               on_error=self._write_failed)
+
+    # ========== impor / ekspor massal ==========
+    FILE_FILTER = "CSV (*.csv);;Excel (*.xlsx)"
+
+    def _run_bulk(self, title, fn, path, on_done):
+        """Jalankan fungsi bulk di worker dengan dialog progress yang bisa dibatalkan."""
+        stop = threading.Event()
+        dlg = QProgressDialog(title, "Batal", 0, 0, self)
+        dlg.setWindowModality(Qt.WindowModal)
+        dlg.setMinimumDuration(300)
+        dlg.canceled.connect(stop.set)
+
+        def progress(done, total):
+            if total > 0:
+                dlg.setMaximum(total)
+                dlg.setValue(min(done, total))
+            dlg.setLabelText(f"{title} {done} baris")
+
+        def finish(result):
+            dlg.close()
+            self._set_busy(False)
+            on_done(result)
+
+        def fail(msg):
+            dlg.close()
+            self._write_failed(msg)
+
+        self._set_busy(True)
+        self.worker.submit(partial(fn, cancelled=stop), self.TABLE, path,
+                           on_done=finish, on_error=fail, on_progress=progress)
+
+    def import_records(self):
+        path, _ = QFileDialog.getOpenFileName(self, f"Impor {self.TABLE}", "", self.FILE_FILTER)
+        if not path:
+            return
+
+        def done(result):
+            msg = f"Tersimpan {result['inserted']} baris."
+            if result["skipped"]:
+                msg += f"\n{result['skipped']} baris tidak valid:\n" + "\n".join(result["errors"][:10])
+            QMessageBox.information(self, "Impor", msg)
+            self.refresh_table()
+        self._run_bulk("Mengimpor...", bulk.import_file, path, done)
+
+    def export_records(self):
+        path, chosen = QFileDialog.getSaveFileName(self, f"Ekspor {self.TABLE}",
+                                                   f"{self.TABLE}.csv", self.FILE_FILTER)
+        if not path:
+            return
+        if "xlsx" in chosen and not path.lower().endswith(".xlsx"):
+            path += ".xlsx"
+        self._run_bulk("Mengekspor...", bulk.export_file, path,
+                       lambda r: QMessageBox.information(self, "Ekspor",
+                                                         f"{r['exported']} baris ke {path}"))
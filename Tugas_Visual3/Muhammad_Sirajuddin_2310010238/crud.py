@@ -1,104 +1,1417 @@
 # crud.py
-import mysql.connector
-from mysql.connector import Error
+import bisect
+import datetime
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import lru_cache
+
+from profiler import TimedCursor, profiler
+from registry import REGISTRY
+
+# Backend penyimpanan: "mysql" (server, default) atau "sqlite" (file lokal, tanpa server).
+# "replica" = file SQLite lokal yang disinkron ke MySQL di belakang (lihat replica.py).
+# Bisa diganti lewat env DB_BACKEND atau use_backend() sebelum query pertama.
+DB_BACKEND = os.environ.get("DB_BACKEND", "mysql")
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SQL_DUMP = os.path.join(_HERE, "db_2310010238.sql")
+SQLITE_PATH = os.environ.get("DB_SQLITE_PATH", os.path.join(_HERE, "db_2310010238.sqlite3"))
+REPLICA_PATH = os.environ.get("DB_REPLICA_PATH", os.path.join(_HERE, "db_2310010238.replica.sqlite3"))
+
+DB_CONFIG = dict(
+    host='localhost',
+    user='root',
+    password='',
+    database='db_2310010238',
+    connection_timeout=5,   # <<— penting: biar nggak nge-freeze lama
+    autocommit=True,
+)
+POOL_SIZE = 8            # maks 32 (batas MySQLConnectionPool)
+STMT_CACHE_SIZE = 64     # prepared statement per koneksi (server: max_prepared_stmt_count)
+
+# Kolom FULLTEXT index per tabel (harus sama dengan db_2310010238.sql; di SQLite jadi tabel FTS5)
+SEARCH_INDEX = {
+    "material": ("nama_material", "satuan"),
+    "pemasok": ("nama_pemasok", "alamat", "telepon", "email"),
+    "pelanggan": ("nama_pelanggan", "alamat", "telepon", "email"),
+    "purchase_order": ("no_po",),
+}
+# Kolom ber-index B-tree untuk kata kunci yang terlalu pendek buat FULLTEXT
+PREFIX_COLUMN = {
+    "material": "nama_material",
+    "pemasok": "nama_pemasok",
+    "pelanggan": "nama_pelanggan",
+    "purchase_order": "no_po",
+}
+FT_MIN_TOKEN = 3         # = innodb_ft_min_token_size di server
+# Kolom bukan teks yang dicocokkan dengan kata kunci utuh (OR dengan pencarian di atas):
+# 'date' = '2024' / '2024-01' / '2024-01-15' jadi rentang tanggal, tuple = nilai enum (awalan)
+SEARCH_EXTRA = {
+    "purchase_order": (("tanggal_po", "date"),
+                       ("status_po", ("Draft", "Disetujui", "Dikirim", "Selesai"))),
+}
+
+# Cache hasil SELECT (ResultCache): batas memori & umur entri; DB_CACHE_MB=0 mematikan
+RESULT_CACHE_MB = float(os.environ.get("DB_CACHE_MB", "32"))
+RESULT_CACHE_TTL = float(os.environ.get("DB_CACHE_TTL", "30"))   # detik; tulis dari proses lain
+
+# Tabel aplikasi yang metadatanya di-cache SchemaCatalog (registry.py; induk dulu baru anak)
+TABLES = tuple(REGISTRY)
+DDL_CHECK_INTERVAL = 60  # detik; paling sering segini cek apakah skema berubah
+
+_TOKEN_RE = re.compile(r"\w+")
+_DATE_KEY_RE = re.compile(r"(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?")
+
+CENT = Decimal("0.01")   # decimal(15,2) untuk harga/subtotal/total
+
+
+def line_subtotal(jumlah, harga_satuan):
+    """subtotal detail_po = jumlah * harga_satuan, dibulatkan ke sen."""
+    return (Decimal(int(jumlah or 0)) * Decimal(str(harga_satuan or 0))).quantize(CENT)
+
+
+# ========== kolom turunan & ringkasan (dijaga trigger di DB, lihat dump) ==========
+DERIVED_COLUMNS = {"purchase_order": ("total",), "detail_po": ("subtotal",)}
+# tabel anak -> (tabel induk, kolom FK): tulis ke anak ikut mengubah total induknya lewat trigger
+ROLLUPS = {"detail_po": ("purchase_order", "id_po")}
+ROLLUP_EVENT_LIMIT = 100   # induk yang berubah lebih dari ini dikabarkan sebagai satu event bulk
+# tabel ringkasan -> kolom kunci (sama dengan PK tabel yang diringkas; 0 = baris tanpa kunci)
+SUMMARY_TABLES = {"ringkasan_pemasok": "id_pemasok", "ringkasan_pelanggan": "id_pelanggan",
+                  "ringkasan_material": "id_material"}
+
+_SUBTOTAL_SQL = "ROUND(COALESCE(`jumlah`, 0) * COALESCE(`harga_satuan`, 0), 2)"
+_TOTAL_SQL = ("(SELECT ROUND(COALESCE(SUM(d.`subtotal`), 0), 2) FROM `detail_po` d "
+              "WHERE d.`id_po` = `purchase_order`.`id_po`)")
+# Hitung semuanya dari data sumber (data lama sebelum trigger ada). Portabel MySQL & SQLite;
+# trigger ikut jalan saat subtotal/total dibetulkan, jadi ringkasan diisi ulang paling akhir.
+REBUILD_SQL = (
+    f"UPDATE `detail_po` SET `subtotal` = {_SUBTOTAL_SQL} "
+    f"WHERE `subtotal` IS NULL OR `subtotal` <> {_SUBTOTAL_SQL}",
+    f"UPDATE `purchase_order` SET `total` = {_TOTAL_SQL} "
+    f"WHERE `total` IS NULL OR `total` <> {_TOTAL_SQL}",
+    "DELETE FROM `ringkasan_pemasok`",
+    "INSERT INTO `ringkasan_pemasok` (`id_pemasok`, `jumlah_po`, `total`) "
+    "SELECT COALESCE(`id_pemasok`, 0), COUNT(*), ROUND(COALESCE(SUM(`total`), 0), 2) "
+    "FROM `purchase_order` GROUP BY COALESCE(`id_pemasok`, 0)",
+    "DELETE FROM `ringkasan_pelanggan`",
+    "INSERT INTO `ringkasan_pelanggan` (`id_pelanggan`, `jumlah_po`, `total`) "
+    "SELECT COALESCE(`id_pelanggan`, 0), COUNT(*), ROUND(COALESCE(SUM(`total`), 0), 2) "
+    "FROM `purchase_order` GROUP BY COALESCE(`id_pelanggan`, 0)",
+    "DELETE FROM `ringkasan_material`",
+    "INSERT INTO `ringkasan_material` (`id_material`, `jumlah_baris`, `jumlah`, `subtotal`) "
+    "SELECT COALESCE(`id_material`, 0), COUNT(*), COALESCE(SUM(`jumlah`), 0), "
+    "ROUND(COALESCE(SUM(`subtotal`), 0), 2) FROM `detail_po` GROUP BY COALESCE(`id_material`, 0)",
+)
+
+
+def derived_values(table, data):
+    """
+    data tulis dengan kolom turunan disesuaikan: total PO dibuang (dijumlah trigger dari
+    detail_po); subtotal dihitung di sini kalau jumlah & harga_satuan ikut ditulis (trigger
+    SQLite tidak perlu menulis ulang barisnya), selain itu dibuang.
+    """
+    if table == "detail_po" and "jumlah" in data and "harga_satuan" in data:
+        return dict(data, subtotal=line_subtotal(data["jumlah"], data["harga_satuan"]))
+    derived = DERIVED_COLUMNS.get(table, ())
+    if any(c in data for c in derived):
+        return {k: v for k, v in data.items() if k not in derived}
+    return data
+
+
+# ========== SQL per (tabel, kolom) ==========
+# Dibuat sekali lalu di-cache: objek string yang sama juga syarat cursor prepared
+# memakai ulang statement-nya (connector membandingkan dengan `is`).
+@lru_cache(maxsize=512)
+def insert_sql(table, cols):
+    return (f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in cols)}) "
+            f"VALUES ({', '.join(['%s'] * len(cols))})")
+
+
+@lru_cache(maxsize=512)
+def update_sql(table, pk_name, cols):
+    return f"UPDATE `{table}` SET {', '.join(f'`{c}`=%s' for c in cols)} WHERE `{pk_name}`=%s"
+
+
+@lru_cache(maxsize=64)
+def delete_sql(table, pk_name):
+    return f"DELETE FROM `{table}` WHERE `{pk_name}`=%s"
+
+
+@lru_cache(maxsize=64)
+def select_by_id_sql(table, pk_name):
+    return f"SELECT * FROM `{table}` WHERE `{pk_name}`=%s"
+
+
+def search_tokens(keyword):
+    """Pecah kata kunci jadi token (huruf kecil), sama seperti parser FULLTEXT."""
+    return [t.lower() for t in _TOKEN_RE.findall(keyword or "")]
+
+
+def search_conditions(table, keyword):
+    """
+    Syarat pencarian ber-index sebagai list (jenis, token):
+    'ft'     = ada kata di kolom FULLTEXT yang diawali token,
+    'anchor' = nilai PREFIX_COLUMN diawali token,
+    'word'   = ada kata (sesudah spasi) di PREFIX_COLUMN yang diawali token.
+    """
+    tokens = search_tokens(keyword)
+    long_tokens = [t for t in tokens if len(t) >= FT_MIN_TOKEN]
+    conds = [("ft", t) for t in long_tokens]
+    for i, t in enumerate(t for t in tokens if len(t) < FT_MIN_TOKEN):
+        conds.append(("anchor" if i == 0 and not long_tokens else "word", t))
+    return conds
+
+
+def _date_range(keyword):
+    """'2024' / '2024-01' / '2024-01-15' -> (awal, akhir) tanggal setengah terbuka; None kalau bukan."""
+    m = _DATE_KEY_RE.fullmatch(keyword)
+    if m is None:
+        return None
+    y, mo, d = (int(g) if g else None for g in m.groups())
+    try:
+        if mo is None:
+            return datetime.date(y, 1, 1), datetime.date(y + 1, 1, 1)
+        if d is None:
+            lo = datetime.date(y, mo, 1)
+            return lo, (datetime.date(y + 1, 1, 1) if mo == 12 else datetime.date(y, mo + 1, 1))
+        lo = datetime.date(y, mo, d)
+        return lo, lo + datetime.timedelta(days=1)
+    except ValueError:   # bulan/tanggal tidak ada, mis. 2024-13
+        return None
+
+
+def extra_conditions(table, keyword):
+    """
+    Syarat SEARCH_EXTRA untuk kata kunci utuh, list (jenis, kolom, nilai):
+    'date' = kolom di rentang (awal, akhir), 'enum' = kolom salah satu nilai (tuple).
+    Satu saja yang cocok sudah cukup (digabung OR dengan syarat FULLTEXT).
+    """
+    keyword = (keyword or "").strip()
+    out = []
+    for col, kind in SEARCH_EXTRA.get(table, ()):
+        if kind == "date":
+            rng = _date_range(keyword)
+            if rng is not None:
+                out.append(("date", col, rng))
+        elif keyword:
+            values = tuple(v for v in kind if v.lower().startswith(keyword.lower()))
+            if values:
+                out.append(("enum", col, values))
+    return out
+
+
+def _extra_sql(extras):
+    """extra_conditions jadi SQL (rentang tanggal / enum IN) -> (list kondisi, params)."""
+    conds, params = [], []
+    for kind, col, value in extras:
+        if kind == "date":
+            conds.append(f"(`{col}` >= %s AND `{col}` < %s)")
+            params += [value[0].isoformat(), value[1].isoformat()]
+        else:
+            conds.append(f"`{col}` IN ({', '.join(['%s'] * len(value))})")
+            params += value
+    return conds, params
+
+
+# syarat jenis X otomatis memenuhi syarat jenis mana saja (token sama/lebih panjang)
+_IMPLIES = {"ft": ("ft",), "anchor": ("anchor", "word"), "word": ("word",)}
+
+
+def _extra_within(new, old):
+    """Syarat SEARCH_EXTRA `new` pasti bagian dari `old` (kolom sama, rentang/nilai lebih sempit)."""
+    kind, col, value = new
+    for k, c, v in old:
+        if k != kind or c != col:
+            continue
+        if kind == "date" and v[0] <= value[0] and value[1] <= v[1]:
+            return True
+        if kind == "enum" and set(value) <= set(v):
+            return True
+    return False
+
+
+def narrows(table, old_keyword, new_keyword):
+    """True kalau hasil new_keyword pasti bagian dari hasil old_keyword (boleh difilter di klien)."""
+    if table not in SEARCH_INDEX:
+        return False
+    old = search_conditions(table, old_keyword)
+    new = search_conditions(table, new_keyword)
+    old_extra = extra_conditions(table, old_keyword)
+    return (bool(old)
+            and all(any(t2.startswith(t) and k in _IMPLIES[k2] for k2, t2 in new) for k, t in old)
+            and all(_extra_within(e, old_extra) for e in extra_conditions(table, new_keyword)))
+
+
+def _extra_matches(row, extras):
+    for kind, col, value in extras:
+        v = row.get(col)
+        if v is None:
+            continue
+        if kind == "date":
+            if value[0].isoformat() <= str(v)[:10] < value[1].isoformat():
+                return True
+        elif v in value:
+            return True
+    return False
+
+
+def row_matches(table, row, conds, extras=()):
+    """
+    Versi Python dari WHERE _fulltext_query, untuk menyaring baris yang sudah di klien;
+    extras = extra_conditions (cukup salah satu cocok).
+    """
+    if extras and _extra_matches(row, extras):
+        return True
+    ft_words = None
+    prefix = str(row.get(PREFIX_COLUMN[table]) or "").lower()
+    for kind, t in conds:
+        if kind == "ft":
+            if ft_words is None:
+                ft_words = search_tokens(" ".join(str(row.get(c) or "") for c in SEARCH_INDEX[table]))
+            ok = any(w.startswith(t) for w in ft_words)
+        elif kind == "anchor":
+            ok = prefix.startswith(t)
+        else:
+            ok = prefix.startswith(t) or f" {t}" in prefix
+        if not ok:
+            return False
+    return True
+
+
+# ========== filter per kolom & urutan (dijadikan WHERE / ORDER BY) ==========
+def filter_conditions(info, filters):
+    """
+    filters: {kolom: (min, max)} = rentang angka/tanggal (None = tidak dibatasi),
+             {kolom: [nilai, ...]} = salah satu nilai (enum).
+    -> (list kondisi SQL, params). Nama kolom dicek ke TableInfo (tidak ada SQL dari luar).
+    """
+    conds, params = [], []
+    for col, spec in (filters or {}).items():
+        if col not in info.types:
+            raise ValueError(f"Kolom `{col}` tidak ada di tabel `{info.name}`")
+        if isinstance(spec, tuple):
+            lo, hi = spec
+            if lo is not None:
+                conds.append(f"`{col}` >= %s")
+                params.append(lo)
+            if hi is not None:
+                conds.append(f"`{col}` <= %s")
+                params.append(hi)
+        elif spec:
+            conds.append(f"`{col}` IN ({', '.join(['%s'] * len(spec))})")
+            params += list(spec)
+        else:
+            conds.append("1 = 0")   # tidak ada nilai yang dipilih
+    return conds, params
+
+
+def filter_matches(filters, row):
+    """Versi Python dari filter_conditions, untuk baris baru yang datang lewat ChangeBus."""
+    for col, spec in (filters or {}).items():
+        v = row.get(col)
+        if isinstance(spec, tuple):
+            lo, hi = spec
+            if v is None and (lo is not None or hi is not None):
+                return False
+            if (lo is not None and v < lo) or (hi is not None and v > hi):
+                return False
+        elif v not in (spec or ()):
+            return False
+    return True
+
+
+def keyset_condition(col, pk_name, desc, last_value, last_pk):
+    """
+    Kondisi "sesudah baris (last_value, last_pk)" untuk ORDER BY col, pk (ASC/DESC sama).
+    NULL dianggap paling kecil seperti di MySQL & SQLite (di depan kalau ASC, di belakang kalau DESC).
+    """
+    cmp = "<" if desc else ">"
+    if last_value is None:
+        if desc:
+            return f"(`{col}` IS NULL AND `{pk_name}` < %s)", (last_pk,)
+        return f"((`{col}` IS NULL AND `{pk_name}` > %s) OR `{col}` IS NOT NULL)", (last_pk,)
+    cond = f"`{col}` {cmp} %s OR (`{col}` = %s AND `{pk_name}` {cmp} %s)"
+    if desc:
+        cond += f" OR `{col}` IS NULL"
+    return f"({cond})", (last_value, last_value, last_pk)
+
+
+# ========== SQL halaman/pencarian (tanpa eksekusi: dipakai crud dan api.py) ==========
+def like_where(cols_info, keyword):
+    """WHERE LIKE '%kw%' di kolom teks (format SHOW COLUMNS) untuk tabel tanpa FULLTEXT."""
+    text_cols = [c['Field'] for c in cols_info
+                 if any(t in c['Type'] for t in ('char','text','date','time'))]
+    if not text_cols:
+        return None, ()
+    where = " OR ".join([f"`{c}` LIKE %s" for c in text_cols])
+    params = tuple([f"%{keyword}%" for _ in text_cols])
+    return where, params
+
+
+def fulltext_where(table, pk_name, keyword, fulltext):
+    """
+    WHERE + ORDER BY untuk pencarian ber-index:
+    token >= FT_MIN_TOKEN -> index teks backend (MATCH ... AGAINST / FTS5), prefix & diranking,
+    token pendek -> LIKE 'tok%' di PREFIX_COLUMN (range scan index, bukan '%kw%'),
+    OR kolom SEARCH_EXTRA (tanggal / status PO).
+    fulltext = dialek backend (Backend.fulltext). Return None kalau tabel tidak punya FULLTEXT index.
+    """
+    cols = SEARCH_INDEX.get(table)
+    search = search_conditions(table, keyword) if cols else []
+    if not search:
+        return None
+    long_tokens = [t for kind, t in search if kind == "ft"]
+    conds, params = [], []
+    order, order_params = "", ()
+    if long_tokens:
+        match, match_params, order, order_params = fulltext(table, pk_name, cols, long_tokens)
+        conds.append(match)
+        params += match_params
+    prefix = PREFIX_COLUMN[table]
+    for kind, t in search:
+        t = t.replace("!", "!!").replace("_", "!_")   # ESCAPE '!' jalan di MySQL & SQLite
+        if kind == "anchor":
+            conds.append(f"`{prefix}` LIKE %s ESCAPE '!'")          # awal nilai: pakai index
+            params.append(f"{t}%")
+        elif kind == "word":
+            conds.append(f"(`{prefix}` LIKE %s ESCAPE '!' OR `{prefix}` LIKE %s ESCAPE '!')")  # awal kata
+            params += [f"{t}%", f"% {t}%"]
+    where = " AND ".join(conds)
+    extra, extra_params = _extra_sql(extra_conditions(table, keyword))
+    if extra:
+        where = " OR ".join([f"({where})"] + extra)
+        params += extra_params
+    return where, tuple(params), order, order_params
+
+
+def page_sql(info, pk_name, cursor=None, limit=200, keyword="", filters=None, order=None,
+             fulltext=None):
+    """
+    SQL satu halaman dengan kata kunci, filter per kolom, dan urutan
+    -> (sql, params, next_cursor) dengan next_cursor(rows) = cursor halaman berikutnya / None.
+    order = (kolom, desc) atau None (urut PK / skor pencarian).
+    Urut kolom: keyset di (kolom, PK) -> cursor = (nilai, pk) baris terakhir;
+    tanpa order dengan FULLTEXT, atau urut kolom enum: cursor = offset.
+    """
+    table = info.name
+    conds, params = filter_conditions(info, filters)
+    rank, rank_params = "", ()
+    if keyword:
+        ft = fulltext_where(table, pk_name, keyword, fulltext)
+        if ft is not None:
+            where, where_params, rank, rank_params = ft
+        else:
+            where, where_params = like_where(info.show_columns(), keyword)
+        if where:
+            conds.insert(0, f"({where})")
+            params[:0] = where_params
+
+    col, desc = order if order is not None else (pk_name, False)
+    if col not in info.types:
+        raise ValueError(f"Kolom `{col}` tidak ada di tabel `{table}`")
+    direction = " DESC" if desc else ""
+    # hasil FULLTEXT diurut skor; enum diurut MySQL menurut posisi nilainya, bukan teks,
+    # jadi kondisi keyset (perbandingan teks) tidak cocok -> dua-duanya pakai offset
+    by_offset = (order is None and bool(rank)) or info.data_types.get(col) == "enum"
+    if cursor is not None and (
+            (type(cursor) is not int or cursor < 0) if by_offset
+            else col != pk_name and not (isinstance(cursor, tuple) and len(cursor) == 2)):
+        raise ValueError("cursor tidak valid")   # cursor dari urutan/pencarian lain
+    if order is None and rank:
+        order_sql, order_params = f"{rank}, `{pk_name}`", rank_params
+    elif by_offset:
+        order_sql, order_params = f"`{col}`{direction}, `{pk_name}`{direction}", ()
+    elif col == pk_name:
+        order_sql, order_params = f"`{pk_name}`{direction}", ()
+        if cursor is not None:
+            conds.append(f"`{pk_name}` {'<' if desc else '>'} %s")
+            params.append(cursor)
+    else:
+        order_sql, order_params = f"`{col}`{direction}, `{pk_name}`{direction}", ()
+        if cursor is not None:
+            cond, cond_params = keyset_condition(col, pk_name, desc, *cursor)
+            conds.append(cond)
+            params += cond_params
+
+    sql = f"SELECT * FROM `{table}`"
+    if conds:
+        sql += " WHERE " + " AND ".join(conds)
+    sql += f" ORDER BY {order_sql} LIMIT %s"
+    params = tuple(params) + tuple(order_params) + (limit,)
+    if by_offset:
+        sql += " OFFSET %s"
+        params += (cursor or 0,)
+
+    def next_cursor(rows):
+        if len(rows) < limit:
+            return None
+        if by_offset:
+            return (cursor or 0) + len(rows)
+        last = rows[-1]
+        return last[pk_name] if col == pk_name else (last[col], last[pk_name])
+    return sql, params, next_cursor
+
+
+class TableInfo:
+    """Metadata satu tabel dari information_schema."""
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = []      # urut sesuai tabel
+        self.types = {}        # kolom -> COLUMN_TYPE, mis. 'decimal(15,2)'
+        self.data_types = {}   # kolom -> DATA_TYPE, mis. 'decimal'
+        self.nullable = {}
+        self.keys = {}         # kolom -> COLUMN_KEY ('PRI', 'UNI', 'MUL', '')
+        self.defaults = {}
+        self.extra = {}
+        self.enums = {}        # kolom enum -> list nilai
+        self.fks = {}          # kolom -> (tabel_ref, kolom_ref)
+        self.pk = None
+
+    def show_columns(self):
+        """Format sama dengan hasil SHOW COLUMNS."""
+        return [{"Field": c, "Type": self.types[c], "Null": "YES" if self.nullable[c] else "NO",
+                 "Key": self.keys[c], "Default": self.defaults[c], "Extra": self.extra[c]}
+                for c in self.columns]
+
+
+_ENUM_RE = re.compile(r"'((?:[^']|'')*)'")
+
+
+def table_infos(names, cols, fks):
+    """{nama: TableInfo} dari baris information_schema COLUMNS & FK (Backend.load_schema)."""
+    tables = {n: TableInfo(n) for n in names}
+    for r in cols:
+        t = tables[r["TABLE_NAME"]]
+        c = r["COLUMN_NAME"]
+        t.columns.append(c)
+        t.types[c] = r["COLUMN_TYPE"]
+        t.data_types[c] = r["DATA_TYPE"]
+        t.nullable[c] = r["IS_NULLABLE"] == "YES"
+        t.keys[c] = r["COLUMN_KEY"]
+        t.defaults[c] = r["COLUMN_DEFAULT"]
+        t.extra[c] = r["EXTRA"]
+        if r["DATA_TYPE"] == "enum":
+            t.enums[c] = [v.replace("''", "'") for v in _ENUM_RE.findall(r["COLUMN_TYPE"])]
+        if r["COLUMN_KEY"] == "PRI" and t.pk is None:
+            t.pk = c
+    for r in fks:
+        tables[r["TABLE_NAME"]].fks[r["COLUMN_NAME"]] = (
+            r["REFERENCED_TABLE_NAME"], r["REFERENCED_COLUMN_NAME"])
+    return tables
+
+
+def check_columns(info, data):
+    """Tolak kolom yang tidak ada & nilai enum yang tidak valid (ValueError)."""
+    for k, v in data.items():
+        if k not in info.types:
+            raise ValueError(f"Kolom `{k}` tidak ada di tabel `{info.name}`")
+        if v is not None and k in info.enums and v not in info.enums[k]:
+            raise ValueError(f"Nilai '{v}' tidak valid untuk `{k}` ({', '.join(info.enums[k])})")
+
+
+class SchemaCatalog:
+    """
+    Cache metadata (kolom, tipe, PK, FK, nilai enum) untuk TABLES, diambil sekali
+    dari backend (information_schema / PRAGMA). Dimuat ulang kalau refresh() dipanggil
+    atau kalau cap skema dari backend berubah (dicek tiap DDL_CHECK_INTERVAL).
+    """
+
+    def __init__(self, tables=TABLES):
+        self._names = tuple(tables)
+        self._lock = threading.Lock()
+        self._tables = None
+        self._stamp = None
+        self._checked = 0.0
+
+    def refresh(self):
+        with self._lock:
+            self._tables = None
+
+    def table(self, db, name):
+        """TableInfo untuk tabel `name`, atau None kalau bukan tabel aplikasi."""
+        with self._lock:
+            now = time.monotonic()
+            if self._tables is not None and now - self._checked > DDL_CHECK_INTERVAL:
+                self._checked = now
+                if self._read_stamp(db) != self._stamp:
+                    self._tables = None   # ada ALTER/CREATE -> muat ulang
+            if self._tables is None:
+                self._load(db)
+                self._checked = now
+            return self._tables.get(name)
+
+    def _read_stamp(self, db):
+        return db.backend().schema_stamp(db, self._names)
+
+    def _load(self, db):
+        cols, fks = db.backend().load_schema(db, self._names)
+        self._tables = table_infos(self._names, cols, fks)
+        self._stamp = self._read_stamp(db)
+
+
+_catalog = SchemaCatalog()
+
+
+# ---- hook sesudah tulis (insert/update/delete) ----
+_write_hooks = []
+
+
+def add_write_hook(fn):
+    """fn(table, op, pk_name, pk, data) dipanggil (di thread pemanggil) sesudah tulis sukses."""
+    _write_hooks.append(fn)
+
+
+def _notify_write(table, op, pk_name, pk, data):
+    for fn in list(_write_hooks):
+        try:
+            fn(table, op, pk_name, pk, data)
+        except Exception as e:
+            print(f"[WARN] write hook: {e}")
+
+
+# ---- cache (pilihan combo, laporan) yang ikut dibuang crud.invalidate_cache ----
+_invalidate_hooks = []
+
+
+def add_invalidate_hook(fn):
+    """fn(table) dipanggil oleh crud.invalidate_cache (table None = semua), mis. tulis dari proses lain."""
+    _invalidate_hooks.append(fn)
+
+
+def _label_key(label):
+    return "" if label is None else str(label).lower()
+
+
+class OptionList:
+    """Pilihan FK (id, label) urut label. Tidak pernah diubah: patch = objek baru."""
+    __slots__ = ("ids", "labels", "_pos", "_lower")
+
+    def __init__(self, ids, labels):
+        self.ids = ids
+        self.labels = labels
+        self._pos = None
+        self._lower = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index_of(self, id_value):
+        if self._pos is None:
+            self._pos = {v: i for i, v in enumerate(self.ids)}
+        return self._pos.get(id_value, -1)
+
+    def lower_labels(self):
+        if self._lower is None:
+            self._lower = [_label_key(l) for l in self.labels]
+        return self._lower
+
+    def rows(self):
+        return [{"id": i, "label": l} for i, l in zip(self.ids, self.labels)]
+
+    def without(self, id_value):
+        i = self.index_of(id_value)
+        if i < 0:
+            return self
+        return OptionList(self.ids[:i] + self.ids[i + 1:], self.labels[:i] + self.labels[i + 1:])
+
+    def with_row(self, id_value, label):
+        base = self.without(id_value)
+        i = bisect.bisect_right(base.lower_labels(), _label_key(label))
+        return OptionList(base.ids[:i] + [id_value] + base.ids[i:],
+                          base.labels[:i] + [label] + base.labels[i:])
+
+
+class LookupCache:
+    """
+    Cache daftar pilihan FK bersama satu proses, key (tabel, id_col, label_col).
+    Dipatch langsung dari hook tulis crud; kalau datanya kurang, entry dibuang.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._gen = {}   # tabel -> jumlah tulis; hasil query yang keduluan tulis tidak disimpan
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def generation(self, table):
+        with self._lock:
+            return self._gen.get(table, 0)
+
+    def put(self, key, options, gen):
+        with self._lock:
+            if self._gen.get(key[0], 0) == gen:
+                self._entries[key] = options
+
+    def invalidate(self, table=None):
+        with self._lock:
+            for key in [k for k in self._entries if table is None or k[0] == table]:
+                del self._entries[key]
+
+    def on_write(self, table, op, pk_name, pk, data):
+        data = data or {}
+        with self._lock:
+            self._gen[table] = self._gen.get(table, 0) + 1
+            for key, opts in list(self._entries.items()):
+                t, id_col, label_col = key
+                if t != table:
+                    continue
+                if id_col != pk_name or pk is None:
+                    del self._entries[key]
+                elif op == "delete":
+                    self._entries[key] = opts.without(pk)
+                elif data.get(label_col) is not None:
+                    self._entries[key] = opts.with_row(pk, data[label_col])
+                elif op == "insert" or label_col in data:
+                    del self._entries[key]
+                # update tanpa kolom label: pilihan tidak berubah
+
+
+_lookups = LookupCache()
+add_write_hook(_lookups.on_write)
+add_invalidate_hook(_lookups.invalidate)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """SQL dengan spasi/baris baru diseragamkan (bagian key ResultCache)."""
+    return " ".join(sql.split())
+
+
+@lru_cache(maxsize=1024)
+def tables_in(sql):
+    """Tabel aplikasi (TABLES) yang disebut di `sql`; () = query tidak di-cache (mis. change_log)."""
+    return tuple(t for t in TABLES if f"`{t}`" in sql)
+
+
+def _rows_size(rows):
+    """Perkiraan byte list dict hasil fetch (dari contoh baris pertama)."""
+    if not rows:
+        return sys.getsizeof(rows)
+    sample = rows[:32]
+    per_row = sum(sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values())
+                  for r in sample) / len(sample)
+    return int(per_row * len(rows)) + sys.getsizeof(rows)
+
+
+class ResultCache:
+    """
+    Cache hasil SELECT bersama satu proses, key (SQL dinormalisasi, params): LRU dengan
+    batas byte dan TTL. Hook tulis crud membuang semua entri yang menyebut tabel yang ditulis;
+    generasi per tabel mencegah hasil query yang mulai sebelum tulis ikut tersimpan sesudahnya.
+    """
+
+    def __init__(self, max_mb=RESULT_CACHE_MB, ttl=RESULT_CACHE_TTL):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (rows, tables, nbytes, kedaluwarsa)
+        self._by_table = {}             # tabel -> set key
+        self._gen = {}
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self.evictions = self.expired = self.invalidations = self.skipped = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def generation(self, tables):
+        with self._lock:
+            return tuple(self._gen.get(t, 0) for t in tables)
+
+    def _drop(self, key):
+        rows, tables, nbytes, _ = self._entries.pop(key)
+        self.bytes -= nbytes
+        for t in tables:
+            keys = self._by_table.get(t)
+            if keys is not None:
+                keys.discard(key)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] < time.monotonic():
+                self._drop(key)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, rows, tables, gen):
+        nbytes = _rows_size(rows)
+        with self._lock:
+            if tuple(self._gen.get(t, 0) for t in tables) != gen:
+                return   # tabelnya ditulis selama query jalan: hasil ini mungkin sudah basi
+            if nbytes > self.max_bytes // 4:
+                self.skipped += 1   # satu hasil besar (mis. fetch_all 100rb baris) tidak mengusir semua
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (rows, tables, nbytes, time.monotonic() + self.ttl)
+            self.bytes += nbytes
+            for t in tables:
+                self._by_table.setdefault(t, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, table=None):
+        with self._lock:
+            tables = list(self._by_table) if table is None else [table]
+            for t in tables:
+                self._gen[t] = self._gen.get(t, 0) + 1
+                for key in list(self._by_table.get(t, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def on_write(self, table, op, pk_name, pk, data):
+        self.invalidate(table)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "ttl": self.ttl, "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "expired": self.expired,
+                    "invalidations": self.invalidations, "skipped": self.skipped}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+            self.evictions = self.expired = self.invalidations = self.skipped = 0
+
+
+_results = ResultCache()
+add_write_hook(_results.on_write)
+add_invalidate_hook(_results.invalidate)
+
+
+def configure_result_cache(max_mb=None, ttl=None):
+    """Ubah batas memori / TTL ResultCache (0 = mati); isi cache lama dibuang."""
+    if max_mb is not None:
+        _results.max_bytes = int(max_mb * 1024 * 1024)
+    if ttl is not None:
+        _results.ttl = ttl
+    _results.invalidate()
+
+
+def _statements(cnx):
+    """Cache cursor prepared (SQL -> cursor) milik satu koneksi fisik, urut LRU."""
+    cnx = getattr(cnx, "_cnx", cnx)   # PooledMySQLConnection -> koneksi aslinya
+    cache = getattr(cnx, "_stmt_cache", None)
+    if cache is None:
+        cache = cnx._stmt_cache = OrderedDict()
+    return cache
+
+
+def _close_quietly(cur):
+    try:
+        cur.close()
+    except Exception:
+        pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _make_backend(kind):
+    # modul backend diimpor saat dipilih: mode SQLite tidak butuh mysql-connector terpasang
+    if kind == "mysql":
+        import backend_mysql
+        return backend_mysql.Backend(DB_CONFIG, POOL_SIZE)
+    if kind == "sqlite":
+        import backend_sqlite
+        backend = backend_sqlite.Backend(SQLITE_PATH, SQL_DUMP, POOL_SIZE)
+    elif kind == "replica":
+        import replica
+        backend = replica.Backend(REPLICA_PATH, SQL_DUMP, POOL_SIZE, DB_CONFIG)
+    else:
+        raise ValueError(f"Backend DB tidak dikenal: {kind!r} (mysql / sqlite / replica)")
+    if any(t in SUMMARY_TABLES for t in backend.created_tables):
+        crud(backend).rebuild_rollups()   # file lama: tabel ringkasan baru diisi dari data yang ada
+    return backend
+
+
+def get_backend():
+    """Satu backend (pool koneksi + dialek SQL) bersama untuk semua form/thread di proses ini."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _make_backend(DB_BACKEND)
+    return _backend
+
+
+def use_backend(kind, sqlite_path=None):
+    """Ganti backend (mis. untuk benchmark MySQL vs SQLite); cache skema & pilihan FK dikosongkan."""
+    global _backend, DB_BACKEND, SQLITE_PATH
+    with _backend_lock:
+        DB_BACKEND = kind
+        if sqlite_path:
+            SQLITE_PATH = sqlite_path
+        _backend = _make_backend(kind)
+    _catalog.refresh()
+    _lookups.invalidate()
+    _results.invalidate()
+    return _backend
+
+
+class UnitOfWork:
+    """
+    Beberapa tulis dalam satu transaksi (dibuat lewat crud.unit_of_work()).
+    Baris banyak dikirim sekaligus lewat executemany; hook tulis baru dipanggil
+    sesudah commit, jadi cache tidak pernah melihat data yang di-rollback.
+    """
+
+    def __init__(self, db, cur):
+        self._db = db
+        self._cur = cur
+        self.events = []   # (table, op, pk_name, pk, data) untuk _notify_write
+
+    def _parents(self, table, where, params):
+        """Nilai FK induk baris yang akan ditulis (sebelum tulis); None kalau tabelnya tanpa rollup."""
+        if table not in ROLLUPS:
+            return None
+        fk = ROLLUPS[table][1]
+        self._cur.execute(f"SELECT DISTINCT `{fk}` FROM `{table}` WHERE {where}", params)
+        return {r[0] for r in self._cur.fetchall()}
+
+    def _rolled_up(self, table, keys):
+        """Event untuk induk yang totalnya diubah trigger (keys None/terlalu banyak: satu bulk)."""
+        parent = ROLLUPS[table][0]
+        keys = None if keys is None else keys - {None}
+        if keys is None or len(keys) > ROLLUP_EVENT_LIMIT:
+            self.events.append((parent, "bulk", None, None, None))
+            return
+        pk_name = self._db._pk_of(parent)
+        known = {e[3] for e in self.events if e[0] == parent and e[1] in ("insert", "update")}
+        self.events += [(parent, "update", pk_name, k, None) for k in sorted(keys) if k not in known]
+
+    def insert(self, table, data: dict):
+        self._db._check_columns(table, data)
+        data = derived_values(table, data)
+        cols = tuple(k for k, v in data.items() if v is not None)
+        self._cur.execute(insert_sql(table, cols), tuple(data[c] for c in cols))
+        pk_name = self._db._pk_of(table)
+        new_id = data.get(pk_name) if pk_name and data.get(pk_name) is not None else self._cur.lastrowid
+        self.events.append((table, "insert", pk_name, new_id, data))
+        if table in ROLLUPS:
+            self._rolled_up(table, {data.get(ROLLUPS[table][1])})
+        return new_id
+
+    def update(self, table, pk_name, id_value, data: dict):
+        self._db._check_columns(table, data)
+        data = derived_values(table, data)
+        cols = tuple(k for k in data if k != pk_name)
+        if not cols:
+            return False
+        parents = self._parents(table, f"`{pk_name}`=%s", (id_value,))
+        self._cur.execute(update_sql(table, pk_name, cols), tuple(data[c] for c in cols) + (id_value,))
+        changed = self._cur.rowcount > 0
+        self.events.append((table, "update", pk_name, id_value, data))
+        if parents is not None:
+            self._rolled_up(table, parents | {data.get(ROLLUPS[table][1])})
+        return changed
+
+    def delete(self, table, pk_name, id_value):
+        parents = self._parents(table, f"`{pk_name}`=%s", (id_value,))
+        self._cur.execute(delete_sql(table, pk_name), (id_value,))
+        deleted = self._cur.rowcount > 0
+        if deleted:
+            self.events.append((table, "delete", pk_name, id_value, None))
+            if parents is not None:
+                self._rolled_up(table, parents)
+        return deleted
+
+    def insert_many(self, table, rows, cols):
+        """INSERT banyak baris (dict) sekaligus; connector menggabungnya jadi satu INSERT multi-VALUES."""
+        if not rows:
+            return 0
+        for r in rows:
+            self._db._check_columns(table, {c: r.get(c) for c in cols})
+        rows = [derived_values(table, {c: r.get(c) for c in cols}) for r in rows]
+        cols = tuple(rows[0])
+        self._cur.executemany(insert_sql(table, cols), [tuple(r[c] for c in cols) for r in rows])
+        self.events.append((table, "bulk", None, None, None))
+        if table in ROLLUPS:
+            self._rolled_up(table, {r.get(ROLLUPS[table][1]) for r in rows})
+        return len(rows)
+
+    def upsert_many(self, table, pk_name, rows, cols):
+        """Ubah banyak baris yang sudah ada dalam satu statement (upsert sesuai dialek backend)."""
+        if not rows:
+            return 0
+        cols = [pk_name] + [c for c in cols if c != pk_name]
+        for r in rows:
+            self._db._check_columns(table, {c: r.get(c) for c in cols})
+        rows = [derived_values(table, {c: r.get(c) for c in cols}) for r in rows]
+        cols = list(rows[0])
+        parents = None
+        if table in ROLLUPS and len(rows) <= ROLLUP_EVENT_LIMIT:
+            ids = [r[pk_name] for r in rows]
+            parents = self._parents(table, f"`{pk_name}` IN ({', '.join(['%s'] * len(ids))})",
+                                    tuple(ids))
+            parents |= {r.get(ROLLUPS[table][1]) for r in rows}
+        self._cur.executemany(self._db.backend().upsert_sql(table, pk_name, cols),
+                              [tuple(r[c] for c in cols) for r in rows])
+        self.events.append((table, "bulk", None, None, None))
+        if table in ROLLUPS:
+            self._rolled_up(table, parents)
+        return len(rows)
+
+    def delete_where(self, table, column, value, pk_name=None, ids=None):
+        """DELETE baris dengan `column`=value (opsional dibatasi pk IN ids)."""
+        where, params = f"`{column}`=%s", [value]
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                return 0
+            where += f" AND `{pk_name}` IN ({', '.join(['%s'] * len(ids))})"
+            params += ids
+        parents = self._parents(table, where, tuple(params))
+        self._cur.execute(f"DELETE FROM `{table}` WHERE {where}", tuple(params))
+        deleted = self._cur.rowcount
+        if deleted:
+            self.events.append((table, "bulk", None, None, None))
+            if parents is not None:
+                self._rolled_up(table, parents)
+        return deleted
+
 
 class crud:
     # Sesuai arahan dosen: pakai _init_ (dan __init__ diarahkan ke sini)
-    def _init_(self):
+    # Objek crud sekarang ringan: koneksi dipinjam dari pool bersama per operasi.
+    # backend: None = backend bersama (get_backend); diisi kalau perlu DB lain (mis. sinkron replika).
+    def _init_(self, backend=None):
+        self._backend = backend
+        self._lock = threading.Lock()
+        self.connection_id = None   # koneksi yang sedang dipinjam (untuk KILL QUERY)
+        self._conn_ms = 0.0
+
+    __init__ = _init_
+
+    @staticmethod
+    def pool_stats():
+        return get_backend().stats()
+
+    @staticmethod
+    def cache_stats():
+        """Statistik ResultCache (hit/miss, byte, eviction, ...)."""
+        return _results.stats()
+
+    @staticmethod
+    def reset_cache_stats():
+        _results.reset_stats()
+
+    @staticmethod
+    def invalidate_cache(table=None):
+        """Buang cache untuk `table` (None = semua), mis. sesudah tulis di luar crud / proses lain."""
+        for fn in list(_invalidate_hooks):
+            try:
+                fn(table)
+            except Exception as e:
+                print(f"[WARN] invalidate hook: {e}")
+
+    @staticmethod
+    def refresh_schema():
+        """Buang cache metadata (panggil sesudah mengubah struktur tabel)."""
+        _catalog.refresh()
+
+    def backend(self):
+        return self._backend or get_backend()
+
+    def table_info(self, table):
+        if self._backend is None:
+            return _catalog.table(self, table)
+        # backend sendiri: metadatanya di-cache di objek backend itu, bukan di katalog bersama
+        catalog = getattr(self._backend, "catalog", None)
+        if catalog is None:
+            catalog = self._backend.catalog = SchemaCatalog()
+        return catalog.table(self, table)
+
+    def _pk_of(self, table):
+        info = self.table_info(table)
+        return info.pk if info is not None else None
+
+    @staticmethod
+    def cached_options(table, id_col, label_col):
+        """OptionList dari cache (tanpa query), atau None kalau belum ada."""
+        return _lookups.get((table, id_col, label_col))
+
+    def _check_columns(self, table, data):
+        """Tolak kolom yang tidak ada & nilai enum yang tidak valid (pakai cache skema)."""
+        info = self.table_info(table)
+        if info is not None:
+            check_columns(info, data)
+
+    @contextmanager
+    def _conn(self):
+        pool = self.backend()
+        t0 = time.perf_counter()
+        conn = pool.get_connection()
+        self._conn_ms = (time.perf_counter() - t0) * 1000   # antri pool + ping, untuk profiler
+        self.connection_id = conn.connection_id
         try:
-            self.koneksi = mysql.connector.connect(
-                host='localhost',
-                user='root',
-                password='',
-                database='db_2310010238',
-                connection_timeout=5,   # <<— penting: biar nggak nge-freeze lama
-            )
-            self.koneksi.autocommit = True
-            # ping singkat untuk pastikan koneksi valid
+            yield conn
+        finally:
+            # dikunci supaya koneksi tidak balik ke pool di tengah KILL QUERY
+            with self._lock:
+                self.connection_id = None
+                pool.release(conn)
+
+    def _timed(self, cur):
+        """Cursor yang dicatat profiler kalau profiler aktif, selain itu cursor apa adanya."""
+        if not profiler.enabled:
+            return cur
+        conn_ms, self._conn_ms = self._conn_ms, 0.0
+        return TimedCursor(cur, profiler, conn_ms)
+
+    @contextmanager
+    def cursor(self):
+        with self._conn() as conn:
+            # buffered=True biar result set tidak nge-hold koneksi lama
+            cur = self._timed(conn.cursor(dictionary=True, buffered=True))
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    @contextmanager
+    def prepared(self, sql):
+        """
+        Cursor prepared statement untuk `sql` (string dari insert_sql dkk.).
+        Cursor-nya disimpan per koneksi fisik dan dipakai ulang: server tidak parse ulang,
+        client tidak bikin cursor baru (conn.cursor() juga selalu ping ke server).
+        """
+        with self._conn() as conn:
+            cache = _statements(conn)
+            cur = cache.pop(sql, None)
+            if cur is None:
+                cur = conn.cursor(prepared=True, dictionary=True)
+            timed = self._timed(cur)
             try:
-                self.koneksi.ping(reconnect=True, attempts=1, delay=0)
+                yield timed
             except Exception:
-                pass
-        except Error as e:
-            raise RuntimeError(f"Gagal koneksi DB: {e}")
+                if timed is not cur:
+                    timed.flush()
+                _close_quietly(cur)   # statement bisa rusak (koneksi putus dsb.), jangan dipakai lagi
+                raise
+            if timed is not cur:
+                timed.flush()
+            cache[sql] = cur
+            while len(cache) > STMT_CACHE_SIZE:
+                _close_quietly(cache.popitem(last=False)[1])
 
-    __init__ = _init_
+    @contextmanager
+    def transaction(self):
+        """
+        Cursor (tuple) dalam satu transaksi eksplisit; commit kalau sukses, rollback kalau error.
+        Tulis lewat cursor ini tidak memanggil hook tulis: sesudahnya panggil notify_bulk_write.
+        """
+        with self._conn() as conn:
+            conn.start_transaction()
+            cur = self._timed(conn.cursor())
+            try:
+                yield cur
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
 
-    def _ensure_conn(self):
-        if not getattr(self, 'koneksi', None) or not self.koneksi.is_connected():
-            self._init_()
-        else:
+    @contextmanager
+    def unit_of_work(self):
+        """with db.unit_of_work() as uow: ... -> semua tulis di dalamnya satu commit."""
+        with self.transaction() as cur:
+            uow = UnitOfWork(self, cur)
+            yield uow
+        for event in uow.events:
+            _notify_write(*event)
+
+    def stream(self, sql, params=(), size=1000):
+        """Generator (header, rows) per `size` baris dengan cursor unbuffered (hasil tidak ditampung)."""
+        with self._conn() as conn:
+            cur = self._timed(conn.cursor(buffered=False))
             try:
-                self.koneksi.ping(reconnect=True, attempts=1, delay=0)
-            except Exception:
-                self._init_()
+                cur.execute(sql, params)
+                header = list(cur.column_names)
+                while True:
+                    rows = cur.fetchmany(size)
+                    if not rows:
+                        break
+                    yield header, rows
+            finally:
+                if conn.unread_result:
+                    conn.consume_results()   # berhenti di tengah: sisa hasil dibuang
+                cur.close()
 
-    def cursor(self):
-        self._ensure_conn()
-        # buffered=True biar result set tidak nge-hold koneksi lama
-        return self.koneksi.cursor(dictionary=True, buffered=True)
+    def fetch_columns(self, sql, params=()):
+        """Hasil query dalam bentuk kolom: (nama_kolom, list tuple nilai per kolom)."""
+        with self._conn() as conn:
+            cur = self._timed(conn.cursor())
+            try:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                names = list(cur.column_names)
+            finally:
+                cur.close()
+        cols = list(zip(*rows)) if rows else [()] * len(names)
+        return names, cols
+
+    def _select(self, sql, params=()):
+        """
+        Hasil SELECT sebagai list dict, lewat ResultCache kalau memakai backend bersama.
+        Yang dikembalikan selalu salinan, jadi pemanggil boleh mengubah dict-nya.
+        """
+        tables = tables_in(sql)
+        key = (normalize_sql(sql), tuple(params))
+        try:
+            hash(key)
+        except TypeError:
+            tables = ()
+        if self._backend is not None or not tables or not _results.enabled:
+            with self.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall()
+        rows = _results.get(key)
+        if rows is None:
+            gen = _results.generation(tables)
+            with self.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+            _results.put(key, rows, tables, gen)
+        return [dict(r) for r in rows]
+
+    def count(self, table):
+        return self._select(f"SELECT COUNT(*) AS n FROM `{table}`")[0]["n"]
+
+    @staticmethod
+    def notify_bulk_write(table):
+        """Beritahu cache/hook bahwa banyak baris `table` berubah sekaligus."""
+        _notify_write(table, "bulk", None, None, None)
+        if table in ROLLUPS:
+            _notify_write(ROLLUPS[table][0], "bulk", None, None, None)   # total induk ikut berubah
 
     def fetch_all(self, table):
-        cur = self.cursor()
-        cur.execute(f"SELECT * FROM `{table}`")
-        return cur.fetchall()
+        return self._select(f"SELECT * FROM `{table}`")
+
+    def fetch_page(self, table, pk_name, after=None, limit=200):
+        # keyset pagination: ambil baris sesudah PK terakhir (pakai index PK, tanpa OFFSET)
+        if after is None:
+            return self._select(f"SELECT * FROM `{table}` ORDER BY `{pk_name}` LIMIT %s", (limit,))
+        return self._select(f"SELECT * FROM `{table}` WHERE `{pk_name}` > %s "
+                            f"ORDER BY `{pk_name}` LIMIT %s", (after, limit))
 
     def fetch_by_id(self, table, pk_name, id_value):
-        cur = self.cursor()
-        cur.execute(f"SELECT * FROM `{table}` WHERE `{pk_name}`=%s", (id_value,))
-        return cur.fetchone()
+        with self.prepared(select_by_id_sql(table, pk_name)) as cur:
+            cur.execute(select_by_id_sql(table, pk_name), (id_value,))
+            rows = cur.fetchall()   # dihabiskan supaya cursor bisa dipakai lagi
+        return rows[0] if rows else None
 
     def show_columns(self, table):
-        cur = self.cursor()
-        cur.execute(f"SHOW COLUMNS FROM `{table}`")
-        return cur.fetchall()
+        info = self.table_info(table)
+        if info is not None:
+            return info.show_columns()
+        if self.backend().name != "mysql":
+            return []   # di luar TABLES hanya MySQL yang bisa SHOW COLUMNS
+        with self.cursor() as cur:
+            cur.execute(f"SHOW COLUMNS FROM `{table}`")
+            return cur.fetchall()
 
     def insert(self, table, data: dict):
-        cols = [k for k,v in data.items() if v is not None]
-        vals = [data[k] for k in cols]
-        placeholders = ", ".join(["%s"] * len(cols))
-        colnames = ", ".join([f"`{c}`" for c in cols])
-        sql = f"INSERT INTO `{table}` ({colnames}) VALUES ({placeholders})"
-        cur = self.cursor()
-        cur.execute(sql, tuple(vals))
-        try:
-            return cur.lastrowid
-        except Exception:
-            return None
+        if table in ROLLUPS:
+            with self.unit_of_work() as uow:   # event untuk induk yang totalnya ikut berubah
+                return uow.insert(table, data)   # kolom dicek di UnitOfWork
+        self._check_columns(table, data)
+        data = derived_values(table, data)
+        cols = tuple(k for k, v in data.items() if v is not None)
+        sql = insert_sql(table, cols)
+        with self.prepared(sql) as cur:
+            cur.execute(sql, tuple(data[k] for k in cols))
+            try:
+                new_id = cur.lastrowid
+            except Exception:
+                new_id = None
+        pk_name = self._pk_of(table)
+        if pk_name and data.get(pk_name) is not None:
+            new_id = data[pk_name]
+        _notify_write(table, "insert", pk_name, new_id, data)
+        return new_id
 
     def update(self, table, pk_name, id_value, data: dict):
-        sets, vals = [], []
-        for k, v in data.items():
-            if k == pk_name:
-                continue
-            sets.append(f"`{k}`=%s")
-            vals.append(v)
-        if not sets:
+        if table in ROLLUPS:
+            with self.unit_of_work() as uow:   # induk lama & baru dibaca dalam transaksi yang sama
+                return uow.update(table, pk_name, id_value, data)   # kolom dicek di UnitOfWork
+        self._check_columns(table, data)
+        data = derived_values(table, data)
+        cols = tuple(k for k in data if k != pk_name)
+        if not cols:
             return False
-        vals.append(id_value)
-        sql = f"UPDATE `{table}` SET {', '.join(sets)} WHERE `{pk_name}`=%s"
-        cur = self.cursor()
-        cur.execute(sql, tuple(vals))
-        return cur.rowcount > 0
+        sql = update_sql(table, pk_name, cols)
+        with self.prepared(sql) as cur:
+            cur.execute(sql, tuple(data[k] for k in cols) + (id_value,))
+            changed = cur.rowcount > 0
+        _notify_write(table, "update", pk_name, id_value, data)
+        return changed
 
     def delete(self, table, pk_name, id_value):
-        cur = self.cursor()
-        cur.execute(f"DELETE FROM `{table}` WHERE `{pk_name}`=%s", (id_value,))
-        return cur.rowcount > 0
-
-    def search(self, table, keyword):
-        cols_info = self.show_columns(table)
-        text_cols = [c['Field'] for c in cols_info
-                     if any(t in c['Type'] for t in ('char','text','date','time'))]
-        if not text_cols:
+        if table in ROLLUPS:
+            with self.unit_of_work() as uow:
+                return uow.delete(table, pk_name, id_value)
+        sql = delete_sql(table, pk_name)
+        with self.prepared(sql) as cur:
+            cur.execute(sql, (id_value,))
+            deleted = cur.rowcount > 0
+        if deleted:
+            _notify_write(table, "delete", pk_name, id_value, None)
+        return deleted
+
+    # ========== purchase order + detail (satu transaksi) ==========
+    LINE_COLUMNS = ("id_po", "id_material", "jumlah", "harga_satuan", "subtotal")
+
+    def fetch_order_lines(self, id_po):
+        return self._select("SELECT * FROM `detail_po` WHERE `id_po`=%s ORDER BY `id_detail_po`",
+                            (id_po,))
+
+    def save_order(self, header: dict, lines, removed=()):
+        """
+        Simpan header purchase_order + semua baris detail_po dalam satu transaksi.
+        lines: list dict (id_detail_po 0/None = baris baru); removed: id_detail_po yang dihapus.
+        subtotal tiap baris dan total header tidak diambil dari user: subtotal dihitung
+        UnitOfWork, total dijumlah trigger DB dari detailnya.
+        Return id_po.
+        """
+        header = dict(header)
+        lines = [dict(l) for l in lines]
+        id_po = int(header.pop("id_po", 0) or 0)
+
+        with self.unit_of_work() as uow:
+            if id_po:
+                uow.update("purchase_order", "id_po", id_po, header)
+            else:
+                id_po = uow.insert("purchase_order", header)
+            for l in lines:
+                l["id_po"] = id_po
+            uow.delete_where("detail_po", "id_po", id_po, "id_detail_po", removed)
+            uow.upsert_many("detail_po", "id_detail_po",
+                            [l for l in lines if l.get("id_detail_po")], self.LINE_COLUMNS)
+            uow.insert_many("detail_po", [l for l in lines if not l.get("id_detail_po")],
+                            self.LINE_COLUMNS)
+        return id_po
+
+    def rebuild_rollups(self):
+        """
+        Hitung ulang subtotal, total PO, dan tabel ringkasan dari awal (satu transaksi);
+        return jumlah baris detail_po dan purchase_order yang nilainya dibetulkan.
+        """
+        fixed = []
+        with self.transaction() as cur:
+            for sql in REBUILD_SQL:
+                cur.execute(sql)
+                fixed.append(cur.rowcount)
+        for table in ROLLUPS:
+            self.notify_bulk_write(table)
+        return fixed[0], fixed[1]
+
+    def delete_order(self, id_po):
+        """Hapus PO beserta semua detailnya (tidak ada detail yatim kalau gagal di tengah)."""
+        with self.unit_of_work() as uow:
+            uow.delete_where("detail_po", "id_po", id_po)
+            return uow.delete("purchase_order", "id_po", id_po)
+
+    def _search_where(self, table, keyword):
+        return like_where(self.show_columns(table), keyword)
+
+    def _fulltext_query(self, table, keyword):
+        """fulltext_where dengan dialek backend ini; None kalau tabel tidak punya FULLTEXT index."""
+        if table not in SEARCH_INDEX:
+            return None
+        return fulltext_where(table, self._pk_of(table), keyword, self.backend().fulltext)
+
+    def search(self, table, keyword, limit=None):
+        ft = self._fulltext_query(table, keyword)
+        if ft is not None:
+            where, params, order, order_params = ft
+            sql = f"SELECT * FROM `{table}` WHERE {where}"
+            if order:
+                sql += f" ORDER BY {order}"
+                params += order_params
+            if limit is not None:
+                sql += " LIMIT %s"
+                params += (limit,)
+            return self._select(sql, params)
+        where, params = self._search_where(table, keyword)
+        if where is None:
             return self.fetch_all(table)
-        where = " OR ".join([f"`{c}` LIKE %s" for c in text_cols])
-        params = tuple([f"%{keyword}%" for _ in text_cols])
-        cur = self.cursor()
-        cur.execute(f"SELECT * FROM `{table}` WHERE {where}", params)
-        return cur.fetchall()
+        return self._select(f"SELECT * FROM `{table}` WHERE {where}", params)
+
+    def search_page(self, table, keyword, pk_name, cursor=None, limit=200):
+        """
+        Satu halaman hasil pencarian -> (rows, next_cursor).
+        Hasil FULLTEXT diurutkan dari skor tertinggi (cursor = offset);
+        tabel tanpa FULLTEXT pakai LIKE lama dengan keyset di PK (cursor = PK terakhir).
+        """
+        ft = self._fulltext_query(table, keyword)
+        if ft is not None:
+            where, params, order, order_params = ft
+            offset = cursor or 0
+            order = f"{order}, `{pk_name}`" if order else f"`{pk_name}`"
+            rows = self._select(f"SELECT * FROM `{table}` WHERE {where} "
+                                f"ORDER BY {order} LIMIT %s OFFSET %s",
+                                params + order_params + (limit, offset))
+            return rows, (offset + len(rows) if len(rows) == limit else None)
+
+        where, params = self._search_where(table, keyword)
+        if where is None:
+            rows = self.fetch_page(table, pk_name, cursor, limit)
+        else:
+            sql = f"SELECT * FROM `{table}` WHERE ({where})"
+            if cursor is not None:
+                sql += f" AND `{pk_name}` > %s"
+                params += (cursor,)
+            rows = self._select(sql + f" ORDER BY `{pk_name}` LIMIT %s", params + (limit,))
+        return rows, (rows[-1][pk_name] if len(rows) == limit else None)
+
+    def query_page(self, table, pk_name, cursor=None, limit=200, keyword="", filters=None,
+                   order=None):
+        """
+        Satu halaman dengan kata kunci, filter per kolom, dan urutan dari header tabel
+        -> (rows, next_cursor). order = (kolom, desc) atau None (urut PK / skor pencarian).
+        Urut kolom: keyset di (kolom, PK) -> cursor = (nilai, pk) baris terakhir;
+        tanpa order dengan FULLTEXT, atau urut kolom enum: cursor = offset.
+        """
+        if not filters and order is None:
+            if keyword:
+                return self.search_page(table, keyword, pk_name, cursor, limit)
+            rows = self.fetch_page(table, pk_name, cursor, limit)
+            return rows, (rows[-1][pk_name] if len(rows) == limit else None)
+
+        sql, params, next_cursor = page_sql(self.table_info(table), pk_name, cursor, limit, keyword,
+                                            filters, order, self.backend().fulltext)
+        rows = self._select(sql, params)
+        return rows, next_cursor(rows)
 
     def fetch_options(self, table, id_col='id', label_col=None):
+        return self.fetch_option_list(table, id_col, label_col).rows()
+
+    def fetch_option_list(self, table, id_col='id', label_col=None):
+        """OptionList (id, label) untuk combo FK; lewat LookupCache bersama."""
         # Pilih label kolom yang enak dibaca
         if label_col is None:
             try_candidates = [
@@ -111,6 +1424,21 @@ class crud:
                     break
             if label_col is None:
                 label_col = id_col
-        cur = self.cursor()
-        cur.execute(f"SELECT `{id_col}` AS id, `{label_col}` AS label FROM `{table}` ORDER BY `{label_col}` ASC")
-        return cur.fetchall()
+        key = (table, id_col, label_col)
+        opts = _lookups.get(key)
+        if opts is not None:
+            return opts
+        gen = _lookups.generation(table)
+        with self.cursor() as cur:
+            cur.execute(f"SELECT `{id_col}` AS id, `{label_col}` AS label FROM `{table}` ORDER BY `{label_col}` ASC")
+            rows = cur.fetchall()
+        opts = OptionList([r["id"] for r in rows], [r["label"] for r in rows])
+        _lookups.put(key, opts, gen)
+        return opts
+
+    def kill_query(self, other):
+        """Hentikan query yang sedang dijalankan objek crud lain (request yang sudah basi)."""
+        with other._lock:
+            if other.connection_id is None:
+                return
+            self.backend().kill(self, other.connection_id)
@@ -0,0 +1,180 @@
+# devpanel.py — panel developer: statistik query per tabel, query lambat, export trace
+import time
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QCheckBox, QDoubleSpinBox, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QMessageBox,
+    QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+from crud import crud
+from profiler import profiler
+from worker import DbWorker
+
+REFRESH_MS = 1000
+
+_STAT_COLUMNS = (
+    ("Tabel", None), ("Query", "count"), ("Rata2 ms", "avg_ms"), ("Maks ms", "max_ms"),
+    ("Baris", "rows"), ("KB", "bytes"), ("Lambat", "slow"), ("Error", "errors"),
+    ("Isi model", "fill_count"), ("Isi model ms", "fill_ms"),
+)
+_SLOW_COLUMNS = ("Detik ke", "Total ms", "Koneksi ms", "Eksekusi ms", "Fetch ms", "Baris", "SQL")
+
+
+def _item(value):
+    if isinstance(value, float):
+        text = f"{value:,.1f}"
+    else:
+        text = f"{value:,}" if isinstance(value, int) else str(value)
+    item = QTableWidgetItem(text)
+    if isinstance(value, (int, float)):
+        item.setTextAlignment(int(Qt.AlignRight | Qt.AlignVCenter))
+    return item
+
+
+class DevPanel(QWidget):
+    """Isi diperbarui tiap REFRESH_MS selama panel terlihat."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Profiler DB")
+        self.worker = DbWorker(self)
+
+        self.checkEnabled = QCheckBox("Catat query")
+        self.checkEnabled.setChecked(profiler.enabled)
+        self.checkEnabled.toggled.connect(self._set_enabled)
+        self.spinSlow = QDoubleSpinBox()
+        self.spinSlow.setRange(1, 60_000)
+        self.spinSlow.setSuffix(" ms")
+        self.spinSlow.setValue(profiler.slow_ms)
+        self.spinSlow.valueChanged.connect(lambda v: setattr(profiler, "slow_ms", v))
+        self.btnReset = QPushButton("Reset")
+        self.btnReset.clicked.connect(self._reset)
+        self.btnClearCache = QPushButton("Kosongkan cache")
+        self.btnClearCache.clicked.connect(self._clear_cache)
+        self.btnRebuild = QPushButton("Hitung ulang total & ringkasan")
+        self.btnRebuild.clicked.connect(self._rebuild)
+        self.btnExport = QPushButton("Export trace...")
+        self.btnExport.clicked.connect(self.export_trace)
+
+        top = QHBoxLayout()
+        top.addWidget(self.checkEnabled)
+        top.addWidget(QLabel("Lambat ≥"))
+        top.addWidget(self.spinSlow)
+        top.addStretch(1)
+        top.addWidget(self.btnReset)
+        top.addWidget(self.btnClearCache)
+        top.addWidget(self.btnRebuild)
+        top.addWidget(self.btnExport)
+
+        self.tableStats = QTableWidget(0, len(_STAT_COLUMNS))
+        self.tableStats.setHorizontalHeaderLabels([c for c, _ in _STAT_COLUMNS])
+        self.tableSlow = QTableWidget(0, len(_SLOW_COLUMNS))
+        self.tableSlow.setHorizontalHeaderLabels(_SLOW_COLUMNS)
+        self.tableSlow.horizontalHeader().setSectionResizeMode(len(_SLOW_COLUMNS) - 1,
+                                                               QHeaderView.Stretch)
+        for t in (self.tableStats, self.tableSlow):
+            t.setEditTriggers(QTableWidget.NoEditTriggers)
+            t.verticalHeader().setVisible(False)
+        self.labelPool = QLabel()
+        self.labelCache = QLabel()
+
+        lay = QVBoxLayout(self)
+        lay.addLayout(top)
+        lay.addWidget(QLabel("Per tabel"))
+        lay.addWidget(self.tableStats, 2)
+        lay.addWidget(QLabel("Query lambat terakhir"))
+        lay.addWidget(self.tableSlow, 1)
+        lay.addWidget(self.labelPool)
+        lay.addWidget(self.labelCache)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _set_enabled(self, on):
+        profiler.enabled = on
+        self.refresh()
+
+    def _reset(self):
+        profiler.reset()
+        crud.reset_cache_stats()
+        self.refresh()
+
+    def _clear_cache(self):
+        crud.invalidate_cache()
+        self.refresh()
+
+    def _rebuild(self):
+        """Subtotal/total/ringkasan dihitung ulang dari detail_po (mis. sesudah tulis tanpa trigger)."""
+        self.btnRebuild.setEnabled(False)
+
+        def done(fixed):
+            self.btnRebuild.setEnabled(True)
+            QMessageBox.information(self, "Hitung ulang",
+                                    f"Dibetulkan: {fixed[0]} subtotal detail, {fixed[1]} total PO.\n"
+                                    "Tabel ringkasan diisi ulang.")
+
+        def fail(msg):
+            self.btnRebuild.setEnabled(True)
+            QMessageBox.warning(self, "Hitung ulang", msg)
+        self.worker.submit(crud.rebuild_rollups, on_done=done, on_error=fail)
+
+    def refresh(self):
+        stats = profiler.table_stats()
+        self.tableStats.setRowCount(len(stats))
+        for r, (table, st) in enumerate(sorted(stats.items(), key=lambda kv: -kv[1]["total_ms"])):
+            for c, (_, key) in enumerate(_STAT_COLUMNS):
+                value = table if key is None else st[key]
+                if key == "bytes":
+                    value = value / 1024
+                self.tableStats.setItem(r, c, _item(value))
+        self.tableStats.resizeColumnsToContents()
+
+        slow = profiler.slow()[::-1]
+        self.tableSlow.setRowCount(len(slow))
+        for r, e in enumerate(slow):
+            total = e["conn_ms"] + e["exec_ms"] + e["fetch_ms"]
+            values = (e["ts"] / 1000, total, e["conn_ms"], e["exec_ms"], e["fetch_ms"],
+                      e["rows"], e["sql"])
+            for c, v in enumerate(values):
+                self.tableSlow.setItem(r, c, _item(v))
+
+        try:
+            pool = crud.pool_stats()
+        except Exception as e:
+            self.labelPool.setText(f"Pool: {e}")
+        else:
+            self.labelPool.setText(
+                f"Pool {pool.get('backend', '')}: {pool['idle']}/{pool['size']} nganggur · "
+                f"tunggu rata2 {pool['wait_avg_ms']:.1f} ms · maks {pool['wait_max_ms']:.1f} ms · "
+                f"habis {pool['exhausted']}x")
+
+        c = crud.cache_stats()
+        self.labelCache.setText(
+            f"Cache query: {c['entries']} entri · {c['bytes'] / 1024:,.0f}/{c['max_bytes'] / 1024:,.0f} KB"
+            f" · hit {c['hits']} / miss {c['misses']} ({c['hit_rate']:.0%}) · "
+            f"dibuang LRU {c['evictions']} · kedaluwarsa {c['expired']} · "
+            f"invalidasi {c['invalidations']} · terlalu besar {c['skipped']}")
+
+    def export_trace(self):
+        default = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        path, _ = QFileDialog.getSaveFileName(self, "Export trace", default, "Trace JSON (*.json)")
+        if not path:
+            return
+        try:
+            n = profiler.export_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export trace", str(e))
+            return
+        QMessageBox.information(self, "Export trace",
+                                f"{n} event ditulis ke {path}\n(buka di chrome://tracing atau ui.perfetto.dev)")
@@ -0,0 +1,127 @@
+# filterbar.py — baris filter per kolom di atas tabel form (nilainya jadi WHERE di crud.query_page)
+from PySide6.QtCore import QDate, QTimer, Signal
+from PySide6.QtWidgets import (
+    QCheckBox, QDateEdit, QDoubleSpinBox, QHBoxLayout, QLabel, QMenu, QPushButton, QToolButton,
+    QWidget
+)
+
+CHANGE_DELAY = 300   # ms jeda sesudah filter terakhir diubah sebelum data dimuat ulang
+MAX_NUMBER = 9_999_999_999_999.99   # decimal(15,2)
+
+
+class FilterBar(QWidget):
+    """
+    spec: {kolom: jenis}; jenis 'date' = rentang tanggal (aktif lewat checkbox),
+    'enum' = pilih nilai dari menu (nilai diisi set_enum_values), 'range' = min/maks angka
+    (0 = tidak dibatasi). filters() -> bentuk yang dipakai crud.filter_conditions.
+    """
+    changed = Signal()
+
+    def __init__(self, spec, parent=None):
+        super().__init__(parent)
+        self._spec = dict(spec)
+        self._widgets = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(CHANGE_DELAY)
+        self._timer.timeout.connect(self.changed)
+
+        lay = QHBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        for col, kind in self._spec.items():
+            if kind == "date":
+                check = QCheckBox(col)
+                start, end = QDateEdit(), QDateEdit()
+                today = QDate.currentDate()
+                start.setDate(today.addMonths(-1))
+                end.setDate(today)
+                for d in (start, end):
+                    d.setCalendarPopup(True)
+                    d.setDisplayFormat("yyyy-MM-dd")
+                    d.setEnabled(False)
+                    d.dateChanged.connect(self._edited)
+                check.toggled.connect(start.setEnabled)
+                check.toggled.connect(end.setEnabled)
+                check.toggled.connect(self._edited)
+                lay.addWidget(check)
+                lay.addWidget(start)
+                lay.addWidget(QLabel("s/d"))
+                lay.addWidget(end)
+                self._widgets[col] = (check, start, end)
+            elif kind == "enum":
+                button = QToolButton()
+                button.setPopupMode(QToolButton.InstantPopup)
+                button.setMenu(QMenu(button))
+                button.setText(f"{col}: semua")
+                lay.addWidget(button)
+                self._widgets[col] = (button,)
+            else:
+                lo, hi = QDoubleSpinBox(), QDoubleSpinBox()
+                for spin, text in ((lo, "min"), (hi, "maks")):
+                    spin.setRange(0, MAX_NUMBER)
+                    spin.setDecimals(2)
+                    spin.setGroupSeparatorShown(True)
+                    spin.setSpecialValueText(text)   # 0 = tidak dibatasi
+                    spin.valueChanged.connect(self._edited)
+                lay.addWidget(QLabel(col))
+                lay.addWidget(lo)
+                lay.addWidget(hi)
+                self._widgets[col] = (lo, hi)
+        self.btnReset = QPushButton("Reset filter")
+        self.btnReset.clicked.connect(self.reset)
+        lay.addWidget(self.btnReset)
+        lay.addStretch(1)
+
+    def set_enum_values(self, col, values):
+        """Isi menu kolom enum (nilai dari TableInfo.enums; diambil di worker)."""
+        button = self._widgets[col][0]
+        menu = button.menu()
+        menu.clear()
+        for v in values:
+            act = menu.addAction(v)
+            act.setCheckable(True)
+            act.setChecked(True)
+            act.toggled.connect(self._edited)
+        self._update_enum_text(col)
+
+    def _update_enum_text(self, col):
+        acts = self._widgets[col][0].menu().actions()
+        picked = [a.text() for a in acts if a.isChecked()]
+        text = "semua" if len(picked) == len(acts) else ", ".join(picked) or "-"
+        self._widgets[col][0].setText(f"{col}: {text}")
+
+    def _edited(self, *args):
+        for col, kind in self._spec.items():
+            if kind == "enum":
+                self._update_enum_text(col)
+        self._timer.start()
+
+    def filters(self):
+        out = {}
+        for col, kind in self._spec.items():
+            w = self._widgets[col]
+            if kind == "date":
+                if w[0].isChecked():
+                    out[col] = (w[1].date().toPython(), w[2].date().toPython())
+            elif kind == "enum":
+                acts = w[0].menu().actions()
+                picked = [a.text() for a in acts if a.isChecked()]
+                if len(picked) != len(acts):
+                    out[col] = picked
+            else:
+                lo, hi = w[0].value() or None, w[1].value() or None
+                if lo is not None or hi is not None:
+                    out[col] = (lo, hi)
+        return out
+
+    def reset(self):
+        for col, kind in self._spec.items():
+            w = self._widgets[col]
+            if kind == "date":
+                w[0].setChecked(False)
+            elif kind == "enum":
+                for a in w[0].menu().actions():
+                    a.setChecked(True)
+            else:
+                w[0].setValue(0)
+                w[1].setValue(0)
@@ -0,0 +1,138 @@
+import time
+from functools import partial
+
+import numpy as np
+from PySide6 import QtWidgets
+from PySide6.QtCore import QAbstractTableModel, QDate, QModelIndex, Qt
+from PySide6.QtWidgets import (
+    QCheckBox, QComboBox, QDateEdit, QLabel, QMessageBox, QPushButton, QTableView
+)
+
+import report
+from changes import change_bus
+from common import load_form_ui
+from profiler import profiler
+from worker import DbWorker
+
+
+class DataFrameModel(QAbstractTableModel):
+    """Tampilkan DataFrame apa adanya; kolom dibaca sebagai array numpy, format saat data()."""
+
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        self._headers = [str(c) for c in df.columns]
+        self._cols = [df[c].to_numpy() for c in df.columns]
+        self._rows = len(df)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def memory_estimate(self):
+        return sum(c.nbytes for c in self._cols)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        v = self._cols[index.column()][index.row()]
+        numeric = isinstance(v, (int, float, np.integer, np.floating))
+        if role == Qt.DisplayRole:
+            if isinstance(v, (float, np.floating)):
+                return "" if np.isnan(v) else f"{v:,.2f}"
+            if isinstance(v, (int, np.integer)):
+                return f"{v:,}"
+            return "" if v is None else str(v)
+        if role == Qt.TextAlignmentRole and numeric:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
+
+
+class LaporanForm(QtWidgets.QWidget):
+    """Jendela laporan: pilih jenis + periode, hitung di worker (hasil di-cache per parameter)."""
+    UI_FILE = "laporan.ui"
+
+    def __init__(self):
+        super().__init__()
+        self.worker = DbWorker(self)
+        self.ui = load_form_ui(self, self.UI_FILE)
+        self.setWindowTitle(self.ui.windowTitle())
+
+        self.comboReport = self.ui.findChild(QComboBox, "comboReport")
+        self.checkPeriode = self.ui.findChild(QCheckBox, "checkPeriode")
+        self.dateFrom = self.ui.findChild(QDateEdit, "dateFrom")
+        self.dateTo = self.ui.findChild(QDateEdit, "dateTo")
+        self.btnRun = self.ui.findChild(QPushButton, "btnRun")
+        self.table = self.ui.findChild(QTableView, "tableView")
+        self.labelInfo = self.ui.findChild(QLabel, "labelInfo")
+
+        self.comboReport.addItems(list(report.REPORTS))
+        today = QDate.currentDate()
+        self.dateFrom.setDate(QDate(today.year(), 1, 1))
+        self.dateTo.setDate(today)
+        self.checkPeriode.toggled.connect(self.dateFrom.setEnabled)
+        self.checkPeriode.toggled.connect(self.dateTo.setEnabled)
+        self.checkPeriode.setChecked(False)
+        self.dateFrom.setEnabled(False)
+        self.dateTo.setEnabled(False)
+
+        self.btnRun.clicked.connect(self.run_report)
+        self.comboReport.currentIndexChanged.connect(self.run_report)
+        self.run_report()
+
+    def params(self):
+        if not self.checkPeriode.isChecked():
+            return {}
+        return {"date_from": self.dateFrom.date().toString("yyyy-MM-dd"),
+                "date_to": self.dateTo.date().toString("yyyy-MM-dd")}
+
+    def run_report(self):
+        name = self.comboReport.currentText()
+        started = time.perf_counter()
+        self.setCursor(Qt.BusyCursor)
+
+        def done(result):
+            self.unsetCursor()
+            df, cached = result
+            t0 = profiler.now()
+            old = self.table.model()
+            self.table.setModel(DataFrameModel(df, self.table))
+            if old is not None:
+                old.deleteLater()
+            self.table.resizeColumnsToContents()
+            profiler.span("model.show", f"laporan:{name}", t0, rows=len(df))
+            ms = (time.perf_counter() - started) * 1000
+            self.labelInfo.setText(f"{len(df)} baris · {ms:.0f} ms" + (" · cache" if cached else ""))
+
+        def fail(msg):
+            self.unsetCursor()
+            QMessageBox.warning(self, "Laporan", msg)
+
+        self.worker.submit(partial(report.run, **self.params()), name,
+                           on_done=done, on_error=fail, channel="report")
+
+    def showEvent(self, event):
+        # tulis dari proses lain (change_log) ikut membuang cache laporan selama jendela terlihat
+        change_bus().hold()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        change_bus().release()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        if self.testAttribute(Qt.WA_DeleteOnClose):
+            self.worker.cancel_all()
+        super().closeEvent(event)
+
+    def cache_size(self):
+        model = self.table.model()
+        return model.memory_estimate() if isinstance(model, DataFrameModel) else 0
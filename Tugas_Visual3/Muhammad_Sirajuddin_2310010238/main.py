@@ -1,59 +1,279 @@
 # main.py
+import importlib
+import os
 import sys
+import threading
+import time
 from pathlib import Path
 
+T0 = time.perf_counter()   # awal proses, untuk ukur waktu sampai jendela pertama tergambar
+
 # Pastikan folder file ini ada di sys.path (biar import modul lokal tidak error)
 BASE = Path(__file__).resolve().parent
 if str(BASE) not in sys.path:
     sys.path.insert(0, str(BASE))
 
-from PySide6 import QtWidgets, QtUiTools
-from PySide6.QtCore import QFile, Qt
+from PySide6 import QtWidgets
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtGui import QCloseEvent, QKeySequence, QShortcut
 
-# Import form per tabel (pastikan file2 ini ada di folder yang sama)
-from material import MaterialForm
-from pemasok import PemasokForm
-from pelanggan import PelangganForm
-from purchase_order import PurchaseOrderForm
-from detail_po import DetailPOForm
+import ui_loader
 
 UI_FILE = "main.ui"  # nama file UI menu utama
 
+# Form per tombol: kunci -> (modul, kelas, file .ui).
+# Modulnya (beserta crud/pandas/dst.) baru di-import waktu dibutuhkan, bukan saat start.
+FORMS = {
+    "material": ("material", "MaterialForm", "material.ui"),
+    "pemasok": ("pemasok", "PemasokForm", "pemasok.ui"),
+    "pelanggan": ("pelanggan", "PelangganForm", "pelanggan.ui"),
+    "po": ("purchase_order", "PurchaseOrderForm", "purchase_order.ui"),
+    "detail_po": ("detail_po", "DetailPOForm", "detail_po.ui"),
+    "po_editor": ("po_editor", "POEditorForm", "po_editor.ui"),
+    "laporan": ("laporan", "LaporanForm", "laporan.ui"),
+}
+
+# Setelah menu tergambar, form disiapkan satu per satu selama aplikasi idle:
+#   off    = tidak ada,
+#   import = import modul + compile/import .ui (default),
+#   create = juga buat satu instance tersembunyi per form (data langsung dimuat).
+PRELOAD = os.environ.get("PRELOAD_FORMS", "import")
+PROFILE = os.environ.get("STARTUP_PROFILE", "0") == "1"   # cetak waktu start & buka form
+TARGET_FIRST_PAINT_MS = 800   # target: proses mulai -> menu utama tergambar
+TARGET_OPEN_MS = 300          # target: klik tombol -> form tergambar
+
+# Modul berat tanpa Qt (pandas dkk.) di-import di thread lain supaya GUI tidak tersendat
+BACKGROUND_IMPORTS = ("crud", "report")
+
+# Instance form: maksimal MAX_INSTANCES jendela per form (FORM_LIMITS untuk pengecualian).
+# Form yang ditutup cuma disembunyikan supaya datanya tetap hangat, selama total data
+# form tersembunyi tidak lebih dari WARM_CACHE_MB (yang paling lama tidak dipakai dibuang).
+MAX_INSTANCES = int(os.environ.get("FORM_MAX_INSTANCES", "1"))
+FORM_LIMITS = {}   # contoh: {"laporan": 2}
+WARM_CACHE_MB = float(os.environ.get("FORM_CACHE_MB", "64"))
+
+
+def form_class(key):
+    module, cls, _ = FORMS[key]
+    return getattr(importlib.import_module(module), cls)
+
+
+class _FirstPaint(QObject):
+    """Catat waktu paint pertama `widget` (sejak t0), lalu panggil `then` sekali."""
+
+    def __init__(self, widget, label, t0, target_ms, then=None):
+        super().__init__(widget)
+        self._label, self._t0, self._target, self._then = label, t0, target_ms, then
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            ms = 1000 * (time.perf_counter() - self._t0)
+            if PROFILE:
+                flag = "" if ms <= self._target else f"  (> target {self._target} ms)"
+                print(f"[startup] {self._label}: {ms:.0f} ms{flag}")
+            if self._then:
+                QTimer.singleShot(0, self._then)
+            self.deleteLater()
+        return False
+
+
 def load_ui(ui_name: str):
     """Load UI (QWidget/QMainWindow) dari folder file ini berada."""
-    ui_path = BASE / ui_name
-    if not ui_path.exists():
+    try:
+        return ui_loader.load_ui(ui_name)
+    except (OSError, RuntimeError):
         return None
-    f = QFile(str(ui_path))
-    if not f.open(QFile.ReadOnly):
-        return None
-    loader = QtUiTools.QUiLoader()
-    w = loader.load(f, None)
-    f.close()
-    return w
-
-def _open_child(parent, cls):
-    """Buka jendela child dan simpan referensinya supaya tidak GC."""
-    child = cls()
-    child.setAttribute(Qt.WA_DeleteOnClose, True)
-    child.show()
-    if not hasattr(parent, "_children"):
-        parent._children = []
-    parent._children.append(child)
+
+
+class FormManager(QObject):
+    """
+    Pemilik semua jendela form. open(key) memunculkan instance yang sudah ada
+    (raise + focus) atau membuka lagi yang tersembunyi; instance baru cuma dibuat
+    kalau belum ada atau batasnya belum tercapai.
+    """
+
+    def __init__(self, limits=None, cache_mb=WARM_CACHE_MB, parent=None):
+        super().__init__(parent)
+        self._limits = dict(FORM_LIMITS if limits is None else limits)
+        self._cache_bytes = int(cache_mb * 1024 * 1024)
+        self._forms = {}   # kunci -> list form, urut terakhir dipakai di belakang
+        self._keys = {}    # id(form) -> kunci
+
+    def limit(self, key):
+        return max(1, self._limits.get(key, MAX_INSTANCES))
+
+    def instances(self, key):
+        return list(self._forms.get(key, ()))
+
+    def open(self, key):
+        """Tampilkan form `key`; return instance yang dipakai."""
+        t0 = time.perf_counter()
+        forms = self._forms.setdefault(key, [])
+        hidden = [f for f in forms if not f.isVisible()]
+        if hidden:
+            form = hidden[-1]
+        elif len(forms) < self.limit(key):
+            form = self._create(key)
+        else:
+            form = forms[-1]
+        if not form.isVisible():
+            _FirstPaint(form, f"buka {key}", t0, TARGET_OPEN_MS)
+        self._touch(key, form)
+        form.show()
+        if form.isMinimized():
+            form.showNormal()
+        form.raise_()
+        form.activateWindow()
+        return form
+
+    def prepare(self, key):
+        """Buat satu instance tersembunyi (data mulai dimuat) kalau belum ada."""
+        if not self._forms.get(key):
+            self._create(key)
+
+    def close_all(self):
+        """Tutup dan hancurkan semua form (aplikasi selesai)."""
+        for forms in list(self._forms.values()):
+            for form in list(forms):
+                self._destroy(form)
+
+    def cached_bytes(self):
+        """Perkiraan data yang dipegang form tersembunyi."""
+        return sum(self._size(f) for forms in self._forms.values() for f in forms
+                   if not f.isVisible())
+
+    def _create(self, key):
+        form = form_class(key)()
+        # ditutup = disembunyikan; baru dihancurkan kalau dibuang dari cache (_destroy)
+        form.setAttribute(Qt.WA_DeleteOnClose, False)
+        form.installEventFilter(self)
+        form.destroyed.connect(lambda *_, i=id(form): self._forget(i))
+        self._forms.setdefault(key, []).append(form)
+        self._keys[id(form)] = key
+        return form
+
+    def _touch(self, key, form):
+        forms = self._forms[key]
+        forms.remove(form)
+        forms.append(form)
+
+    def _forget(self, ident):
+        key = self._keys.pop(ident, None)
+        if key is not None:
+            self._forms[key] = [f for f in self._forms[key] if id(f) != ident]
+
+    def _destroy(self, form):
+        self._forget(id(form))
+        form.removeEventFilter(self)
+        form.setAttribute(Qt.WA_DeleteOnClose, True)
+        if form.isVisible():
+            form.close()
+        else:
+            # close() tidak mengirim closeEvent ke widget tersembunyi
+            form.closeEvent(QCloseEvent())   # lepas ChangeBus & batalkan query
+            form.deleteLater()
+
+    @staticmethod
+    def _size(form):
+        try:
+            return form.cache_size()
+        except (AttributeError, RuntimeError):
+            return 0
+
+    def eventFilter(self, obj, event):
+        # Hide tanpa isVisible = ditutup (minimize tetap isVisible)
+        if event.type() == QEvent.Hide and not obj.isVisible():
+            QTimer.singleShot(0, self.trim)
+        return False
+
+    def trim(self):
+        """Buang form tersembunyi yang paling lama tidak dipakai sampai di bawah batas memori."""
+        order = {}
+        for forms in self._forms.values():
+            for i, f in enumerate(forms):
+                if not f.isVisible():
+                    order[f] = i
+        total = sum(self._size(f) for f in order)
+        for form in sorted(order, key=order.get):
+            if total <= self._cache_bytes:
+                break
+            total -= self._size(form)
+            self._destroy(form)
+
+
+_manager = None
+
+
+def form_manager():
+    """FormManager bersama; dibuat sesudah QApplication ada."""
+    global _manager
+    if _manager is None:
+        _manager = FormManager()
+        app = QtWidgets.QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_manager.close_all)
+    return _manager
+
+
+def _open_child(key):
+    """Buka form `key` lewat FormManager (satu instance dipakai ulang, bukan dibuat per klik)."""
+    form_manager().open(key)
+
+
+def _import_background():
+    for name in BACKGROUND_IMPORTS:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[WARN] preload {name}: {e}")
+
+def preload_forms(mode=PRELOAD):
+    """Siapkan form satu per satu lewat timer 0 ms, jadi event loop tetap responsif."""
+    if mode not in ("import", "create"):
+        return
+    pending = list(FORMS)
+    imports = threading.Thread(target=_import_background, name="preload", daemon=True)
+    imports.start()
+
+    def step():
+        if not pending:
+            return
+        if imports.is_alive():
+            QTimer.singleShot(50, step)   # jangan ikut antri import lock di thread GUI
+            return
+        key = pending.pop(0)
+        t0 = time.perf_counter()
+        try:
+            ui_loader.warm(FORMS[key][2])
+            form_class(key)
+            if mode == "create":
+                form_manager().prepare(key)   # belum di-show; __init__ sudah mulai ambil data
+        except Exception as e:
+            print(f"[WARN] preload {key}: {e}")
+        if PROFILE:
+            print(f"[startup] preload {key}: {1000 * (time.perf_counter() - t0):.0f} ms")
+        QTimer.singleShot(0, step)
+
+    step()
 
 def wire_buttons(win):
     """
     Hubungkan tombol di main.ui ke handler.
     ObjectName yang dicari (sesuai file .ui yang kubuat):
-      btnMaterial, btnPemasok, btnPelanggan, btnPO, btnDetailPO
+      btnMaterial, btnPemasok, btnPelanggan, btnPO, btnDetailPO, btnPOEditor,
+      btnLaporan
     Ada fallback pencocokan berdasarkan text tombol.
     """
     mapping = {
-        "btnMaterial": lambda: _open_child(win, MaterialForm),
-        "btnPemasok": lambda: _open_child(win, PemasokForm),
-        "btnPelanggan": lambda: _open_child(win, PelangganForm),
-        "btnPO": lambda: _open_child(win, PurchaseOrderForm),
-        "btnDetailPO": lambda: _open_child(win, DetailPOForm),
+        "btnMaterial": lambda: _open_child("material"),
+        "btnPemasok": lambda: _open_child("pemasok"),
+        "btnPelanggan": lambda: _open_child("pelanggan"),
+        "btnPO": lambda: _open_child("po"),
+        "btnDetailPO": lambda: _open_child("detail_po"),
+        "btnPOEditor": lambda: _open_child("po_editor"),
+        "btnLaporan": lambda: _open_child("laporan"),
     }
 
     found_any = False
@@ -68,11 +288,13 @@ def wire_buttons(win):
     # 2) Fallback: sambungkan berdasarkan text tombol
     if not found_any:
         text_map = {
-            "material": lambda: _open_child(win, MaterialForm),
-            "pemasok": lambda: _open_child(win, PemasokForm),
-            "pelanggan": lambda: _open_child(win, PelangganForm),
-            "purchase order": lambda: _open_child(win, PurchaseOrderForm),
-            "detail po": lambda: _open_child(win, DetailPOForm),
+            "material": lambda: _open_child("material"),
+            "pemasok": lambda: _open_child("pemasok"),
+            "pelanggan": lambda: _open_child("pelanggan"),
+            "purchase order": lambda: _open_child("po"),
+            "detail po": lambda: _open_child("detail_po"),
+            "po + detail": lambda: _open_child("po_editor"),
+            "laporan": lambda: _open_child("laporan"),
         }
         for btn in win.findChildren(QtWidgets.QPushButton):
             t = (btn.text() or "").strip().lower()
@@ -82,6 +304,24 @@ def wire_buttons(win):
 
     return found_any
 
+
+def toggle_dev_panel(win):
+    """F12: panel profiler DB (dock di kanan menu utama; jendela sendiri kalau bukan QMainWindow)."""
+    dock = getattr(win, "_dev_panel", None)
+    if dock is None:
+        from devpanel import DevPanel   # baru di-import waktu dipakai
+        panel = DevPanel()
+        if isinstance(win, QtWidgets.QMainWindow):
+            dock = QtWidgets.QDockWidget("Profiler DB", win)
+            dock.setWidget(panel)
+            win.addDockWidget(Qt.RightDockWidgetArea, dock)
+            dock.hide()
+        else:
+            dock = panel
+        win._dev_panel = dock
+    dock.setVisible(not dock.isVisible())
+
+
 def build_fallback():
     """Kalau main.ui tidak ada/tidak cocok: tampilkan menu grid tombol sederhana."""
     win = QtWidgets.QMainWindow()
@@ -90,11 +330,13 @@ def build_fallback():
     grid = QtWidgets.QGridLayout(central)
 
     buttons = [
-        ("Material",      lambda: _open_child(win, MaterialForm)),
-        ("Pemasok",       lambda: _open_child(win, PemasokForm)),
-        ("Pelanggan",     lambda: _open_child(win, PelangganForm)),
-        ("Purchase Order",lambda: _open_child(win, PurchaseOrderForm)),
-        ("Detail PO",     lambda: _open_child(win, DetailPOForm)),
+        ("Material",      lambda: _open_child("material")),
+        ("Pemasok",       lambda: _open_child("pemasok")),
+        ("Pelanggan",     lambda: _open_child("pelanggan")),
+        ("Purchase Order",lambda: _open_child("po")),
+        ("Detail PO",     lambda: _open_child("detail_po")),
+        ("PO + Detail",   lambda: _open_child("po_editor")),
+        ("Laporan",       lambda: _open_child("laporan")),
     ]
     for i, (text, handler) in enumerate(buttons):
         b = QtWidgets.QPushButton(text)
@@ -132,12 +374,20 @@ def main():
                 if lay is None:
                     lay = QtWidgets.QVBoxLayout(win)
                 lay.addWidget(tb)
-            tb.addAction("Material").triggered.connect(lambda: _open_child(win, MaterialForm))
-            tb.addAction("Pemasok").triggered.connect(lambda: _open_child(win, PemasokForm))
-            tb.addAction("Pelanggan").triggered.connect(lambda: _open_child(win, PelangganForm))
-            tb.addAction("Purchase Order").triggered.connect(lambda: _open_child(win, PurchaseOrderForm))
-            tb.addAction("Detail PO").triggered.connect(lambda: _open_child(win, DetailPOForm))
+            tb.addAction("Material").triggered.connect(lambda: _open_child("material"))
+            tb.addAction("Pemasok").triggered.connect(lambda: _open_child("pemasok"))
+            tb.addAction("Pelanggan").triggered.connect(lambda: _open_child("pelanggan"))
+            tb.addAction("Purchase Order").triggered.connect(lambda: _open_child("po"))
+            tb.addAction("Detail PO").triggered.connect(lambda: _open_child("detail_po"))
+            tb.addAction("PO + Detail").triggered.connect(lambda: _open_child("po_editor"))
+            tb.addAction("Laporan").triggered.connect(lambda: _open_child("laporan"))
+
+    QShortcut(QKeySequence("F12"), win, activated=lambda: toggle_dev_panel(win))
+    if os.environ.get("DB_PROFILE", "0") == "1":
+        toggle_dev_panel(win)
 
+    # menu tampil dulu; form baru disiapkan sesudah paint pertama
+    _FirstPaint(win, "menu utama tergambar", T0, TARGET_FIRST_PAINT_MS, then=preload_forms)
     win.show()
     sys.exit(app.exec())
 
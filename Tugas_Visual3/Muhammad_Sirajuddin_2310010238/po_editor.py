@@ -0,0 +1,176 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QComboBox, QDoubleSpinBox, QHeaderView, QMessageBox, QPushButton, QSpinBox,
+    QTableWidget, QTableWidgetItem
+)
+
+from common import BaseForm, OptionsModel
+from crud import crud, line_subtotal
+
+
+class POEditorForm(BaseForm):
+    """Header purchase_order + baris detail_po, disimpan sekaligus lewat crud.save_order."""
+    TABLE = "purchase_order"
+    UI_FILE = "po_editor.ui"
+    FIELD_WIDGETS = {
+        "id_po": ("spin", "spinId"),
+        "no_po": ("line", "editNoPO"),
+        "tanggal_po": ("date", "datePO"),
+        "id_pemasok": ("combo", "comboPemasok"),
+        "id_pelanggan": ("combo", "comboPelanggan"),
+        "total": ("double", "spinTotal"),
+        "status_po": ("combo_text", "comboStatus"),
+    }
+    LINE_HEADERS = ["Material", "Jumlah", "Harga Satuan", "Subtotal"]
+
+    def _first_load(self):
+        self._removed = []   # id_detail_po yang dihapus sejak PO dibuka
+        self.tableLines = self.ui.findChild(QTableWidget, "tableLines")
+        self.tableLines.setColumnCount(len(self.LINE_HEADERS))
+        self.tableLines.setHorizontalHeaderLabels(self.LINE_HEADERS)
+        self.tableLines.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tableLines.itemChanged.connect(self._on_line_changed)
+        self.ui.findChild(QPushButton, "btnAddLine").clicked.connect(self.add_line)
+        self.ui.findChild(QPushButton, "btnRemoveLine").clicked.connect(self.remove_line)
+        super()._first_load()
+
+    def setup_fk_options(self):
+        self.load_combo("comboPemasok", "pemasok", "id_pemasok", "nama_pemasok")
+        self.load_combo("comboPelanggan", "pelanggan", "id_pelanggan", "nama_pelanggan")
+        self.load_combo("comboMaterial", "material", "id_material", "nama_material")
+
+    # ========== baris detail ==========
+    def _material_label(self, id_material):
+        model = self.ui.findChild(QComboBox, "comboMaterial").model()
+        if isinstance(model, OptionsModel):
+            opts = model.options()
+            i = opts.index_of(id_material)
+            if i >= 0:
+                return str(opts.labels[i])
+        return str(id_material)
+
+    def _append_line(self, line):
+        t = self.tableLines
+        r = t.rowCount()
+        t.insertRow(r)
+        name = QTableWidgetItem(self._material_label(line["id_material"]))
+        name.setFlags(name.flags() & ~Qt.ItemIsEditable)
+        name.setData(Qt.UserRole, (line.get("id_detail_po"), line["id_material"]))
+        sub = QTableWidgetItem()
+        sub.setFlags(sub.flags() & ~Qt.ItemIsEditable)
+        t.blockSignals(True)   # itemChanged baru berarti kalau user yang mengedit
+        t.setItem(r, 0, name)
+        t.setItem(r, 1, QTableWidgetItem(str(int(line.get("jumlah") or 0))))
+        t.setItem(r, 2, QTableWidgetItem(str(line.get("harga_satuan") or 0)))
+        t.setItem(r, 3, sub)
+        t.blockSignals(False)
+        self._update_line(r)
+
+    def _update_line(self, r):
+        t = self.tableLines
+        try:
+            sub = line_subtotal(t.item(r, 1).text(), t.item(r, 2).text())
+        except Exception:
+            sub = None   # angka belum valid, dicek lagi saat simpan
+        t.blockSignals(True)
+        t.item(r, 3).setText("?" if sub is None else f"{sub:,.2f}")
+        t.blockSignals(False)
+
+    def _on_line_changed(self, item):
+        if item.column() in (1, 2):
+            self._update_line(item.row())
+            self._update_total()
+
+    def _update_total(self):
+        try:
+            total = sum(line_subtotal(l["jumlah"], l["harga_satuan"]) for l in self.lines())
+        except Exception:
+            return
+        self.ui.findChild(QDoubleSpinBox, "spinTotal").setValue(float(total))
+
+    def lines(self):
+        """Baris detail di tabel sebagai list dict (id_detail_po None = baris baru)."""
+        t = self.tableLines
+        out = []
+        for r in range(t.rowCount()):
+            id_detail, id_material = t.item(r, 0).data(Qt.UserRole)
+            out.append({
+                "id_detail_po": id_detail,
+                "id_material": id_material,
+                "jumlah": int(t.item(r, 1).text()),
+                "harga_satuan": t.item(r, 2).text().strip(),
+            })
+        return out
+
+    def set_lines(self, rows):
+        t = self.tableLines
+        t.blockSignals(True)
+        t.setRowCount(0)
+        t.blockSignals(False)
+        for row in rows:
+            self._append_line(row)
+        self._removed = []
+        self._update_total()
+
+    def add_line(self):
+        id_material = self.ui.findChild(QComboBox, "comboMaterial").currentData()
+        if id_material is None:
+            QMessageBox.information(self, "Detail", "Pilih material.")
+            return
+        self._append_line({
+            "id_material": id_material,
+            "jumlah": self.ui.findChild(QSpinBox, "spinJumlah").value(),
+            "harga_satuan": f"{self.ui.findChild(QDoubleSpinBox, 'spinHargaSatuan').value():.2f}",
+        })
+        self._update_total()
+
+    def remove_line(self):
+        rows = sorted({i.row() for i in self.tableLines.selectedIndexes()}, reverse=True)
+        for r in rows:
+            id_detail, _ = self.tableLines.item(r, 0).data(Qt.UserRole)
+            if id_detail:
+                self._removed.append(id_detail)
+            self.tableLines.removeRow(r)
+        self._update_total()
+
+    # ========== form ==========
+    def clear_form(self):
+        super().clear_form()
+        if hasattr(self, "tableLines"):
+            self.worker.cancel_channel("lines")
+            self.set_lines([])
+
+    def _on_selection(self):
+        super()._on_selection()
+        id_po = int(self.get_form_data().get(self.PK) or 0)
+        if id_po:
+            self.worker.submit(crud.fetch_order_lines, id_po,
+                               on_done=self.set_lines, channel="lines")
+
+    def save_record(self):
+        header = self.get_form_data()
+        if not header.get("no_po"):
+            QMessageBox.information(self, "PO", "No PO wajib diisi.")
+            return
+        try:
+            lines = self.lines()
+            for l in lines:
+                line_subtotal(l["jumlah"], l["harga_satuan"])
+        except Exception:
+            QMessageBox.warning(self, "PO", "Jumlah / harga satuan ada yang bukan angka.")
+            return
+        self._set_busy(True)
+        self.worker.submit(crud.save_order, header, lines, list(self._removed),
+                           on_done=self._after_write("PO tersimpan (id={})"),
+                           on_error=self._write_failed)
+
+    def delete_record(self):
+        rid = int(self.get_form_data().get(self.PK) or 0)
+        if rid <= 0:
+            QMessageBox.information(self, "Hapus", "Pilih baris.")
+            return
+        if QMessageBox.question(self, "Konfirmasi", "Hapus PO ini beserta detailnya?") == QMessageBox.Yes:
+            self._set_busy(True)
+            self.worker.submit(crud.delete_order, rid,
+                               on_done=self._after_write(),
+                               on_error=self._write_failed)
@@ -0,0 +1,241 @@
+# profiler.py — catat waktu tiap statement crud & pengisian model ke ring buffer (tanpa Qt)
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+
+ENABLED = os.environ.get("DB_PROFILE", "0") == "1"   # bisa dinyalakan dari panel developer
+RING_SIZE = 5000        # event terakhir yang disimpan (statement + span model)
+SLOW_MS = float(os.environ.get("DB_SLOW_MS", "200"))   # statement selambat ini masuk log lambat
+SLOW_LOG = os.environ.get("DB_SLOW_LOG")               # file log lambat (opsional)
+SQL_MAX = 500           # SQL dipotong segini di event
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN|TABLE)\s+`?(\w+)`?", re.I)
+_T0 = time.perf_counter()
+
+
+def table_of(sql):
+    """Tabel pertama yang disebut di `sql` (untuk statistik per tabel)."""
+    m = _TABLE_RE.search(sql)
+    return m.group(1) if m else "-"
+
+
+def row_bytes(row):
+    """Perkiraan byte data satu baris (dict/tuple) hasil fetch."""
+    values = row.values() if isinstance(row, dict) else row
+    n = 0
+    for v in values:
+        if isinstance(v, (str, bytes, bytearray)):
+            n += len(v)
+        elif isinstance(v, Decimal):
+            n += 8
+        elif v is not None:
+            n += 8
+    return n
+
+
+class _TableStats:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "bytes", "slow", "errors",
+                 "fill_count", "fill_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.slow = 0
+        self.errors = 0
+        self.fill_count = 0
+        self.fill_ms = 0.0
+
+    def as_dict(self):
+        d = {k: getattr(self, k) for k in self.__slots__}
+        d["avg_ms"] = self.total_ms / self.count if self.count else 0.0
+        return d
+
+
+class Profiler:
+    """
+    Ring buffer event + statistik per tabel. Event statement:
+    {kind: "sql", table, sql, ts, conn_ms, exec_ms, fetch_ms, rows, bytes, error, thread};
+    event span (mis. isi model di BaseForm): {kind, table, ts, ms, rows, ...}.
+    ts = ms sejak modul dimuat (dipakai juga di export trace).
+    """
+
+    def __init__(self, enabled=ENABLED, size=RING_SIZE, slow_ms=SLOW_MS, slow_log=SLOW_LOG):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=size)
+        self._slow = deque(maxlen=200)
+        self._tables = {}
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+            self._slow.clear()
+            self._tables.clear()
+
+    @staticmethod
+    def now():
+        return (time.perf_counter() - _T0) * 1000
+
+    def _stats(self, table):
+        st = self._tables.get(table)
+        if st is None:
+            st = self._tables[table] = _TableStats()
+        return st
+
+    def statement(self, event):
+        total = event["conn_ms"] + event["exec_ms"] + event["fetch_ms"]
+        slow = total >= self.slow_ms
+        with self._lock:
+            self._events.append(event)
+            st = self._stats(event["table"])
+            st.count += 1
+            st.total_ms += total
+            st.max_ms = max(st.max_ms, total)
+            st.rows += event["rows"]
+            st.bytes += event["bytes"]
+            st.errors += event["error"] is not None
+            if slow:
+                st.slow += 1
+                self._slow.append(event)
+        if slow and self.slow_log:
+            try:
+                with open(self.slow_log, "a", encoding="utf-8") as f:
+                    f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {total:.1f} ms "
+                            f"rows={event['rows']} {event['sql']}\n")
+            except OSError:
+                pass
+
+    def span(self, kind, table, start_ms, **info):
+        """Catat span non-SQL (kind mis. 'model.page', 'model.show') dari start_ms sampai sekarang."""
+        if not self.enabled:
+            return
+        ms = self.now() - start_ms
+        event = dict(kind=kind, table=table, ts=start_ms, ms=ms,
+                     thread=threading.current_thread().name, **info)
+        with self._lock:
+            self._events.append(event)
+            st = self._stats(table)
+            st.fill_count += 1
+            st.fill_ms += ms
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def slow(self):
+        with self._lock:
+            return list(self._slow)
+
+    def table_stats(self):
+        with self._lock:
+            return {t: st.as_dict() for t, st in self._tables.items()}
+
+    def export_trace(self, path):
+        """Tulis event ke format Trace Event JSON (buka di chrome://tracing atau ui.perfetto.dev)."""
+        tids = {}
+        out = []
+        for e in self.events():
+            tid = tids.setdefault(e.get("thread", "-"), len(tids) + 1)
+            if e["kind"] == "sql":
+                dur = e["conn_ms"] + e["exec_ms"] + e["fetch_ms"]
+                name = f"{e['sql'].split(None, 1)[0].upper()} {e['table']}"
+                args = {k: e[k] for k in ("sql", "conn_ms", "exec_ms", "fetch_ms", "rows",
+                                          "bytes", "error")}
+            else:
+                dur = e["ms"]
+                name = f"{e['kind']} {e['table']}"
+                args = {k: v for k, v in e.items() if k not in ("kind", "ts", "ms", "thread")}
+            start = e["ts"] - e.get("conn_ms", 0.0)   # pinjam koneksi terjadi sebelum execute
+            out.append({"name": name, "cat": e["kind"], "ph": "X", "pid": os.getpid(),
+                        "tid": tid, "ts": start * 1000, "dur": dur * 1000, "args": args})
+        for name, tid in tids.items():
+            out.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                        "args": {"name": name}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": out, "displayTimeUnit": "ms"}, f, default=str)
+        return len(out)
+
+
+class TimedCursor:
+    """
+    Bungkus cursor DB-API: execute/executemany dan fetch* diukur, lalu dicatat ke profiler
+    sebagai satu event per statement (ditutup saat execute berikutnya atau close).
+    """
+
+    def __init__(self, cur, profiler, conn_ms=0.0):
+        self._cur = cur
+        self._prof = profiler
+        self._conn_ms = conn_ms   # waktu pinjam koneksi (ping dsb.), dibebankan ke statement pertama
+        self._event = None
+
+    def flush(self):
+        if self._event is not None:
+            self._prof.statement(self._event)
+            self._event = None
+
+    def _run(self, method, sql, args):
+        self.flush()
+        ev = self._event = dict(kind="sql", table=table_of(sql), sql=sql[:SQL_MAX],
+                                ts=self._prof.now(), conn_ms=self._conn_ms, exec_ms=0.0,
+                                fetch_ms=0.0, rows=0, bytes=0, error=None,
+                                thread=threading.current_thread().name)
+        self._conn_ms = 0.0
+        t0 = time.perf_counter()
+        try:
+            return method(sql, *args)
+        except Exception as e:
+            ev["error"] = str(e)[:200]
+            raise
+        finally:
+            ev["exec_ms"] = (time.perf_counter() - t0) * 1000
+            if method == self._cur.executemany and args:
+                ev["rows"] = len(args[0])
+
+    def execute(self, sql, *args):
+        return self._run(self._cur.execute, sql, args)
+
+    def executemany(self, sql, seq, *args):
+        seq = list(seq)
+        return self._run(self._cur.executemany, sql, (seq,) + args)
+
+    def _fetch(self, method, *args):
+        t0 = time.perf_counter()
+        result = method(*args)
+        ev = self._event
+        if ev is not None:
+            ev["fetch_ms"] += (time.perf_counter() - t0) * 1000
+            rows = [] if result is None else [result] if method == self._cur.fetchone else result
+            ev["rows"] += len(rows)
+            ev["bytes"] += sum(row_bytes(r) for r in rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cur.fetchone)
+
+    def fetchall(self):
+        return self._fetch(self._cur.fetchall)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cur.fetchmany, *args)
+
+    def close(self):
+        self.flush()
+        return self._cur.close()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+profiler = Profiler()
@@ -0,0 +1,33 @@
+# registry.py — definisi tabel aplikasi tanpa Qt: dipakai form (common.BaseForm),
+# crud (TABLES), dan service headless (api.py), jadi tabel/PK cukup ditulis di sini
+from collections import OrderedDict
+
+
+class TableDef:
+    """Satu tabel yang punya form: PK, kolom yang diisi form/API, filter header, tabel ringkasan."""
+
+    def __init__(self, name, pk, columns, filters=None, summary=""):
+        self.name = name
+        self.pk = pk
+        self.columns = tuple(columns)      # kolom yang boleh ditulis (tanpa diubah_pada)
+        self.filters = dict(filters or {})   # kolom -> jenis filter ('date', 'enum', 'range')
+        self.summary = summary             # tabel ringkasan_* (crud.SUMMARY_TABLES), "" = tidak ada
+
+
+# urutan = induk dulu baru anak (FK), sama dengan urutan isi dump
+REGISTRY = OrderedDict((t.name, t) for t in (
+    TableDef("material", "id_material",
+             ("id_material", "nama_material", "satuan", "harga"),
+             filters={"harga": "range"}, summary="ringkasan_material"),
+    TableDef("pemasok", "id_pemasok",
+             ("id_pemasok", "nama_pemasok", "alamat", "telepon", "email"),
+             summary="ringkasan_pemasok"),
+    TableDef("pelanggan", "id_pelanggan",
+             ("id_pelanggan", "nama_pelanggan", "alamat", "telepon", "email"),
+             summary="ringkasan_pelanggan"),
+    TableDef("purchase_order", "id_po",
+             ("id_po", "no_po", "tanggal_po", "id_pemasok", "id_pelanggan", "total", "status_po"),
+             filters={"tanggal_po": "date", "status_po": "enum", "total": "range"}),
+    TableDef("detail_po", "id_detail_po",
+             ("id_detail_po", "id_po", "id_material", "jumlah", "harga_satuan", "subtotal")),
+))
@@ -0,0 +1,582 @@
+# replica.py — replika lokal (SQLite) untuk kerja offline-first:
+# form baca/tulis ke file lokal, perubahan masuk outbox dan dikirim ke MySQL di belakang.
+import datetime
+import json
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from mysql.connector.errors import DataError, IntegrityError
+
+import backend_mysql
+import backend_sqlite
+from crud import DERIVED_COLUMNS, ROLLUPS, TABLES, add_write_hook, crud, insert_sql
+
+LOCAL_ID_BASE = 2_000_000_000   # id >= ini = baris yang dibuat lokal, belum punya id server
+SYNC_INTERVAL = 5       # detik antar siklus sinkron (lebih cepat kalau ada tulis lokal)
+RETRY_MAX = 60          # detik; jeda maksimum kalau server tidak bisa dihubungi
+PUSH_BATCH = 200        # entri outbox per transaksi MySQL
+PULL_BATCH = 1000       # baris per halaman tarikan
+PULL_OVERLAP = 2        # detik mundur dari watermark (transaksi server yang commit telat)
+RECONCILE_EVERY = 12    # tiap N siklus cocokkan daftar PK (menangkap DELETE di server)
+STAMP_COLUMN = "diubah_pada"   # timestamp ON UPDATE di server = watermark tarikan
+
+_LOCAL_DDL = (
+    "CREATE TABLE IF NOT EXISTS `_outbox` (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "tabel TEXT NOT NULL, op TEXT NOT NULL, pk INTEGER NOT NULL, data TEXT, base TEXT, "
+    "dibuat TEXT DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE TABLE IF NOT EXISTS `_sync_state` (tabel TEXT PRIMARY KEY, ts TEXT, pk INTEGER)",
+    "CREATE TABLE IF NOT EXISTS `_sync_flag` (applying INTEGER NOT NULL)",
+    # id lokal yang sudah diganti id server: referensi basi dari form masih bisa diterjemahkan
+    "CREATE TABLE IF NOT EXISTS `_id_map` (tabel TEXT NOT NULL, lokal INTEGER NOT NULL, "
+    "server INTEGER NOT NULL, PRIMARY KEY (tabel, lokal))",
+    "CREATE TABLE IF NOT EXISTS `_konflik` (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "tabel TEXT, op TEXT, pk INTEGER, data TEXT, alasan TEXT, "
+    "waktu TEXT DEFAULT CURRENT_TIMESTAMP)",
+)
+
+
+def _to_server(v):
+    # angka dari json_object SQLite datang sebagai float: kirim ke kolom decimal tanpa galat biner
+    return Decimal(repr(v)) if isinstance(v, float) else v
+
+
+def _as_stamp(v):
+    if v is None or isinstance(v, datetime.datetime):
+        return v
+    return datetime.datetime.fromisoformat(str(v))
+
+
+class _LocalSchema:
+    """Kolom, PK, dan FK tabel replika (dibaca sekali dari PRAGMA lewat backend SQLite)."""
+
+    def __init__(self, backend):
+        cols, fks = backend.load_schema(crud(backend), TABLES)
+        self.columns = {t: [] for t in TABLES}
+        self.pk = {}
+        self.children = {t: [] for t in TABLES}   # tabel induk -> [(tabel anak, kolom FK)]
+        self.fks = {t: {} for t in TABLES}        # tabel -> {kolom FK: tabel induk}
+        for r in cols:
+            self.columns[r["TABLE_NAME"]].append(r["COLUMN_NAME"])
+            if r["COLUMN_KEY"] == "PRI":
+                self.pk[r["TABLE_NAME"]] = r["COLUMN_NAME"]
+        for r in fks:
+            self.children[r["REFERENCED_TABLE_NAME"]].append((r["TABLE_NAME"], r["COLUMN_NAME"]))
+            self.fks[r["TABLE_NAME"]][r["COLUMN_NAME"]] = r["REFERENCED_TABLE_NAME"]
+
+
+class Backend(backend_sqlite.Backend):
+    """
+    Backend SQLite yang sekaligus replika MySQL: semua query form jalan di file lokal.
+    Trigger SQLite mencatat tiap INSERT/UPDATE/DELETE ke tabel _outbox dalam transaksi
+    yang sama dengan tulisnya (tidak hilang walau aplikasi ditutup sebelum sinkron).
+    """
+    name = "replica"
+
+    def __init__(self, path, dump_path, pool_size, server_config, interval=SYNC_INTERVAL):
+        super().__init__(path, dump_path, pool_size)
+        self.schema = _LocalSchema(self)
+        self._install()
+        self.sync = Syncer(self, server_config, interval)
+        add_write_hook(self.sync.on_write)
+        self.sync.start()
+
+    @contextmanager
+    def raw(self):
+        """Koneksi sqlite3 mentah dari pool (placeholder ?, tanpa lapisan crud)."""
+        conn = self.get_connection()
+        try:
+            yield conn.raw
+        finally:
+            self.release(conn)
+
+    def _install(self):
+        with self.raw() as raw:
+            for stmt in _LOCAL_DDL:
+                raw.execute(stmt)
+            raw.execute("DELETE FROM `_sync_flag`")
+            raw.execute("INSERT INTO `_sync_flag` VALUES (0)")
+            for t in TABLES:
+                self._install_table(raw, t)
+            for child in ROLLUPS:
+                self._guard_rollup(raw, child)
+
+    def _install_table(self, raw, t):
+        cols, pk = self.schema.columns[t], self.schema.pk[t]
+        stamp = STAMP_COLUMN if STAMP_COLUMN in cols else None
+        row = ", ".join(f"'{c}', new.`{c}`" for c in cols)
+        guard = "(SELECT applying FROM `_sync_flag`) = 0"
+        # stempel waktu hanya dipercaya kalau barisnya berasal dari server
+        base = (f"CASE WHEN old.`{pk}` >= {LOCAL_ID_BASE} THEN NULL ELSE old.`{stamp}` END"
+                if stamp else "NULL")
+        # UPDATE dari trigger _idmap (FK id lokal basi -> id server) tidak perlu dikirim lagi;
+        # IFNULL: FK NULL jangan sampai bikin syaratnya NULL (trigger jadi tidak jalan)
+        fixup = " OR ".join(
+            f"(IFNULL(old.`{col}`, 0) >= {LOCAL_ID_BASE} AND new.`{col}` IS "
+            f"(SELECT server FROM `_id_map` WHERE tabel = '{parent}' AND lokal = old.`{col}`))"
+            for col, parent in self.schema.fks[t].items())
+        au_guard = f"{guard} AND NOT ({fixup})" if fixup else guard
+        # kolom turunan (subtotal/total) diisi trigger di kedua sisi: perubahannya saja tidak dikirim
+        derived = DERIVED_COLUMNS.get(t, ())
+        if derived:
+            own = " OR ".join(f"new.`{c}` IS NOT old.`{c}`" for c in cols
+                              if c not in derived and c != STAMP_COLUMN)
+            au_guard = f"{au_guard} AND ({own})"
+        # di replika diubah_pada = milik server; ON UPDATE lokal dimatikan
+        raw.execute(f"DROP TRIGGER IF EXISTS `{t}__{STAMP_COLUMN}`")
+        for suffix, ddl in (
+            ("ai", f"AFTER INSERT ON `{t}` WHEN {guard} BEGIN "
+                   f"INSERT INTO `_outbox`(tabel, op, pk, data) "
+                   f"VALUES ('{t}', 'insert', new.`{pk}`, json_object({row})); END"),
+            ("au", f"AFTER UPDATE ON `{t}` WHEN {au_guard} BEGIN "
+                   f"INSERT INTO `_outbox`(tabel, op, pk, data, base) "
+                   f"VALUES ('{t}', 'update', new.`{pk}`, json_object({row}), {base}); END"),
+            ("ad", f"AFTER DELETE ON `{t}` WHEN {guard} BEGIN "
+                   f"INSERT INTO `_outbox`(tabel, op, pk, base) "
+                   f"VALUES ('{t}', 'delete', old.`{pk}`, {base}); END"),
+        ):
+            raw.execute(f"DROP TRIGGER IF EXISTS `_outbox_{t}_{suffix}`")
+            raw.execute(f"CREATE TRIGGER `_outbox_{t}_{suffix}` {ddl}")
+        # FK yang masih menunjuk id lokal lama (combo yang belum di-refresh) dibetulkan
+        # dalam statement yang sama, sebelum SQLite mengecek constraint-nya
+        for col, parent in self.schema.fks[t].items():
+            server_id = f"(SELECT server FROM `_id_map` WHERE tabel = '{parent}' AND lokal = new.`{col}`)"
+            for suffix, event in (("ai", "INSERT"), ("au", f"UPDATE OF `{col}`")):
+                raw.execute(f"DROP TRIGGER IF EXISTS `_idmap_{t}_{col}_{suffix}`")
+                raw.execute(
+                    f"CREATE TRIGGER `_idmap_{t}_{col}_{suffix}` AFTER {event} ON `{t}` "
+                    f"WHEN new.`{col}` >= {LOCAL_ID_BASE} AND {server_id} IS NOT NULL BEGIN "
+                    f"UPDATE `{t}` SET `{col}` = {server_id} WHERE `{pk}` = new.`{pk}`; END")
+        # id baris baru lokal mulai dari LOCAL_ID_BASE supaya tidak bentrok dengan id server
+        if raw.execute("SELECT 1 FROM sqlite_sequence WHERE name = ?", (t,)).fetchone():
+            raw.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?",
+                        (LOCAL_ID_BASE - 1, t))
+        else:
+            raw.execute("INSERT INTO sqlite_sequence(name, seq) VALUES (?, ?)", (t, LOCAL_ID_BASE - 1))
+
+    def _guard_rollup(self, raw, child):
+        """
+        Trigger total induk dari dump tidak jalan saat menerapkan data server: baris induk
+        yang ditarik sudah membawa total versi server, delta lokal akan menghitungnya dua kali.
+        """
+        guard = "(SELECT applying FROM `_sync_flag`) = 0"
+        for name, sql in raw.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ? "
+                "AND name LIKE '%\\_total' ESCAPE '\\'", (child,)).fetchall():
+            if "_sync_flag" in sql or "FOR EACH ROW" not in sql:
+                continue
+            raw.execute(f"DROP TRIGGER `{name}`")
+            raw.execute(sql.replace("FOR EACH ROW", f"FOR EACH ROW WHEN {guard}", 1))
+
+    @contextmanager
+    def applying(self):
+        """Transaksi lokal untuk menerapkan data server: trigger outbox tidak mencatat apa-apa."""
+        with self.raw() as raw:
+            raw.execute("BEGIN IMMEDIATE")
+            try:
+                raw.execute("PRAGMA defer_foreign_keys = ON")   # urutan baris bebas, dicek saat commit
+                raw.execute("UPDATE `_sync_flag` SET applying = 1")
+                yield raw
+                raw.execute("UPDATE `_sync_flag` SET applying = 0")
+                raw.execute("COMMIT")
+            except BaseException:
+                raw.execute("ROLLBACK")
+                raise
+
+    def stats(self):
+        return dict(super().stats(), **self.sync.status())
+
+
+class Syncer(threading.Thread):
+    """
+    Sinkron di belakang, satu siklus:
+    1. push  — outbox dikirim per PUSH_BATCH entri dalam satu transaksi MySQL;
+               id lokal (>= LOCAL_ID_BASE) diganti id dari server, juga di FK anak & outbox.
+    2. pull  — hanya kalau outbox kosong; baris server dengan diubah_pada >= watermark
+               (tabel tanpa kolom itu: PK > PK terakhir) di-upsert ke lokal.
+    3. reconcile (tiap RECONCILE_EVERY siklus) — COUNT/SUM(PK) dibandingkan; kalau beda,
+               daftar PK dicocokkan untuk menangkap DELETE dan baris yang terlewat.
+
+    Konflik — server menang: UPDATE/DELETE lokal atas baris yang sudah berubah (atau
+    hilang) di server sejak terakhir ditarik, dan tulis yang ditolak server (duplikat,
+    FK), tidak diterapkan; isinya disimpan di tabel _konflik dan baris lokal
+    dikembalikan ke versi server. Pengiriman at-least-once: kalau aplikasi mati persis
+    sesudah commit MySQL dan sebelum outbox lokal dibersihkan, INSERT bisa terkirim dua kali.
+    """
+
+    def __init__(self, local, server_config, interval=SYNC_INTERVAL):
+        super().__init__(name="replica-sync", daemon=True)
+        self.local = local
+        self.schema = local.schema
+        self._config = server_config
+        self._server = None
+        self._stamped = None      # tabel server yang punya STAMP_COLUMN
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.cycles = 0
+        self.pushed = 0
+        self.pulled = 0
+        self.conflicts = 0
+        self.last_sync = None
+        self.last_error = None
+
+    # ----- kontrol -----
+    def on_write(self, table, op, pk_name, pk, data):
+        if threading.current_thread() is not self:
+            self._wake.set()   # ada tulis lokal: kirim secepatnya, tidak nunggu interval
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def status(self):
+        with self.local.raw() as raw:
+            pending = raw.execute("SELECT COUNT(*) FROM `_outbox`").fetchone()[0]
+        with self._lock:
+            return {"outbox": pending, "pushed": self.pushed, "pulled": self.pulled,
+                    "conflicts": self.conflicts, "online": self._server is not None,
+                    "last_sync": self.last_sync, "last_error": self.last_error}
+
+    def run(self):
+        delay = 0
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.sync_once()
+                delay = self.interval
+                with self._lock:
+                    self.last_error = None
+                    self.last_sync = time.time()
+            except Exception as e:
+                self._server = None   # koneksi dibuat ulang di siklus berikutnya
+                delay = min(max(delay, self.interval) * 2, RETRY_MAX)
+                with self._lock:
+                    self.last_error = str(e)
+
+    # ----- server -----
+    def server(self):
+        if self._server is None:
+            backend = backend_mysql.Backend(self._config, 2)
+            db = crud(backend)
+            with db.cursor() as cur:
+                cur.execute("SELECT TABLE_NAME FROM information_schema.COLUMNS "
+                            "WHERE TABLE_SCHEMA = DATABASE() AND COLUMN_NAME = %s", (STAMP_COLUMN,))
+                self._stamped = {r["TABLE_NAME"] for r in cur.fetchall()}
+            self._server = db
+        return self._server
+
+    def sync_once(self):
+        server = self.server()
+        while self.push(server):
+            pass
+        with self.local.raw() as raw:
+            if raw.execute("SELECT 1 FROM `_outbox` LIMIT 1").fetchone():
+                return   # ada tulis baru selama push: tarik di siklus berikutnya
+        changed = self.pull(server)
+        self.cycles += 1
+        if self.cycles % RECONCILE_EVERY == 0:
+            changed |= self.reconcile(server)
+        for t in TABLES:
+            if t in changed:
+                crud.notify_bulk_write(t)
+
+    # ----- push -----
+    def push(self, server):
+        """Kirim satu batch outbox; True kalau masih ada sisa."""
+        with self.local.raw() as raw:
+            entries = raw.execute("SELECT seq, tabel, op, pk, data, base FROM `_outbox` "
+                                  "ORDER BY seq LIMIT ?", (PUSH_BATCH,)).fetchall()
+        if not entries:
+            return False
+        idmap, touched, conflicts = {}, {}, []
+        known = self._known_ids(entries)
+        with server.transaction() as cur:
+            stamps = self._server_stamps(cur, entries)
+            for seq, t, op, pk, data, base in entries:
+                pk_name = self.schema.pk[t]
+                pk = idmap.get((t, pk)) or known.get((t, pk), pk)
+                row = json.loads(data) if data else {}
+                for col, parent in self.schema.fks[t].items():
+                    if row.get(col) is not None:
+                        row[col] = idmap.get((parent, row[col])) or known.get((parent, row[col]), row[col])
+                if op != "insert" and pk >= LOCAL_ID_BASE:
+                    if op == "update":   # induknya gagal dikirim
+                        conflicts.append((t, op, pk, data, "baris lokal tidak pernah sampai ke server"))
+                    continue
+                server_stamp = stamps.get((t, pk), False)
+                if op != "insert" and base is not None and t in self._stamped:
+                    if server_stamp is None:
+                        if op == "update":
+                            conflicts.append((t, op, pk, data, "sudah dihapus di server"))
+                            touched.setdefault(t, set()).add(pk)
+                        continue
+                    if server_stamp is not False and server_stamp > _as_stamp(base):
+                        conflicts.append((t, op, pk, data, "sudah diubah di server"))
+                        touched.setdefault(t, set()).add(pk)
+                        continue
+                derived = DERIVED_COLUMNS.get(t, ())
+                cols = tuple(c for c, v in row.items()
+                             if c != STAMP_COLUMN and c not in derived and v is not None and
+                             not (c == pk_name and pk >= LOCAL_ID_BASE))
+                try:
+                    if op == "insert":
+                        cur.execute(insert_sql(t, cols), tuple(_to_server(row[c]) for c in cols))
+                        new_pk = cur.lastrowid if pk >= LOCAL_ID_BASE else pk
+                        if pk >= LOCAL_ID_BASE:
+                            idmap[(t, pk)] = new_pk
+                        touched.setdefault(t, set()).add(new_pk)
+                    elif op == "update":
+                        cols = tuple(c for c in row
+                                     if c not in (pk_name, STAMP_COLUMN) and c not in derived)
+                        cur.execute(f"UPDATE `{t}` SET {', '.join(f'`{c}`=%s' for c in cols)} "
+                                    f"WHERE `{pk_name}`=%s",
+                                    tuple(_to_server(row[c]) for c in cols) + (pk,))
+                        touched.setdefault(t, set()).add(pk)
+                    else:
+                        if t in ROLLUPS:   # entri delete tidak membawa data: induknya dibaca dulu
+                            cur.execute(f"SELECT `{ROLLUPS[t][1]}` FROM `{t}` WHERE `{pk_name}`=%s", (pk,))
+                            found = cur.fetchone()
+                            if found:
+                                row = {ROLLUPS[t][1]: found[0]}
+                        cur.execute(f"DELETE FROM `{t}` WHERE `{pk_name}`=%s", (pk,))
+                    if t in ROLLUPS and row.get(ROLLUPS[t][1]) is not None:
+                        # total induk berubah di server (trigger): versi & stempelnya ikut ditarik
+                        touched.setdefault(ROLLUPS[t][0], set()).add(row[ROLLUPS[t][1]])
+                except (IntegrityError, DataError) as e:
+                    conflicts.append((t, op, pk, data, f"ditolak server: {e}"))
+                    touched.setdefault(t, set()).add(pk)
+        self._after_push(server, entries[-1][0], idmap, touched, conflicts)
+        with self._lock:
+            self.pushed += len(entries)
+            self.conflicts += len(conflicts)
+        return len(entries) == PUSH_BATCH
+
+    def _known_ids(self, entries):
+        """{(tabel, id_lokal): id_server} dari _id_map untuk id lokal yang disebut di batch."""
+        wanted = {}
+        for _, t, _, pk, data, _ in entries:
+            if pk >= LOCAL_ID_BASE:
+                wanted.setdefault(t, set()).add(pk)
+            row = json.loads(data) if data else {}
+            for col, parent in self.schema.fks[t].items():
+                if (row.get(col) or 0) >= LOCAL_ID_BASE:
+                    wanted.setdefault(parent, set()).add(row[col])
+        known = {}
+        with self.local.raw() as raw:
+            # lewat PK (tabel, lokal): biaya ikut ukuran batch, bukan ukuran _id_map yang terus tumbuh
+            for t, ids in wanted.items():
+                ids = sorted(ids)
+                for lokal, server in raw.execute(
+                        f"SELECT lokal, server FROM `_id_map` WHERE tabel = ? "
+                        f"AND lokal IN ({', '.join(['?'] * len(ids))})", (t, *ids)):
+                    known[(t, lokal)] = server
+        return known
+
+    def _server_stamps(self, cur, entries):
+        """{(tabel, pk): diubah_pada server, None = tidak ada} untuk UPDATE/DELETE di batch."""
+        want = {}
+        for _, t, op, pk, _, base in entries:
+            if op != "insert" and base is not None and t in self._stamped:
+                want.setdefault(t, set()).add(pk)
+        out = {}
+        for t, pks in want.items():
+            pk_name = self.schema.pk[t]
+            pks = sorted(pks)
+            cur.execute(f"SELECT `{pk_name}`, `{STAMP_COLUMN}` FROM `{t}` WHERE `{pk_name}` IN "
+                        f"({', '.join(['%s'] * len(pks))}) FOR UPDATE", tuple(pks))
+            found = dict(cur.fetchall())
+            for pk in pks:
+                out[(t, pk)] = found.get(pk)
+        return out
+
+    def _after_push(self, server, last_seq, idmap, touched, conflicts):
+        fresh = {t: self._fetch_rows(server, t, pks) for t, pks in touched.items()
+                 if not all(pk >= LOCAL_ID_BASE for pk in pks)}
+        with self.local.applying() as raw:
+            for (t, old), new in idmap.items():
+                self._remap(raw, t, old, new, last_seq)
+            for t, op, pk, data, reason in conflicts:
+                raw.execute("INSERT INTO `_konflik`(tabel, op, pk, data, alasan) VALUES (?, ?, ?, ?, ?)",
+                            (t, op, pk, data, reason))
+                if op == "insert" and pk >= LOCAL_ID_BASE:
+                    self._drop_local(raw, t, pk)   # server menolak: baris lokal dibuang
+            raw.execute("DELETE FROM `_outbox` WHERE seq <= ?", (last_seq,))
+            for t in TABLES:
+                if t in fresh:
+                    rows = fresh[t]
+                    pk_name = self.schema.pk[t]
+                    pending = {pk for (pk,) in raw.execute(
+                        "SELECT DISTINCT pk FROM `_outbox` WHERE tabel = ?", (t,))}
+                    self._upsert(raw, t, [r for r in rows if r[pk_name] not in pending])
+                    gone = touched[t] - {r[pk_name] for r in rows}
+                    for pk in gone - pending:
+                        if pk < LOCAL_ID_BASE:
+                            self._drop_local(raw, t, pk)
+                    for r in rows:
+                        if r.get(STAMP_COLUMN) is not None:
+                            # entri yang masih antri dibandingkan dengan versi server yang baru
+                            raw.execute("UPDATE `_outbox` SET base = ? WHERE tabel = ? AND pk = ?",
+                                        (r[STAMP_COLUMN], t, r[pk_name]))
+        for t in set(touched) | {t for t, _ in idmap}:
+            crud.notify_bulk_write(t)
+
+    def _remap(self, raw, t, old, new, last_seq):
+        pk_name = self.schema.pk[t]
+        raw.execute(f"UPDATE `{t}` SET `{pk_name}` = ? WHERE `{pk_name}` = ?", (new, old))
+        raw.execute("INSERT OR REPLACE INTO `_id_map`(tabel, lokal, server) VALUES (?, ?, ?)",
+                    (t, old, new))
+        raw.execute("UPDATE `_outbox` SET pk = ? WHERE tabel = ? AND pk = ? AND seq > ?",
+                    (new, t, old, last_seq))
+        for child, col in self.schema.children[t]:
+            raw.execute(f"UPDATE `{child}` SET `{col}` = ? WHERE `{col}` = ?", (new, old))
+            raw.execute("UPDATE `_outbox` SET data = json_set(data, ?, ?) WHERE tabel = ? "
+                        "AND json_extract(data, ?) = ? AND seq > ?",
+                        (f"$.{col}", new, child, f"$.{col}", old, last_seq))
+
+    def _drop_local(self, raw, t, pk):
+        """Hapus baris lokal beserta anak-anaknya (FK) dan entri outbox-nya."""
+        for child, col in self.schema.children[t]:
+            child_pk = self.schema.pk[child]
+            for (cpk,) in raw.execute(f"SELECT `{child_pk}` FROM `{child}` WHERE `{col}` = ?",
+                                      (pk,)).fetchall():
+                self._drop_local(raw, child, cpk)
+        parent = None
+        if t in ROLLUPS:
+            found = raw.execute(f"SELECT `{ROLLUPS[t][1]}` FROM `{t}` WHERE `{self.schema.pk[t]}` = ?",
+                                (pk,)).fetchone()
+            parent = found[0] if found else None
+        raw.execute(f"DELETE FROM `{t}` WHERE `{self.schema.pk[t]}` = ?", (pk,))
+        raw.execute("DELETE FROM `_outbox` WHERE tabel = ? AND pk = ?", (t, pk))
+        if parent is not None:
+            # trigger total mati selama applying(): total induk dihitung ulang di sini
+            table, fk = ROLLUPS[t]
+            raw.execute(f"UPDATE `{table}` SET `{DERIVED_COLUMNS[table][0]}` = "
+                        f"(SELECT ROUND(COALESCE(SUM(`{DERIVED_COLUMNS[t][0]}`), 0), 2) "
+                        f"FROM `{t}` WHERE `{fk}` = ?) WHERE `{self.schema.pk[table]}` = ?",
+                        (parent, parent))
+
+    # ----- pull -----
+    def _fetch_rows(self, server, t, pks):
+        pk_name = self.schema.pk[t]
+        pks = sorted(pk for pk in pks if pk < LOCAL_ID_BASE)
+        rows = []
+        for i in range(0, len(pks), PULL_BATCH):
+            chunk = pks[i:i + PULL_BATCH]
+            with server.cursor() as cur:
+                cur.execute(f"SELECT * FROM `{t}` WHERE `{pk_name}` IN "
+                            f"({', '.join(['%s'] * len(chunk))})", tuple(chunk))
+                rows += cur.fetchall()
+        return rows
+
+    def _upsert(self, raw, t, rows):
+        """Terapkan baris server ke lokal; return jumlah yang benar-benar berubah."""
+        if not rows:
+            return 0
+        pk_name = self.schema.pk[t]
+        cols = [c for c in self.schema.columns[t] if c in rows[0]]
+        if STAMP_COLUMN in cols:
+            # lewati baris yang versinya sudah sama (tarikan overlap tidak memicu tulis/notify)
+            local = {}
+            pks = [r[pk_name] for r in rows]
+            for i in range(0, len(pks), 500):
+                chunk = pks[i:i + 500]
+                local.update(raw.execute(
+                    f"SELECT `{pk_name}`, `{STAMP_COLUMN}` FROM `{t}` WHERE `{pk_name}` IN "
+                    f"({', '.join('?' * len(chunk))})", chunk).fetchall())
+            rows = [r for r in rows if local.get(r[pk_name], False) != r[STAMP_COLUMN]]
+        if rows:
+            raw.executemany(
+                f"INSERT INTO `{t}` ({', '.join(f'`{c}`' for c in cols)}) "
+                f"VALUES ({', '.join('?' * len(cols))}) ON CONFLICT(`{pk_name}`) DO UPDATE SET "
+                f"{', '.join(f'`{c}`=excluded.`{c}`' for c in cols if c != pk_name)}",
+                [tuple(r[c] for c in cols) for r in rows])
+        return len(rows)
+
+    def pull(self, server):
+        """Tarik perubahan server sejak watermark tiap tabel; return set tabel yang berubah."""
+        changed = set()
+        for t in TABLES:
+            pk_name = self.schema.pk[t]
+            with self.local.raw() as raw:
+                state = raw.execute("SELECT ts, pk FROM `_sync_state` WHERE tabel = ?", (t,)).fetchone()
+            ts, last_pk = state if state else (None, None)
+            stamped = t in self._stamped
+            if stamped and ts is not None:
+                ts, last_pk = _as_stamp(ts) - datetime.timedelta(seconds=PULL_OVERLAP), 0
+            while True:
+                with server.cursor() as cur:
+                    if stamped and ts is not None:
+                        cur.execute(f"SELECT * FROM `{t}` WHERE `{STAMP_COLUMN}` > %s OR "
+                                    f"(`{STAMP_COLUMN}` = %s AND `{pk_name}` > %s) "
+                                    f"ORDER BY `{STAMP_COLUMN}`, `{pk_name}` LIMIT %s",
+                                    (ts, ts, last_pk, PULL_BATCH))
+                    elif stamped:
+                        cur.execute(f"SELECT * FROM `{t}` ORDER BY `{STAMP_COLUMN}`, `{pk_name}` "
+                                    f"LIMIT %s", (PULL_BATCH,))
+                    else:
+                        cur.execute(f"SELECT * FROM `{t}` WHERE `{pk_name}` > %s "
+                                    f"ORDER BY `{pk_name}` LIMIT %s", (last_pk or 0, PULL_BATCH))
+                    rows = cur.fetchall()
+                if not rows:
+                    break
+                last = rows[-1]
+                ts = last[STAMP_COLUMN] if stamped else None
+                last_pk = last[pk_name]
+                with self.local.applying() as raw:
+                    # baris yang punya tulis lokal yang belum terkirim tidak ditimpa
+                    pending = {pk for (pk,) in raw.execute(
+                        "SELECT DISTINCT pk FROM `_outbox` WHERE tabel = ?", (t,))}
+                    n = self._upsert(raw, t, [r for r in rows if r[pk_name] not in pending])
+                    raw.execute("INSERT OR REPLACE INTO `_sync_state`(tabel, ts, pk) VALUES (?, ?, ?)",
+                                (t, ts, last_pk))
+                if n:
+                    changed.add(t)
+                    with self._lock:
+                        self.pulled += n
+                if len(rows) < PULL_BATCH:
+                    break
+        return changed
+
+    def reconcile(self, server):
+        """Cocokkan himpunan PK lokal vs server (hanya tabel yang COUNT/SUM-nya beda)."""
+        changed = set()
+        diffs = {}
+        for t in TABLES:
+            pk_name = self.schema.pk[t]
+            sql = f"SELECT COUNT(*), COALESCE(SUM(`{pk_name}`), 0) FROM `{t}`"
+            _, cols = server.fetch_columns(sql)
+            remote = (cols[0][0], int(cols[1][0]))
+            with self.local.raw() as raw:
+                n, s = raw.execute(sql + f" WHERE `{pk_name}` < ?", (LOCAL_ID_BASE,)).fetchone()
+            if remote == (n, int(s)):
+                continue
+            _, cols = server.fetch_columns(f"SELECT `{pk_name}` FROM `{t}`")
+            remote_ids = set(cols[0]) if cols else set()
+            with self.local.raw() as raw:
+                local_ids = {pk for (pk,) in raw.execute(
+                    f"SELECT `{pk_name}` FROM `{t}` WHERE `{pk_name}` < ?", (LOCAL_ID_BASE,))}
+            diffs[t] = (remote_ids - local_ids, local_ids - remote_ids)
+        for t in TABLES:   # induk dulu untuk baris yang kurang ...
+            if t in diffs and diffs[t][0]:
+                rows = self._fetch_rows(server, t, diffs[t][0])
+                with self.local.applying() as raw:
+                    if self._upsert(raw, t, rows):
+                        changed.add(t)
+        for t in reversed(TABLES):   # ... anak dulu untuk baris yang sudah dihapus di server
+            if t in diffs and diffs[t][1]:
+                with self.local.applying() as raw:
+                    pending = {pk for (pk,) in raw.execute(
+                        "SELECT DISTINCT pk FROM `_outbox` WHERE tabel = ?", (t,))}
+                    for pk in diffs[t][1] - pending:
+                        self._drop_local(raw, t, pk)
+                changed.add(t)
+        return changed
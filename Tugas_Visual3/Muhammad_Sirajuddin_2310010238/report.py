@@ -0,0 +1,233 @@
+# report.py — laporan agregat purchase_order / detail_po / material / pemasok / pelanggan
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from crud import add_invalidate_hook, add_write_hook
+
+STATUS_ORDER = ["Draft", "Disetujui", "Dikirim", "Selesai"]   # urutan enum status_po
+CACHE_TTL = 300      # detik; batas atas kalau tulis dari proses lain tidak terlihat poller change_log
+CACHE_SIZE = 32      # jumlah set parameter yang disimpan
+REPORT_TABLES = {"purchase_order", "detail_po", "material", "pemasok", "pelanggan"}
+
+
+def _period(alias, date_from, date_to):
+    """WHERE tanggal_po (tanggal 'yyyy-mm-dd' atau None = tidak dibatasi)."""
+    conds, params = [], []
+    if date_from:
+        conds.append(f"{alias}.`tanggal_po` >= %s")
+        params.append(date_from)
+    if date_to:
+        conds.append(f"{alias}.`tanggal_po` <= %s")
+        params.append(date_to)
+    return (" WHERE " + " AND ".join(conds)) if conds else "", tuple(params)
+
+
+def _frame(db, sql, params, numeric=()):
+    """Query -> DataFrame yang dibangun per kolom (kolom angka jadi array float64)."""
+    names, cols = db.fetch_columns(sql, params)
+    data = {}
+    for name, values in zip(names, cols):
+        if name in numeric:
+            data[name] = np.array([0.0 if v is None else float(v) for v in values], dtype=np.float64)
+        else:
+            data[name] = list(values)
+    return pd.DataFrame(data, columns=names)
+
+
+# ========== laporan ==========
+def _spend_by(db, table, key, name, label, date_from, date_to):
+    """
+    Belanja per pemasok/pelanggan. Tanpa periode dibaca langsung dari tabel ringkasan_<tabel>
+    (dijaga trigger, satu baris per kunci); dengan periode diagregasi dari purchase_order.
+    """
+    if not date_from and not date_to:
+        sql = f"""
+        SELECT COALESCE(x.`{name}`, '{label}') AS {table}, r.`jumlah_po`, r.`total`
+        FROM `ringkasan_{table}` r
+        LEFT JOIN `{table}` x ON x.`{key}` = r.`{key}`
+        WHERE r.`jumlah_po` > 0
+        ORDER BY r.`total` DESC"""
+        params = ()
+    else:
+        where, params = _period("po", date_from, date_to)
+        sql = f"""
+        SELECT COALESCE(x.`{name}`, '{label}') AS {table},
+               COUNT(*) AS jumlah_po, SUM(po.`total`) AS total
+        FROM `purchase_order` po
+        LEFT JOIN `{table}` x ON x.`{key}` = po.`{key}`{where}
+        GROUP BY po.`{key}`, x.`{name}`
+        ORDER BY total DESC"""
+    df = _frame(db, sql, params, numeric=("jumlah_po", "total"))
+    total = df["total"].to_numpy()
+    grand = total.sum()
+    df["rata_rata"] = np.divide(total, df["jumlah_po"].to_numpy(),
+                                out=np.zeros_like(total), where=df["jumlah_po"].to_numpy() > 0)
+    df["porsi_%"] = np.round(total / grand * 100, 2) if grand else 0.0
+    df["jumlah_po"] = df["jumlah_po"].astype(np.int64)
+    return df
+
+
+def spend_by_supplier(db, date_from=None, date_to=None):
+    """Belanja per pemasok: jumlah PO, total, rata-rata, dan porsi (%) dari seluruh belanja."""
+    return _spend_by(db, "pemasok", "id_pemasok", "nama_pemasok", "(tanpa pemasok)",
+                     date_from, date_to)
+
+
+def spend_by_customer(db, date_from=None, date_to=None):
+    """Nilai PO per pelanggan: jumlah PO, total, rata-rata, dan porsi (%)."""
+    return _spend_by(db, "pelanggan", "id_pelanggan", "nama_pelanggan", "(tanpa pelanggan)",
+                     date_from, date_to)
+
+
+def material_totals(db, date_from=None, date_to=None):
+    """Pembelian per material: baris detail, jumlah, subtotal (tanpa periode: dari ringkasan_material)."""
+    if not date_from and not date_to:
+        sql = """
+        SELECT r.`id_material`, m.`nama_material` AS material,
+               r.`jumlah_baris`, r.`jumlah`, r.`subtotal`
+        FROM `ringkasan_material` r
+        LEFT JOIN `material` m ON m.`id_material` = r.`id_material`
+        WHERE r.`jumlah_baris` > 0
+        ORDER BY r.`subtotal` DESC"""
+        params = ()
+    else:
+        where, params = _period("po", date_from, date_to)
+        sql = f"""
+        SELECT COALESCE(d.`id_material`, 0) AS id_material, m.`nama_material` AS material,
+               COUNT(*) AS jumlah_baris, SUM(d.`jumlah`) AS jumlah, SUM(d.`subtotal`) AS subtotal
+        FROM `detail_po` d
+        JOIN `purchase_order` po ON po.`id_po` = d.`id_po`
+        LEFT JOIN `material` m ON m.`id_material` = d.`id_material`{where}
+        GROUP BY COALESCE(d.`id_material`, 0), m.`nama_material`
+        ORDER BY subtotal DESC"""
+    df = _frame(db, sql, params, numeric=("jumlah_baris", "jumlah", "subtotal"))
+    # kunci 0 = detail tanpa material; id yang materialnya sudah dihapus diberi label #id
+    missing = df["material"].isna()
+    df.loc[missing, "material"] = np.where(df.loc[missing, "id_material"] == 0, "(tanpa material)",
+                                           "#" + df.loc[missing, "id_material"].astype(str))
+    df["jumlah_baris"] = df["jumlah_baris"].astype(np.int64)
+    return df.drop(columns="id_material")
+
+
+def material_per_month(db, date_from=None, date_to=None, value="jumlah"):
+    """Pemakaian material per bulan (pivot material x bulan) dari detail_po; value = jumlah/subtotal."""
+    where, params = _period("po", date_from, date_to)
+    long = _frame(db, f"""
+        SELECT d.`id_material`, m.`nama_material` AS material,
+               SUBSTR(po.`tanggal_po`, 1, 7) AS bulan,
+               SUM(d.`jumlah`) AS jumlah, SUM(d.`subtotal`) AS subtotal
+        FROM `detail_po` d
+        JOIN `purchase_order` po ON po.`id_po` = d.`id_po`
+        LEFT JOIN `material` m ON m.`id_material` = d.`id_material`{where}
+        GROUP BY d.`id_material`, m.`nama_material`, bulan""", params,
+                  numeric=("jumlah", "subtotal"))
+    if long.empty:
+        return pd.DataFrame(columns=["material", "total"])
+    # SQL-nya sengaja portabel (MySQL & SQLite): label material yatim dibuat di sini
+    missing = long["material"].isna()
+    long.loc[missing, "material"] = "#" + long.loc[missing, "id_material"].astype(str)
+    long["bulan"] = long["bulan"].fillna("(tanpa tanggal)")
+    pivot = long.pivot_table(index="material", columns="bulan", values=value,
+                             aggfunc="sum", fill_value=0.0)
+    pivot = pivot.reindex(sorted(pivot.columns), axis=1)
+    pivot["total"] = pivot.to_numpy().sum(axis=1)
+    pivot = pivot.sort_values("total", ascending=False)
+    return pivot.reset_index()
+
+
+def status_funnel(db, date_from=None, date_to=None):
+    """Funnel status PO: jumlah per status, yang sudah sampai tahap itu, dan konversi dari Draft."""
+    where, params = _period("po", date_from, date_to)
+    df = _frame(db, f"""
+        SELECT po.`status_po` AS status, COUNT(*) AS jumlah_po, SUM(po.`total`) AS total
+        FROM `purchase_order` po{where}
+        GROUP BY po.`status_po`""", params, numeric=("jumlah_po", "total"))
+    df["status"] = df["status"].fillna("(kosong)")
+    order = STATUS_ORDER + [s for s in df["status"] if s not in STATUS_ORDER]
+    df = df.set_index("status").reindex(order, fill_value=0.0).reset_index()
+    counts = df["jumlah_po"].to_numpy()
+    stages = len(STATUS_ORDER)
+    # PO berstatus X berarti sudah melewati semua tahap sebelum X
+    reached = counts.copy()
+    reached[:stages] = np.cumsum(counts[:stages][::-1])[::-1]
+    df["sampai_tahap"] = reached.astype(np.int64)
+    top = reached[0]
+    konversi = np.full(len(df), np.nan)   # status di luar enum tidak masuk funnel
+    if top:
+        konversi[:stages] = np.round(reached[:stages] / top * 100, 2)
+    df["konversi_%"] = konversi
+    df["jumlah_po"] = df["jumlah_po"].astype(np.int64)
+    return df
+
+
+REPORTS = OrderedDict([
+    ("Belanja per pemasok", spend_by_supplier),
+    ("Belanja per pelanggan", spend_by_customer),
+    ("Pembelian per material", material_totals),
+    ("Pemakaian material per bulan", material_per_month),
+    ("Funnel status PO", status_funnel),
+])
+
+
+# ========== cache hasil per set parameter ==========
+class ReportCache:
+    """LRU kecil (nama, parameter) -> DataFrame; dikosongkan kalau tabel laporan ditulis."""
+
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (waktu, generasi, df)
+        self._size = size
+        self._ttl = ttl
+        self._gen = 0
+
+    def get(self, key):
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None or hit[1] != self._gen or time.monotonic() - hit[0] > self._ttl:
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return hit[2]
+
+    def generation(self):
+        with self._lock:
+            return self._gen
+
+    def put(self, key, df, gen):
+        with self._lock:
+            if gen != self._gen:
+                return   # ada tulis selama query jalan: hasilnya mungkin basi
+            self._entries[key] = (time.monotonic(), gen, df)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table=None):
+        if table is None or table in REPORT_TABLES:
+            with self._lock:
+                self._gen += 1
+                self._entries.clear()
+
+    def on_write(self, table, op, pk_name, pk, data):
+        self.invalidate(table)
+
+
+_cache = ReportCache()
+add_write_hook(_cache.on_write)
+add_invalidate_hook(_cache.invalidate)   # tulis dari proses lain (poller change_log)
+
+
+def run(db, name, **params):
+    """Jalankan laporan `name` (kunci REPORTS); return (DataFrame, dari_cache)."""
+    key = (name, tuple(sorted(params.items())))
+    df = _cache.get(key)
+    if df is not None:
+        return df, True
+    gen = _cache.generation()
+    df = REPORTS[name](db, **params)
+    _cache.put(key, df, gen)
+    return df, False
@@ -0,0 +1,282 @@
+# rowstore.py — penyimpanan baris per kolom (array bertipe + string di-intern) untuk LazyTableModel (tanpa Qt)
+import datetime
+import sys
+from array import array
+from decimal import Decimal, InvalidOperation
+
+MAX_SCALE = 6        # decimal dengan angka di belakang koma lebih dari ini disimpan sebagai objek
+INTERN_RATIO = 0.5   # kolom string di-intern kalau nilai uniknya <= rasio ini x jumlah baris
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_US = datetime.timedelta(microseconds=1)
+
+
+# ========== codec per jenis kolom: (typecode array, encode(nilai, scale), decode(x, scale)) ==========
+def _enc_int(v, scale):
+    if type(v) is not int:
+        raise TypeError
+    return v
+
+
+def _enc_dec(v, scale):
+    if type(v) is not Decimal:
+        raise TypeError
+    x = v.scaleb(scale)
+    if x != x.to_integral_value():
+        raise ValueError   # butuh scale lebih besar
+    return int(x)
+
+
+def _enc_float(v, scale):
+    if type(v) is not float:
+        raise TypeError
+    return v
+
+
+def _enc_date(v, scale):
+    if type(v) is not datetime.date:
+        raise TypeError
+    return v.toordinal()
+
+
+def _enc_dt(v, scale):
+    if type(v) is not datetime.datetime or v.tzinfo is not None:
+        raise TypeError
+    return (v - _EPOCH) // _US
+
+
+_CODECS = {
+    "int": ("q", _enc_int, lambda x, s: x),
+    "dec": ("q", _enc_dec, lambda x, s: Decimal(x).scaleb(-s)),
+    "float": ("d", _enc_float, lambda x, s: x),
+    "date": ("i", _enc_date, lambda x, s: datetime.date.fromordinal(x)),
+    "dt": ("q", _enc_dt, lambda x, s: _EPOCH + x * _US),
+}
+_KIND_OF = {int: "int", Decimal: "dec", float: "float", datetime.date: "date",
+            datetime.datetime: "dt"}
+
+
+def _scale(values):
+    scale = 0
+    for v in values:
+        if type(v) is Decimal:
+            exp = v.as_tuple().exponent
+            if not isinstance(exp, int) or -exp > MAX_SCALE:
+                return None   # NaN/inf atau terlalu presisi
+            scale = max(scale, -exp)
+    return scale
+
+
+class Column:
+    """
+    Satu kolom: array bertipe (int, decimal -> int x 10^scale, float, date -> ordinal,
+    datetime -> mikrodetik) plus bytearray penanda NULL, atau list objek biasa.
+    """
+    __slots__ = ("kind", "data", "nulls", "scale")
+
+    def __init__(self, values):
+        self.nulls = None
+        self.scale = 0
+        present = [v for v in values if v is not None]
+        kinds = {_KIND_OF.get(type(v)) for v in present}
+        kind = kinds.pop() if len(kinds) == 1 else None
+        if kind == "dec":
+            self.scale = _scale(present)
+            if self.scale is None:
+                kind = None
+        if kind is not None:
+            typecode, enc, _ = _CODECS[kind]
+            try:
+                self.data = array(typecode, [0 if v is None else enc(v, self.scale)
+                                             for v in values])
+            except (TypeError, ValueError, OverflowError, InvalidOperation):
+                kind = None
+            else:
+                if len(present) != len(values):
+                    self.nulls = bytearray(v is None for v in values)
+        if kind is None:
+            strings = [v for v in present if type(v) is str]
+            if strings and len(set(strings)) <= INTERN_RATIO * len(strings):
+                # nilai berulang (satuan, status_po, ...): satu objek str untuk semua baris
+                values = [sys.intern(v) if type(v) is str else v for v in values]
+                kind = "str"
+            self.data = list(values)
+        self.kind = kind
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, i):
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        codec = _CODECS.get(self.kind)
+        return self.data[i] if codec is None else codec[2](self.data[i], self.scale)
+
+    def _encode(self, v):
+        if self.kind == "str" and type(v) is str:
+            return sys.intern(v)
+        codec = _CODECS.get(self.kind)
+        if codec is None or v is None:
+            return 0 if codec else v
+        return codec[1](v, self.scale)
+
+    def _to_objects(self):
+        """Nilai yang tidak muat di array (tipe lain/scale lebih besar): jadi list objek."""
+        self.data = [self.get(i) for i in range(len(self.data))]
+        self.nulls = None
+        self.kind = None
+
+    def _put(self, i, v, insert):
+        try:
+            x = self._encode(v)
+        except (TypeError, ValueError, OverflowError, InvalidOperation):
+            self._to_objects()
+            x = v
+        if v is None and self.kind in _CODECS and self.nulls is None:
+            self.nulls = bytearray(len(self.data))
+        if insert:
+            self.data.insert(i, x)
+            if self.nulls is not None:
+                self.nulls.insert(i, v is None)
+        else:
+            self.data[i] = x
+            if self.nulls is not None:
+                self.nulls[i] = v is None
+
+    def set(self, i, v):
+        self._put(i, v, False)
+
+    def append(self, v):
+        self._put(len(self.data), v, True)
+
+    def delete(self, i):
+        del self.data[i]
+        if self.nulls is not None:
+            del self.nulls[i]
+
+    def index(self, v):
+        """Posisi pertama bernilai `v` (dipakai cari PK), -1 kalau tidak ada."""
+        try:
+            x = self._encode(v)
+        except (TypeError, ValueError, OverflowError, InvalidOperation):
+            return next((i for i in range(len(self.data)) if self.get(i) == v), -1)
+        start = 0
+        while True:
+            try:
+                i = self.data.index(x, start)
+            except ValueError:
+                return -1
+            if self.nulls is None or not self.nulls[i]:
+                return i
+            start = i + 1
+
+    def nbytes(self, seen):
+        """Byte kolom ini; objek yang dipakai bersama (string di-intern) dihitung sekali lewat `seen`."""
+        n = sys.getsizeof(self.data)
+        if self.nulls is not None:
+            n += sys.getsizeof(self.nulls)
+        if not isinstance(self.data, array):
+            for v in self.data:
+                if id(v) not in seen:
+                    seen.add(id(v))
+                    n += sys.getsizeof(v)
+        return n
+
+
+class RowPage:
+    """
+    Satu halaman hasil query, disimpan per kolom. row(i) membuat dict baru saat diminta
+    (form, ChangeBus); view cukup value(i, kolom) tanpa dict perantara.
+    """
+    __slots__ = ("headers", "cols", "valid")
+
+    def __init__(self, headers, cols, valid):
+        self.headers = headers
+        self.cols = cols
+        self.valid = valid   # 0 = baris kosong (halaman diambil ulang tapi barisnya sudah hilang)
+
+    @classmethod
+    def from_rows(cls, rows, headers=None):
+        """Pak list dict hasil crud jadi halaman per kolom (dipanggil di thread worker)."""
+        if headers is None:
+            headers = list(rows[0].keys()) if rows else []
+        cols = [Column([r.get(h) for r in rows]) for h in headers]
+        return cls(headers, cols, bytearray(b"\x01" * len(rows)))
+
+    def __len__(self):
+        return len(self.valid)
+
+    def value(self, i, c):
+        return self.cols[c].get(i) if self.valid[i] else None
+
+    def row(self, i):
+        if not self.valid[i]:
+            return {}
+        return {h: col.get(i) for h, col in zip(self.headers, self.cols)}
+
+    def rows(self):
+        return [self.row(i) for i in range(len(self.valid))]
+
+    def set_row(self, i, row):
+        for h, col in zip(self.headers, self.cols):
+            col.set(i, row.get(h))
+        self.valid[i] = 1
+
+    def append(self, row):
+        for h, col in zip(self.headers, self.cols):
+            col.append(row.get(h))
+        self.valid.append(1)
+
+    def pad(self, n):
+        """Tambah n baris kosong (jumlah baris halaman harus tetap sama dengan sebelumnya)."""
+        for _ in range(n):
+            for col in self.cols:
+                col.append(None)
+            self.valid.append(0)
+
+    def delete(self, i):
+        for col in self.cols:
+            col.delete(i)
+        del self.valid[i]
+
+    def find(self, header, value):
+        """Posisi baris dengan `header` == value, -1 kalau tidak ada di halaman ini."""
+        try:
+            c = self.headers.index(header)
+        except ValueError:
+            return -1
+        return self.cols[c].index(value)   # baris kosong isinya NULL, tidak akan cocok
+
+    def nbytes(self, seen=None):
+        seen = set() if seen is None else seen
+        return (sys.getsizeof(self.cols) + sys.getsizeof(self.valid)
+                + sum(col.nbytes(seen) for col in self.cols))
+
+
+def rows_nbytes(rows):
+    """Byte list dict (bentuk hasil crud) termasuk nilainya; objek yang sama dihitung sekali."""
+    seen = set()
+    n = sys.getsizeof(rows)
+    for r in rows:
+        n += sys.getsizeof(r)
+        for v in r.values():
+            if id(v) not in seen:
+                seen.add(id(v))
+                n += sys.getsizeof(v)
+    return n
+
+
+def format_value(v):
+    """Teks sel tabel; dipanggil view per sel yang terlihat saja."""
+    if v is None:
+        return ""
+    t = type(v)
+    if t is Decimal or t is float:
+        return f"{v:,.2f}"
+    if t is datetime.datetime:
+        return v.strftime("%Y-%m-%d %H:%M:%S")
+    return str(v)
+
+
+def is_numeric(v):
+    return type(v) in (int, float, Decimal)
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mysql.connector
+from mysql.connector import pooling
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+import crud as crud_module
+import fakemysql
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _server(tmp_path_factory):
+    # thread worker menyimpan koneksinya terus, jadi 'server' dipakai bersama satu sesi
+    srv = fakemysql.Server(tmp_path_factory.mktemp("mysql") / "db.sqlite3")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(mysql.connector, "connect", srv.connect)
+        mp.setattr(pooling, "connect", srv.connect)
+        mp.setattr(pooling, "MYSQL_CNX_CLASS", (fakemysql.Connection,))
+        yield srv
+
+
+@pytest.fixture
+def server(_server):
+    """'Server MySQL' palsu (sqlite), dikosongkan untuk tiap tes."""
+    _server.reset()
+    if crud_module.get_backend().name != "mysql":
+        crud_module.use_backend("mysql")   # tes sebelumnya memakai backend SQLite
+    crud_module.crud.invalidate_cache()    # isi tabel diganti di luar crud
+    return _server
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """crud di atas backend SQLite: file baru dari db_2310010238.sql (backend bersama diganti)."""
+    crud_module.use_backend("sqlite", str(tmp_path / "tes.sqlite3"))
+    return crud_module.crud()
+
+
+@pytest.fixture
+def wait(qapp):
+    """wait(cond): proses event Qt sampai cond() benar (sinyal dari thread worker)."""
+    def wait(cond, timeout=5.0):
+        end = time.monotonic() + timeout
+        while not cond():
+            if time.monotonic() > end:
+                raise AssertionError("timeout menunggu worker")
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+    return wait
+
+
+_exit_status = 0
+
+
+def pytest_sessionfinish(session, exitstatus):
+    global _exit_status
+    _exit_status = int(exitstatus)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    # PySide6 6.12 + Python 3.11: setiap data() model Python yang mengembalikan None ke C++
+    # mengurangi refcount None satu kali lebih. Setelah banyak tes view, finalisasi
+    # interpreter berhenti dengan "none_dealloc" walau semua tes lulus; keluar langsung
+    # setelah ringkasan pytest dicetak.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(_exit_status)
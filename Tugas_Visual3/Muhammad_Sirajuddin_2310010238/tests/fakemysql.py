@@ -0,0 +1,343 @@
+# fakemysql.py
+# Pengganti server MySQL untuk tes: sqlite3 dibungkus supaya mirip mysql.connector
+# (placeholder %s, cursor dictionary, SHOW COLUMNS, information_schema, KILL QUERY,
+# MATCH ... AGAINST dalam BOOLEAN MODE, LIKE dengan escape backslash, transaksi,
+# executemany, cursor unbuffered, cursor prepared).
+# Skema = db_2310010238.sql.
+import datetime
+import itertools
+import re
+import sqlite3
+import zlib
+from decimal import Decimal
+
+from mysql.connector import errors
+
+# tabel -> [(kolom, tipe MySQL, COLUMN_KEY)]
+SCHEMA = {
+    "material": [
+        ("id_material", "int(11)", "PRI"),
+        ("nama_material", "varchar(100)", ""),
+        ("satuan", "varchar(20)", ""),
+        ("harga", "decimal(15,2)", ""),
+    ],
+    "pemasok": [
+        ("id_pemasok", "int(11)", "PRI"),
+        ("nama_pemasok", "varchar(100)", ""),
+        ("alamat", "text", ""),
+        ("telepon", "varchar(15)", ""),
+        ("email", "varchar(50)", ""),
+    ],
+    "pelanggan": [
+        ("id_pelanggan", "int(11)", "PRI"),
+        ("nama_pelanggan", "varchar(100)", ""),
+        ("alamat", "text", ""),
+        ("telepon", "varchar(15)", ""),
+        ("email", "varchar(50)", ""),
+    ],
+    "purchase_order": [
+        ("id_po", "int(11)", "PRI"),
+        ("no_po", "varchar(50)", "UNI"),
+        ("tanggal_po", "date", ""),
+        ("id_pemasok", "int(11)", "MUL"),
+        ("id_pelanggan", "int(11)", "MUL"),
+        ("total", "decimal(15,2)", ""),
+        ("status_po", "enum('Draft','Disetujui','Dikirim','Selesai')", ""),
+    ],
+    "detail_po": [
+        ("id_detail_po", "int(11)", "PRI"),
+        ("id_po", "int(11)", "MUL"),
+        ("id_material", "int(11)", "MUL"),
+        ("jumlah", "int(11)", ""),
+        ("harga_satuan", "decimal(15,2)", ""),
+        ("subtotal", "decimal(15,2)", ""),
+    ],
+}
+
+NOT_NULL = {"nama_material", "nama_pemasok", "nama_pelanggan", "no_po"}
+FOREIGN_KEYS = [
+    ("detail_po", "id_po", "purchase_order", "id_po"),
+    ("detail_po", "id_material", "material", "id_material"),
+    ("purchase_order", "id_pemasok", "pemasok", "id_pemasok"),
+    ("purchase_order", "id_pelanggan", "pelanggan", "id_pelanggan"),
+]
+DATABASE = "db_2310010238"
+
+_SHOW_COLUMNS_RE = re.compile(r"SHOW COLUMNS FROM `(\w+)`")
+_KILL_RE = re.compile(r"KILL QUERY (\d+)")
+_MATCH_RE = re.compile(r"MATCH\(([^)]*)\) AGAINST\(%s IN BOOLEAN MODE\)")
+_LIKE_RE = re.compile(r"LIKE %s(?! ESCAPE)")
+_WORD_RE = re.compile(r"\w+")
+_ids = itertools.count(1)
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(datetime.date, datetime.date.isoformat)
+
+
+def _sqlite_type(mysql_type):
+    if mysql_type.startswith("int"):
+        return "INTEGER"
+    if mysql_type.startswith("decimal"):
+        return "REAL"
+    return "TEXT COLLATE NOCASE"   # = utf8mb4_general_ci: urut & bandingkan tanpa beda huruf besar
+
+
+class Server:
+    """Satu 'database' (file sqlite); connect() dipasang menggantikan mysql.connector.connect."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.info_path = self.path + "-information_schema"
+        self.queries = []   # semua SQL yang dijalankan, untuk dicek tes
+        self.killed = []    # connection_id yang kena KILL QUERY
+        self.prepares = []  # (connection_id, sql) tiap PREPARE dari cursor prepared
+        self.connections = {}
+        self.down = False   # True = server mati, ping/connect gagal
+        self._create()
+
+    def _create(self):
+        k = sqlite3.connect(self.path)
+        k.execute(f"ATTACH '{self.info_path}' AS information_schema")
+        k.executescript(
+            "DROP TABLE IF EXISTS information_schema.COLUMNS;"
+            "CREATE TABLE information_schema.COLUMNS (TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, "
+            "ORDINAL_POSITION, COLUMN_TYPE, DATA_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA);"
+            "DROP TABLE IF EXISTS information_schema.KEY_COLUMN_USAGE;"
+            "CREATE TABLE information_schema.KEY_COLUMN_USAGE (TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, "
+            "REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME);")
+        for table, cols in SCHEMA.items():
+            k.execute(f"DROP TABLE IF EXISTS `{table}`")
+            defs = [f"`{c}` {_sqlite_type(t)}" + (" PRIMARY KEY" if key == "PRI" else "")
+                    for c, t, key in cols]
+            k.execute(f"CREATE TABLE `{table}` ({', '.join(defs)})")
+            for c, t, key in cols:
+                self._add_column_info(k, table, c, t, key)
+        k.executemany("INSERT INTO information_schema.KEY_COLUMN_USAGE VALUES (?, ?, ?, ?, ?)",
+                      [(DATABASE,) + fk for fk in FOREIGN_KEYS])
+        k.commit()
+        k.close()
+
+    @staticmethod
+    def _add_column_info(k, table, col, mysql_type, key=""):
+        pos = k.execute("SELECT COUNT(*) + 1 FROM information_schema.COLUMNS WHERE TABLE_NAME = ?",
+                        (table,)).fetchone()[0]
+        required = key == "PRI" or col in NOT_NULL
+        k.execute("INSERT INTO information_schema.COLUMNS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                  (DATABASE, table, col, pos, mysql_type, mysql_type.split("(")[0],
+                   "NO" if required else "YES", key, None if required else "NULL",
+                   "auto_increment" if key == "PRI" else ""))
+
+    def add_column(self, table, col, mysql_type):
+        """ALTER TABLE ... ADD COLUMN (DDL dari luar aplikasi)."""
+        k = sqlite3.connect(self.path)
+        k.execute(f"ATTACH '{self.info_path}' AS information_schema")
+        k.execute(f"ALTER TABLE `{table}` ADD COLUMN `{col}` {_sqlite_type(mysql_type)}")
+        self._add_column_info(k, table, col, mysql_type)
+        k.commit()
+        k.close()
+
+    def connect(self, **config):
+        if self.down:
+            raise errors.InterfaceError("Can't connect to MySQL server")
+        conn = Connection(self)
+        self.connections[conn.connection_id] = conn
+        return conn
+
+    def drop_connections(self):
+        """Semua koneksi diputus server (mis. wait_timeout habis / server restart)."""
+        for conn in self.connections.values():
+            conn.lost = True
+
+    def reset(self):
+        """Tabel dibuat ulang kosong (server dipakai bersama satu sesi tes)."""
+        self._create()
+        self.queries.clear()
+        self.killed.clear()
+        self.prepares.clear()
+        self.down = False
+        for conn in self.connections.values():
+            conn.lost = False
+
+    def fill(self, table, rows):
+        cols = list(rows[0])
+        k = sqlite3.connect(self.path)
+        k.executemany(f"INSERT INTO `{table}` ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                      [tuple(r[c] for c in cols) for r in rows])
+        k.commit()
+        k.close()
+
+
+def ft_match(expr, *values):
+    """MATCH ... AGAINST('+tok* +tok2*' IN BOOLEAN MODE): skor = jumlah kata yang cocok, 0 = tidak."""
+    words = _WORD_RE.findall(" ".join(str(v) for v in values if v is not None).lower())
+    score = 0
+    for term in expr.split():
+        prefix = term.strip("+*").lower()
+        hits = sum(w.startswith(prefix) for w in words)
+        if not hits:
+            return 0
+        score += hits
+    return score
+
+
+def translate(sql):
+    """SQL MySQL -> sqlite."""
+    sql = _MATCH_RE.sub(r"ft_match(%s, \1)", sql)
+    sql = _LIKE_RE.sub(r"LIKE %s ESCAPE '\\'", sql)
+    return sql.replace("%s", "?")
+
+
+def materials(n):
+    return [{"id_material": i, "nama_material": f"Material {i}", "satuan": "kg", "harga": i * 1000}
+            for i in range(1, n + 1)]
+
+
+class Connection:
+    def __init__(self, server):
+        self.server = server
+        self.connection_id = next(_ids)
+        self.autocommit = True
+        self.lost = False
+        self.pings = 0
+        self.unread_result = False
+        self._k = sqlite3.connect(server.path, isolation_level=None, check_same_thread=False)
+        self._k.create_function("ft_match", -1, ft_match)
+        self._k.create_function("DATABASE", 0, lambda: DATABASE)
+        self._k.create_function("CRC32", 1, lambda v: zlib.crc32(str(v).encode()))
+        self._k.create_function("CONCAT_WS", -1,
+                                lambda sep, *v: sep.join(str(x) for x in v if x is not None))
+        self._k.execute(f"ATTACH '{server.info_path}' AS information_schema")
+
+    def config(self, **kwargs):
+        pass
+
+    def is_connected(self):
+        return self._k is not None and not self.lost
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self.pings += 1
+        if self.server.down:
+            raise errors.InterfaceError("Can't connect to MySQL server")
+        if self.lost:
+            if not reconnect:
+                raise errors.OperationalError("MySQL Connection not available")
+            # sesi baru di server = connection_id baru
+            del self.server.connections[self.connection_id]
+            self.connection_id = next(_ids)
+            self.server.connections[self.connection_id] = self
+            self.lost = False
+
+    def cursor(self, dictionary=False, buffered=False, prepared=False, **kwargs):
+        return Cursor(self, dictionary, prepared)
+
+    def start_transaction(self):
+        self._k.execute("BEGIN")
+
+    def commit(self):
+        if self._k.in_transaction:
+            self._k.execute("COMMIT")
+
+    def rollback(self):
+        if self._k.in_transaction:
+            self._k.execute("ROLLBACK")
+
+    def consume_results(self):
+        self.unread_result = False
+
+    def close(self):
+        self._k.close()
+        self._k = None
+
+
+class Cursor:
+    def __init__(self, conn, dictionary, prepared=False):
+        self._conn = conn
+        self._dict = dictionary
+        self._prepared = prepared
+        self._stmt = None     # (connection_id, sql) statement yang sudah di-PREPARE
+        self.closed = False
+        self._rows = []
+        self.description = None
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, sql, params=()):
+        if self._conn.lost or self._conn.server.down:
+            raise errors.OperationalError("MySQL server has gone away")
+        if self.closed:
+            raise errors.ProgrammingError("Cursor is not connected")
+        if self._prepared:
+            self._prepare(sql)
+        self._conn.server.queries.append(sql)
+        m = _KILL_RE.fullmatch(sql)
+        if m:
+            target = self._conn.server.connections.get(int(m.group(1)))
+            if target is not None and target._k is not None:
+                target._k.interrupt()
+            self._conn.server.killed.append(int(m.group(1)))
+            self.description, self._rows = None, []
+            return
+        m = _SHOW_COLUMNS_RE.fullmatch(sql)
+        if m:
+            self.description = [(n,) for n in ("Field", "Type", "Null", "Key", "Default", "Extra")]
+            self._rows = self._conn._k.execute(
+                "SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA "
+                "FROM information_schema.COLUMNS WHERE TABLE_NAME = ? ORDER BY ORDINAL_POSITION",
+                (m.group(1),)).fetchall()
+            return
+        try:
+            cur = self._conn._k.execute(translate(sql), tuple(params))
+        except sqlite3.IntegrityError as e:
+            raise errors.IntegrityError(str(e))
+        self.description = cur.description
+        self._rows = cur.fetchall() if cur.description else []
+        self.lastrowid = cur.lastrowid
+        self.rowcount = cur.rowcount if cur.description is None else len(self._rows)
+        self._conn.unread_result = bool(self._rows)
+
+    def executemany(self, sql, seq_params):
+        if self._conn.lost or self._conn.server.down:
+            raise errors.OperationalError("MySQL server has gone away")
+        self._conn.server.queries.append(sql)
+        try:
+            cur = self._conn._k.executemany(translate(sql), [tuple(p) for p in seq_params])
+        except sqlite3.IntegrityError as e:
+            raise errors.IntegrityError(str(e))
+        self.rowcount = cur.rowcount
+
+    def _prepare(self, sql):
+        if self._stmt is not None and self._stmt[0] != self._conn.connection_id:
+            # statement milik sesi lama (koneksi tersambung ulang) sudah tidak ada di server
+            raise errors.ProgrammingError("Unknown prepared statement handler")
+        if self._stmt != (self._conn.connection_id, sql):
+            self._stmt = (self._conn.connection_id, sql)
+            self._conn.server.prepares.append(self._stmt)
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self.description or ())
+
+    def _out(self, row):
+        if not self._dict:
+            return row
+        return dict(zip((d[0] for d in self.description), row))
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        self._conn.unread_result = False
+        return [self._out(r) for r in rows]
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        self._conn.unread_result = bool(self._rows)
+        return [self._out(r) for r in rows]
+
+    def fetchone(self):
+        if not self._rows:
+            return None
+        row = self._rows.pop(0)
+        self._conn.unread_result = bool(self._rows)
+        return self._out(row)
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from urllib.parse import quote
+
+import pytest
+
+import api
+
+
+def call(srv, method, target, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    status, data = asyncio.run(srv.dispatch(method, target, body))
+    return status, json.loads(api.dumps(data))
+
+
+@pytest.fixture
+def api_server(sqlite_db):
+    store = api.ThreadStore(2)
+    asyncio.run(store.start())
+    yield api.ApiServer(store)
+    asyncio.run(store.close())
+
+
+def test_api_status_codes(api_server):
+    assert call(api_server, "GET", "/")[0] == 200
+    assert call(api_server, "GET", "/material?order=nope")[0] == 400
+    assert call(api_server, "GET", "/material?cursor=%7Bbad")[0] == 400
+    assert call(api_server, "GET", "/material?limit=x")[0] == 400
+    assert call(api_server, "POST", "/material", {"nope": 1})[0] == 400
+    assert call(api_server, "POST", "/material", {"diubah_pada": "x"})[0] == 400
+    assert call(api_server, "GET", "/material/999999")[0] == 404
+    assert call(api_server, "GET", "/tidak_ada")[0] == 404
+    assert call(api_server, "DELETE", "/material")[0] == 405
+    assert api_server.errors == 8
+
+
+@pytest.mark.parametrize("query", [
+    "cursor=%5B1%2C2%5D",                      # [1,2] untuk urut PK
+    "cursor=%7B%22a%22%3A1%7D",                # objek
+    "cursor=true",
+    "order=harga&cursor=%5B1%2C2%2C3%5D",      # 3 elemen
+    "order=harga&cursor=%5B%5B1%5D%2C2%5D",    # nilai bukan skalar
+    "order=harga&cursor=%22x%22",              # skalar untuk urut kolom
+    "order=harga&cursor=-1",
+    "cursor=%5B1%2C2%5D&order=-id_material",   # urutan param tidak berpengaruh
+])
+def test_api_rejects_cursor_of_other_order(api_server, query):
+    assert call(api_server, "GET", f"/material?{query}") == (400, {"error": "cursor tidak valid"})
+
+
+def test_api_rejects_keyset_cursor_for_offset_paging(api_server):
+    # urut enum pakai offset; integer untuk urut kolom biasa (keyset) juga ditolak
+    assert call(api_server, "GET", "/purchase_order?order=status_po&cursor=%5B%22Draft%22%2C1%5D") \
+        == (400, {"error": "cursor tidak valid"})
+    assert call(api_server, "GET", "/material?order=harga&cursor=3") \
+        == (400, {"error": "cursor tidak valid"})
+
+
+def test_api_crud_round_trip(api_server):
+    status, made = call(api_server, "POST", "/material",
+                        {"nama_material": "Api Besi", "satuan": "kg", "harga": 12.5})
+    assert status == 201
+    path = f"/material/{made['id']}"
+    assert call(api_server, "PUT", path, {"harga": "13.25"}) == (200, {"updated": True})
+    assert call(api_server, "GET", path)[1]["harga"] == "13.25"
+    assert call(api_server, "POST", "/purchase_order", {"no_po": "PO-A", "status_po": "Draft"})[0] == 201
+    assert call(api_server, "POST", "/purchase_order", {"no_po": "PO-A"})[0] == 409   # no_po UNIQUE
+    assert call(api_server, "DELETE", path) == (200, {"deleted": True})
+    assert call(api_server, "DELETE", path) == (200, {"deleted": False})
+
+
+def test_api_bulk_counts_and_paging(api_server):
+    _, po = call(api_server, "POST", "/purchase_order", {"no_po": "PO-BULK", "status_po": "Draft"})
+    lines = [{"id_po": po["id"], "jumlah": i, "harga_satuan": "10"} for i in range(1, 6)]
+    assert call(api_server, "POST", "/detail_po/bulk", lines) == (200, {"inserted": 5, "upserted": 0})
+
+    status, page = call(api_server, "GET", f"/detail_po?id_po={po['id']}&limit=3")
+    assert status == 200 and len(page["rows"]) == 3 and page["next"] is not None
+    _, rest = call(api_server, "GET", f"/detail_po?id_po={po['id']}&limit=3&cursor={page['next']}")
+    assert len(rest["rows"]) == 2 and rest["next"] is None
+
+    first = page["rows"][0]
+    again = [{"id_detail_po": first["id_detail_po"], "id_po": po["id"], "jumlah": 100,
+              "harga_satuan": "10"},
+             {"id_po": po["id"], "jumlah": 1, "harga_satuan": "1"}]
+    assert call(api_server, "POST", "/detail_po/bulk", again) == (200, {"inserted": 1, "upserted": 1})
+    # 10*(2+3+4+5) + 100*10 + 1*1
+    assert call(api_server, "GET", f"/purchase_order/{po['id']}")[1]["total"] == "1141"
+    assert call(api_server, "POST", "/detail_po/bulk", {"id_po": 1})[0] == 400
+
+
+@pytest.mark.parametrize("order", ["harga", "-harga", "id_material", "-id_material"])
+def test_api_next_cursor_round_trips(api_server, order):
+    for i in range(7):
+        call(api_server, "POST", "/material",
+             {"nama_material": f"M{i}", "harga": None if i % 3 == 0 else i % 4})
+    ids, target = [], f"/material?order={order}&limit=2"
+    while True:
+        status, page = call(api_server, "GET", target)
+        assert status == 200
+        ids += [r["id_material"] for r in page["rows"]]
+        if page["next"] is None:
+            break
+        target = f"/material?order={order}&limit=2&cursor={quote(page['next'])}"
+    assert sorted(ids) == list(range(1, 8)) and len(ids) == 7
+
+
+def test_api_enum_order_pages_by_offset(api_server):
+    for i, s in enumerate(["Draft", "Selesai", "Draft", "Dikirim", "Disetujui"]):
+        call(api_server, "POST", "/purchase_order", {"no_po": f"PO-{i}", "status_po": s})
+    _, page = call(api_server, "GET", "/purchase_order?order=status_po&limit=3")
+    assert page["next"] == "3"
+    _, rest = call(api_server, "GET", f"/purchase_order?order=status_po&limit=3&cursor={page['next']}")
+    assert len(page["rows"]) + len(rest["rows"]) == 5 and rest["next"] is None
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+from PySide6.QtCore import QItemSelectionModel, QModelIndex
+
+import crud as crud_module
+from common import BaseForm, LazyTableModel
+from fakemysql import materials
+from material import MaterialForm
+
+
+class NoWidgetForm(BaseForm):
+    TABLE = "material"
+    UI_FILE = "material.ui"
+    PK = "id_material"
+    FIELD_WIDGETS = {
+        "id_material": ("spin", "spinId"),
+        "harga": ("check", "checkTidakAda"),
+        "nama_material": ("line", "editTidakAda"),
+        "satuan": ("spin", "editSatuan"),   # objectName ada, tapi QLineEdit
+    }
+
+
+@pytest.fixture
+def form(server, wait):
+    crud_module._lookups.invalidate()
+    server.fill("material", materials(3))
+    form = MaterialForm()
+    wait(lambda: isinstance(form.table.model(), LazyTableModel) and form.table.model().rowCount() == 3)
+    return form
+
+
+def test_widgets_are_looked_up_once(form, monkeypatch):
+    def lookup(*args):
+        raise AssertionError("findChild per panggilan")
+    monkeypatch.setattr(BaseForm, "_get_widget", lookup)
+    row = {"id_material": 7, "nama_material": "Semen", "satuan": "sak", "harga": 52000.5}
+    form.set_form_data(row)
+    assert form.get_form_data() == row
+    form.clear_form()
+    assert form.get_form_data() == {"id_material": 0, "nama_material": "", "satuan": "", "harga": 0.0}
+
+
+def test_missing_and_mismatched_widgets(server):
+    form = NoWidgetForm()
+    form.set_form_data({"id_material": 4, "harga": 1, "nama_material": "x", "satuan": " sak "})
+    # widget tidak ada: check = 0, lainnya None; editSatuan dibaca sebagai teks
+    assert form.get_form_data() == {"id_material": 4, "harga": 0, "nama_material": None,
+                                    "satuan": "sak"}
+
+
+def test_selected_row_comes_from_model_storage(form, monkeypatch):
+    model = form.table.model()
+    monkeypatch.setattr(LazyTableModel, "data", lambda *a: pytest.fail("data() dipanggil"))
+    form.table.selectionModel().select(
+        model.index(1, 0), QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+    assert form.get_form_data() == {"id_material": 2, "nama_material": "Material 2",
+                                    "satuan": "kg", "harga": 2000.0}
+
+
+def test_selection_waits_for_evicted_page(form):
+    model = form.table.model()
+    model._pages.clear()   # halaman sedang diambil ulang
+    form.set_form_data({"id_material": 9, "nama_material": "lama", "satuan": "", "harga": Decimal("1")})
+    form.table.selectionModel().select(
+        model.index(0, 0), QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+    assert form.get_form_data()["nama_material"] == "lama"
+    form.table.selectionModel().select(QModelIndex(), QItemSelectionModel.Clear)
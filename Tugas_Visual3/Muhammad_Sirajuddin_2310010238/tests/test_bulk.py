@@ -0,0 +1,164 @@
+import csv
+import threading
+
+import openpyxl
+import pytest
+from mysql.connector import errors
+
+import bulk
+from crud import crud
+from fakemysql import materials
+
+
+def write_csv(path, rows, delimiter=","):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f, delimiter=delimiter).writerows(rows)
+    return path
+
+
+def table(db):
+    return [(r["id_material"], r["nama_material"], r["satuan"], r["harga"])
+            for r in db.fetch_all("material")]
+
+
+@pytest.fixture
+def db(server):
+    return crud()
+
+
+def test_import_csv_in_batches(db, server, tmp_path):
+    path = write_csv(tmp_path / "m.csv", [["nama_material", "satuan", "harga"],
+                                          ["Semen", "sak", "65.000"],
+                                          ["Pasir", "m3", "250000"],
+                                          [" ", "", ""],            # baris kosong dilewati
+                                          ["Bata", "buah", "800.5"]])
+    seen = []
+    result = bulk.import_file(db, "material", path, batch_size=2,
+                              progress=lambda done, total: seen.append(done))
+    assert result == {"inserted": 3, "skipped": 0, "errors": []}
+    assert table(db) == [(1, "Semen", "sak", 65.0), (2, "Pasir", "m3", 250000.0),
+                         (3, "Bata", "buah", 800.5)]
+    assert sum(q.startswith("INSERT") for q in server.queries) == 2   # 2 batch executemany
+    assert seen[-1] == 3
+
+
+def test_import_semicolon_csv_and_enum_date(db, tmp_path):
+    path = write_csv(tmp_path / "po.csv", [["no_po", "tanggal_po", "status_po"],
+                                           ["PO-1", "15/01/2024", "draft"],
+                                           ["PO-2", "2024-02-01", "SELESAI"]], delimiter=";")
+    assert bulk.import_file(db, "purchase_order", path)["inserted"] == 2
+    assert [(r["no_po"], r["tanggal_po"], r["status_po"]) for r in db.fetch_all("purchase_order")] \
+        == [("PO-1", "2024-01-15", "Draft"), ("PO-2", "2024-02-01", "Selesai")]
+
+
+def test_atomic_import_with_bad_row_inserts_nothing(db, tmp_path):
+    path = write_csv(tmp_path / "m.csv", [["nama_material", "satuan", "harga"],
+                                          ["Semen", "sak", "1"],
+                                          ["Pasir", "m3", "abc"],
+                                          ["", "kg", "2"],
+                                          ["Bata", "buah", "3"]])
+    result = bulk.import_file(db, "material", path, batch_size=1)
+    assert result == {"inserted": 0, "skipped": 2,
+                      "errors": ["baris 3: bukan angka: 'abc'", "baris 4: wajib diisi"]}
+    assert table(db) == []   # batch yang sudah dikirim ikut dibatalkan
+
+
+def test_atomic_import_rolls_back_on_database_error(db, tmp_path):
+    path = write_csv(tmp_path / "m.csv", [["id_material", "nama_material"],
+                                          ["1", "Semen"], ["2", "Pasir"],
+                                          ["3", "Bata"], ["1", "Kembar"]])
+    with pytest.raises(errors.IntegrityError):
+        bulk.import_file(db, "material", path, batch_size=2)
+    assert table(db) == []
+
+
+def test_non_atomic_import_skips_and_reports_bad_rows(db, tmp_path):
+    path = write_csv(tmp_path / "m.csv", [["nama_material", "satuan", "harga"],
+                                          ["Semen", "sak", "1"],
+                                          ["Pasir", "m3", "abc"],
+                                          ["Bata", "buah", "3"]])
+    result = bulk.import_file(db, "material", path, atomic=False)
+    assert result == {"inserted": 2, "skipped": 1, "errors": ["baris 3: bukan angka: 'abc'"]}
+    assert [r[1] for r in table(db)] == ["Semen", "Bata"]
+
+
+def test_error_report_is_capped(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_ERRORS", 3)
+    path = write_csv(tmp_path / "m.csv", [["nama_material", "harga"]] +
+                     [["x", "salah"] for _ in range(10)])
+    result = bulk.import_file(db, "material", path, atomic=False)
+    assert (result["skipped"], len(result["errors"])) == (10, 3)
+
+
+@pytest.mark.parametrize("header, message", [
+    (["nama_material", "warna"], "Kolom tidak ada di tabel `material`: warna"),
+    (["satuan", "harga"], "Kolom wajib tidak ada di file: nama_material"),
+])
+def test_header_is_checked_against_schema(db, tmp_path, header, message):
+    path = write_csv(tmp_path / "m.csv", [header, ["a", "1"]])
+    with pytest.raises(bulk.BulkError, match=message):
+        bulk.import_file(db, "material", path)
+
+
+def test_unknown_table(db, tmp_path):
+    with pytest.raises(bulk.BulkError):
+        bulk.import_file(db, "tidak_ada", write_csv(tmp_path / "m.csv", [["a"], ["1"]]))
+
+
+def test_cancelled_import_keeps_nothing(db, tmp_path):
+    path = write_csv(tmp_path / "m.csv", [["nama_material"]] + [[f"M{i}"] for i in range(10)])
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(bulk.BulkCancelled):
+        bulk.import_file(db, "material", path, batch_size=2, cancelled=stop)
+    assert table(db) == []
+
+
+def test_xlsx_import_and_export_round_trip(db, server, tmp_path):
+    src = tmp_path / "in.xlsx"
+    wb = openpyxl.Workbook()
+    wb.active.append(["nama_material", "satuan", "harga"])
+    wb.active.append(["Semen", "sak", 65000])
+    wb.active.append(["Pasir", "m3", 250000.5])
+    wb.save(src)
+    assert bulk.count_rows(src) == 2
+    assert bulk.import_file(db, "material", src)["inserted"] == 2
+
+    out = tmp_path / "out.xlsx"
+    assert bulk.export_file(db, "material", out) == {"exported": 2}
+    rows = list(openpyxl.load_workbook(out).active.iter_rows(values_only=True))
+    assert rows == [("id_material", "nama_material", "satuan", "harga"),
+                    (1, "Semen", "sak", 65000), (2, "Pasir", "m3", 250000.5)]
+
+
+def test_export_csv_streams_in_chunks(db, server, tmp_path, monkeypatch):
+    server.fill("material", materials(25))
+    chunks = []
+    stream = db.stream
+    monkeypatch.setattr(db, "stream", lambda sql: stream(sql, size=10))
+    out = tmp_path / "out.csv"
+    assert bulk.export_file(db, "material", out,
+                            progress=lambda done, total: chunks.append((done, total))) \
+        == {"exported": 25}
+    assert chunks == [(10, 25), (20, 25), (25, 25)]
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id_material", "nama_material", "satuan", "harga"]
+    assert rows[25] == ["25", "Material 25", "kg", "25000.0"]
+
+
+def test_export_empty_table_writes_header(db, tmp_path):
+    out = tmp_path / "out.csv"
+    assert bulk.export_file(db, "material", out) == {"exported": 0}
+    assert out.read_text(encoding="utf-8").strip() == "id_material,nama_material,satuan,harga"
+
+
+def test_cancelled_export_removes_file(db, server, tmp_path):
+    server.fill("material", materials(5))
+    stop = threading.Event()
+    stop.set()
+    out = tmp_path / "out.csv"
+    with pytest.raises(bulk.BulkCancelled):
+        bulk.export_file(db, "material", out, cancelled=stop)
+    assert not out.exists()
+    assert db.count("material") == 5   # sisa hasil sudah dibuang, koneksi bisa dipakai lagi
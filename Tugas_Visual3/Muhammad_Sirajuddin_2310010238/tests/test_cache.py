@@ -0,0 +1,125 @@
+import time
+
+import pytest
+
+import crud as crud_module
+from crud import ResultCache, crud, normalize_sql, tables_in
+from fakemysql import materials
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def db(server):
+    server.fill("material", materials(5))
+    server.fill("pemasok", [{"id_pemasok": 1, "nama_pemasok": "Abadi"}])
+    crud.reset_cache_stats()
+    server.queries.clear()
+    return crud()
+
+
+def selects(server, table):
+    """fetch_all(table) yang benar-benar sampai ke server."""
+    return [q for q in server.queries if q == f"SELECT * FROM `{table}`"]
+
+
+def put(cache, key, rows, tables=("material",)):
+    cache.put(key, rows, tables, cache.generation(tables))
+
+
+def test_repeated_select_served_from_cache(db, server):
+    first = db.fetch_all("material")
+    first[0]["nama_material"] = "diubah"   # salinan: cache tidak ikut berubah
+    again = db.fetch_all("material")
+    assert again[0]["nama_material"] == "Material 1"
+    assert len(selects(server, "material")) == 1
+    stats = crud.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_write_invalidates_only_that_table(db, server):
+    db.fetch_all("material")
+    db.fetch_all("pemasok")
+    db.insert("material", {"id_material": 6, "nama_material": "Baru", "satuan": "kg", "harga": 1})
+    assert len(db.fetch_all("material")) == 6
+    db.fetch_all("pemasok")
+    assert len(selects(server, "material")) == 2
+    assert len(selects(server, "pemasok")) == 1
+
+
+def test_invalidate_cache_for_writes_outside_crud(db, server):
+    db.fetch_all("material")
+    server.fill("material", materials(7)[5:])   # proses lain menulis (poller change_log)
+    assert len(db.fetch_all("material")) == 5
+    crud.invalidate_cache("pemasok")
+    assert len(db.fetch_all("material")) == 5
+    crud.invalidate_cache("material")
+    assert len(db.fetch_all("material")) == 7
+    crud.invalidate_cache()
+    assert crud.cache_stats()["entries"] == 0
+
+
+def test_own_backend_and_untracked_tables_bypass_cache(db, server):
+    own = crud(crud_module.get_backend())
+    own.fetch_all("material")
+    own.fetch_all("material")
+    assert len(selects(server, "material")) == 2
+    assert tables_in("SELECT * FROM `change_log`") == ()
+    assert crud.cache_stats()["entries"] == 0
+
+
+def test_disabled_cache_always_queries(db, server):
+    crud_module.configure_result_cache(ttl=0)
+    try:
+        db.fetch_all("material")
+        db.fetch_all("material")
+    finally:
+        crud_module.configure_result_cache(ttl=crud_module.RESULT_CACHE_TTL)
+    assert len(selects(server, "material")) == 2
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResultCache(max_mb=1)
+    rows = [{"x": "a" * 1000} for _ in range(50)]   # ~60 KB per entri
+    for i in range(20):
+        put(cache, ("q", i), rows)
+        cache.get(("q", 0))   # entri 0 selalu baru dipakai
+    assert cache.bytes <= MB
+    assert cache.get(("q", 0)) is rows
+    assert cache.get(("q", 1)) is None   # yang paling lama tidak dipakai sudah dibuang
+    assert cache.get(("q", 19)) is rows
+    assert cache.stats()["evictions"] > 0
+
+
+def test_entry_larger_than_quarter_is_skipped():
+    cache = ResultCache(max_mb=1)
+    put(cache, "besar", [{"x": "a" * 1000} for _ in range(300)])
+    assert cache.get("besar") is None
+    assert cache.stats()["skipped"] == 1 and cache.bytes == 0
+
+
+def test_ttl_expiry():
+    cache = ResultCache(max_mb=1, ttl=0.05)
+    put(cache, "k", [{"x": 1}])
+    assert cache.get("k") == [{"x": 1}]
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] == 1 and cache.bytes == 0
+
+
+def test_result_of_query_racing_a_write_is_not_stored():
+    cache = ResultCache(max_mb=1)
+    gen = cache.generation(("material", "pemasok"))
+    cache.on_write("pemasok", "update", "id_pemasok", 1, {})   # tulis selama query jalan
+    cache.put("join", [{"x": 1}], ("material", "pemasok"), gen)
+    assert cache.get("join") is None
+    put(cache, "join", [{"x": 1}], ("material", "pemasok"))
+    cache.invalidate("pemasok")   # entri multi-tabel ikut dibuang
+    assert cache.get("join") is None and cache.bytes == 0
+
+
+def test_key_ignores_whitespace_and_lists_tables():
+    assert normalize_sql("SELECT *\n   FROM `material`  WHERE x = %s") == \
+        "SELECT * FROM `material` WHERE x = %s"
+    assert tables_in("SELECT * FROM `detail_po` JOIN `material` USING (id_material)") == \
+        ("material", "detail_po")
@@ -0,0 +1,192 @@
+import pytest
+
+import changes
+import crud as crud_module
+from changes import ChangeBus, ChangeLogPoller, _poll
+from common import LazyTableModel
+from test_paging import fetch_all_pages, list_fetch
+from worker import DbWorker
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    calls = []
+    monkeypatch.setattr(crud_module, "_invalidate_hooks",
+                        crud_module._invalidate_hooks + [calls.append])
+    return calls
+
+
+def _log(db):
+    with db.cursor() as cur:
+        cur.execute("SELECT `id`, `tabel`, `op`, `pk` FROM `change_log` ORDER BY `id`")
+        return cur.fetchall()
+
+
+def test_poll_starts_from_now_and_dedups_per_row(sqlite_db, invalidated):
+    sqlite_db.insert("material", {"nama_material": "lama"})
+    after, events = _poll(sqlite_db, None, 500, {"material"})
+    assert events == [] and after == _log(sqlite_db)[-1]["id"]   # riwayat tidak diputar ulang
+
+    a = sqlite_db.insert("material", {"nama_material": "a"})
+    for harga in (1, 2, 3):
+        sqlite_db.update("material", "id_material", a, {"harga": harga})
+    b = sqlite_db.insert("material", {"nama_material": "b"})
+    sqlite_db.update("material", "id_material", b, {"harga": 9})
+    sqlite_db.delete("material", "id_material", b)
+    sqlite_db.insert("pemasok", {"nama_pemasok": "tidak didengar"})
+
+    after, events = _poll(sqlite_db, after, 500, {"material"})
+    assert after == _log(sqlite_db)[-1]["id"]
+    assert [(t, op, pk) for t, op, _, pk, _ in events] == \
+        [("material", "update", a), ("material", "delete", b)]
+    assert events[0][4]["harga"] == 3      # baris terbaru, diambil sekali
+    assert sorted(invalidated) == ["material", "pemasok"]
+
+
+def test_poll_reads_at_most_limit_rows(sqlite_db):
+    after, _ = _poll(sqlite_db, None, 500, {"material"})
+    ids = [sqlite_db.insert("material", {"nama_material": f"m{i}"}) for i in range(5)]
+    after, events = _poll(sqlite_db, after, 3, {"material"})
+    assert [e[3] for e in events] == ids[:3]
+    after, events = _poll(sqlite_db, after, 3, {"material"})
+    assert [e[3] for e in events] == ids[3:]
+    assert _poll(sqlite_db, after, 3, {"material"}) == (after, [])
+
+
+def test_row_deleted_before_fetch_becomes_delete(sqlite_db):
+    after, _ = _poll(sqlite_db, None, 500, {"material"})
+    a = sqlite_db.insert("material", {"nama_material": "a"})
+    with sqlite_db.cursor() as cur:   # dihapus tanpa change_log (mis. sebelum trigger terpasang)
+        cur.execute("DELETE FROM `material` WHERE `id_material` = %s", (a,))
+        cur.execute("DELETE FROM `change_log` WHERE `op` = 'delete'")
+    _, events = _poll(sqlite_db, after, 500, {"material"})
+    assert events == [("material", "delete", "id_material", a, None)]
+
+
+def test_poller_does_not_prune_by_default(sqlite_db, monkeypatch):
+    monkeypatch.setattr(changes, "CHANGE_LOG_KEEP", 2)
+    for i in range(6):
+        sqlite_db.insert("material", {"nama_material": f"m{i}"})
+    after, _ = _poll(sqlite_db, None, 500, {"material"})
+    _poll(sqlite_db, after, 500, {"material"})
+    assert len(_log(sqlite_db)) == 6
+
+
+def test_opt_in_prune_deletes_in_bounded_batches(sqlite_db, monkeypatch):
+    monkeypatch.setattr(changes, "CHANGE_LOG_KEEP", 2)
+    monkeypatch.setattr(changes, "PRUNE_BATCH", 3)
+    for i in range(10):
+        sqlite_db.insert("material", {"nama_material": f"m{i}"})
+    first = _log(sqlite_db)[0]["id"]
+    after, _ = _poll(sqlite_db, None, 500, {"material"}, prune=True)
+    assert [r["id"] for r in _log(sqlite_db)][0] == first + 3      # satu batch saja
+    _poll(sqlite_db, after, 500, {"material"}, prune=True)
+    _poll(sqlite_db, after, 500, {"material"}, prune=True)
+    assert [r["id"] for r in _log(sqlite_db)] == [after - 2, after - 1, after]   # id >= MAX - KEEP
+
+
+def test_reader_behind_retention_reloads_everything(sqlite_db, invalidated):
+    after, _ = _poll(sqlite_db, None, 500, {"material"})
+    for i in range(5):
+        sqlite_db.insert("material", {"nama_material": f"m{i}"})
+    with sqlite_db.cursor() as cur:   # event retensi MySQL membuang baris yang belum dibaca
+        cur.execute("DELETE FROM `change_log` WHERE `id` < %s", (after + 3,))
+    hi = _log(sqlite_db)[-1]["id"]
+    invalidated.clear()
+    assert _poll(sqlite_db, after, 500, {"pemasok", "material"}) == \
+        (hi, [("material", "bulk", None, None, None), ("pemasok", "bulk", None, None, None)])
+    assert invalidated == [None]
+
+
+def test_invalidate_cache_drops_option_cache(sqlite_db):
+    sqlite_db.insert("pemasok", {"nama_pemasok": "A"})
+    key = ("pemasok", "id_pemasok", "nama_pemasok")
+    sqlite_db.fetch_options(*key)
+    assert crud_module._lookups.get(key) is not None
+    crud_module.crud.invalidate_cache("material")
+    assert crud_module._lookups.get(key) is not None
+    crud_module.crud.invalidate_cache("pemasok")
+    assert crud_module._lookups.get(key) is None
+
+
+def test_bus_publishes_only_watched_tables(sqlite_db, qapp, wait):
+    bus, seen = ChangeBus(), []
+    slot = lambda *e: seen.append(e)
+    bus.watch("material", slot)
+    bus.on_write("pemasok", "insert", "id_pemasok", 1, {})
+    a = sqlite_db.insert("material", {"nama_material": "a"})
+    bus.on_write("material", "update", "id_material", a, {"harga": 5})
+    bus.on_write("material", "update", "id_material", 999, {"harga": 5})
+    wait(lambda: len(seen) == 2)
+    assert seen[0][:4] == ("material", "update", "id_material", a)
+    assert seen[0][4]["nama_material"] == "a"
+    assert seen[1] == ("material", "delete", "id_material", 999, None)   # keburu dihapus
+    bus.unwatch("material", slot)
+    assert not bus.watched("material")
+
+
+def test_poller_idles_unless_watched_or_held(sqlite_db, qapp, wait):
+    bus = ChangeBus()
+    poller = ChangeLogPoller(bus, interval=60_000)
+    poller.poll()                       # baca pertama: watermark
+    wait(lambda: not poller._busy)
+    poller.poll()
+    assert not poller._busy             # tidak ada form/laporan yang butuh
+    bus.hold()
+    poller.poll()
+    assert poller._busy
+    wait(lambda: not poller._busy)
+    bus.release()
+    poller.stop()
+
+
+@pytest.fixture
+def model(qapp, wait):
+    rows = [{"id": i, "nama": f"n{i}"} for i in range(1, 6)]
+    m = LazyTableModel(list_fetch(rows), DbWorker())
+    fetch_all_pages(m, wait)
+    return m
+
+
+def test_apply_change_update_delete_insert(model):
+    changed, removed, inserted = [], [], []
+    model.dataChanged.connect(lambda a, b: changed.append(a.row()))
+    model.rowsRemoved.connect(lambda p, a, b: removed.append(a))
+    model.rowsInserted.connect(lambda p, a, b: inserted.append(a))
+
+    assert model.apply_change("update", "id", 3, {"id": 3, "nama": "baru"})
+    assert model.row_dict(2) == {"id": 3, "nama": "baru"} and changed == [2]
+    assert model.apply_change("update", "id", 3, {"id": 3, "nama": "baru"})
+    assert changed == [2]               # hook & change_log untuk tulis yang sama: sekali saja
+
+    assert model.apply_change("delete", "id", 1)
+    assert removed == [0] and model.rowCount() == 4
+    assert model.apply_change("delete", "id", 99)   # tidak ada, semua halaman di memori
+
+    assert model.apply_change("insert", "id", 6, {"id": 6, "nama": "n6"})
+    assert inserted == [4] and model.row_dict(4)["id"] == 6
+    assert model.apply_change("insert", "id", 7, {"id": 7}, accept_insert=False)
+    assert model.rowCount() == 5        # hasil pencarian: baris baru belum tentu cocok
+    assert not model.apply_change("update", "id", 2, None)
+
+
+def test_apply_change_on_partially_loaded_model(qapp, wait):
+    class SmallModel(LazyTableModel):
+        PAGE_SIZE = 2
+        MAX_PAGES = 1
+
+    rows = [{"id": i} for i in range(1, 6)]
+    m = SmallModel(list_fetch(rows), DbWorker())
+    wait(lambda: not m._loading)
+    m.fetchMore()
+    wait(lambda: not m._loading)        # halaman 0 sudah dibuang dari memori, data belum habis
+    assert not m.apply_change("delete", "id", 1)   # tidak bisa dipastikan: muat ulang
+    assert m.apply_change("insert", "id", 6, {"id": 6})
+    assert m.rowCount() == 4            # datang sendiri lewat fetchMore
+
+
+def test_apply_change_insert_into_empty_table(qapp, wait):
+    m = LazyTableModel(list_fetch([]), DbWorker())
+    wait(lambda: not m._loading)
+    assert m.apply_change("insert", "id", 1, {"id": 1, "nama": "a"})
+    assert m.rowCount() == 1 and m.columnCount() == 2
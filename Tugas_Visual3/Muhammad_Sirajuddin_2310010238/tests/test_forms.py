@@ -0,0 +1,116 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QWidget
+
+import main
+
+
+class Form(QWidget):
+    """Form palsu: hitung instance & closeEvent, ukuran cache bisa diatur."""
+
+    created = 0
+    size = 0
+
+    def __init__(self):
+        super().__init__()
+        type(self).created += 1
+        self.closed = 0
+
+    def cache_size(self):
+        return self.size
+
+    def closeEvent(self, event):
+        self.closed += 1
+        super().closeEvent(event)
+
+
+@pytest.fixture
+def forms(qapp, monkeypatch):
+    classes = {k: type(f"Form_{k}", (Form,), {"created": 0}) for k in ("a", "b")}
+    monkeypatch.setattr(main, "form_class", classes.__getitem__)
+    return classes
+
+
+def settle():
+    """Jalankan timer trim & deleteLater yang tertunda."""
+    for _ in range(3):
+        QCoreApplication.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def test_open_reuses_the_visible_instance(forms):
+    fm = main.FormManager(limits={})
+    first = fm.open("a")
+    assert fm.open("a") is first
+    assert forms["a"].created == 1
+    assert first.isVisible()
+    fm.close_all()
+
+
+def test_closed_form_is_hidden_and_reshown(forms):
+    fm = main.FormManager(limits={})
+    form = fm.open("a")
+    form.close()
+    settle()
+    assert not form.isVisible()
+    assert fm.instances("a") == [form]   # disembunyikan, bukan dihancurkan
+    assert fm.open("a") is form
+    assert form.isVisible()
+    assert forms["a"].created == 1
+    fm.close_all()
+
+
+def test_limit_allows_extra_instances(forms):
+    fm = main.FormManager(limits={"a": 2})
+    assert fm.limit("a") == 2 and fm.limit("b") == main.MAX_INSTANCES
+    first = fm.open("a")
+    second = fm.open("a")
+    assert second is not first
+    assert fm.open("a") is second   # batas tercapai: yang terakhir dipakai
+    assert forms["a"].created == 2
+    first.hide()
+    assert fm.open("a") is first    # yang tersembunyi dipakai lagi dulu
+    assert forms["a"].created == 2
+    fm.close_all()
+
+
+def test_trim_drops_least_recently_used_hidden_forms(forms):
+    forms["a"].size = forms["b"].size = 600
+    fm = main.FormManager(limits={}, cache_mb=1000 / (1024 * 1024))
+    a, b = fm.open("a"), fm.open("b")
+    a.close()
+    settle()
+    assert fm.instances("a") == [a]   # 600 byte masih muat
+    b.close()
+    settle()
+    # 1200 byte > 1000: yang paling lama tidak dipakai (a) dibuang
+    assert fm.instances("a") == [] and fm.instances("b") == [b]
+    assert fm.cached_bytes() == 600
+    assert a.closed == 2   # closeEvent tetap terkirim ke form yang sudah tersembunyi
+    assert fm.open("a") is not a
+    fm.close_all()
+
+
+def test_close_all_destroys_every_form(forms):
+    fm = main.FormManager(limits={})
+    visible = fm.open("a")
+    fm.prepare("b")
+    hidden = fm.instances("b")[0]
+    destroyed = []
+    for f in (visible, hidden):
+        f.destroyed.connect(lambda *_: destroyed.append(1))
+    fm.close_all()
+    settle()
+    assert len(destroyed) == 2
+    assert fm.instances("a") == [] and fm.instances("b") == []
+
+
+def test_prepare_creates_one_hidden_instance(forms):
+    fm = main.FormManager(limits={})
+    fm.prepare("a")
+    fm.prepare("a")
+    assert forms["a"].created == 1
+    (form,) = fm.instances("a")
+    assert not form.isVisible()
+    assert fm.open("a") is form
+    fm.close_all()
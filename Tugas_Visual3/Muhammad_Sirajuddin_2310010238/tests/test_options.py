@@ -0,0 +1,98 @@
+import pytest
+from PySide6.QtWidgets import QComboBox
+
+import crud as crud_module
+from common import OptionsModel
+from crud import OptionList, crud
+
+KEY = ("pemasok", "id_pemasok", "nama_pemasok")
+
+
+@pytest.fixture
+def db(server):
+    crud_module._lookups.invalidate()
+    server.fill("pemasok", [{"id_pemasok": i, "nama_pemasok": n}
+                            for i, n in ((1, "Cahaya"), (2, "abadi"), (3, "Bumi"))])
+    server.queries.clear()
+    yield crud()
+    crud_module._lookups.invalidate()
+
+
+def option_queries(server):
+    return [q for q in server.queries if " AS label " in q]
+
+
+def labels(db):
+    return db.fetch_option_list(*KEY).labels
+
+
+def test_option_list_patches_keep_label_order():
+    opts = OptionList([2, 3, 1], ["abadi", "Bumi", "Cahaya"])
+    assert opts.index_of(3) == 1 and opts.index_of(9) == -1
+    added = opts.with_row(4, "Batu")
+    assert added.labels == ["abadi", "Batu", "Bumi", "Cahaya"]
+    assert opts.labels == ["abadi", "Bumi", "Cahaya"]           # tidak pernah diubah di tempat
+    assert added.with_row(2, "Zaitun").ids == [4, 3, 1, 2]       # ganti label = pindah posisi
+    assert added.without(3).ids == [2, 4, 1]
+    assert added.without(99) is added
+
+
+def test_options_queried_once_then_served_from_cache(db, server):
+    assert labels(db) == ["abadi", "Bumi", "Cahaya"]
+    assert crud().fetch_option_list(*KEY) is db.fetch_option_list(*KEY)
+    assert crud.cached_options(*KEY) is not None
+    assert len(option_queries(server)) == 1
+
+
+def test_writes_patch_cached_options_without_query(db, server):
+    labels(db)
+    new_id = db.insert("pemasok", {"nama_pemasok": "Baru"})
+    assert labels(db) == ["abadi", "Baru", "Bumi", "Cahaya"]
+    db.update("pemasok", "id_pemasok", 1, {"nama_pemasok": "Akbar"})
+    assert labels(db) == ["abadi", "Akbar", "Baru", "Bumi"]
+    db.update("pemasok", "id_pemasok", 3, {"telepon": "0812"})   # label tetap
+    db.delete("pemasok", "id_pemasok", new_id)
+    assert db.fetch_option_list(*KEY).ids == [2, 1, 3]
+    assert len(option_queries(server)) == 1
+    assert db.fetch_option_list(*KEY).labels == \
+        [r["label"] for r in crud_module.crud.fetch_options(db, *KEY)]
+
+
+def test_entry_dropped_when_write_cannot_patch_it(db, server):
+    db.fetch_option_list("pemasok", "id_pemasok", "email")
+    db.insert("pemasok", {"nama_pemasok": "Tanpa Email"})      # label (email) tidak dikirim
+    assert crud.cached_options("pemasok", "id_pemasok", "email") is None
+
+
+def test_query_older_than_a_write_is_not_cached(db):
+    gen = crud_module._lookups.generation("pemasok")
+    stale = OptionList([1], ["Cahaya"])
+    db.insert("pemasok", {"nama_pemasok": "Baru"})
+    crud_module._lookups.put(KEY, stale, gen)
+    assert crud.cached_options(*KEY) is None
+
+
+def test_options_model_shows_rows_in_chunks():
+    opts = OptionList(list(range(1200)), [f"m{i:04}" for i in range(1200)])
+    model = OptionsModel(opts)
+    assert model.rowCount() == 500 and model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 1000
+    assert model.row_of(1100) == 1100 and model.rowCount() == 1101
+    assert model.row_of(-5) == -1
+
+
+def test_second_form_reuses_cached_combo_options(db, server, wait):
+    from purchase_order import PurchaseOrderForm
+    first = PurchaseOrderForm()
+    combo = first.ui.findChild(QComboBox, "comboPemasok")
+    wait(lambda: isinstance(combo.model(), OptionsModel))
+    assert [combo.itemText(i) for i in range(combo.count())] == ["abadi", "Bumi", "Cahaya"]
+    queries = len(option_queries(server))
+
+    second = PurchaseOrderForm()
+    combo2 = second.ui.findChild(QComboBox, "comboPemasok")
+    assert isinstance(combo2.model(), OptionsModel)   # langsung dari cache, tanpa menunggu worker
+    assert combo2.model().options() is combo.model().options()
+    wait(lambda: second.table.model() is not None)
+    assert len(option_queries(server)) == queries
@@ -0,0 +1,108 @@
+from PySide6.QtCore import Qt
+
+from common import LazyTableModel
+from crud import crud
+from fakemysql import materials
+from worker import DbWorker
+
+
+def list_fetch(rows, key="id", calls=None):
+    """fetch(db, cursor, limit) keyset di atas list biasa."""
+    def fetch(db, after, limit):
+        if calls is not None:
+            calls.append((after, limit))
+        page = [r for r in rows if after is None or r[key] > after][:limit]
+        return page, (page[-1][key] if len(page) == limit else None)
+    return fetch
+
+
+def fetch_all_pages(model, wait):
+    while True:
+        wait(lambda: not model._loading)
+        if not model.canFetchMore():
+            return
+        model.fetchMore()
+
+
+def test_fetch_page_is_keyset(server):
+    server.fill("material", materials(450))
+    db = crud()
+    sizes, after = [], None
+    while True:
+        rows = db.fetch_page("material", "id_material", after, 200)
+        sizes.append(len(rows))
+        if len(rows) < 200:
+            break
+        after = rows[-1]["id_material"]
+    assert sizes == [200, 200, 50]
+    assert rows[-1]["id_material"] == 450
+    assert not any("OFFSET" in q for q in server.queries)
+
+
+def test_search_page_continues_from_cursor(server):
+    server.fill("material", materials(450))
+    db = crud()
+    first, nxt = db.search_page("material", "Material 1", "id_material", None, 50)
+    rest, end = db.search_page("material", "Material 1", "id_material", nxt, 200)
+    ids = [r["id_material"] for r in first + rest]
+    assert sorted(ids) == [i for i in range(1, 451) if str(i).startswith("1")]
+    assert end is None
+
+
+def test_model_loads_first_page_then_fetch_more(wait):
+    rows = [{"id": i, "nama": f"n{i}"} for i in range(1, 451)]
+    model = LazyTableModel(list_fetch(rows), DbWorker())
+    wait(lambda: model.rowCount() == 200)
+    assert model.columnCount() == 2
+    assert model.canFetchMore()
+    fetch_all_pages(model, wait)
+    assert model.rowCount() == 450
+    assert model.data(model.index(449, 1)) == "n450"
+    assert model.headerData(0, Qt.Horizontal) == "id"
+
+
+def test_model_stops_on_exact_multiple_of_page_size(wait):
+    rows = [{"id": i} for i in range(1, 401)]
+    calls = []
+    model = LazyTableModel(list_fetch(rows, calls=calls), DbWorker())
+    fetch_all_pages(model, wait)
+    assert model.rowCount() == 400
+    assert len(calls) == 3             # halaman ketiga kosong -> selesai
+
+
+def test_model_refetches_evicted_page_from_its_start_cursor(wait):
+    class SmallModel(LazyTableModel):
+        PAGE_SIZE = 10
+        MAX_PAGES = 2
+
+    rows = [{"id": i} for i in range(1, 51)]
+    calls = []
+    model = SmallModel(list_fetch(rows, calls=calls), DbWorker())
+    fetch_all_pages(model, wait)
+    assert model.rowCount() == 50
+    assert len(model._pages) == 2
+
+    calls.clear()
+    assert model.row_dict(15) == {}    # belum ada di memori -> diambil ulang di worker
+    wait(lambda: model.row_dict(15) == {"id": 16})
+    assert calls == [(10, 10)]          # halaman 1 diambil ulang mulai sesudah id 10
+    model.row_dict(0)
+    wait(lambda: model.row_dict(0) == {"id": 1})
+    assert calls == [(10, 10), (None, 10)]
+    assert len(model._pages) == 2
+
+
+def test_form_table_pages_from_db(server, wait):
+    from material import MaterialForm
+    server.fill("material", materials(450))
+    form = MaterialForm()
+    wait(lambda: form.table.model() is not None)
+    model = form.table.model()
+    assert model.rowCount() == 200
+    model.fetchMore()
+    wait(lambda: model.rowCount() == 400)
+    form.lineSearch.setText("Material 44")
+    wait(lambda: form.table.model().keyword == "Material 44")
+    model = form.table.model()
+    assert [model.row_dict(i)["id_material"] for i in range(model.rowCount())] == \
+        [44] + list(range(440, 450))
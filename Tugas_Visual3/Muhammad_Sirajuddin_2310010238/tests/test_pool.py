@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+import backend_mysql
+import crud as crud_module
+from crud import crud
+from fakemysql import materials
+
+
+@pytest.fixture
+def pool(server):
+    crud_module.configure_result_cache(max_mb=0)   # tiap fetch harus benar-benar pinjam koneksi
+    yield crud_module.get_backend()._pool
+    crud_module.configure_result_cache(max_mb=crud_module.RESULT_CACHE_MB)
+
+
+def use_every_connection(pool):
+    """Pinjam & kembalikan semua koneksi sekali (antrian pool FIFO)."""
+    for _ in range(pool.pool_size):
+        crud().fetch_all("material")
+
+
+def test_crud_objects_share_one_bounded_pool(server, pool):
+    server.fill("material", materials(5))
+    before = set(server.connections)
+
+    def run():
+        for db in [crud() for _ in range(10)]:
+            assert len(db.fetch_all("material")) == 5
+
+    threads = [threading.Thread(target=run) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = crud.pool_stats()
+    assert stats["size"] == crud_module.POOL_SIZE
+    assert stats["idle"] == crud_module.POOL_SIZE
+    assert set(server.connections) == before   # tidak ada koneksi baru di luar pool
+
+
+def test_checkout_waits_for_a_returned_connection(pool):
+    before = pool.stats()
+    held = [pool.get_connection() for _ in range(pool.pool_size)]
+    threading.Timer(0.2, pool.release, (held.pop(),)).start()
+    conn = pool.get_connection(timeout=5)
+    for c in held + [conn]:
+        pool.release(c)
+    after = pool.stats()
+    assert after["exhausted"] == before["exhausted"] + 1
+    assert after["timeouts"] == before["timeouts"]
+    assert after["wait_max_ms"] >= 150
+    assert after["idle"] == pool.pool_size
+
+
+def test_checkout_gives_up_after_timeout(pool):
+    before = pool.stats()
+    held = [pool.get_connection() for _ in range(pool.pool_size)]
+    try:
+        with pytest.raises(PoolError):
+            pool.get_connection(timeout=0.05)
+    finally:
+        for c in held:
+            pool.release(c)
+    assert pool.stats()["timeouts"] == before["timeouts"] + 1
+
+
+def test_only_idle_connections_are_pinged(pool, monkeypatch):
+    monkeypatch.setattr(backend_mysql, "HEALTH_INTERVAL", 3600)
+    use_every_connection(pool)
+    pings = pool.stats()["pings"]
+    for _ in range(20):
+        crud().fetch_all("material")
+    assert pool.stats()["pings"] == pings
+
+    monkeypatch.setattr(backend_mysql, "HEALTH_INTERVAL", 0)
+    use_every_connection(pool)
+    assert pool.stats()["pings"] == pings + pool.pool_size
+
+
+def test_dropped_connections_reconnect_on_health_check(server, pool, monkeypatch):
+    server.fill("material", materials(3))
+    monkeypatch.setattr(backend_mysql, "HEALTH_INTERVAL", 0)
+    server.drop_connections()
+    for _ in range(pool.pool_size):
+        assert len(crud().fetch_all("material")) == 3
+
+
+def test_failed_ping_keeps_connection_in_pool(server, pool, monkeypatch):
+    monkeypatch.setattr(backend_mysql, "HEALTH_INTERVAL", 0)
+    server.down = True
+    with pytest.raises(Error):
+        crud().fetch_all("material")
+    assert pool.stats()["idle"] == pool.pool_size
+    server.down = False
+    assert crud().fetch_all("material") == []
@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+
+import pytest
+from mysql.connector import errors
+
+import backend_mysql
+import crud as crud_module
+from crud import crud, delete_sql, insert_sql, select_by_id_sql, update_sql
+
+
+@pytest.fixture
+def pool(server, monkeypatch):
+    monkeypatch.setattr(crud_module, "_write_hooks", [])   # hook lain (mis. bus perubahan) ikut query
+    pool = crud_module.get_backend()._pool
+    for conn in server.connections.values():
+        conn.__dict__.pop("_stmt_cache", None)   # cache dari tes sebelumnya
+    return pool
+
+
+@contextmanager
+def one_connection(pool):
+    """Pinjam semua koneksi kecuali satu, jadi crud selalu memakai koneksi yang sama."""
+    held = [pool.get_connection() for _ in range(pool.pool_size - 1)]
+    try:
+        yield
+    finally:
+        for c in held:
+            pool.release(c)
+
+
+def test_sql_builders_return_the_same_string_object():
+    assert insert_sql("material", ("nama_material",)) is insert_sql("material", ("nama_material",))
+    assert update_sql("material", "id_material", ("harga",)) == \
+        "UPDATE `material` SET `harga`=%s WHERE `id_material`=%s"
+    assert delete_sql("material", "id_material") is delete_sql("material", "id_material")
+
+
+def test_statements_are_prepared_once_per_connection(server, pool):
+    db = crud()
+    for i in range(40):
+        new_id = db.insert("material", {"nama_material": f"M{i}", "harga": i})
+        db.update("material", "id_material", new_id, {"harga": i + 1})
+        assert db.fetch_by_id("material", "id_material", new_id)["harga"] == i + 1
+    assert db.delete("material", "id_material", 1)
+    assert len(server.prepares) == len(set(server.prepares))   # tidak ada PREPARE ulang
+    assert len({sql for _, sql in server.prepares}) == 4
+    assert len(server.prepares) <= 3 * pool.pool_size + 1
+
+
+def test_statement_cache_is_lru_per_connection(server, pool, monkeypatch):
+    monkeypatch.setattr(crud_module, "STMT_CACHE_SIZE", 2)
+    db = crud()
+    with one_connection(pool):
+        new_id = db.insert("material", {"nama_material": "a"})
+        db.fetch_by_id("material", "id_material", new_id)
+        db.insert("material", {"nama_material": "b"})      # insert jadi yang terbaru
+        db.update("material", "id_material", new_id, {"harga": 1})   # fetch_by_id keluar
+        db.insert("material", {"nama_material": "c"})
+        assert len(server.prepares) == 3
+        db.fetch_by_id("material", "id_material", new_id)   # di-PREPARE lagi
+        assert server.prepares[-1][1] == select_by_id_sql("material", "id_material")
+        assert len(server.prepares) == 4
+    cache = crud_module._statements(server.connections[server.prepares[-1][0]])
+    assert list(cache) == [insert_sql("material", ("nama_material",)),
+                           select_by_id_sql("material", "id_material")]
+
+
+def test_cache_is_dropped_when_health_check_reconnects(server, pool, monkeypatch):
+    db = crud()
+    with one_connection(pool):
+        db.insert("material", {"nama_material": "a"})
+        first = server.prepares[-1][0]
+        server.drop_connections()
+        monkeypatch.setattr(backend_mysql, "HEALTH_INTERVAL", 0)
+        db.insert("material", {"nama_material": "b"})   # statement lama sudah hilang di server
+    assert server.prepares[-1][0] != first
+    assert [r["nama_material"] for r in db.fetch_all("material")] == ["a", "b"]
+
+
+def test_cursor_that_raised_is_not_reused(server, pool):
+    db = crud()
+    with one_connection(pool):
+        db.insert("material", {"id_material": 1, "nama_material": "a"})
+        cursors = list(crud_module._statements(server.connections[server.prepares[-1][0]]).values())
+        with pytest.raises(errors.IntegrityError):
+            db.insert("material", {"id_material": 1, "nama_material": "b"})
+        assert cursors[0].closed
+        db.insert("material", {"id_material": 2, "nama_material": "c"})
+    assert len(server.prepares) == 2
@@ -0,0 +1,120 @@
+import pytest
+
+from crud import crud, filter_conditions, filter_matches, keyset_condition
+
+PRICES = [300, None, 100, 300, None, 200, 100, 300, 50, None, 200]
+
+
+@pytest.fixture
+def db(server):
+    server.fill("material", [{"id_material": i, "nama_material": f"Material {i}",
+                              "satuan": "kg", "harga": h} for i, h in enumerate(PRICES, 1)])
+    server.fill("purchase_order", [{"id_po": i, "no_po": f"PO-{i:03}", "total": i * 10,
+                                    "status_po": s}
+                                   for i, s in enumerate(["Draft", "Selesai", "Draft", None,
+                                                          "Dikirim", "Disetujui", "Draft"], 1)])
+    server.queries.clear()
+    return crud()
+
+
+def all_pages(db, table, pk, limit, **kw):
+    rows, cursor, cursors = [], None, []
+    while True:
+        page, cursor = db.query_page(table, pk, cursor, limit, **kw)
+        rows += page
+        cursors.append(cursor)
+        if cursor is None:
+            return rows, cursors
+
+
+def expected(desc):
+    # NULL paling kecil: di depan kalau ASC, di belakang kalau DESC; seri diurut PK searah
+    key = [(h is not None, h or 0, i) for i, h in enumerate(PRICES, 1)]
+    return [i for *_, i in sorted(key, reverse=desc)]
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 20])
+def test_column_sort_pages_by_keyset(db, server, desc, limit):
+    rows, cursors = all_pages(db, "material", "id_material", limit, order=("harga", desc))
+    assert [r["id_material"] for r in rows] == expected(desc)
+    assert all(isinstance(c, tuple) for c in cursors[:-1])
+    sql = [q for q in server.queries if "FROM `material`" in q]
+    assert all("OFFSET" not in q for q in sql)
+    direction = " DESC" if desc else ""
+    assert f"ORDER BY `harga`{direction}, `id_material`{direction}" in sql[0]
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_pk_sort_uses_pk_cursor(db, desc):
+    rows, cursors = all_pages(db, "material", "id_material", 4, order=("id_material", desc))
+    ids = [r["id_material"] for r in rows]
+    assert ids == sorted(ids, reverse=desc) and len(ids) == len(PRICES)
+    assert cursors[:-1] == ([4, 8] if not desc else [8, 4])
+
+
+def test_enum_sort_pages_by_offset(db, server):
+    rows, cursors = all_pages(db, "purchase_order", "id_po", 3, order=("status_po", False))
+    assert sorted(r["id_po"] for r in rows) == list(range(1, 8))
+    assert cursors == [3, 6, None]
+    assert all("OFFSET" in q for q in server.queries if "FROM `purchase_order`" in q)
+
+
+def test_filters_combine_with_sort(db):
+    rows, _ = all_pages(db, "material", "id_material", 2, order=("harga", True),
+                        filters={"harga": (100, 250)})
+    assert [(r["id_material"], r["harga"]) for r in rows] == [(11, 200), (6, 200), (7, 100), (3, 100)]
+    rows, _ = db.query_page("purchase_order", "id_po", None, 50,
+                            filters={"status_po": ["Draft", "Dikirim"], "total": (None, 50)})
+    assert [r["id_po"] for r in rows] == [1, 3, 5]
+
+
+def test_filters_with_keyword_search(db):
+    rows, cursor = db.query_page("material", "id_material", None, 50, keyword="Material 1",
+                                 filters={"harga": (None, 200)})
+    # "Material 1", "Material 10" (harga NULL) dan "Material 11": yang lolos filter cuma 11
+    assert [r["id_material"] for r in rows] == [11]
+    assert cursor is None
+
+
+def test_plain_page_keeps_old_path(db, server):
+    rows, cursor = db.query_page("material", "id_material", None, 5)
+    assert [r["id_material"] for r in rows] == [1, 2, 3, 4, 5] and cursor == 5
+    assert "ORDER BY `id_material` LIMIT" in server.queries[-1]
+
+
+def test_unknown_column_rejected(db):
+    with pytest.raises(ValueError):
+        db.query_page("material", "id_material", order=("harga; DROP TABLE x", False))
+    with pytest.raises(ValueError):
+        db.query_page("material", "id_material", filters={"nama`": ["x"]})
+
+
+def test_filter_conditions_sql():
+    info = crud().table_info("purchase_order")
+    conds, params = filter_conditions(info, {"total": (10, None), "tanggal_po": (None, "2024-12-31"),
+                                             "status_po": ["Draft", "Selesai"], "id_pemasok": []})
+    assert conds == ["`total` >= %s", "`tanggal_po` <= %s", "`status_po` IN (%s, %s)", "1 = 0"]
+    assert params == [10, "2024-12-31", "Draft", "Selesai"]
+    assert filter_conditions(info, None) == ([], [])
+
+
+def test_filter_matches_mirrors_sql():
+    filters = {"total": (10, 50), "status_po": ["Draft"]}
+    assert filter_matches(filters, {"total": 10, "status_po": "Draft"})
+    assert not filter_matches(filters, {"total": 60, "status_po": "Draft"})
+    assert not filter_matches(filters, {"total": None, "status_po": "Draft"})
+    assert not filter_matches(filters, {"total": 20, "status_po": None})
+    assert not filter_matches({"status_po": []}, {"status_po": "Draft"})
+    assert filter_matches({"total": (None, None)}, {"total": None})
+    assert filter_matches(None, {})
+
+
+def test_keyset_condition_handles_nulls():
+    assert keyset_condition("harga", "id", False, 5, 2) == \
+        ("(`harga` > %s OR (`harga` = %s AND `id` > %s))", (5, 5, 2))
+    assert keyset_condition("harga", "id", True, 5, 2) == \
+        ("(`harga` < %s OR (`harga` = %s AND `id` < %s) OR `harga` IS NULL)", (5, 5, 2))
+    assert keyset_condition("harga", "id", False, None, 2) == \
+        ("((`harga` IS NULL AND `id` > %s) OR `harga` IS NOT NULL)", (2,))
+    assert keyset_condition("harga", "id", True, None, 2) == ("(`harga` IS NULL AND `id` < %s)", (2,))
@@ -0,0 +1,117 @@
+import sqlite3
+import time
+from decimal import Decimal
+
+import pytest
+
+import backend_sqlite
+import crud as crud_module
+import replica
+
+
+@pytest.fixture
+def replica_pair(tmp_path, monkeypatch):
+    """Replika lokal + 'server' stub: crud di file SQLite kedua, sinkron dipanggil manual."""
+    execute = backend_sqlite._Cursor.execute
+    # SQLite tidak punya SELECT ... FOR UPDATE (penguncian cukup dari transaksi tulisnya)
+    monkeypatch.setattr(backend_sqlite._Cursor, "execute",
+                        lambda self, sql, params=(): execute(self, sql.replace(" FOR UPDATE", ""), params))
+    monkeypatch.setattr(replica, "IntegrityError", sqlite3.IntegrityError)
+    monkeypatch.setattr(replica, "DataError", sqlite3.DataError)
+    monkeypatch.setattr(replica.Syncer, "start", lambda self: None)   # tanpa thread latar
+
+    remote = crud_module.crud(backend_sqlite.Backend(str(tmp_path / "server.sqlite3"),
+                                                     crud_module.SQL_DUMP, 2))
+
+    def stub_server(self):
+        self._stamped = set(crud_module.TABLES)
+        self._server = remote
+        return remote
+    monkeypatch.setattr(replica.Syncer, "server", stub_server)
+    monkeypatch.setattr(crud_module, "REPLICA_PATH", str(tmp_path / "lokal.sqlite3"))
+    local = crud_module.use_backend("replica")
+    return crud_module.crud(), remote, local.sync
+
+
+def test_replica_push_assigns_server_ids(replica_pair):
+    db, remote, sync = replica_pair
+    sync.sync_once()
+    local_id = db.insert("material", {"nama_material": "Lokal Kerikil", "satuan": "m3",
+                                      "harga": "75.50"})
+    assert local_id >= replica.LOCAL_ID_BASE
+    sync.sync_once()
+    on_server = [r for r in remote.fetch_all("material") if r["nama_material"] == "Lokal Kerikil"]
+    assert len(on_server) == 1 and on_server[0]["harga"] == Decimal("75.50")
+    new_id = on_server[0]["id_material"]
+    assert db.fetch_by_id("material", "id_material", new_id)["nama_material"] == "Lokal Kerikil"
+    assert db.fetch_by_id("material", "id_material", local_id) is None
+    assert sync.status()["outbox"] == 0
+
+
+def test_replica_push_remaps_local_foreign_keys(replica_pair):
+    db, remote, sync = replica_pair
+    sync.sync_once()
+    sp = db.insert("pemasok", {"nama_pemasok": "Pemasok Lokal"})
+    po = db.insert("purchase_order", {"no_po": "PO-LOKAL", "id_pemasok": sp})
+    sync.sync_once()
+    sp_server = remote.fetch_all("pemasok")[-1]["id_pemasok"]
+    po_row = [r for r in remote.fetch_all("purchase_order") if r["no_po"] == "PO-LOKAL"][0]
+    assert sp_server < replica.LOCAL_ID_BASE
+    assert po_row["id_pemasok"] == sp_server
+    # baris dengan FK NULL (id_pelanggan) tetap tercatat di outbox saat diubah
+    db.update("purchase_order", "id_po", po_row["id_po"], {"status_po": "Dikirim"})
+    sync.sync_once()
+    assert remote.fetch_by_id("purchase_order", "id_po", po_row["id_po"])["status_po"] == "Dikirim"
+    assert po >= replica.LOCAL_ID_BASE
+
+
+def test_replica_conflict_server_wins(replica_pair):
+    db, remote, sync = replica_pair
+    m = remote.insert("material", {"nama_material": "Pasir", "satuan": "m3", "harga": "100.00"})
+    sync.sync_once()
+    assert db.fetch_by_id("material", "id_material", m)["harga"] == Decimal("100.00")
+
+    time.sleep(1.1)   # diubah_pada beresolusi detik: stempel server harus berbeda dari yang ditarik
+    remote.update("material", "id_material", m, {"harga": "111.00"})
+    db.update("material", "id_material", m, {"harga": "222.00"})   # dasar: versi lama
+    sync.sync_once()
+
+    assert remote.fetch_by_id("material", "id_material", m)["harga"] == Decimal("111.00")
+    assert db.fetch_by_id("material", "id_material", m)["harga"] == Decimal("111.00")
+    with crud_module.get_backend().raw() as raw:
+        conflicts = raw.execute("SELECT tabel, op, pk, alasan FROM `_konflik`").fetchall()
+    assert conflicts == [("material", "update", m, "sudah diubah di server")]
+    assert sync.status()["conflicts"] == 1 and sync.status()["outbox"] == 0
+
+
+def test_replica_pull_brings_server_rows(replica_pair):
+    db, remote, sync = replica_pair
+    sync.sync_once()
+    p = remote.insert("pelanggan", {"nama_pelanggan": "Dari Server"})
+    sync.sync_once()
+    assert db.fetch_by_id("pelanggan", "id_pelanggan", p)["nama_pelanggan"] == "Dari Server"
+
+
+def test_replica_later_batch_gets_server_ids_of_earlier_batch(replica_pair, monkeypatch):
+    db, remote, sync = replica_pair
+    monkeypatch.setattr(replica, "PUSH_BATCH", 1)   # pemasok & PO terkirim di batch berbeda
+    sync.sync_once()
+    sp = db.insert("pemasok", {"nama_pemasok": "Pemasok Lokal"})
+    db.insert("purchase_order", {"no_po": "PO-LOKAL", "id_pemasok": sp})
+    sync.sync_once()
+    sp_server = [r for r in remote.fetch_all("pemasok") if r["nama_pemasok"] == "Pemasok Lokal"]
+    po_server = [r for r in remote.fetch_all("purchase_order") if r["no_po"] == "PO-LOKAL"]
+    assert po_server[0]["id_pemasok"] == sp_server[0]["id_pemasok"] < replica.LOCAL_ID_BASE
+    assert sync.status()["outbox"] == 0
+
+
+def test_known_ids_reads_only_ids_named_in_batch(replica_pair):
+    db, remote, sync = replica_pair
+    base = replica.LOCAL_ID_BASE
+    with crud_module.get_backend().raw() as raw:
+        raw.executemany("INSERT INTO `_id_map` VALUES (?, ?, ?)",
+                        [("pemasok", base + i, i) for i in range(1, 500)] +
+                        [("purchase_order", base + 7, 70)])
+    entries = [(1, "purchase_order", "update", base + 7, '{"id_pemasok": %d}' % (base + 3), None),
+               (2, "material", "delete", 5, None, None)]
+    assert sync._known_ids(entries) == {("purchase_order", base + 7): 70, ("pemasok", base + 3): 3}
@@ -0,0 +1,98 @@
+import datetime
+from array import array
+from decimal import Decimal
+
+from rowstore import Column, RowPage, format_value, rows_nbytes
+
+ROWS = [
+    {"id": 1, "harga": Decimal("1500.50"), "qty": 2.5, "tgl": datetime.date(2024, 1, 31),
+     "waktu": datetime.datetime(2024, 1, 31, 8, 30, 15, 250), "status": "Draft", "catatan": "a"},
+    {"id": 2, "harga": Decimal("7"), "qty": None, "tgl": None,
+     "waktu": datetime.datetime(1969, 12, 31, 23, 59), "status": "Draft", "catatan": None},
+    {"id": 3, "harga": None, "qty": 0.0, "tgl": datetime.date(1, 1, 1),
+     "waktu": None, "status": "Selesai", "catatan": "c"},
+    {"id": -4, "harga": Decimal("-0.125"), "qty": 1e300, "tgl": datetime.date(9999, 12, 31),
+     "waktu": datetime.datetime(2038, 1, 19, 3, 14, 8), "status": "Draft", "catatan": "d"},
+]
+
+
+def same(a, b):
+    """Nilai dan tipenya sama (Decimal 7 != 7.000 sebagai teks, tapi == sebagai angka)."""
+    return a == b and [type(v) for v in a.values()] == [type(v) for v in b.values()]
+
+
+def test_round_trip_keeps_values_and_types():
+    page = RowPage.from_rows(ROWS)
+    assert len(page) == 4
+    assert [same(page.row(i), r) for i, r in enumerate(ROWS)] == [True] * 4
+    assert page.rows() == ROWS
+    kinds = {h: c.kind for h, c in zip(page.headers, page.cols)}
+    assert kinds == {"id": "int", "harga": "dec", "qty": "float", "tgl": "date",
+                     "waktu": "dt", "status": "str", "catatan": None}
+    assert all(isinstance(page.cols[c].data, array) for c in range(5))
+    assert page.value(1, 1) == Decimal("7") and page.value(2, 1) is None
+
+
+def test_repeated_strings_are_interned():
+    page = RowPage.from_rows([{"s": "".join(["Dr", "aft"])} for _ in range(4)])
+    col = page.cols[0]
+    assert col.kind == "str"
+    assert all(v is col.data[0] for v in col.data)
+
+
+def test_mixed_or_too_precise_values_stay_objects():
+    assert Column([1, "x", None]).kind is None
+    assert Column([1, True]).kind is None   # bool bukan int
+    assert Column([Decimal("1.1234567")]).kind is None
+    assert Column([Decimal("NaN")]).kind is None
+    assert Column([2 ** 70]).kind is None
+    tz = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    assert Column([tz]).get(0) == tz
+
+
+def test_updates_fall_back_to_objects_when_needed():
+    page = RowPage.from_rows(ROWS)
+    page.set_row(1, dict(ROWS[1], harga=Decimal("0.375"), qty=3.0, status="Batal"))
+    assert page.row(1)["harga"] == Decimal("0.375")
+    assert page.cols[1].kind == "dec"   # masih muat di scale 3
+    page.set_row(1, dict(ROWS[1], harga=Decimal("0.1234")))
+    assert page.cols[1].kind is None    # butuh scale 4: jadi list objek
+    assert page.row(0)["harga"] == Decimal("1500.50")   # baris lain tidak berubah
+    page.set_row(2, dict(ROWS[2], harga="gratis"))
+    assert [page.row(i)["harga"] for i in range(4)] == \
+        [Decimal("1500.50"), Decimal("0.1234"), "gratis", Decimal("-0.125")]
+
+
+def test_append_delete_pad_and_find():
+    page = RowPage.from_rows(ROWS[:2])
+    page.append(ROWS[2])
+    assert page.rows() == ROWS[:3]
+    assert page.find("id", 3) == 2 and page.find("id", 9) == -1 and page.find("x", 1) == -1
+    page.delete(0)
+    assert page.rows() == ROWS[1:3]
+    page.pad(2)
+    assert len(page) == 4
+    assert page.row(3) == {} and page.value(3, 0) is None
+    assert page.find("tgl", None) == -1   # NULL / baris kosong tidak pernah cocok
+    page.set_row(3, ROWS[3])
+    assert page.row(3) == ROWS[3]
+
+
+def test_empty_page():
+    page = RowPage.from_rows([], ["id", "nama"])
+    assert len(page) == 0 and page.rows() == []
+    page.append({"id": 5})
+    assert page.rows() == [{"id": 5, "nama": None}]
+
+
+def test_page_is_smaller_than_dicts():
+    rows = [dict(r, id=i) for i in range(200) for r in ROWS[:1]]
+    assert RowPage.from_rows(rows).nbytes() * 3 < rows_nbytes(rows)
+
+
+def test_format_value():
+    assert format_value(None) == ""
+    assert format_value(Decimal("1234.5")) == "1,234.50"
+    assert format_value(2.0) == "2.00"
+    assert format_value(datetime.datetime(2024, 1, 2, 3, 4, 5)) == "2024-01-02 03:04:05"
+    assert format_value(datetime.date(2024, 1, 2)) == "2024-01-02"
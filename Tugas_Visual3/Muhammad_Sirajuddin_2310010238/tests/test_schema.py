@@ -0,0 +1,81 @@
+import pytest
+
+import crud as crud_module
+from crud import crud
+
+
+@pytest.fixture
+def db(server):
+    crud.refresh_schema()
+    yield crud()
+    crud.refresh_schema()
+
+
+def schema_queries(server):
+    return [q for q in server.queries if "information_schema" in q or "SHOW COLUMNS" in q]
+
+
+def test_metadata_loaded_once_from_information_schema(db, server):
+    info = db.table_info("purchase_order")
+    assert info.columns == ["id_po", "no_po", "tanggal_po", "id_pemasok", "id_pelanggan",
+                            "total", "status_po"]
+    assert info.pk == "id_po"
+    assert info.types["total"] == "decimal(15,2)"
+    assert info.data_types["tanggal_po"] == "date"
+    assert info.enums["status_po"] == ["Draft", "Disetujui", "Dikirim", "Selesai"]
+    assert info.fks == {"id_pemasok": ("pemasok", "id_pemasok"),
+                        "id_pelanggan": ("pelanggan", "id_pelanggan")}
+    assert not info.nullable["no_po"] and info.nullable["total"]
+    assert db.table_info("detail_po").fks["id_material"] == ("material", "id_material")
+    assert db.table_info("tidak_ada") is None
+
+    loaded = len(schema_queries(server))
+    for table in crud_module.TABLES:
+        db.table_info(table)
+        db.show_columns(table)
+    crud().fetch_options("material", "id_material")
+    assert len(schema_queries(server)) == loaded
+    assert not any("SHOW COLUMNS" in q for q in server.queries)
+
+
+def test_show_columns_from_cache_matches_server(db, server):
+    cached = db.show_columns("material")
+    with db.cursor() as cur:
+        cur.execute("SHOW COLUMNS FROM `material`")
+        assert cur.fetchall() == cached
+
+
+def test_unknown_column_and_bad_enum_rejected_before_sending(db, server):
+    server.queries.clear()
+    db.table_info("purchase_order")
+    sent = len(server.queries)
+    with pytest.raises(ValueError, match="nope"):
+        db.insert("material", {"nama_material": "x", "nope": 1})
+    with pytest.raises(ValueError, match="tidak valid"):
+        db.update("purchase_order", "id_po", 1, {"status_po": "Batal"})
+    assert len(server.queries) == sent
+    db.insert("purchase_order", {"no_po": "PO-1", "status_po": "Draft"})
+
+
+def test_ddl_change_picked_up_by_checksum(db, server, monkeypatch):
+    db.table_info("material")
+    server.add_column("material", "kode", "varchar(20)")
+    assert "kode" not in db.table_info("material").columns   # belum waktunya cek
+    monkeypatch.setattr(crud_module, "DDL_CHECK_INTERVAL", 0)
+    assert "kode" in db.table_info("material").columns
+    db.insert("material", {"nama_material": "x", "kode": "K1"})
+
+
+def test_checksum_only_costs_one_query_when_unchanged(db, server, monkeypatch):
+    db.table_info("material")
+    monkeypatch.setattr(crud_module, "DDL_CHECK_INTERVAL", 0)
+    server.queries.clear()
+    db.table_info("material")
+    assert len(server.queries) == 1 and "CRC32" in server.queries[0]
+
+
+def test_refresh_schema_forces_reload(db, server):
+    db.table_info("material")
+    server.add_column("material", "kode", "varchar(20)")
+    crud.refresh_schema()
+    assert db.table_info("material").columns[-1] == "kode"
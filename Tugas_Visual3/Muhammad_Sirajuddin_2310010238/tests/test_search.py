@@ -0,0 +1,162 @@
+import datetime
+
+import pytest
+
+from crud import crud, extra_conditions, narrows, row_matches, search_conditions
+
+NAMES = ["Besi Beton 10mm", "Besi Baja Ringan", "Kawat Besi", "Baja Ringan", "Semen Gresik",
+         "Kayu Balok", "Bata Merah"]
+
+
+@pytest.fixture
+def db(server):
+    server.fill("material", [{"id_material": i, "nama_material": n, "satuan": "kg", "harga": 1}
+                             for i, n in enumerate(NAMES, 1)])
+    server.fill("purchase_order", [
+        {"id_po": 1, "no_po": "PO-0001", "tanggal_po": "2024-01-15", "status_po": "Draft"},
+        {"id_po": 2, "no_po": "PO-0002", "tanggal_po": "2024-02-01", "status_po": "Disetujui"},
+        {"id_po": 3, "no_po": "PO-0003", "tanggal_po": "2023-12-31", "status_po": "Selesai"},
+    ])
+    server.queries.clear()
+    return crud()
+
+
+def names(rows):
+    return [r["nama_material"] for r in rows]
+
+
+def test_long_tokens_use_fulltext_prefix_match(db, server):
+    assert sorted(names(db.search("material", "besi"))) == \
+        ["Besi Baja Ringan", "Besi Beton 10mm", "Kawat Besi"]
+    assert sorted(names(db.search("material", "bes rin"))) == ["Besi Baja Ringan"]
+    searches = [q for q in server.queries if "FROM `material`" in q]
+    assert len(searches) == 2
+    assert all("AGAINST" in q and "LIKE" not in q for q in searches)
+
+
+def test_short_token_is_anchored_prefix_on_name(db):
+    assert sorted(names(db.search("material", "ba"))) == ["Baja Ringan", "Bata Merah"]
+    # token pendek sesudah token panjang: awal kata mana saja di nama
+    assert names(db.search("material", "besi ba")) == ["Besi Baja Ringan"]
+
+
+def test_underscore_is_literal_in_prefix(db, server):
+    server.fill("material", [{"id_material": 50, "nama_material": "a_x", "satuan": "", "harga": 1},
+                             {"id_material": 51, "nama_material": "abx", "satuan": "", "harga": 1}])
+    assert names(db.search("material", "a_")) == ["a_x"]
+
+
+def test_search_page_ranks_and_pages_by_offset(server):
+    server.fill("material", [{"id_material": i, "nama_material": f"Pipa {i}", "satuan": "m",
+                              "harga": 1} for i in range(1, 251)])
+    db = crud()
+    rows, nxt = db.search_page("material", "pipa", "id_material", None, 200)
+    assert (len(rows), nxt) == (200, 200)
+    rest, nxt = db.search_page("material", "pipa", "id_material", nxt, 200)
+    assert (len(rest), nxt) == (50, None)
+    assert len({r["id_material"] for r in rows + rest}) == 250
+
+
+def test_table_without_fulltext_keeps_like_and_keyset(server):
+    server.fill("detail_po", [{"id_detail_po": i, "id_po": 1, "id_material": 1, "jumlah": i,
+                               "harga_satuan": 1, "subtotal": i} for i in range(1, 6)])
+    db = crud()
+    rows, nxt = db.search_page("detail_po", "x", "id_detail_po", None, 3)
+    assert ([r["id_detail_po"] for r in rows], nxt) == ([1, 2, 3], 3)   # cursor = PK terakhir
+    rows, nxt = db.search_page("detail_po", "x", "id_detail_po", nxt, 3)
+    assert ([r["id_detail_po"] for r in rows], nxt) == ([4, 5], None)
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("2024", ["PO-0001", "PO-0002"]),
+    ("2024-01", ["PO-0001"]),
+    ("2023-12-31", ["PO-0003"]),
+    ("Draft", ["PO-0001"]),
+    ("di", ["PO-0002"]),            # awalan status, huruf besar/kecil sama
+    ("PO-0003", ["PO-0003"]),
+    ("2024-13", []),                # bukan tanggal
+])
+def test_purchase_order_search_covers_date_and_status(db, keyword, expected):
+    assert sorted(r["no_po"] for r in db.search("purchase_order", keyword)) == expected
+
+
+def test_extra_conditions():
+    assert extra_conditions("purchase_order", "2024-02") == [
+        ("date", "tanggal_po", (datetime.date(2024, 2, 1), datetime.date(2024, 3, 1)))]
+    assert extra_conditions("purchase_order", "D") == [
+        ("enum", "status_po", ("Draft", "Disetujui", "Dikirim"))]
+    assert extra_conditions("material", "2024") == []
+
+
+# ========== narrowing di klien (user-005) ==========
+def test_search_conditions_split_long_and_short_tokens():
+    assert search_conditions("material", "Besi ba") == [("ft", "besi"), ("word", "ba")]
+    assert search_conditions("material", "ba") == [("anchor", "ba")]
+    assert search_conditions("material", "  ") == []
+
+
+@pytest.mark.parametrize("old, new, expected", [
+    ("bes", "besi", True),
+    ("besi", "besi baja", True),
+    ("besi", "bes", False),        # lebih pendek = hasil lebih luas
+    ("besi", "semen", False),
+    ("ba", "bat", False),          # anchor tidak menjamin syarat FULLTEXT
+    ("", "besi", False),
+])
+def test_narrows_material(old, new, expected):
+    assert narrows("material", old, new) is expected
+
+
+def test_narrows_purchase_order_extra_columns():
+    assert narrows("purchase_order", "d", "di")
+    assert narrows("purchase_order", "2024", "2024-01")
+    assert not narrows("purchase_order", "2024-", "2024-01")   # '2024-' belum jadi rentang tanggal
+    assert not narrows("purchase_order", "2024-01", "2024")
+    assert not narrows("detail_po", "abc", "abcd")             # tanpa FULLTEXT
+
+
+def test_row_matches_purchase_order_date_and_status():
+    row = {"no_po": "PO-0000005", "tanggal_po": "2024-01-15", "status_po": "Draft"}
+    for kw, hit in (("2024-01", True), ("2024-02", False), ("dra", True), ("sel", False),
+                    ("PO-0000005", True)):
+        assert row_matches("purchase_order", row, search_conditions("purchase_order", kw),
+                           extra_conditions("purchase_order", kw)) is hit, kw
+
+
+@pytest.mark.parametrize("keyword", ["besi", "bes rin", "ba", "besi ba", "kawat"])
+def test_client_filter_agrees_with_sql(db, keyword):
+    everything = db.fetch_all("material")
+    conds = search_conditions("material", keyword)
+    assert sorted(names(r for r in everything if row_matches("material", r, conds))) == \
+        sorted(names(db.search("material", keyword)))
+
+
+@pytest.mark.parametrize("keyword", ["Draft", "2024-01", "PO-0002", "s"])
+def test_client_filter_agrees_with_sql_purchase_order(db, keyword):
+    conds, extras = search_conditions("purchase_order", keyword), extra_conditions("purchase_order", keyword)
+    rows = db.search("purchase_order", keyword)
+    assert rows
+    assert all(row_matches("purchase_order", r, conds, extras) for r in rows)
+
+
+def test_form_debounces_and_narrows_without_query(db, server, wait):
+    from material import MaterialForm
+    form = MaterialForm()
+    wait(lambda: form.table.model() is not None)
+    for text in ("b", "be", "bes"):   # diketik cepat: satu pencarian saja
+        form.lineSearch.setText(text)
+    wait(lambda: form.table.model().keyword == "bes")
+    assert sum("AGAINST" in q or "LIKE" in q for q in server.queries) == 1
+    assert sorted(names(form.table.model().all_rows())) == \
+        ["Besi Baja Ringan", "Besi Beton 10mm", "Kawat Besi"]
+
+    server.queries.clear()
+    form.lineSearch.setText("besi ba")   # hasil pasti bagian dari 'bes' -> disaring di klien
+    wait(lambda: form.table.model().keyword == "besi ba")
+    assert names(form.table.model().all_rows()) == ["Besi Baja Ringan"]
+    assert server.queries == []
+
+    form.lineSearch.setText("semen")     # bukan penyempitan -> query baru
+    wait(lambda: form.table.model().keyword == "semen")
+    assert names(form.table.model().all_rows()) == ["Semen Gresik"]
+    assert len(server.queries) == 1
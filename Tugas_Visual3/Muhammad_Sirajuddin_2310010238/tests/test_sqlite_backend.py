@@ -0,0 +1,123 @@
+import datetime
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+import backend_sqlite
+import crud as crud_module
+from worker import DbWorker
+
+
+def _one(db, sql, *params):
+    with db.cursor() as cur:
+        cur.execute(sql, params)
+        return cur.fetchone()
+
+
+def test_database_is_built_from_dump(sqlite_db):
+    info = sqlite_db.table_info("purchase_order")
+    assert info.pk == "id_po"
+    assert list(info.enums["status_po"]) == ["Draft", "Disetujui", "Dikirim", "Selesai"]
+    assert info.data_types["tanggal_po"] == "date"
+    assert crud_module.crud.pool_stats()["backend"] == "sqlite"
+    assert _one(sqlite_db, "PRAGMA journal_mode")["journal_mode"] == "wal"
+
+
+def test_crud_round_trip_keeps_types(sqlite_db):
+    sp = sqlite_db.insert("pemasok", {"nama_pemasok": "PT Maju"})
+    po = sqlite_db.insert("purchase_order", {"no_po": "PO-1", "tanggal_po": "2024-01-15",
+                                             "id_pemasok": sp, "status_po": "Draft"})
+    m = sqlite_db.insert("material", {"nama_material": "Semen", "harga": "65000.50"})
+    row = sqlite_db.fetch_by_id("material", "id_material", m)
+    assert row["harga"] == Decimal("65000.50")
+    assert sqlite_db.fetch_by_id("purchase_order", "id_po", po)["tanggal_po"] == \
+        datetime.date(2024, 1, 15)
+    assert sqlite_db.update("material", "id_material", m, {"satuan": "sak"})
+    assert sqlite_db.fetch_by_id("material", "id_material", m)["satuan"] == "sak"
+    assert sqlite_db.delete("material", "id_material", m)
+    assert sqlite_db.fetch_by_id("material", "id_material", m) is None
+
+
+def test_bad_enum_and_foreign_key_are_rejected(sqlite_db):
+    with pytest.raises(Exception):
+        sqlite_db.insert("purchase_order", {"no_po": "PO-2", "status_po": "Batal"})
+    with pytest.raises(Exception):
+        sqlite_db.insert("purchase_order", {"no_po": "PO-3", "id_pemasok": 999})
+
+
+def test_fts5_search_matches_mysql_semantics(sqlite_db):
+    for n in ("Besi Beton 10mm", "Besi Baja Ringan", "Kawat Besi", "Baja Ringan", "Bata Merah"):
+        sqlite_db.insert("material", {"nama_material": n})
+    names = lambda kw: sorted(r["nama_material"] for r in sqlite_db.search("material", kw))
+    assert names("besi") == ["Besi Baja Ringan", "Besi Beton 10mm", "Kawat Besi"]
+    assert names("bes rin") == ["Besi Baja Ringan"]
+    assert names("ba") == ["Baja Ringan", "Bata Merah"]
+    assert names("besi ba") == ["Besi Baja Ringan"]
+    # index FTS5 ikut trigger tulis
+    m = sqlite_db.insert("material", {"nama_material": "Besi Siku"})
+    sqlite_db.update("material", "id_material", m, {"nama_material": "Paku"})
+    assert names("siku") == [] and names("paku") == ["Paku"]
+
+
+def test_purchase_order_search_by_date_and_status(sqlite_db):
+    for i, (tgl, st) in enumerate([("2024-01-15", "Draft"), ("2024-02-01", "Selesai")], 1):
+        sqlite_db.insert("purchase_order", {"no_po": f"PO-{i}", "tanggal_po": tgl, "status_po": st})
+    assert [r["no_po"] for r in sqlite_db.search("purchase_order", "2024-02")] == ["PO-2"]
+    assert [r["no_po"] for r in sqlite_db.search("purchase_order", "dra")] == ["PO-1"]
+
+
+def test_save_order_upserts_lines(sqlite_db):
+    m = sqlite_db.insert("material", {"nama_material": "Semen"})
+    po = sqlite_db.save_order({"no_po": "PO-1", "status_po": "Draft"},
+                              [{"id_material": m, "jumlah": 2, "harga_satuan": "1000"}])
+    line = sqlite_db.fetch_order_lines(po)[0]
+    po2 = sqlite_db.save_order({"id_po": po, "no_po": "PO-1"},
+                               [dict(line, jumlah=5)])
+    assert po2 == po
+    lines = sqlite_db.fetch_order_lines(po)
+    assert [(l["id_detail_po"], l["jumlah"], l["subtotal"]) for l in lines] == \
+        [(line["id_detail_po"], 5, Decimal("5000.00"))]
+    assert sqlite_db.fetch_by_id("purchase_order", "id_po", po)["total"] == Decimal("5000.00")
+
+
+def test_writer_does_not_block_readers(sqlite_db):
+    sqlite_db.insert("material", {"nama_material": "a"})
+    with sqlite_db.transaction() as cur:   # transaksi tulis terbuka (WAL)
+        cur.execute("INSERT INTO `material` (`nama_material`) VALUES (%s)", ("b",))
+        assert [r["nama_material"] for r in crud_module.crud().fetch_all("material")] == ["a"]
+    sqlite_db.notify_bulk_write("material")   # tulis lewat cursor mentah tidak lewat hook
+    assert len(sqlite_db.fetch_all("material")) == 2
+
+
+def test_superseded_query_is_interrupted(sqlite_db, wait):
+    slow = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000000) "
+            "SELECT COUNT(*) AS n FROM c")
+    started, outcome, done = threading.Event(), [], []
+
+    def fn(db):
+        started.set()
+        try:
+            with db.cursor() as cur:
+                cur.execute(slow)
+        except Exception as e:
+            outcome.append(str(e))
+
+    worker = DbWorker()
+    worker.submit(fn, channel="cari")
+    assert started.wait(5)
+    time.sleep(0.1)
+    worker.submit(lambda db: "baru", on_done=done.append, channel="cari")
+    wait(lambda: outcome and done)
+    assert "interrupted" in outcome[0]
+
+
+def test_dump_parser_reads_keys_and_fulltext():
+    with open(crud_module.SQL_DUMP, encoding="utf-8") as f:
+        tables, _, _ = backend_sqlite.parse_dump(f.read())
+    assert set(tables) >= set(crud_module.TABLES)
+    po = tables["purchase_order"]
+    assert (po.pk, po.auto) == ("id_po", "id_po")
+    assert ("FULLTEXT", "ft_purchase_order", ["no_po"]) in po.indexes
+    assert ("id_pemasok", "pemasok", "id_pemasok") in po.fks
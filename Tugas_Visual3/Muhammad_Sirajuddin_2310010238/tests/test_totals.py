@@ -0,0 +1,89 @@
+from decimal import Decimal
+
+import pytest
+from PySide6.QtWidgets import QAbstractSpinBox, QDoubleSpinBox
+
+
+def one(db, sql, *params):
+    with db.cursor() as cur:
+        cur.execute(sql, params)
+        return cur.fetchone()
+
+
+def order(db):
+    """Pemasok, pelanggan, 2 material + PO baru; return (id_pemasok, id_pelanggan, id_po, m1, m2)."""
+    sp = db.insert("pemasok", {"nama_pemasok": "Tes Pemasok"})
+    pl = db.insert("pelanggan", {"nama_pelanggan": "Tes Pelanggan"})
+    m1 = db.insert("material", {"nama_material": "Tes Semen", "satuan": "sak", "harga": "50000"})
+    m2 = db.insert("material", {"nama_material": "Tes Pasir", "satuan": "m3", "harga": "200000"})
+    po = db.insert("purchase_order", {"no_po": "PO-TES-1", "tanggal_po": "2024-01-15",
+                                      "id_pemasok": sp, "id_pelanggan": pl, "status_po": "Draft"})
+    return sp, pl, po, m1, m2
+
+
+def test_detail_writes_maintain_totals_and_summaries(sqlite_db):
+    db = sqlite_db
+    sp, pl, po, m1, m2 = order(db)
+    d1 = db.insert("detail_po", {"id_po": po, "id_material": m1, "jumlah": 3,
+                                 "harga_satuan": "1000.50", "subtotal": "1"})   # subtotal diabaikan
+    db.insert("detail_po", {"id_po": po, "id_material": m2, "jumlah": 2, "harga_satuan": "250"})
+
+    assert db.fetch_by_id("detail_po", "id_detail_po", d1)["subtotal"] == Decimal("3001.50")
+    assert db.fetch_by_id("purchase_order", "id_po", po)["total"] == Decimal("3501.50")
+    assert one(db, "SELECT jumlah_po, total FROM ringkasan_pemasok WHERE id_pemasok = %s", sp) \
+        == {"jumlah_po": 1, "total": Decimal("3501.50")}
+    assert one(db, "SELECT jumlah_po, total FROM ringkasan_pelanggan WHERE id_pelanggan = %s", pl) \
+        == {"jumlah_po": 1, "total": Decimal("3501.50")}
+    assert one(db, "SELECT jumlah_baris, jumlah, subtotal FROM ringkasan_material "
+                   "WHERE id_material = %s", m1) \
+        == {"jumlah_baris": 1, "jumlah": 3, "subtotal": Decimal("3001.50")}
+
+    db.update("detail_po", "id_detail_po", d1, {"jumlah": 1, "harga_satuan": "1000.50"})
+    assert db.fetch_by_id("purchase_order", "id_po", po)["total"] == Decimal("1500.50")
+    db.delete("detail_po", "id_detail_po", d1)
+    assert db.fetch_by_id("purchase_order", "id_po", po)["total"] == Decimal("500.00")
+    assert one(db, "SELECT total FROM ringkasan_pemasok WHERE id_pemasok = %s", sp)["total"] \
+        == Decimal("500.00")
+    assert one(db, "SELECT jumlah_baris, subtotal FROM ringkasan_material WHERE id_material = %s",
+               m1) == {"jumlah_baris": 0, "subtotal": Decimal("0.00")}
+    # data sudah konsisten: hitung ulang tidak membetulkan apa-apa
+    assert db.rebuild_rollups() == (0, 0)
+
+
+def test_moving_a_line_updates_both_orders(sqlite_db):
+    db = sqlite_db
+    _, _, po, m1, _ = order(db)
+    other = db.insert("purchase_order", {"no_po": "PO-TES-2", "status_po": "Draft"})
+    d1 = db.insert("detail_po", {"id_po": po, "id_material": m1, "jumlah": 2, "harga_satuan": "10"})
+    db.update("detail_po", "id_detail_po", d1, {"id_po": other})
+    assert db.fetch_by_id("purchase_order", "id_po", po)["total"] == Decimal("0.00")
+    assert db.fetch_by_id("purchase_order", "id_po", other)["total"] == Decimal("20.00")
+
+
+def test_total_typed_by_user_is_ignored(sqlite_db):
+    db = sqlite_db
+    _, _, po, _, _ = order(db)
+    db.update("purchase_order", "id_po", po, {"total": "999", "status_po": "Disetujui"})
+    row = db.fetch_by_id("purchase_order", "id_po", po)
+    assert (row["total"], row["status_po"]) == (Decimal("0"), "Disetujui")
+
+
+def test_unknown_column_rejected_on_rollup_path(sqlite_db):
+    with pytest.raises(ValueError, match="nope"):
+        sqlite_db.insert("detail_po", {"nope": 1})
+    with pytest.raises(ValueError, match="tidak valid"):
+        sqlite_db.insert("purchase_order", {"no_po": "PO-X", "status_po": "Salah"})
+
+
+@pytest.mark.parametrize("module, cls, col, widget", [
+    ("purchase_order", "PurchaseOrderForm", "total", "spinTotal"),
+    ("po_editor", "POEditorForm", "total", "spinTotal"),
+    ("detail_po", "DetailPOForm", "subtotal", "spinSubtotal"),
+])
+def test_derived_columns_are_display_only(qapp, server, module, cls, col, widget):
+    form = getattr(__import__(module), cls)()
+    spin = form.ui.findChild(QDoubleSpinBox, widget)
+    assert spin.isReadOnly() and spin.buttonSymbols() == QAbstractSpinBox.NoButtons
+    form.set_form_data({col: "1234.5"})
+    assert spin.value() == 1234.5   # tetap ditampilkan
+    assert col not in form.get_form_data()
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from worker import DbWorker
+
+# query yang jalan lama sekali kecuali dihentikan KILL QUERY
+SLOW_SQL = ("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 300000000) "
+            "SELECT COUNT(*) AS n FROM c")
+
+
+def slow_query(started, outcome):
+    def fn(db):
+        started.set()
+        t0 = time.monotonic()
+        try:
+            with db.cursor() as cur:
+                cur.execute(SLOW_SQL)
+            outcome.append(("selesai", time.monotonic() - t0))
+        except Exception as e:
+            outcome.append((str(e), time.monotonic() - t0))
+        return "lambat"
+    return fn
+
+
+def test_result_comes_back_on_gui_thread(server, wait):
+    worker = DbWorker()
+    got = []
+    worker.submit(lambda db, x: x * 2, 21,
+                  on_done=lambda r: got.append((r, threading.current_thread())))
+    wait(lambda: got)
+    assert got == [(42, threading.main_thread())]
+
+
+def test_error_goes_to_on_error(server, wait):
+    worker = DbWorker()
+    errors = []
+    worker.submit(lambda db: db.fetch_all("tidak_ada"), on_error=errors.append)
+    wait(lambda: errors)
+    assert "tidak_ada" in errors[0]
+
+
+def test_newer_request_on_channel_supersedes_and_kills_running_one(server, wait):
+    worker = DbWorker()
+    started, outcome, done = threading.Event(), [], []
+    worker.submit(slow_query(started, outcome), on_done=done.append, channel="cari")
+    assert started.wait(5)
+    time.sleep(0.1)   # query sudah di server
+    worker.submit(lambda db: "baru", on_done=done.append, channel="cari")
+    wait(lambda: outcome and done)
+    time.sleep(0.05)
+    assert done == ["baru"]                      # hasil request lama dibuang
+    assert "interrupted" in outcome[0][0]
+    assert outcome[0][1] < 2
+    assert len(server.killed) == 1
+
+
+def test_queued_request_is_taken_off_the_queue(server, wait):
+    worker = DbWorker()
+    gate = threading.Event()
+    ran, done = [], []
+    for _ in range(4):   # semua thread pool sibuk
+        worker.submit(lambda db: gate.wait(5))
+    worker.submit(lambda db: ran.append("lama"), channel="x")
+    worker.submit(lambda db: ran.append("baru"), on_done=done.append, channel="x")
+    gate.set()
+    wait(lambda: done)
+    assert ran == ["baru"]
+    assert server.killed == []
+
+
+def test_cancel_all_stops_busy_pool(server, wait):
+    # KILL tidak boleh antre di belakang query yang mau dihentikannya
+    worker = DbWorker()
+    outcome = []
+    for _ in range(4):
+        started = threading.Event()
+        worker.submit(slow_query(started, outcome))
+        assert started.wait(5)
+    time.sleep(0.1)
+    t0 = time.monotonic()
+    worker.cancel_all()
+    wait(lambda: len(outcome) == 4)
+    assert time.monotonic() - t0 < 2
+    assert all("interrupted" in msg for msg, _ in outcome)
@@ -0,0 +1,157 @@
+# ui_loader.py — muat file .ui lewat modul hasil pyside6-uic (dicek basi/tidak), cadangannya QUiLoader
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from PySide6 import QtWidgets
+from PySide6.QtCore import QBuffer, QByteArray
+
+BASE = Path(__file__).resolve().parent
+COMPILED_DIR = BASE / "_uic"   # hasil pyside6-uic (tidak di-commit, dibuat ulang kalau .ui berubah)
+AUTO_COMPILE = os.environ.get("UI_AUTO_COMPILE", "1") != "0"   # compile otomatis waktu pertama dipakai
+
+_TOP_RE = re.compile(rb'<widget\s+class="(\w+)"')
+_HEADER = "# ui-sha1: {} {}\n"   # baris pertama modul hasil compile: hash isi .ui + kelas widget teratas
+
+_lock = threading.Lock()
+_classes = {}     # nama .ui -> (kelas Ui_*, kelas widget teratas)
+_templates = {}   # nama .ui -> isi file (untuk QUiLoader kalau uic tidak ada)
+_loader = None
+
+
+def _source(ui_name):
+    path = BASE / ui_name
+    if not path.exists():
+        raise FileNotFoundError(f"UI file tidak ditemukan: {path}")
+    return path
+
+
+def _compiled_path(ui_name):
+    return COMPILED_DIR / f"ui_{Path(ui_name).stem}.py"
+
+
+def _uic():
+    exe = shutil.which("pyside6-uic")
+    return [exe] if exe else None
+
+
+def is_stale(ui_name):
+    """True kalau modul hasil uic belum ada atau dibuat dari isi .ui yang lain."""
+    data = _source(ui_name).read_bytes()
+    try:
+        with open(_compiled_path(ui_name), encoding="utf-8") as f:
+            first = f.readline()
+    except OSError:
+        return True
+    return not first.startswith(f"# ui-sha1: {hashlib.sha1(data).hexdigest()} ")
+
+
+def compile_ui(ui_name, force=False):
+    """Jalankan pyside6-uic kalau modulnya basi; return path modul atau None kalau uic tidak ada."""
+    out = _compiled_path(ui_name)
+    if not force and not is_stale(ui_name):
+        return out
+    uic = _uic()
+    if uic is None:
+        return None
+    data = _source(ui_name).read_bytes()
+    m = _TOP_RE.search(data)
+    top = m.group(1).decode() if m else "QWidget"
+    try:
+        code = subprocess.run(uic + [str(_source(ui_name))], capture_output=True,
+                              check=True, timeout=30).stdout.decode("utf-8")
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"[WARN] pyside6-uic {ui_name}: {e}")
+        return None
+    try:
+        COMPILED_DIR.mkdir(exist_ok=True)
+        tmp = out.with_suffix(".tmp")
+        tmp.write_text(_HEADER.format(hashlib.sha1(data).hexdigest(), top) + code, encoding="utf-8")
+        os.replace(tmp, out)   # atomik: proses lain tidak pernah melihat file setengah jadi
+    except OSError as e:
+        print(f"[WARN] simpan {out.name}: {e}")   # folder read-only: pakai QUiLoader saja
+        return None
+    return out
+
+
+def _compiled_class(ui_name):
+    with _lock:
+        if ui_name in _classes:
+            return _classes[ui_name]
+        path = None
+        if not is_stale(ui_name):
+            path = _compiled_path(ui_name)
+        elif AUTO_COMPILE:
+            path = compile_ui(ui_name)
+        found = None
+        if path is not None:
+            with open(path, encoding="utf-8") as f:
+                top = f.readline().split()[-1]
+            spec = importlib.util.spec_from_file_location(f"_uic.{path.stem}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            ui_cls = next(v for k, v in vars(module).items() if k.startswith("Ui_"))
+            found = (ui_cls, getattr(QtWidgets, top, QtWidgets.QWidget))
+        _classes[ui_name] = found
+        return found
+
+
+def _load_with_loader(ui_name, parent):
+    """Cadangan tanpa uic: QUiLoader dengan isi file yang di-cache di memori."""
+    global _loader
+    from PySide6 import QtUiTools   # cuma di-import kalau memang perlu
+    with _lock:
+        data = _templates.get(ui_name)
+        if data is None:
+            data = _templates[ui_name] = _source(ui_name).read_bytes()
+        if _loader is None:
+            _loader = QtUiTools.QUiLoader()
+    buf = QBuffer()
+    buf.setData(QByteArray(data))
+    buf.open(QBuffer.ReadOnly)
+    try:
+        return _loader.load(buf, parent)
+    finally:
+        buf.close()
+
+
+def load_ui(ui_name, parent=None):
+    """Widget baru dari `ui_name` (anak `parent`), objectName & isinya sama persis dengan QUiLoader."""
+    found = _compiled_class(ui_name)
+    if found is None:
+        return _load_with_loader(ui_name, parent)
+    ui_cls, widget_cls = found
+    w = widget_cls(parent)
+    ui = ui_cls()
+    ui.setupUi(w)
+    w._ui = ui   # atribut Ui_* tetap hidup selama widgetnya hidup
+    return w
+
+
+def warm(ui_name):
+    """Siapkan (compile + import) modul .ui tanpa membuat widget; dipakai saat aplikasi idle."""
+    _compiled_class(ui_name)
+
+
+def main(argv):
+    """python ui_loader.py [--force] -> compile semua .ui di folder ini (langkah build)."""
+    force = "--force" in argv
+    if _uic() is None:
+        print("pyside6-uic tidak ditemukan; form akan dimuat dengan QUiLoader")
+        return 1
+    for path in sorted(BASE.glob("*.ui")):
+        stale = force or is_stale(path.name)
+        if stale:
+            compile_ui(path.name, force=True)
+        print(f"{path.name}: {'dikompilasi' if stale else 'sudah terbaru'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
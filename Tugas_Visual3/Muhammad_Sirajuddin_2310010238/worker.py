@@ -0,0 +1,158 @@
+import threading
+from functools import partial
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from crud import crud
+
+# Pool thread khusus DB (bukan globalInstance, biar tidak rebutan sama Qt)
+_threads = QThreadPool()
+_threads.setMaxThreadCount(4)   # <= POOL_SIZE di crud, sisanya untuk KILL QUERY
+# KILL QUERY punya pool sendiri: kalau semua _threads sibuk query lambat (saat batal paling
+# dibutuhkan), KILL tidak boleh antre di belakang query yang mau dihentikannya
+_killers = QThreadPool()
+_killers.setMaxThreadCount(2)
+
+
+class _Signals(QObject):
+    done = Signal(int, object)
+    failed = Signal(int, str)
+    progress = Signal(int, int, int)   # seq, selesai, total
+
+
+class _Task(QRunnable):
+    def __init__(self, seq, fn, args, signals, kwargs=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.seq = seq
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.signals = signals
+        self.lock = threading.Lock()
+        self.running = False
+        self.db = None
+
+    def run(self):
+        try:
+            # objek crud per tugas; koneksinya dipinjam dari pool bersama (crud.get_backend)
+            with self.lock:
+                self.running = True
+                self.db = crud()
+            result = self.fn(self.db, *self.args, **self.kwargs)
+        except Exception as e:
+            with self.lock:
+                self.running = False
+            self._emit(self.signals.failed, str(e))
+        else:
+            with self.lock:
+                self.running = False
+            self._emit(self.signals.done, result)
+
+    def report(self, done, total):
+        try:
+            self.signals.progress.emit(self.seq, done, total)
+        except RuntimeError:
+            pass
+
+    def _emit(self, signal, value):
+        try:
+            signal.emit(self.seq, value)
+        except RuntimeError:
+            pass  # penerimanya (form) sudah ditutup
+
+
+def _kill(task):
+    # KILL cuma dikirim kalau tugasnya memang masih jalan
+    try:
+        with task.lock:
+            if task.running:
+                crud().kill_query(task.db)
+    except Exception as e:
+        print(f"[WARN] DB: batal query gagal: {e}")
+
+
+class DbWorker(QObject):
+    """
+    Jalankan fungsi crud di thread pool, hasilnya balik lewat sinyal ke thread GUI.
+    fn dipanggil sebagai fn(db, *args) dengan db = objek crud milik tugas itu.
+    Request dengan channel yang sama saling menggantikan: yang lama dibatalkan.
+    Dengan on_progress, fn juga menerima progress=callable(selesai, total).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._signals = _Signals(self)
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.progress.connect(self._on_progress)
+        self._seq = 0
+        self._tasks = {}      # seq -> (task, on_done, on_error, channel)
+        self._channels = {}   # channel -> seq terakhir
+        self._progress = {}   # seq -> on_progress
+
+    def submit(self, fn, *args, on_done=None, on_error=None, channel=None,
+               on_progress=None):
+        if channel is not None:
+            self.cancel_channel(channel)
+        self._seq += 1
+        seq = self._seq
+        task = _Task(seq, fn, args, self._signals)
+        if on_progress is not None:
+            task.kwargs["progress"] = task.report
+            self._progress[seq] = on_progress
+        self._tasks[seq] = (task, on_done, on_error, channel)
+        if channel is not None:
+            self._channels[channel] = seq
+        _threads.start(task)
+        return seq
+
+    def cancel(self, seq):
+        entry = self._tasks.pop(seq, None)
+        self._progress.pop(seq, None)
+        if entry is None:
+            return
+        task, _, _, channel = entry
+        if channel is not None and self._channels.get(channel) == seq:
+            del self._channels[channel]
+        if not _threads.tryTake(task):
+            # sudah jalan: hasilnya dibuang, query-nya dihentikan di server
+            _killers.start(partial(_kill, task))
+
+    def cancel_channel(self, channel):
+        seq = self._channels.get(channel)
+        if seq is not None:
+            self.cancel(seq)
+
+    def cancel_all(self):
+        for seq in list(self._tasks):
+            self.cancel(seq)
+
+    def _on_progress(self, seq, done, total):
+        fn = self._progress.get(seq)
+        if fn is not None:
+            fn(done, total)
+
+    def _on_done(self, seq, result):
+        self._progress.pop(seq, None)
+        entry = self._tasks.pop(seq, None)
+        if entry is None:
+            return  # sudah dibatalkan
+        _, on_done, _, channel = entry
+        if channel is not None and self._channels.get(channel) == seq:
+            del self._channels[channel]
+        if on_done:
+            on_done(result)
+
+    def _on_failed(self, seq, msg):
+        self._progress.pop(seq, None)
+        entry = self._tasks.pop(seq, None)
+        if entry is None:
+            return
+        _, _, on_error, channel = entry
+        if channel is not None and self._channels.get(channel) == seq:
+            del self._channels[channel]
+        if on_error:
+            on_error(msg)
+        else:
+            print(f"[WARN] DB: {msg}")
@@ -23,8 +23,41 @@ SET time_zone = "+00:00";
 
 -- --------------------------------------------------------
 
+--
+-- Struktur dari tabel `change_log`
+-- (diisi trigger di bawah; dibaca aplikasi per id untuk memperbarui form yang terbuka.
+--  Retensi: event MySQL di bawah membuang baris di luar 100.000 id terakhir, paling banyak
+--  5.000 baris sekali hapus; perlu SET GLOBAL event_scheduler = ON. Kalau event tidak bisa
+--  dipasang, nyalakan CHANGE_LOG_PRUNE=1 di SATU proses aplikasi saja (lihat changes.py).
+--  Pembaca yang tertinggal lebih jauh dari itu memuat ulang form-nya.)
+--
+
+CREATE TABLE `change_log` (
+  `id` bigint(20) NOT NULL,
+  `tabel` varchar(64) NOT NULL,
+  `op` enum('insert','update','delete') NOT NULL,
+  `pk` int(11) NOT NULL,
+  `waktu` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Event retensi `change_log`
+--
+DELIMITER $$
+CREATE EVENT `change_log_retensi` ON SCHEDULE EVERY 1 MINUTE DO BEGIN
+  DECLARE batas BIGINT;
+  SELECT MAX(`id`) - 100000 INTO batas FROM `change_log`;
+  DELETE FROM `change_log` WHERE `id` < batas ORDER BY `id` LIMIT 5000;
+END
+$$
+DELIMITER ;
+
+-- --------------------------------------------------------
+
 --
 -- Struktur dari tabel `detail_po`
+-- (subtotal = jumlah * harga_satuan dan total purchase_order = jumlah subtotal detailnya
+--  dijaga trigger di bawah; nilai yang diketik/diimpor untuk kedua kolom itu diabaikan)
 --
 
 CREATE TABLE `detail_po` (
@@ -33,9 +66,49 @@ CREATE TABLE `detail_po` (
   `id_material` int(11) DEFAULT NULL,
   `jumlah` int(11) DEFAULT NULL,
   `harga_satuan` decimal(15,2) DEFAULT NULL,
-  `subtotal` decimal(15,2) DEFAULT NULL
+  `subtotal` decimal(15,2) DEFAULT 0.00,
+  `diubah_pada` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+--
+-- Trigger `detail_po`
+--
+DELIMITER $$
+CREATE TRIGGER `detail_po_insert_log` AFTER INSERT ON `detail_po` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('detail_po', 'insert', NEW.`id_detail_po`)
+$$
+CREATE TRIGGER `detail_po_update_log` AFTER UPDATE ON `detail_po` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('detail_po', 'update', NEW.`id_detail_po`)
+$$
+CREATE TRIGGER `detail_po_delete_log` AFTER DELETE ON `detail_po` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('detail_po', 'delete', OLD.`id_detail_po`)
+$$
+CREATE TRIGGER `detail_po_insert_subtotal` BEFORE INSERT ON `detail_po` FOR EACH ROW SET NEW.`subtotal` = ROUND(COALESCE(NEW.`jumlah`, 0) * COALESCE(NEW.`harga_satuan`, 0), 2)
+$$
+CREATE TRIGGER `detail_po_update_subtotal` BEFORE UPDATE ON `detail_po` FOR EACH ROW SET NEW.`subtotal` = ROUND(COALESCE(NEW.`jumlah`, 0) * COALESCE(NEW.`harga_satuan`, 0), 2)
+$$
+CREATE TRIGGER `detail_po_insert_total` AFTER INSERT ON `detail_po` FOR EACH ROW UPDATE `purchase_order` SET `total` = ROUND(COALESCE(`total`, 0) + NEW.`subtotal`, 2) WHERE `id_po` = NEW.`id_po` AND NEW.`subtotal` <> 0
+$$
+CREATE TRIGGER `detail_po_update_total` AFTER UPDATE ON `detail_po` FOR EACH ROW BEGIN
+  UPDATE `purchase_order` SET `total` = ROUND(COALESCE(`total`, 0) + COALESCE(NEW.`subtotal`, 0) - COALESCE(OLD.`subtotal`, 0), 2) WHERE `id_po` = NEW.`id_po` AND NEW.`id_po` = OLD.`id_po` AND COALESCE(NEW.`subtotal`, 0) <> COALESCE(OLD.`subtotal`, 0);
+  UPDATE `purchase_order` SET `total` = ROUND(COALESCE(`total`, 0) - COALESCE(OLD.`subtotal`, 0), 2) WHERE `id_po` = OLD.`id_po` AND COALESCE(NEW.`id_po`, 0) <> OLD.`id_po`;
+  UPDATE `purchase_order` SET `total` = ROUND(COALESCE(`total`, 0) + COALESCE(NEW.`subtotal`, 0), 2) WHERE `id_po` = NEW.`id_po` AND COALESCE(OLD.`id_po`, 0) <> NEW.`id_po`;
+END
+$$
+CREATE TRIGGER `detail_po_delete_total` AFTER DELETE ON `detail_po` FOR EACH ROW UPDATE `purchase_order` SET `total` = ROUND(COALESCE(`total`, 0) - COALESCE(OLD.`subtotal`, 0), 2) WHERE `id_po` = OLD.`id_po` AND COALESCE(OLD.`subtotal`, 0) <> 0
+$$
+CREATE TRIGGER `detail_po_insert_ringkasan` AFTER INSERT ON `detail_po` FOR EACH ROW BEGIN
+  INSERT IGNORE INTO `ringkasan_material` (`id_material`) VALUES (COALESCE(NEW.`id_material`, 0));
+  UPDATE `ringkasan_material` SET `jumlah_baris` = `jumlah_baris` + 1, `jumlah` = `jumlah` + COALESCE(NEW.`jumlah`, 0), `subtotal` = ROUND(`subtotal` + COALESCE(NEW.`subtotal`, 0), 2) WHERE `id_material` = COALESCE(NEW.`id_material`, 0);
+END
+$$
+CREATE TRIGGER `detail_po_update_ringkasan` AFTER UPDATE ON `detail_po` FOR EACH ROW BEGIN
+  UPDATE `ringkasan_material` SET `jumlah_baris` = `jumlah_baris` - 1, `jumlah` = `jumlah` - COALESCE(OLD.`jumlah`, 0), `subtotal` = ROUND(`subtotal` - COALESCE(OLD.`subtotal`, 0), 2) WHERE `id_material` = COALESCE(OLD.`id_material`, 0) AND (COALESCE(NEW.`id_material`, 0) <> COALESCE(OLD.`id_material`, 0) OR COALESCE(NEW.`jumlah`, 0) <> COALESCE(OLD.`jumlah`, 0) OR COALESCE(NEW.`subtotal`, 0) <> COALESCE(OLD.`subtotal`, 0));
+  INSERT IGNORE INTO `ringkasan_material` (`id_material`) VALUES (COALESCE(NEW.`id_material`, 0));
+  UPDATE `ringkasan_material` SET `jumlah_baris` = `jumlah_baris` + 1, `jumlah` = `jumlah` + COALESCE(NEW.`jumlah`, 0), `subtotal` = ROUND(`subtotal` + COALESCE(NEW.`subtotal`, 0), 2) WHERE `id_material` = COALESCE(NEW.`id_material`, 0) AND (COALESCE(NEW.`id_material`, 0) <> COALESCE(OLD.`id_material`, 0) OR COALESCE(NEW.`jumlah`, 0) <> COALESCE(OLD.`jumlah`, 0) OR COALESCE(NEW.`subtotal`, 0) <> COALESCE(OLD.`subtotal`, 0));
+END
+$$
+CREATE TRIGGER `detail_po_delete_ringkasan` AFTER DELETE ON `detail_po` FOR EACH ROW UPDATE `ringkasan_material` SET `jumlah_baris` = `jumlah_baris` - 1, `jumlah` = `jumlah` - COALESCE(OLD.`jumlah`, 0), `subtotal` = ROUND(`subtotal` - COALESCE(OLD.`subtotal`, 0), 2) WHERE `id_material` = COALESCE(OLD.`id_material`, 0)
+$$
+DELIMITER ;
+
 -- --------------------------------------------------------
 
 --
@@ -46,9 +119,22 @@ CREATE TABLE `material` (
   `id_material` int(11) NOT NULL,
   `nama_material` varchar(100) NOT NULL,
   `satuan` varchar(20) DEFAULT NULL,
-  `harga` decimal(15,2) DEFAULT NULL
+  `harga` decimal(15,2) DEFAULT NULL,
+  `diubah_pada` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+--
+-- Trigger `material`
+--
+DELIMITER $$
+CREATE TRIGGER `material_insert_log` AFTER INSERT ON `material` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('material', 'insert', NEW.`id_material`)
+$$
+CREATE TRIGGER `material_update_log` AFTER UPDATE ON `material` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('material', 'update', NEW.`id_material`)
+$$
+CREATE TRIGGER `material_delete_log` AFTER DELETE ON `material` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('material', 'delete', OLD.`id_material`)
+$$
+DELIMITER ;
+
 -- --------------------------------------------------------
 
 --
@@ -60,9 +146,22 @@ CREATE TABLE `pelanggan` (
   `nama_pelanggan` varchar(100) NOT NULL,
   `alamat` text DEFAULT NULL,
   `telepon` varchar(15) DEFAULT NULL,
-  `email` varchar(50) DEFAULT NULL
+  `email` varchar(50) DEFAULT NULL,
+  `diubah_pada` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+--
+-- Trigger `pelanggan`
+--
+DELIMITER $$
+CREATE TRIGGER `pelanggan_insert_log` AFTER INSERT ON `pelanggan` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pelanggan', 'insert', NEW.`id_pelanggan`)
+$$
+CREATE TRIGGER `pelanggan_update_log` AFTER UPDATE ON `pelanggan` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pelanggan', 'update', NEW.`id_pelanggan`)
+$$
+CREATE TRIGGER `pelanggan_delete_log` AFTER DELETE ON `pelanggan` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pelanggan', 'delete', OLD.`id_pelanggan`)
+$$
+DELIMITER ;
+
 -- --------------------------------------------------------
 
 --
@@ -74,9 +173,22 @@ CREATE TABLE `pemasok` (
   `nama_pemasok` varchar(100) NOT NULL,
   `alamat` text DEFAULT NULL,
   `telepon` varchar(15) DEFAULT NULL,
-  `email` varchar(50) DEFAULT NULL
+  `email` varchar(50) DEFAULT NULL,
+  `diubah_pada` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
+--
+-- Trigger `pemasok`
+--
+DELIMITER $$
+CREATE TRIGGER `pemasok_insert_log` AFTER INSERT ON `pemasok` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pemasok', 'insert', NEW.`id_pemasok`)
+$$
+CREATE TRIGGER `pemasok_update_log` AFTER UPDATE ON `pemasok` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pemasok', 'update', NEW.`id_pemasok`)
+$$
+CREATE TRIGGER `pemasok_delete_log` AFTER DELETE ON `pemasok` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('pemasok', 'delete', OLD.`id_pemasok`)
+$$
+DELIMITER ;
+
 -- --------------------------------------------------------
 
 --
@@ -89,39 +201,130 @@ CREATE TABLE `purchase_order` (
   `tanggal_po` date DEFAULT NULL,
   `id_pemasok` int(11) DEFAULT NULL,
   `id_pelanggan` int(11) DEFAULT NULL,
-  `total` decimal(15,2) DEFAULT NULL,
-  `status_po` enum('Draft','Disetujui','Dikirim','Selesai') DEFAULT NULL
+  `total` decimal(15,2) DEFAULT 0.00,
+  `status_po` enum('Draft','Disetujui','Dikirim','Selesai') DEFAULT NULL,
+  `diubah_pada` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+--
+-- Trigger `purchase_order`
+--
+DELIMITER $$
+CREATE TRIGGER `purchase_order_insert_log` AFTER INSERT ON `purchase_order` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('purchase_order', 'insert', NEW.`id_po`)
+$$
+CREATE TRIGGER `purchase_order_update_log` AFTER UPDATE ON `purchase_order` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('purchase_order', 'update', NEW.`id_po`)
+$$
+CREATE TRIGGER `purchase_order_delete_log` AFTER DELETE ON `purchase_order` FOR EACH ROW INSERT INTO `change_log` (`tabel`, `op`, `pk`) VALUES ('purchase_order', 'delete', OLD.`id_po`)
+$$
+CREATE TRIGGER `purchase_order_insert_ringkasan` AFTER INSERT ON `purchase_order` FOR EACH ROW BEGIN
+  INSERT IGNORE INTO `ringkasan_pemasok` (`id_pemasok`) VALUES (COALESCE(NEW.`id_pemasok`, 0));
+  UPDATE `ringkasan_pemasok` SET `jumlah_po` = `jumlah_po` + 1, `total` = ROUND(`total` + COALESCE(NEW.`total`, 0), 2) WHERE `id_pemasok` = COALESCE(NEW.`id_pemasok`, 0);
+  INSERT IGNORE INTO `ringkasan_pelanggan` (`id_pelanggan`) VALUES (COALESCE(NEW.`id_pelanggan`, 0));
+  UPDATE `ringkasan_pelanggan` SET `jumlah_po` = `jumlah_po` + 1, `total` = ROUND(`total` + COALESCE(NEW.`total`, 0), 2) WHERE `id_pelanggan` = COALESCE(NEW.`id_pelanggan`, 0);
+END
+$$
+CREATE TRIGGER `purchase_order_update_ringkasan` AFTER UPDATE ON `purchase_order` FOR EACH ROW BEGIN
+  UPDATE `ringkasan_pemasok` SET `jumlah_po` = `jumlah_po` - 1, `total` = ROUND(`total` - COALESCE(OLD.`total`, 0), 2) WHERE `id_pemasok` = COALESCE(OLD.`id_pemasok`, 0) AND (COALESCE(NEW.`id_pemasok`, 0) <> COALESCE(OLD.`id_pemasok`, 0) OR COALESCE(NEW.`total`, 0) <> COALESCE(OLD.`total`, 0));
+  INSERT IGNORE INTO `ringkasan_pemasok` (`id_pemasok`) VALUES (COALESCE(NEW.`id_pemasok`, 0));
+  UPDATE `ringkasan_pemasok` SET `jumlah_po` = `jumlah_po` + 1, `total` = ROUND(`total` + COALESCE(NEW.`total`, 0), 2) WHERE `id_pemasok` = COALESCE(NEW.`id_pemasok`, 0) AND (COALESCE(NEW.`id_pemasok`, 0) <> COALESCE(OLD.`id_pemasok`, 0) OR COALESCE(NEW.`total`, 0) <> COALESCE(OLD.`total`, 0));
+  UPDATE `ringkasan_pelanggan` SET `jumlah_po` = `jumlah_po` - 1, `total` = ROUND(`total` - COALESCE(OLD.`total`, 0), 2) WHERE `id_pelanggan` = COALESCE(OLD.`id_pelanggan`, 0) AND (COALESCE(NEW.`id_pelanggan`, 0) <> COALESCE(OLD.`id_pelanggan`, 0) OR COALESCE(NEW.`total`, 0) <> COALESCE(OLD.`total`, 0));
+  INSERT IGNORE INTO `ringkasan_pelanggan` (`id_pelanggan`) VALUES (COALESCE(NEW.`id_pelanggan`, 0));
+  UPDATE `ringkasan_pelanggan` SET `jumlah_po` = `jumlah_po` + 1, `total` = ROUND(`total` + COALESCE(NEW.`total`, 0), 2) WHERE `id_pelanggan` = COALESCE(NEW.`id_pelanggan`, 0) AND (COALESCE(NEW.`id_pelanggan`, 0) <> COALESCE(OLD.`id_pelanggan`, 0) OR COALESCE(NEW.`total`, 0) <> COALESCE(OLD.`total`, 0));
+END
+$$
+CREATE TRIGGER `purchase_order_delete_ringkasan` AFTER DELETE ON `purchase_order` FOR EACH ROW BEGIN
+  UPDATE `ringkasan_pemasok` SET `jumlah_po` = `jumlah_po` - 1, `total` = ROUND(`total` - COALESCE(OLD.`total`, 0), 2) WHERE `id_pemasok` = COALESCE(OLD.`id_pemasok`, 0);
+  UPDATE `ringkasan_pelanggan` SET `jumlah_po` = `jumlah_po` - 1, `total` = ROUND(`total` - COALESCE(OLD.`total`, 0), 2) WHERE `id_pelanggan` = COALESCE(OLD.`id_pelanggan`, 0);
+END
+$$
+DELIMITER ;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `ringkasan_material`
+-- (tabel ringkasan diisi trigger detail_po / purchase_order, dibaca form & laporan per baris;
+--  id 0 = baris tanpa material/pemasok/pelanggan. Hitung ulang dari awal: crud.rebuild_rollups)
+--
+
+CREATE TABLE `ringkasan_material` (
+  `id_material` int(11) NOT NULL,
+  `jumlah_baris` int(11) NOT NULL DEFAULT 0,
+  `jumlah` bigint(20) NOT NULL DEFAULT 0,
+  `subtotal` decimal(15,2) NOT NULL DEFAULT 0.00
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `ringkasan_pelanggan`
+--
+
+CREATE TABLE `ringkasan_pelanggan` (
+  `id_pelanggan` int(11) NOT NULL,
+  `jumlah_po` int(11) NOT NULL DEFAULT 0,
+  `total` decimal(15,2) NOT NULL DEFAULT 0.00
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `ringkasan_pemasok`
+--
+
+CREATE TABLE `ringkasan_pemasok` (
+  `id_pemasok` int(11) NOT NULL,
+  `jumlah_po` int(11) NOT NULL DEFAULT 0,
+  `total` decimal(15,2) NOT NULL DEFAULT 0.00
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
 --
 -- Indexes for dumped tables
 --
 
+--
+-- Indeks untuk tabel `change_log`
+--
+ALTER TABLE `change_log`
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `waktu` (`waktu`);
+
 --
 -- Indeks untuk tabel `detail_po`
 --
 ALTER TABLE `detail_po`
   ADD PRIMARY KEY (`id_detail_po`),
   ADD KEY `id_po` (`id_po`),
-  ADD KEY `id_material` (`id_material`);
+  ADD KEY `id_material` (`id_material`),
+  ADD KEY `diubah_pada` (`diubah_pada`);
 
 --
 -- Indeks untuk tabel `material`
 --
 ALTER TABLE `material`
-  ADD PRIMARY KEY (`id_material`);
+  ADD PRIMARY KEY (`id_material`),
+  ADD KEY `nama_material` (`nama_material`),
+  ADD FULLTEXT KEY `ft_material` (`nama_material`,`satuan`),
+  ADD KEY `diubah_pada` (`diubah_pada`),
+  ADD KEY `harga` (`harga`);
 
 --
 -- Indeks untuk tabel `pelanggan`
 --
 ALTER TABLE `pelanggan`
-  ADD PRIMARY KEY (`id_pelanggan`);
+  ADD PRIMARY KEY (`id_pelanggan`),
+  ADD KEY `nama_pelanggan` (`nama_pelanggan`),
+  ADD FULLTEXT KEY `ft_pelanggan` (`nama_pelanggan`,`alamat`,`telepon`,`email`),
+  ADD KEY `diubah_pada` (`diubah_pada`);
 
 --
 -- Indeks untuk tabel `pemasok`
 --
 ALTER TABLE `pemasok`
-  ADD PRIMARY KEY (`id_pemasok`);
+  ADD PRIMARY KEY (`id_pemasok`),
+  ADD KEY `nama_pemasok` (`nama_pemasok`),
+  ADD FULLTEXT KEY `ft_pemasok` (`nama_pemasok`,`alamat`,`telepon`,`email`),
+  ADD KEY `diubah_pada` (`diubah_pada`);
 
 --
 -- Indeks untuk tabel `purchase_order`
@@ -130,12 +333,42 @@ ALTER TABLE `purchase_order`
   ADD PRIMARY KEY (`id_po`),
   ADD UNIQUE KEY `no_po` (`no_po`),
   ADD KEY `id_pemasok` (`id_pemasok`),
-  ADD KEY `id_pelanggan` (`id_pelanggan`);
+  ADD KEY `tanggal_po` (`tanggal_po`),
+  ADD FULLTEXT KEY `ft_purchase_order` (`no_po`),
+  ADD KEY `id_pelanggan` (`id_pelanggan`),
+  ADD KEY `diubah_pada` (`diubah_pada`),
+  ADD KEY `total` (`total`),
+  ADD KEY `status_tanggal` (`status_po`,`tanggal_po`),
+  ADD KEY `status_total` (`status_po`,`total`);
+
+--
+-- Indeks untuk tabel `ringkasan_material`
+--
+ALTER TABLE `ringkasan_material`
+  ADD PRIMARY KEY (`id_material`);
+
+--
+-- Indeks untuk tabel `ringkasan_pelanggan`
+--
+ALTER TABLE `ringkasan_pelanggan`
+  ADD PRIMARY KEY (`id_pelanggan`);
+
+--
+-- Indeks untuk tabel `ringkasan_pemasok`
+--
+ALTER TABLE `ringkasan_pemasok`
+  ADD PRIMARY KEY (`id_pemasok`);
 
 --
 -- AUTO_INCREMENT untuk tabel yang dibuang
 --
 
+--
+-- AUTO_INCREMENT untuk tabel `change_log`
+--
+ALTER TABLE `change_log`
+  MODIFY `id` bigint(20) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT untuk tabel `detail_po`
 --